@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark of per-genome against bulk creation of the initial population.
+
+Times DefaultReproduction.create_new for a population of wide genomes
+(``--inputs`` inputs, ``--outputs`` outputs, ``initial_connection`` as given)
+with ``initialization = per_genome`` and with ``initialization = bulk``, for
+DefaultGenome and CompactGenome.  Reports the best of three runs.
+
+Usage:
+    python benchmarks/bulk_initialization.py
+    python benchmarks/bulk_initialization.py --pop-size 5000 --inputs 1000 --workers 4
+    python benchmarks/bulk_initialization.py --initial-connection "partial_direct 0.3"
+"""
+
+import argparse
+import configparser
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+from neat.compact_genome import CompactGenome
+
+
+def make_config(genome_type, args, directory):
+    """Write a copy of the test configuration with a wide topology for ``genome_type``."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    section = dict(parser['DefaultGenome'])
+    section.update({'num_inputs': str(args.inputs), 'num_outputs': str(args.outputs),
+                    'initial_connection': args.initial_connection})
+    parser.remove_section('DefaultGenome')
+    parser[genome_type.__name__] = section
+    path = os.path.join(directory, genome_type.__name__)
+    with open(path, 'w') as f:
+        parser.write(f)
+    return neat.Config(genome_type, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, path)
+
+
+def best_time(config, initialization, args, repeat=3):
+    config.reproduction_config.initialization = initialization
+    config.reproduction_config.initialization_workers = args.workers
+    best = float('inf')
+    for _ in range(repeat):
+        reproduction = neat.DefaultReproduction(config.reproduction_config, neat.reporting.ReporterSet(), None)
+        t0 = time.perf_counter()
+        genomes = reproduction.create_new(config.genome_type, config.genome_config, args.pop_size)
+        best = min(best, time.perf_counter() - t0)
+        del genomes
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--pop-size', type=int, default=50)
+    parser.add_argument('--inputs', type=int, default=300)
+    parser.add_argument('--outputs', type=int, default=10)
+    parser.add_argument('--initial-connection', default='full_direct')
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"pop_size {args.pop_size}, {args.inputs} inputs, {args.outputs} outputs, "
+          f"initial_connection {args.initial_connection}, {args.workers} worker(s)")
+    print(f"{'genome type':>15} {'per_genome s':>13} {'bulk s':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for genome_type in (neat.DefaultGenome, CompactGenome):
+            config = make_config(genome_type, args, directory)
+            per_genome = best_time(config, 'per_genome', args)
+            bulk = best_time(config, 'bulk', args)
+            print(f"{genome_type.__name__:>15} {per_genome:>13.2f} {bulk:>8.2f} {per_genome / bulk:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
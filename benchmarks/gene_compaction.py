@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark of gene compaction (``gene_compaction_generations``).
+
+Evolves a population on XOR for ``--generations`` generations, recording which
+genes are expressed in the innovation tracker but removing none, then compacts
+a copy of the final population for each value of K in ``--compaction-generations``.
+For the population before and after compaction it reports the mean numbers of
+node and connection genes per genome, the size of the pickled population (what
+is sent to worker processes or saved in a checkpoint), and the time spent in
+the gene-heavy parts of a generation: the distances between all pairs of
+``--distance-genomes`` genomes and ``pop_size`` crossovers.  The cost of
+compaction itself (per generation) is reported as well.
+
+Usage:
+    python benchmarks/gene_compaction.py
+    python benchmarks/gene_compaction.py --generations 300 --compaction-generations 1 5 20
+"""
+
+import argparse
+import configparser
+import copy
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+
+XOR_INPUTS = [(0.0, 0.0), (0.0, 1.0), (1.0, 0.0), (1.0, 1.0)]
+XOR_OUTPUTS = [0.0, 1.0, 1.0, 0.0]
+
+
+def eval_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        genome.fitness = 4.0 - sum((net.activate(xi)[0] - xo) ** 2 for xi, xo in zip(XOR_INPUTS, XOR_OUTPUTS))
+
+
+def make_config(args, directory):
+    """Write a copy of the test configuration that records gene expression without removing genes."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    parser['NEAT']['pop_size'] = str(args.pop_size)
+    parser['NEAT']['no_fitness_termination'] = 'True'
+    parser['DefaultGenome'].update({'node_add_prob': str(args.node_add_prob), 'conn_delete_prob': '0.1'})
+    parser['DefaultReproduction']['gene_compaction_generations'] = str(args.generations + 1)
+    path = os.path.join(directory, 'config')
+    with open(path, 'w') as f:
+        parser.write(f)
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, path)
+
+
+def best_time(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def measure(genomes, config, args):
+    """Mean genes per genome, pickle size and the times of the distance and crossover workloads."""
+    genome_config = config.genome_config
+    nodes = sum(len(g.nodes) for g in genomes) / len(genomes)
+    connections = sum(len(g.connections) for g in genomes) / len(genomes)
+    size = len(pickle.dumps(genomes))
+
+    sample = genomes[:args.distance_genomes]
+
+    def distances():
+        for i, g1 in enumerate(sample):
+            for g2 in sample[i + 1:]:
+                g1.distance(g2, genome_config)
+
+    rng = random.Random(0)
+    pairs = [(rng.choice(genomes), rng.choice(genomes)) for _ in genomes]
+
+    def crossovers():
+        for g1, g2 in pairs:
+            neat.DefaultGenome(0).configure_crossover(g1, g2, genome_config)
+
+    return nodes, connections, size, best_time(distances), best_time(crossovers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--pop-size', type=int, default=150)
+    parser.add_argument('--generations', type=int, default=150)
+    parser.add_argument('--compaction-generations', type=int, nargs='+', default=[1, 5, 20])
+    parser.add_argument('--node-add-prob', type=float, default=0.5)
+    parser.add_argument('--distance-genomes', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config = make_config(args, directory)
+    population = neat.Population(config, seed=args.seed)
+    population.run(eval_genomes, args.generations)
+    reproduction = population.reproduction
+    tracker = reproduction.innovation_tracker
+    generation = population.generation - 1
+    for fitness, genome in zip(range(len(population.population)), population.population.values()):
+        genome.fitness = fitness
+
+    print(f"pop_size {args.pop_size}, {args.generations} generations, node_add_prob {args.node_add_prob}; "
+          f"distances between {args.distance_genomes} genomes, {args.pop_size} crossovers")
+    print(f"{'K':>4} {'nodes':>7} {'connections':>11} {'pickle kB':>10} {'distance ms':>11} "
+          f"{'crossover ms':>12} {'compaction ms':>13}")
+    for k in [None] + args.compaction_generations:
+        # Measure copies in all cases, for comparable memory layouts.
+        compacted = copy.deepcopy(population.population)
+        compaction = ''
+        if k is not None:
+            reproduction.innovation_tracker = copy.deepcopy(tracker)
+            config.reproduction_config.gene_compaction_generations = k
+            t0 = time.perf_counter()
+            reproduction.compact_genes(config.genome_config, compacted, generation)
+            compaction = f"{(time.perf_counter() - t0) * 1000:.1f}"
+        nodes, connections, size, distances, crossovers = measure(list(compacted.values()), config, args)
+        print(f"{'off' if k is None else k:>4} {nodes:>7.1f} {connections:>11.1f} {size / 1024:>10.1f} "
+              f"{distances * 1000:>11.1f} {crossovers * 1000:>12.1f} {compaction:>13}")
+
+if __name__ == '__main__':
+    main()
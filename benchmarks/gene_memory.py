@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Memory and throughput benchmark for the gene classes in neat.genes.
+
+Reports the memory held per DefaultNodeGene and DefaultConnectionGene
+(measured with tracemalloc, including the attribute values) and the
+throughput of gene copy, crossover and mutate (best of five runs).
+
+Usage:
+    python benchmarks/gene_memory.py
+    python benchmarks/gene_memory.py --genes 200000
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+
+
+def load_config():
+    config_path = os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, config_path)
+    return config.genome_config
+
+
+def make_genes(gene_type, count, config):
+    genes = []
+    for i in range(count):
+        if gene_type is neat.DefaultConnectionGene:
+            gene = gene_type((-1 - i % 7, i), innovation=i)
+        else:
+            gene = gene_type(i)
+        gene.init_attributes(config)
+        genes.append(gene)
+    return genes
+
+
+def held_per_gene(gene_type, count, config):
+    random.seed(0)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    genes = make_genes(gene_type, count, config)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # Don't count the list holding the genes.
+    return (held - sys.getsizeof(genes)) / count
+
+
+def best_rate(function, count, repeat=5):
+    """Operations per second of the fastest of ``repeat`` runs of ``function``."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - t0)
+    return count / best
+
+
+def throughput(gene_type, count, config):
+    random.seed(0)
+    genes = make_genes(gene_type, count, config)
+    others = [g.copy() for g in genes]
+    for g in others:
+        g.mutate(config)
+
+    def copy():
+        for g in genes:
+            g.copy()
+
+    def crossover():
+        for g1, g2 in zip(genes, others):
+            g1.crossover(g2)
+
+    def mutate():
+        for g in genes:
+            g.mutate(config)
+
+    return {'copy': best_rate(copy, count), 'crossover': best_rate(crossover, count),
+            'mutate': best_rate(mutate, count)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--genes', type=int, default=100000)
+    parser.add_argument('--timed-genes', type=int, default=20000)
+    args = parser.parse_args()
+
+    config = load_config()
+    print(f"{'Gene':>22} {'bytes/gene':>11} {'copy/s':>10} {'crossover/s':>12} {'mutate/s':>10}")
+    for gene_type in (neat.DefaultNodeGene, neat.DefaultConnectionGene):
+        size = held_per_gene(gene_type, args.genes, config)
+        rates = throughput(gene_type, args.timed_genes, config)
+        print(f"{gene_type.__name__:>22} {size:>11.0f} {rates['copy']:>10.0f} "
+              f"{rates['crossover']:>12.0f} {rates['mutate']:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for neat.CompactGenome against neat.DefaultGenome.
+
+Builds fully connected genomes with about ``--inputs * --outputs``
+connections of each genome type and reports the memory held per genome
+(measured with tracemalloc), the bytes per connection gene and the time of
+the common genome operations.
+
+Usage:
+    python benchmarks/genome_memory.py
+    python benchmarks/genome_memory.py --inputs 40 --outputs 50 --genomes 200
+"""
+
+import argparse
+import configparser
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+from neat.innovation import InnovationTracker
+
+
+def make_config(genome_type, num_inputs, num_outputs, directory):
+    """Write a copy of the test configuration with a wide, fully connected topology."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    section = dict(parser['DefaultGenome'])
+    parser.remove_section('DefaultGenome')
+    parser[genome_type.__name__] = section
+    parser[genome_type.__name__].update({'num_inputs': str(num_inputs), 'num_outputs': str(num_outputs),
+                                         'initial_connection': 'full_direct'})
+    path = os.path.join(directory, genome_type.__name__)
+    with open(path, 'w') as f:
+        parser.write(f)
+    config = neat.Config(genome_type, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, path)
+    config.genome_config.innovation_tracker = InnovationTracker()
+    return config
+
+
+def measure(genome_type, num_inputs, num_outputs, num_genomes, directory):
+    config = make_config(genome_type, num_inputs, num_outputs, directory)
+    genome_config = config.genome_config
+    random.seed(0)
+    # Register the initial connections with the innovation tracker up front so
+    # that its tables are not counted as genome memory.
+    genome_type(-1).configure_new(genome_config)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    genomes = []
+    for key in range(num_genomes):
+        genome = genome_type(key)
+        genome.configure_new(genome_config)
+        genome.fitness = random.random()
+        genomes.append(genome)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    num_connections = len(genomes[0].connections)
+
+    timings = {}
+    t0 = time.perf_counter()
+    for a, b in zip(genomes, genomes[1:]):
+        a.distance(b, genome_config)
+    timings['distance'] = (time.perf_counter() - t0) / (len(genomes) - 1)
+
+    t0 = time.perf_counter()
+    for a, b in zip(genomes, genomes[1:]):
+        child = genome_type(None)
+        child.configure_crossover(a, b, genome_config)
+    timings['crossover'] = (time.perf_counter() - t0) / (len(genomes) - 1)
+
+    t0 = time.perf_counter()
+    for genome in genomes:
+        genome.mutate(genome_config)
+    timings['mutate'] = (time.perf_counter() - t0) / len(genomes)
+
+    return held / num_genomes, num_connections, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--inputs', type=int, default=40)
+    parser.add_argument('--outputs', type=int, default=50)
+    parser.add_argument('--genomes', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'Genome':>14} {'conns':>6} {'KB/genome':>10} {'B/conn':>7} {'distance (ms)':>14} "
+          f"{'crossover (ms)':>15} {'mutate (ms)':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for genome_type in (neat.DefaultGenome, neat.CompactGenome):
+            per_genome, num_connections, timings = measure(genome_type, args.inputs, args.outputs,
+                                                           args.genomes, directory)
+            print(f"{genome_type.__name__:>14} {num_connections:>6} {per_genome / 1024:>10.1f} "
+                  f"{per_genome / num_connections:>7.0f} {1000 * timings['distance']:>14.2f} "
+                  f"{1000 * timings['crossover']:>15.2f} {1000 * timings['mutate']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
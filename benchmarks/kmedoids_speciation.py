@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark of k-medoids speciation (KMedoidsSpeciesSet).
+
+Creates ``--pop-size`` genomes with ``--inputs`` inputs and ``--outputs``
+outputs and gives each ``--mutations`` rounds of mutation, then times the
+speciation of them into ``--num-species`` species for each
+``--tile-sizes`` value with both distance engines, reporting the peak memory
+traced during speciation (NumPy arrays included) and the mean distance of the
+genomes to their medoid.  The species are the same for all tile sizes.
+
+Usage:
+    python benchmarks/kmedoids_speciation.py
+    python benchmarks/kmedoids_speciation.py --pop-size 20000 --sample-size 1000 --tile-sizes 64 256
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+from neat.kmedoids_species import KMedoidsSpeciesSet
+from neat.reporting import BaseReporter, ReporterSet
+
+
+class InfoReporter(BaseReporter):
+    """Keeps the last message reported through ``info``."""
+
+    def __init__(self):
+        self.message = ''
+
+    def info(self, msg):
+        self.message = msg
+
+
+def make_population(args):
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation,
+                         os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    genome_config = config.genome_config
+    genome_config.num_inputs = args.inputs
+    genome_config.num_outputs = args.outputs
+    genome_config.input_keys = [-i - 1 for i in range(args.inputs)]
+    genome_config.output_keys = list(range(args.outputs))
+    genome_config.initial_connection = 'partial_direct'
+    genome_config.connection_fraction = 0.5
+    genome_config.conn_delete_prob = genome_config.node_delete_prob = 0.05
+    random.seed(args.seed)
+    reproduction = neat.DefaultReproduction(config.reproduction_config, ReporterSet(), None)
+    population = reproduction.create_new(neat.DefaultGenome, genome_config, args.pop_size)
+    for _ in range(args.mutations):
+        for genome in population.values():
+            genome.mutate(genome_config)
+    return config, population
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--pop-size', type=int, default=5000)
+    parser.add_argument('--inputs', type=int, default=8)
+    parser.add_argument('--outputs', type=int, default=2)
+    parser.add_argument('--mutations', type=int, default=10)
+    parser.add_argument('--num-species', type=int, default=20)
+    parser.add_argument('--sample-size', type=int, default=500)
+    parser.add_argument('--samples', type=int, default=3)
+    parser.add_argument('--tile-sizes', type=int, nargs='+', default=[64, 256, 1024])
+    parser.add_argument('--engines', nargs='+', default=['python', 'vectorized'])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    config, population = make_population(args)
+    print(f"{args.pop_size} genomes into {args.num_species} species; CLARA with {args.samples} samples "
+          f"of {args.sample_size}")
+    results = []
+    for engine in args.engines:
+        for tile_size in args.tile_sizes:
+            params = {'num_species': str(args.num_species), 'clara_sample_size': str(args.sample_size),
+                      'clara_samples': str(args.samples), 'distance_tile_size': str(tile_size),
+                      'kmedoids_seed': '1', 'distance_engine': engine}
+            config.species_set_config = KMedoidsSpeciesSet.parse_config(params)
+            reporter = InfoReporter()
+            reporters = ReporterSet()
+            reporters.add(reporter)
+            species_set = KMedoidsSpeciesSet(config.species_set_config, reporters)
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            species_set.speciate(config, population, 0)
+            seconds = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results.append(species_set.genome_to_species)
+            mean_distance = reporter.message.rsplit(' ', 1)[-1]
+            print(f"{engine:>10} tile {tile_size:>5}: {seconds:7.2f} s, peak {peak / 2 ** 20:7.1f} MiB, "
+                  f"mean distance to medoid {mean_distance}")
+    print(f"same species for all tile sizes: {all(r == results[0] for r in results[:len(args.tile_sizes)])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark of approximate speciation with LSHSpeciesSet against DefaultSpeciesSet.
+
+Creates ``--pop-size`` genomes with ``--inputs`` inputs and ``--outputs``
+outputs, gives each ``--mutations`` rounds of mutation so that they differ in
+structure, and speciates them once with DefaultSpeciesSet to create species.
+Then mutates all genomes once more (a new generation) and times the
+speciation of them, starting from those species, with DefaultSpeciesSet and
+with LSHSpeciesSet for each ``--hashes``/``--bands`` setting.  Reports the
+number of species, the number of representative comparisons and the recall
+reported by LSHSpeciesSet, and the fraction of genomes placed in the same
+species as by DefaultSpeciesSet.
+
+Usage:
+    python benchmarks/lsh_speciation.py
+    python benchmarks/lsh_speciation.py --pop-size 50000 --settings 32/16 64/16
+"""
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+from neat.lsh_species import LSHSpeciesSet
+from neat.reporting import BaseReporter, ReporterSet
+
+
+class InfoReporter(BaseReporter):
+    """Keeps the messages reported through ``info``."""
+
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
+
+
+def make_population(args):
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation,
+                         os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    genome_config = config.genome_config
+    genome_config.num_inputs = args.inputs
+    genome_config.num_outputs = args.outputs
+    genome_config.input_keys = [-i - 1 for i in range(args.inputs)]
+    genome_config.output_keys = list(range(args.outputs))
+    genome_config.initial_connection = 'partial_direct'
+    genome_config.connection_fraction = 0.5
+    genome_config.conn_delete_prob = genome_config.node_delete_prob = 0.05
+    config.species_set_config.compatibility_threshold = args.threshold
+    random.seed(args.seed)
+    reproduction = neat.DefaultReproduction(config.reproduction_config, ReporterSet(), None)
+    population = reproduction.create_new(neat.DefaultGenome, genome_config, args.pop_size)
+    for _ in range(args.mutations):
+        for genome in population.values():
+            genome.mutate(genome_config)
+    return config, population
+
+
+def lsh_config(config, num_hashes, bands):
+    """The configuration of DefaultSpeciesSet with the MinHash settings of LSHSpeciesSet."""
+    params = {p.name: p.format(getattr(config.species_set_config, p.name))
+              for p in neat.DefaultSpeciesSet.config_parameters()}
+    params.update(minhash_num_hashes=str(num_hashes), minhash_bands=str(bands))
+    return LSHSpeciesSet.parse_config(params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--pop-size', type=int, default=10000)
+    parser.add_argument('--inputs', type=int, default=20)
+    parser.add_argument('--outputs', type=int, default=2)
+    parser.add_argument('--mutations', type=int, default=10)
+    parser.add_argument('--threshold', type=float, default=2.5)
+    parser.add_argument('--settings', nargs='+', default=['32/16', '64/16'],
+                        help='minhash_num_hashes/minhash_bands settings of LSHSpeciesSet')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    config, population = make_population(args)
+    species_set = neat.DefaultSpeciesSet(config.species_set_config, ReporterSet())
+    species_set.speciate(config, population, 0)
+    for genome in population.values():
+        genome.mutate(config.genome_config)
+    connections = sum(len(g.connections) for g in population.values()) / len(population)
+    print(f"{args.pop_size} genomes, {connections:.1f} connections each, "
+          f"{len(species_set.species)} species before speciation")
+
+    state = pickle.dumps(species_set)
+    runs = [('exact', neat.DefaultSpeciesSet, config.species_set_config)]
+    for setting in args.settings:
+        num_hashes, bands = (int(x) for x in setting.split('/'))
+        runs.append((setting, LSHSpeciesSet, lsh_config(config, num_hashes, bands)))
+
+    exact = None
+    for name, species_set_type, species_set_config in runs:
+        species = pickle.loads(state)
+        if species_set_type is LSHSpeciesSet:
+            lsh = LSHSpeciesSet(species_set_config, ReporterSet())
+            lsh.species, lsh.indexer = species.species, species.indexer
+            species = lsh
+        species.species_set_config = species_set_config
+        reporter = InfoReporter()
+        species.reporters = ReporterSet()
+        species.reporters.add(reporter)
+        t0 = time.perf_counter()
+        species.speciate(config, population, 1)
+        seconds = time.perf_counter() - t0
+        if exact is None:
+            exact = species.genome_to_species
+        same = sum(exact[gid] == sid for gid, sid in species.genome_to_species.items()) / len(population)
+        details = '; '.join(m for m in reporter.messages if m.startswith('LSH'))
+        print(f"{name:>6}: {seconds:7.2f} s, {len(species.species)} species, {same:.1%} as exact"
+              f"{'; ' + details if details else ''}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Allocation benchmark for reproduction with and without copy-on-write genes.
+
+Evolves a population of fully connected genomes with a random fitness
+function, once with ``copy_on_write_genes`` off and once with it on, and
+reports the time per generation, the number of gene objects allocated per
+generation (genes of the new population that are not inherited objects), the
+number of distinct gene objects in the final population and the number of
+garbage collector runs. Both runs use the same seed and end with the same
+genomes.
+
+Usage:
+    python benchmarks/reproduction_memory.py
+    python benchmarks/reproduction_memory.py --inputs 20 --outputs 10 --generations 20
+    python benchmarks/reproduction_memory.py --weight-mutate-rate 0.1 --bias-mutate-rate 0.1
+"""
+
+import argparse
+import configparser
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+
+
+def make_config(args, copy_on_write, directory):
+    """Write a copy of the test configuration with a wide, fully connected topology."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    parser['DefaultGenome'].update({'num_inputs': str(args.inputs), 'num_outputs': str(args.outputs),
+                                    'initial_connection': 'full_direct',
+                                    'weight_mutate_rate': str(args.weight_mutate_rate),
+                                    'bias_mutate_rate': str(args.bias_mutate_rate),
+                                    'copy_on_write_genes': str(copy_on_write)})
+    parser['NEAT']['no_fitness_termination'] = 'True'
+    path = os.path.join(directory, 'config')
+    with open(path, 'w') as f:
+        parser.write(f)
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, path)
+
+
+def eval_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = random.random()
+
+
+def population_genes(population):
+    genes = {}
+    for genome in population.population.values():
+        for gene in list(genome.connections.values()) + list(genome.nodes.values()):
+            genes[id(gene)] = gene
+    return genes
+
+
+def measure(args, copy_on_write, directory):
+    config = make_config(args, copy_on_write, directory)
+    population = neat.Population(config, seed=1)
+    gc.collect()
+    collections = sum(s['collections'] for s in gc.get_stats())
+    elapsed = 0.0
+    allocated = 0
+    previous = population_genes(population)
+    for _ in range(args.generations):
+        t0 = time.perf_counter()
+        population.run(eval_genomes, 1)
+        elapsed += time.perf_counter() - t0
+        # Genes of the new population that are not inherited objects.
+        genes = population_genes(population)
+        allocated += sum(1 for key in genes if key not in previous)
+        previous = genes
+    collections = sum(s['collections'] for s in gc.get_stats()) - collections
+
+    signature = tuple(str(population.population[k]) for k in sorted(population.population))
+    return elapsed / args.generations, allocated / args.generations, len(previous), collections, signature
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--inputs', type=int, default=20)
+    parser.add_argument('--outputs', type=int, default=10)
+    parser.add_argument('--generations', type=int, default=10)
+    parser.add_argument('--weight-mutate-rate', type=float, default=0.8)
+    parser.add_argument('--bias-mutate-rate', type=float, default=0.7)
+    args = parser.parse_args()
+
+    print(f"{'copy_on_write':>14} {'s/generation':>13} {'new genes/generation':>21} "
+          f"{'distinct genes':>15} {'gc runs':>8}")
+    signatures = set()
+    with tempfile.TemporaryDirectory() as directory:
+        for copy_on_write in (False, True):
+            per_generation, allocated, distinct, collections, signature = measure(args, copy_on_write, directory)
+            signatures.add(signature)
+            print(f"{str(copy_on_write):>14} {per_generation:>13.3f} {allocated:>21.0f} "
+                  f"{distinct:>15} {collections:>8}")
+    print("identical final populations:", len(signatures) == 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load generator for the neat.serve micro-batching inference server.
+
+Starts a local server for an evolved network (or targets an already running
+one with --url), drives it from concurrent HTTP clients and reports
+throughput and latency percentiles.  By default the run is repeated with
+micro-batching disabled (max_batch_size=1) for comparison.
+
+Usage:
+    python benchmarks/serve_load.py
+    python benchmarks/serve_load.py --clients 32 --duration 10
+    python benchmarks/serve_load.py --url http://127.0.0.1:8000 --inputs 2
+
+Requires NumPy.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.request
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+from neat.serve import InferenceServer
+
+
+def make_genome(num_hidden=20, seed=42):
+    """Take a genome from a fresh population and grow it to a realistic size."""
+    config_path = os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation, config_path)
+    population = neat.Population(config, seed=seed)
+    genome = next(iter(population.population.values()))
+    for _ in range(num_hidden):
+        genome.mutate_add_node(config.genome_config)
+        genome.mutate_add_connection(config.genome_config)
+    return genome, config
+
+
+def run_clients(url, num_inputs, clients, duration):
+    """Send requests from ``clients`` threads for ``duration`` seconds; return latencies."""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client():
+        rng = random.Random()
+        local = []
+        while time.perf_counter() < stop_at:
+            body = json.dumps({'inputs': [rng.uniform(-1, 1) for _ in range(num_inputs)]}).encode()
+            request = urllib.request.Request(url + '/activate', data=body,
+                                             headers={'Content-Type': 'application/json'})
+            t0 = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+            except OSError:
+                with lock:
+                    errors[0] += 1
+                continue
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sorted(latencies), errors[0]
+
+
+def report(label, latencies, errors, duration, stats=None):
+    def pct(p):
+        return 1000.0 * latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else float('nan')
+
+    line = (f"{label:>14} {len(latencies) / duration:>10.0f} {pct(0.5):>9.2f} {pct(0.95):>9.2f} "
+            f"{pct(0.99):>9.2f} {errors:>7d}")
+    if stats:
+        line += f" {stats['mean_batch_size']:>10.1f}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--url', help='benchmark an already running server instead of a local one')
+    parser.add_argument('--inputs', type=int, default=2, help='number of network inputs (with --url)')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--max-delay', type=float, default=0.001)
+    args = parser.parse_args()
+
+    print(f"{'Mode':>14} {'req/s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'errors':>7} "
+          f"{'mean batch':>10}")
+    if args.url:
+        latencies, errors = run_clients(args.url, args.inputs, args.clients, args.duration)
+        report('remote', latencies, errors, args.duration)
+        return
+
+    genome, config = make_genome()
+    for label, max_batch_size in (('micro-batched', 256), ('unbatched', 1)):
+        server = InferenceServer(genome, config, max_batch_size=max_batch_size, max_delay=args.max_delay)
+        server.start()
+        try:
+            latencies, errors = run_clients(server.url, config.genome_config.num_inputs,
+                                            args.clients, args.duration)
+            report(label, latencies, errors, args.duration, server.stats())
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark of speciation with the Python and the vectorized distance engines,
+with the Python engine and ``distance_bounds``, and with the Python engine
+sharded across a pool of ``--processes`` processes.
+
+Creates ``--pop-size`` genomes with ``--inputs`` inputs and ``--outputs``
+outputs, gives each ``--mutations`` rounds of mutation so that they differ in
+structure, and speciates them once to create species.  Then mutates all
+genomes once more (a new generation) and times
+DefaultSpeciesSet.speciate on them with ``distance_engine = python``,
+``distance_engine = vectorized``, ``distance_engine = python`` with
+``distance_bounds = True`` and ``distance_engine = python`` with the pool as
+executor, starting from the same species.  Reports the best
+of three runs, and checks that all give the same species.
+
+Usage:
+    python benchmarks/speciation_distance.py
+    python benchmarks/speciation_distance.py --pop-size 2000 --threshold 2.5
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import time
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+from neat.reporting import BaseReporter, ReporterSet
+
+
+class InfoReporter(BaseReporter):
+    """Keeps the last message reported through ``info``."""
+
+    def __init__(self):
+        self.message = ''
+
+    def info(self, msg):
+        self.message = msg
+
+
+def make_population(args):
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation,
+                         os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    genome_config = config.genome_config
+    genome_config.num_inputs = args.inputs
+    genome_config.num_outputs = args.outputs
+    genome_config.input_keys = [-i - 1 for i in range(args.inputs)]
+    genome_config.output_keys = list(range(args.outputs))
+    genome_config.initial_connection = 'partial_direct'
+    genome_config.connection_fraction = 0.5
+    genome_config.conn_delete_prob = genome_config.node_delete_prob = 0.05
+    config.species_set_config.compatibility_threshold = args.threshold
+    random.seed(args.seed)
+    reproduction = neat.DefaultReproduction(config.reproduction_config, ReporterSet(), None)
+    population = reproduction.create_new(neat.DefaultGenome, genome_config, args.pop_size)
+    for _ in range(args.mutations):
+        for genome in population.values():
+            genome.mutate(genome_config)
+    return config, population
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--pop-size', type=int, default=2000)
+    parser.add_argument('--inputs', type=int, default=8)
+    parser.add_argument('--outputs', type=int, default=2)
+    parser.add_argument('--mutations', type=int, default=10)
+    parser.add_argument('--threshold', type=float, default=3.0)
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    config, population = make_population(args)
+    species_set = neat.DefaultSpeciesSet(config.species_set_config, ReporterSet())
+    species_set.speciate(config, population, 0)
+    for genome in population.values():
+        genome.mutate(config.genome_config)
+    connections = sum(len(g.connections) for g in population.values()) / len(population)
+    print(f"{args.pop_size} genomes, {connections:.1f} connections each, "
+          f"{len(species_set.species)} species before speciation")
+
+    state = pickle.dumps(species_set)
+    reporter = InfoReporter()
+    species_set.reporters.add(reporter)
+    results = {}
+    pool = multiprocessing.Pool(args.processes)
+    for name, engine, bounds, executor in (('python', 'python', False, None),
+                                           ('vectorized', 'vectorized', False, None),
+                                           ('bounds', 'python', True, None),
+                                           ('pool', 'python', False, pool)):
+        config.species_set_config.distance_engine = engine
+        config.species_set_config.distance_bounds = bounds
+        best = float('inf')
+        for _ in range(3):
+            species = pickle.loads(state)
+            species.species_set_config = config.species_set_config
+            species.reporters = species_set.reporters
+            t0 = time.perf_counter()
+            species.speciate(config, population, 1, executor=executor)
+            best = min(best, time.perf_counter() - t0)
+        results[name] = best, species.genome_to_species
+        skipped = f"; {reporter.message}" if bounds else ''
+        print(f"{name:>10}: {best:.3f} s, {len(species.species)} species{skipped}")
+    pool.close()
+    pool.join()
+    for name in ('vectorized', 'bounds', 'pool'):
+        print(f"{name}: speedup {results['python'][0] / results[name][0]:.1f}x; same species: "
+              f"{results['python'][1] == results[name][1]}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the scaling of DefaultSpeciesSet.speciate with the population size.
+
+Speciates populations of ``--sizes`` genomes whose distance is the difference
+of one coordinate, spread uniformly over ``--species`` times the
+compatibility threshold, so that the number of species, and the number of
+distances computed per genome, stay about the same at every size and the
+time is mostly that of assigning genomes to species.  Each population is
+speciated once to create species, and then the next generation (the same
+points moved slightly, with new keys) is timed.  The time per genome stays
+about the same as the population grows if the bookkeeping is linear.
+
+Usage:
+    python benchmarks/speciation_scaling.py
+    python benchmarks/speciation_scaling.py --sizes 1000 10000 100000 --species 50
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import neat
+from neat.reporting import ReporterSet
+
+
+class PointGenome:
+    """A genome that is a point on a line, to time speciation without the cost of genomic distances."""
+
+    distance_count = 0
+
+    def __init__(self, key, x):
+        self.key = key
+        self.x = x
+
+    def distance(self, other, config):
+        PointGenome.distance_count += 1
+        return abs(self.x - other.x)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 5000, 10000, 20000, 50000, 100000])
+    parser.add_argument('--species', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation,
+                         os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    config.species_set_config.compatibility_threshold = 1.0
+    print(f"{'genomes':>8} {'species':>8} {'distances':>10} {'seconds':>8} {'us/genome':>10} {'ns/distance':>12}")
+    for size in args.sizes:
+        random.seed(args.seed)
+        population = {i: PointGenome(i, random.uniform(0.0, args.species)) for i in range(size)}
+        species_set = neat.DefaultSpeciesSet(config.species_set_config, ReporterSet())
+        species_set.speciate(config, population, 0)
+        population = {i + size: PointGenome(i + size, g.x + random.gauss(0.0, 0.1))
+                      for i, g in population.items()}
+
+        PointGenome.distance_count = 0
+        t0 = time.perf_counter()
+        species_set.speciate(config, population, 1)
+        seconds = time.perf_counter() - t0
+        count = PointGenome.distance_count
+        print(f"{size:>8} {len(species_set.species):>8} {count:>10} {seconds:>8.3f} "
+              f"{seconds / size * 1e6:>10.2f} {seconds / count * 1e9:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
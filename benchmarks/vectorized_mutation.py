@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark of per-gene against population-level (vectorized) attribute mutation.
+
+Builds ``--genomes`` fully connected genomes with about ``--inputs * --outputs``
+connections each and times mutating the attributes of all their genes,
+once gene by gene (``attribute_mutation = per_gene``) and once with
+neat.vectorized_mutation.mutate_attributes (``attribute_mutation = vectorized``).
+Reports the best of three runs.
+
+Usage:
+    python benchmarks/vectorized_mutation.py
+    python benchmarks/vectorized_mutation.py --genomes 1000 --inputs 40 --outputs 25
+"""
+
+import argparse
+import configparser
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add project root to path.
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+
+import neat
+from neat.vectorized_mutation import mutate_attributes
+
+
+def make_config(num_inputs, num_outputs, directory):
+    """Write a copy of the test configuration with a wide, fully connected topology."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), '..', 'tests', 'test_configuration'))
+    parser['DefaultGenome'].update({'num_inputs': str(num_inputs), 'num_outputs': str(num_outputs),
+                                    'initial_connection': 'full_direct'})
+    path = os.path.join(directory, 'config')
+    with open(path, 'w') as f:
+        parser.write(f)
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, path)
+    config.genome_config.innovation_tracker = neat.InnovationTracker()
+    return config.genome_config
+
+
+def best_time(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1])
+    parser.add_argument('--genomes', type=int, default=200)
+    parser.add_argument('--inputs', type=int, default=40)
+    parser.add_argument('--outputs', type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config = make_config(args.inputs, args.outputs, directory)
+    random.seed(0)
+    genomes = []
+    for key in range(args.genomes):
+        genome = neat.DefaultGenome(key)
+        genome.configure_new(config)
+        genomes.append(genome)
+    num_genes = sum(len(g.connections) + len(g.nodes) for g in genomes)
+
+    def per_gene():
+        for genome in genomes:
+            for cg in genome.connections.values():
+                cg.mutate(config)
+            for ng in genome.nodes.values():
+                ng.mutate(config)
+
+    rng = np.random.default_rng(0)
+
+    def vectorized():
+        mutate_attributes(genomes, config, rng)
+
+    print(f"{args.genomes} genomes, {num_genes} genes")
+    print(f"{'attribute_mutation':>19} {'seconds':>9} {'genes/s':>11}")
+    for name, function in (('per_gene', per_gene), ('vectorized', vectorized)):
+        seconds = best_time(function)
+        print(f"{name:>19} {seconds:>9.3f} {num_genes / seconds:>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
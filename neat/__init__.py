@@ -9,10 +9,13 @@ import neat.iznn as iznn
 from neat.config import Config
 from neat.population import Population, CompleteExtinctionException
 from neat.genome import DefaultGenome
+from neat.compact_genome import CompactGenome
 from neat.reproduction import DefaultReproduction
 from neat.stagnation import DefaultStagnation
 from neat.reporting import StdOutReporter
 from neat.species import DefaultSpeciesSet
+from neat.lsh_species import LSHSpeciesSet
+from neat.kmedoids_species import KMedoidsSpeciesSet
 from neat.statistics import StatisticsReporter
 from neat.parallel import ParallelEvaluator
 from neat.checkpoint import Checkpointer
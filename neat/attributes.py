@@ -28,6 +28,34 @@ class BaseAttribute:
         return [ConfigParameter(self.config_item_name(n), ci[0], ci[1])
                 for n, ci in self._config_items.items()]
 
+    def initializer(self, config):
+        """
+        Returns a function of no arguments equivalent to ``init_value(config)``.
+        Subclasses look their configuration values up once, here, instead of
+        on every call.
+        """
+        init_value = self.init_value
+
+        def init():
+            return init_value(config)
+        return init
+
+    def mutator(self, config):
+        """
+        Returns a function of one value equivalent to ``mutate_value(value, config)``,
+        drawing the same random numbers in the same order.
+        """
+        mutate_value = self.mutate_value
+
+        def mutate(value):
+            return mutate_value(value, config)
+        return mutate
+
+    def _specializes(self, attribute_class, *methods):
+        """Whether none of ``methods`` is overridden below ``attribute_class``."""
+        cls = type(self)
+        return all(getattr(cls, m) is getattr(attribute_class, m) for m in methods)
+
 
 class FloatAttribute(BaseAttribute):
     """
@@ -82,6 +110,47 @@ class FloatAttribute(BaseAttribute):
 
         return value
 
+    def initializer(self, config):
+        if not self._specializes(FloatAttribute, 'init_value', 'clamp'):
+            return super().initializer(config)
+        mean = getattr(config, self.init_mean_name)
+        stdev = getattr(config, self.init_stdev_name)
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+        init_type = getattr(config, self.init_type_name).lower()
+
+        if ('gauss' in init_type) or ('normal' in init_type):
+            def init():
+                return max(min(gauss(mean, stdev), max_value), min_value)
+        elif 'uniform' in init_type:
+            low = max(min_value, (mean - (2 * stdev)))
+            high = min(max_value, (mean + (2 * stdev)))
+
+            def init():
+                return uniform(low, high)
+        else:
+            init = super().initializer(config)
+        return init
+
+    def mutator(self, config):
+        if not self._specializes(FloatAttribute, 'mutate_value', 'init_value', 'clamp'):
+            return super().mutator(config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        mutate_power = getattr(config, self.mutate_power_name)
+        replace_limit = getattr(config, self.replace_rate_name) + mutate_rate
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+        init = self.initializer(config)
+
+        def mutate(value):
+            r = random()
+            if r < mutate_rate:
+                return max(min(value + gauss(0.0, mutate_power), max_value), min_value)
+            if r < replace_limit:
+                return init()
+            return value
+        return mutate
+
     def validate(self, config):
         min_value = getattr(config, self.min_value_name)
         max_value = getattr(config, self.max_value_name)
@@ -126,6 +195,35 @@ class IntegerAttribute(BaseAttribute):
 
         return value
 
+    def initializer(self, config):
+        if not self._specializes(IntegerAttribute, 'init_value'):
+            return super().initializer(config)
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+
+        def init():
+            return randint(min_value, max_value)
+        return init
+
+    def mutator(self, config):
+        if not self._specializes(IntegerAttribute, 'mutate_value', 'init_value', 'clamp'):
+            return super().mutator(config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        mutate_power = getattr(config, self.mutate_power_name)
+        replace_limit = getattr(config, self.replace_rate_name) + mutate_rate
+        min_value = getattr(config, self.min_value_name)
+        max_value = getattr(config, self.max_value_name)
+        init = self.initializer(config)
+
+        def mutate(value):
+            r = random()
+            if r < mutate_rate:
+                return max(min(value + int(round(gauss(0.0, mutate_power))), max_value), min_value)
+            if r < replace_limit:
+                return init()
+            return value
+        return mutate
+
     def validate(self, config):
         min_value = getattr(config, self.min_value_name)
         max_value = getattr(config, self.max_value_name)
@@ -171,6 +269,40 @@ class BoolAttribute(BaseAttribute):
 
         return value
 
+    def initializer(self, config):
+        if not self._specializes(BoolAttribute, 'init_value'):
+            return super().initializer(config)
+        default = str(getattr(config, self.default_name)).lower()
+
+        if default in ('1', 'on', 'yes', 'true'):
+            def init():
+                return True
+        elif default in ('0', 'off', 'no', 'false'):
+            def init():
+                return False
+        elif default in ('random', 'none'):
+            def init():
+                return bool(random() < 0.5)
+        else:
+            init = super().initializer(config)
+        return init
+
+    def mutator(self, config):
+        if not self._specializes(BoolAttribute, 'mutate_value'):
+            return super().mutator(config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        # The mutation rate for True values and for False values.
+        true_rate = mutate_rate + getattr(config, self.rate_to_false_add_name)
+        false_rate = mutate_rate + getattr(config, self.rate_to_true_add_name)
+
+        def mutate(value):
+            rate = true_rate if value else false_rate
+            if rate > 0:
+                if random() < rate:
+                    return random() < 0.5
+            return value
+        return mutate
+
     def validate(self, config):
         default = str(getattr(config, self.default_name)).lower()
         if default not in ('1', 'on', 'yes', 'true', '0', 'off', 'no', 'false', 'random', 'none'):
@@ -206,6 +338,35 @@ class StringAttribute(BaseAttribute):
 
         return value
 
+    def initializer(self, config):
+        if not self._specializes(StringAttribute, 'init_value'):
+            return super().initializer(config)
+        default = getattr(config, self.default_name)
+        options = getattr(config, self.options_name)
+
+        if default.lower() in ('none', 'random'):
+            def init():
+                return choice(options)
+        else:
+            def init():
+                return default
+        return init
+
+    def mutator(self, config):
+        if not self._specializes(StringAttribute, 'mutate_value'):
+            return super().mutator(config)
+        mutate_rate = getattr(config, self.mutate_rate_name)
+        options = getattr(config, self.options_name)
+        if mutate_rate <= 0:
+            def mutate(value):
+                return value
+        else:
+            def mutate(value):
+                if random() < mutate_rate:
+                    return choice(options)
+                return value
+        return mutate
+
     def validate(self, config):
         default = getattr(config, self.default_name)
         if default not in ('none', 'random'):
@@ -0,0 +1,171 @@
+"""
+Bulk creation of the initial population, with NumPy (imported lazily).
+
+Selected with ``initialization = bulk`` in the ``[DefaultReproduction]``
+section.  Instead of calling ``configure_new`` on each new genome,
+:meth:`neat.DefaultReproduction.create_new` then calls :func:`create_genomes`,
+which
+
+* lists the candidate initial connections once for all genomes with the same
+  nodes (normally all of them, as hidden nodes are the only nodes that differ),
+  and assigns the innovation numbers of the used ones together instead of
+  once per connection of every genome;
+* chooses each genome's connections (for ``fs_neat`` and ``partial``
+  connectivity) and draws all initial attribute values in vectorized form from
+  NumPy generators seeded with a base seed and the genome key
+  (see :func:`neat.vectorized_mutation.initial_values`);
+* builds the genomes from these columns with ``configure_from_columns``
+  (which :class:`neat.CompactGenome` implements by filling its arrays),
+  optionally in several worker processes.
+
+The genomes have the same structure and value distributions as with
+``configure_new``, but not the same values, so a run differs from one using
+per-genome initialization.  Runs are reproducible, whatever the number of
+workers.  Genome types that override ``configure_new`` or the methods it uses
+are configured one at a time as usual.
+"""
+import random
+from multiprocessing import Pool
+
+from neat.genome import DefaultGenome
+from neat.vectorized_mutation import _import_numpy, initial_values
+
+# DefaultGenome methods whose behavior create_genomes reproduces.
+_CONFIGURE_METHODS = ('configure_new', '_initial_connection_method', 'compute_full_connections',
+                      'connect_fs_neat_nohidden', 'connect_fs_neat_hidden', 'connect_full_nodirect',
+                      'connect_full_direct', 'connect_partial_nodirect', 'connect_partial_direct',
+                      'create_node', 'create_connection')
+
+
+def supports_bulk(genome_type):
+    """Whether :func:`create_genomes` can configure genomes of ``genome_type``."""
+    return (issubclass(genome_type, DefaultGenome) and
+            all(getattr(genome_type, m) is getattr(DefaultGenome, m) for m in _CONFIGURE_METHODS))
+
+
+def _candidates(config, method, hidden):
+    """
+    All the connections (as (input, output) pairs) that ``method`` may add to
+    a genome with hidden nodes ``hidden``, in the order the ``connect_*``
+    methods list them.
+    """
+    output = config.output_keys
+    if method is None:
+        return []
+    if method.startswith('connect_fs_neat'):
+        targets = output + hidden if method == 'connect_fs_neat_hidden' else output
+        return [(input_id, output_id) for input_id in config.input_keys for output_id in targets]
+
+    # As DefaultGenome.compute_full_connections.
+    direct = method.endswith('_direct')
+    connections = []
+    if hidden:
+        connections.extend((input_id, h) for input_id in config.input_keys for h in hidden)
+        connections.extend((h, output_id) for h in hidden for output_id in output)
+    if direct or (not hidden):
+        connections.extend((input_id, output_id) for input_id in config.input_keys for output_id in output)
+    if not config.feed_forward:
+        connections.extend((i, i) for i in output + hidden)
+    return connections
+
+
+def _choose(np, rng, config, method, num_candidates, num_targets):
+    """The (sorted) positions in the candidate list of the connections of one genome."""
+    if method is None:
+        return np.arange(0)
+    if method.startswith('connect_fs_neat'):
+        # One input, connected to all targets.
+        start = int(rng.integers(0, len(config.input_keys))) * num_targets
+        return np.arange(start, start + num_targets)
+    if method.startswith('connect_partial'):
+        num_to_add = int(round(num_candidates * config.connection_fraction))
+        return np.sort(rng.permutation(num_candidates)[:num_to_add])
+    return np.arange(num_candidates)
+
+
+def _build_genomes(genome_type, config, seed, tables, plans):
+    """
+    Builds the genomes described by ``plans``, a list of (key, node keys,
+    index into ``tables``, chosen candidate positions) tuples; each table is an
+    (input nodes, output nodes, innovation numbers) triple of NumPy arrays.
+    """
+    np = _import_numpy()
+    node_inits = [(a.name, initial_values(a, config)) for a in config.node_gene_type._gene_attributes]
+    connection_inits = [(a.name, initial_values(a, config)) for a in config.connection_gene_type._gene_attributes]
+    genomes = []
+    for key, node_keys, table, chosen in plans:
+        rng = np.random.default_rng([seed, key, 1])
+        in_nodes, out_nodes, innovations = tables[table]
+        connection_keys = list(zip(in_nodes[chosen].tolist(), out_nodes[chosen].tolist()))
+        genome = genome_type(key)
+        genome.configure_from_columns(
+            config,
+            (node_keys, {name: init(rng, len(node_keys)) for name, init in node_inits}),
+            (connection_keys, innovations[chosen].tolist(),
+             {name: init(rng, len(connection_keys)) for name, init in connection_inits}))
+        genomes.append(genome)
+    return genomes
+
+
+def _build_chunk(args):
+    return _build_genomes(*args)
+
+
+def create_genomes(genome_type, config, keys, seed=None, num_workers=1):
+    """
+    Creates new genomes of ``genome_type`` (see :func:`supports_bulk`) with
+    the given keys, as ``configure_new`` would.  ``config`` is the genome
+    configuration, with its ``innovation_tracker`` set.  Random choices are
+    drawn from NumPy generators seeded with ``seed`` (by default, bits drawn
+    from the ``random`` module) and each genome's key.  With ``num_workers``
+    above 1 the genomes are built in that many worker processes.
+
+    Returns a dict mapping each key to its genome.
+    """
+    np = _import_numpy()
+    assert config.innovation_tracker is not None, "Innovation tracker must be set"
+    if seed is None:
+        seed = random.getrandbits(64)
+    keys = list(keys)
+    method = DefaultGenome._initial_connection_method(config)
+
+    # Hidden nodes get new keys for every genome, as in configure_new.
+    hidden_keys = []
+    for _ in keys:
+        nodes = dict.fromkeys(config.output_keys)
+        for _ in range(config.num_hidden):
+            nodes[config.get_new_node_key(nodes)] = None
+        hidden_keys.append(list(nodes)[len(config.output_keys):])
+
+    # Candidate connections, by set of hidden nodes, and each genome's choice.
+    candidates = {}
+    plans = []
+    for key, hidden in zip(keys, hidden_keys):
+        table = candidates.get(tuple(hidden))
+        if table is None:
+            table = candidates[tuple(hidden)] = (len(candidates), _candidates(config, method, hidden))
+        num_targets = len(config.output_keys) + (len(hidden) if method == 'connect_fs_neat_hidden' else 0)
+        chosen = _choose(np, np.random.default_rng([seed, key, 0]), config, method, len(table[1]), num_targets)
+        plans.append((key, config.output_keys + hidden, table[0], chosen))
+
+    # Innovation numbers for the candidates some genome uses, in candidate order.
+    used = [np.zeros(len(pairs), dtype=bool) for number, pairs in candidates.values()]
+    for key, node_keys, table, chosen in plans:
+        used[table][chosen] = True
+    tables = []
+    for number, pairs in candidates.values():
+        innovations = np.zeros(len(pairs), dtype=np.int64)
+        get_innovation_number = config.innovation_tracker.get_innovation_number
+        for i in np.flatnonzero(used[number]).tolist():
+            innovations[i] = get_innovation_number(pairs[i][0], pairs[i][1], 'initial_connection')
+        pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        tables.append((pairs[:, 0], pairs[:, 1], innovations))
+
+    if num_workers > 1 and len(plans) > 1:
+        size = -(-len(plans) // (4 * num_workers))
+        chunks = [(genome_type, config, seed, tables, plans[i:i + size]) for i in range(0, len(plans), size)]
+        with Pool(num_workers) as pool:
+            genomes = [genome for chunk in pool.map(_build_chunk, chunks) for genome in chunk]
+    else:
+        genomes = _build_genomes(genome_type, config, seed, tables, plans)
+    return {genome.key: genome for genome in genomes}
@@ -0,0 +1,706 @@
+"""
+Array-backed genome with a small memory footprint.
+
+:class:`CompactGenome` is a drop-in alternative to
+:class:`neat.genome.DefaultGenome` that stores its genes as parallel typed
+arrays (module :mod:`array`) instead of one Python object per gene.
+Connection genes are kept sorted by innovation number in the columns
+``innovation``, ``in_node``, ``out_node`` plus one column per gene attribute
+(``weight``, ``enabled``); node genes are kept sorted by key with one column
+per attribute.  String attributes such as the activation and aggregation
+functions are interned and stored as 16-bit ids.
+
+``genome.nodes`` and ``genome.connections`` are dict-like views over the
+arrays: they yield gene views whose attributes read and write the arrays,
+so network constructors, reporters and the other genome operations work
+unchanged.  Crossover, attribute mutation and distance work on the arrays
+directly.
+
+To use it, pass ``neat.CompactGenome`` as the genome type and name the
+genome section of the configuration file ``[CompactGenome]``.  Gene classes
+are taken from the ``node_gene_type`` and ``connection_gene_type`` class
+attributes; their attributes must be Float, Integer, Bool or String
+attributes, and crossover and attribute mutation follow
+:class:`neat.genes.BaseGene`.
+"""
+import warnings
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import MutableMapping
+from random import choice, random
+from types import FunctionType, MethodType
+
+from neat.attributes import BoolAttribute, FloatAttribute, IntegerAttribute, StringAttribute
+from neat.genes import DefaultConnectionGene, DefaultNodeGene, GeneKernels
+from neat.genome import DefaultGenome, DefaultGenomeConfig
+from neat.graphs import creates_cycle, required_for_output
+
+_TYPECODES = ((FloatAttribute, 'd'), (IntegerAttribute, 'q'), (BoolAttribute, 'b'), (StringAttribute, 'H'))
+
+# Values of string attributes (activation and aggregation names) are interned
+# process-wide; columns store their ids.  Pickled genomes carry the names.
+_strings = []
+_string_ids = {}
+
+
+def _intern(value):
+    string_id = _string_ids.get(value)
+    if string_id is None:
+        string_id = len(_strings)
+        if string_id > 0xFFFF:
+            raise ValueError("Too many distinct string attribute values for CompactGenome")
+        _strings.append(value)
+        _string_ids[value] = string_id
+    return string_id
+
+
+class _Layout:
+    """Column names, typecodes and value conversions of one kind of gene table."""
+
+    def __init__(self, index_columns, gene_type):
+        self.gene_type = gene_type
+        self.num_index_columns = len(index_columns)
+        self.typecodes = [typecode for name, typecode in index_columns]
+        self.column = {name: c for c, (name, typecode) in enumerate(index_columns)}
+        # (column, attribute, decode, encode); None means the stored value is used as is.
+        self.attributes = []
+        for attribute in gene_type._gene_attributes:
+            for attribute_type, typecode in _TYPECODES:
+                if isinstance(attribute, attribute_type):
+                    break
+            else:
+                raise TypeError(f"{gene_type.__name__} attribute {attribute.name!r} "
+                                f"cannot be stored in a CompactGenome")
+            decode, encode = {'b': (bool, None), 'H': (_strings.__getitem__, _intern)}.get(typecode, (None, None))
+            self.column[attribute.name] = len(self.typecodes)
+            self.attributes.append((len(self.typecodes), attribute, decode, encode))
+            self.typecodes.append(typecode)
+
+    def decode(self, column, value):
+        return _strings[value] if self.typecodes[column] == 'H' else \
+            bool(value) if self.typecodes[column] == 'b' else value
+
+    def encode(self, column, value):
+        return _intern(value) if self.typecodes[column] == 'H' else value
+
+
+_layouts = {}
+
+
+class _GeneTable:
+    """One gene set stored as parallel typed arrays, one row per gene."""
+    __slots__ = ('layout', 'columns', 'version')
+
+    index_columns = ()
+
+    def __init__(self, gene_type):
+        self.layout = self._layout(gene_type)
+        self.columns = [array(typecode) for typecode in self.layout.typecodes]
+        # Incremented whenever rows move, so that gene views can relocate themselves.
+        self.version = 0
+
+    @classmethod
+    def _layout(cls, gene_type):
+        layout = _layouts.get((cls, gene_type))
+        if layout is None:
+            layout = _layouts[cls, gene_type] = _Layout(cls.index_columns, gene_type)
+        return layout
+
+    @property
+    def gene_type(self):
+        return self.layout.gene_type
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def column(self, name):
+        return self.columns[self.layout.column[name]]
+
+    def get(self, pos, name):
+        c = self.layout.column[name]
+        return self.layout.decode(c, self.columns[c][pos])
+
+    def set(self, pos, name, value):
+        c = self.layout.column[name]
+        if c < self.layout.num_index_columns:
+            raise AttributeError(f"Gene attribute {name!r} cannot be changed")
+        self.columns[c][pos] = self.layout.encode(c, value)
+
+    def _row_from_gene(self, key, gene):
+        row = self._index_values(key, gene)
+        for c, attribute, decode, encode in self.layout.attributes:
+            value = getattr(gene, attribute.name)
+            row.append(encode(value) if encode else value)
+        return row
+
+    def put(self, key, gene):
+        """Store ``gene`` (a gene object or a gene view) under ``key``."""
+        row = self._row_from_gene(key, gene)
+        pos = self.find(key)
+        if pos >= 0:
+            if self.columns[0][pos] == row[0]:
+                for column, value in zip(self.columns, row):
+                    column[pos] = value
+                return
+            self.delete(pos)
+        pos = bisect_right(self.columns[0], row[0])
+        for column, value in zip(self.columns, row):
+            column.insert(pos, value)
+        self.version += 1
+
+    def delete(self, pos):
+        for column in self.columns:
+            del column[pos]
+        self.version += 1
+
+    def retain(self, rows):
+        """Keep only the rows at the (ascending) positions ``rows``."""
+        self.columns = [array(column.typecode, [column[pos] for pos in rows]) for column in self.columns]
+        self.version += 1
+
+    def set_columns(self, index, values):
+        """
+        Replace the rows with rows given column-wise: a list of the index
+        columns and a dict mapping each attribute name to its column.
+        """
+        columns = list(index) + [values[attribute.name] for c, attribute, decode, encode in self.layout.attributes]
+        encoders = [None] * self.layout.num_index_columns + [encode for c, a, d, encode in self.layout.attributes]
+        first = columns[0]
+        if any(a > b for a, b in zip(first, first[1:])):
+            order = sorted(range(len(first)), key=first.__getitem__)
+            columns = [[column[i] for i in order] for column in columns]
+        self.columns = [array(typecode, map(encode, column) if encode else column)
+                        for typecode, column, encode in zip(self.layout.typecodes, columns, encoders)]
+        self.version += 1
+
+    def append_row(self, source, pos):
+        """Append row ``pos`` of ``source``; the caller keeps the rows sorted."""
+        for column, source_column in zip(self.columns, source.columns):
+            column.append(source_column[pos])
+
+    def append_values(self, row):
+        for column, value in zip(self.columns, row):
+            column.append(value)
+
+    def crossover_row(self, pos, other, other_pos):
+        """
+        The row of a gene inheriting each attribute at random from row ``pos``
+        or from ``other``'s row ``other_pos``, as :meth:`neat.genes.BaseGene.crossover`.
+        """
+        columns, other_columns = self.columns, other.columns
+        row = [columns[c][pos] for c in range(self.layout.num_index_columns)]
+        for c, attribute, decode, encode in self.layout.attributes:
+            row.append(columns[c][pos] if random() > 0.5 else other_columns[c][other_pos])
+        enabled = self.layout.column.get('enabled')
+        if enabled is not None:
+            if not columns[enabled][pos] or not other_columns[enabled][other_pos]:
+                row[enabled] = random() >= 0.75
+        return row
+
+    def mutate_attributes(self, config):
+        """Mutate every gene's attributes in row order, as :meth:`neat.genes.BaseGene.mutate`."""
+        kernels = GeneKernels.get(self.gene_type, config)
+        attributes = []
+        for i, (c, attribute, decode, encode) in enumerate(self.layout.attributes):
+            column = self.columns[c]
+            mutate = kernels.mutators[i] if kernels is not None else attribute.mutator(config)
+            attributes.append((c, mutate, [decode(v) for v in column] if decode else column.tolist(), encode))
+        for pos in range(len(self)):
+            for c, mutate, values, encode in attributes:
+                values[pos] = mutate(values[pos])
+        for c, mutate, values, encode in attributes:
+            self.columns[c] = array(self.layout.typecodes[c], map(encode, values) if encode else values)
+
+    def materialize(self, pos):
+        """Build a gene object holding row ``pos``."""
+        gene = self._new_gene(pos)
+        for c, attribute, decode, encode in self.layout.attributes:
+            value = self.columns[c][pos]
+            setattr(gene, attribute.name, decode(value) if decode else value)
+        return gene
+
+    def homologous_distance(self, other, rows, other_rows, config):
+        """
+        Sum of the distances between each row in ``rows`` and the matching
+        row of ``other`` in ``other_rows``, using the gene class's ``distance``.
+        """
+        distance = self.gene_type.distance
+        total = 0.0
+        for i, j in zip(rows, other_rows):
+            total += distance(_GeneView(self, self.key_at(i), i), _GeneView(other, other.key_at(j), j), config)
+        return total
+
+    def __getstate__(self):
+        columns = [[_strings[v] for v in column] if column.typecode == 'H' else column
+                   for column in self.columns]
+        return {'gene_type': self.gene_type, 'columns': columns}
+
+    def __setstate__(self, state):
+        self.layout = self._layout(state['gene_type'])
+        self.columns = [array('H', map(_intern, column)) if typecode == 'H' else column
+                        for typecode, column in zip(self.layout.typecodes, state['columns'])]
+        self.version = 0
+
+
+class _NodeTable(_GeneTable):
+    """Node genes sorted by key."""
+    __slots__ = ()
+
+    index_columns = (('key', 'q'),)
+
+    def key_at(self, pos):
+        return self.columns[0][pos]
+
+    def keys(self):
+        return self.columns[0].tolist()
+
+    def find(self, key):
+        keys = self.columns[0]
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            return pos
+        return -1
+
+    def _index_values(self, key, gene):
+        return [key]
+
+    def _new_gene(self, pos):
+        return self.gene_type(self.columns[0][pos])
+
+    def homologous_distance(self, other, rows, other_rows, config):
+        if self.gene_type.distance is not DefaultNodeGene.distance:
+            return super().homologous_distance(other, rows, other_rows, config)
+        # Inlined DefaultNodeGene.distance.
+        bias, response, activation, aggregation, time_constant = (
+            self.column(n).tolist() for n in ('bias', 'response', 'activation', 'aggregation', 'time_constant'))
+        bias2, response2, activation2, aggregation2, time_constant2 = (
+            other.column(n).tolist() for n in ('bias', 'response', 'activation', 'aggregation', 'time_constant'))
+        coefficient = config.compatibility_weight_coefficient
+        total = 0.0
+        for i, j in zip(rows, other_rows):
+            d = abs(bias[i] - bias2[j]) + abs(response[i] - response2[j])
+            d += abs(time_constant[i] - time_constant2[j])
+            if activation[i] != activation2[j]:
+                d += 1.0
+            if aggregation[i] != aggregation2[j]:
+                d += 1.0
+            total += d * coefficient
+        return total
+
+
+class _ConnectionTable(_GeneTable):
+    """Connection genes sorted by innovation number."""
+    __slots__ = ()
+
+    index_columns = (('innovation', 'q'), ('in_node', 'q'), ('out_node', 'q'))
+
+    def key_at(self, pos):
+        return self.columns[1][pos], self.columns[2][pos]
+
+    def keys(self):
+        return list(zip(self.columns[1], self.columns[2]))
+
+    def find(self, key):
+        in_node, out_node = key
+        in_nodes, out_nodes = self.columns[1], self.columns[2]
+        pos = -1
+        try:
+            while True:
+                pos = in_nodes.index(in_node, pos + 1)
+                if out_nodes[pos] == out_node:
+                    return pos
+        except ValueError:
+            return -1
+
+    def _index_values(self, key, gene):
+        return [gene.innovation, key[0], key[1]]
+
+    def _new_gene(self, pos):
+        return self.gene_type(self.key_at(pos), innovation=self.columns[0][pos])
+
+    def homologous_distance(self, other, rows, other_rows, config):
+        if self.gene_type.distance is not DefaultConnectionGene.distance:
+            return super().homologous_distance(other, rows, other_rows, config)
+        # Inlined DefaultConnectionGene.distance.
+        weight, enabled = self.column('weight').tolist(), self.column('enabled').tolist()
+        weight2, enabled2 = other.column('weight').tolist(), other.column('enabled').tolist()
+        enable_penalty = getattr(config, 'compatibility_enable_penalty', 1.0)
+        coefficient = config.compatibility_weight_coefficient
+        total = 0.0
+        for i, j in zip(rows, other_rows):
+            d = abs(weight[i] - weight2[j])
+            if enabled[i] != enabled2[j]:
+                d += enable_penalty
+            total += d * coefficient
+        return total
+
+
+class _GeneView:
+    """
+    A gene stored in a gene table.  Attribute reads and writes go to the
+    table's arrays; methods of the gene class (``distance``, ``mutate``)
+    run on the view.
+    """
+    __slots__ = ('_table', '_key', '_pos', '_version')
+
+    def __init__(self, table, key, pos):
+        object.__setattr__(self, '_table', table)
+        object.__setattr__(self, '_key', key)
+        object.__setattr__(self, '_pos', pos)
+        object.__setattr__(self, '_version', table.version)
+
+    def _row(self):
+        table = self._table
+        if self._version != table.version:
+            pos = table.find(self._key)
+            if pos < 0:
+                raise KeyError(f"Gene {self._key!r} is no longer in the genome")
+            object.__setattr__(self, '_pos', pos)
+            object.__setattr__(self, '_version', table.version)
+        return self._pos
+
+    @property
+    def key(self):
+        return self._key
+
+    def __getattr__(self, name):
+        if name in _GeneView.__slots__:
+            raise AttributeError(name)
+        table = self._table
+        if name in table.layout.column:
+            return table.get(self._row(), name)
+        value = getattr(table.gene_type, name)
+        if isinstance(value, FunctionType):
+            return MethodType(value, self)
+        return value
+
+    def __setattr__(self, name, value):
+        if name not in self._table.layout.column:
+            raise AttributeError(f"{self._table.gene_type.__name__} has no attribute {name!r}")
+        self._table.set(self._row(), name, value)
+
+    def copy(self):
+        """A gene object (not a view) with this gene's attributes."""
+        return self._table.materialize(self._row())
+
+    def crossover(self, gene2):
+        return self.copy().crossover(gene2)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __lt__(self, other):
+        return self._key < other.key
+
+    def __str__(self):
+        return str(self.copy())
+
+    __repr__ = __str__
+
+
+class _GeneMapping(MutableMapping):
+    """Dict-like ``{key: gene}`` view of a gene table."""
+    __slots__ = ('_table',)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __getitem__(self, key):
+        pos = self._table.find(key)
+        if pos < 0:
+            raise KeyError(key)
+        return _GeneView(self._table, key, pos)
+
+    def __setitem__(self, key, gene):
+        self._table.put(key, gene)
+
+    def __delitem__(self, key):
+        pos = self._table.find(key)
+        if pos < 0:
+            raise KeyError(key)
+        self._table.delete(pos)
+
+    def __contains__(self, key):
+        return self._table.find(key) >= 0
+
+    def __iter__(self):
+        return iter(self._table.keys())
+
+    def __len__(self):
+        return len(self._table)
+
+    def keys(self):
+        return self._table.keys()
+
+    def values(self):
+        return [_GeneView(self._table, key, pos) for pos, key in enumerate(self._table.keys())]
+
+    def items(self):
+        return [(key, _GeneView(self._table, key, pos)) for pos, key in enumerate(self._table.keys())]
+
+    def __repr__(self):
+        return f"{{{', '.join(f'{key!r}: {gene}' for key, gene in self.items())}}}"
+
+
+class CompactGenome(DefaultGenome):
+    """
+    A :class:`neat.genome.DefaultGenome` whose genes are stored in typed
+    arrays; see the module documentation.
+    """
+
+    node_gene_type = DefaultNodeGene
+    connection_gene_type = DefaultConnectionGene
+
+    @classmethod
+    def parse_config(cls, param_dict):
+        param_dict['node_gene_type'] = cls.node_gene_type
+        param_dict['connection_gene_type'] = cls.connection_gene_type
+        return DefaultGenomeConfig(param_dict, cls.__name__)
+
+    def __init__(self, key):
+        self.key = key
+        self._node_table = _NodeTable(self.node_gene_type)
+        self._connection_table = _ConnectionTable(self.connection_gene_type)
+        self.fitness = None
+
+    @property
+    def nodes(self):
+        return _GeneMapping(self._node_table)
+
+    @nodes.setter
+    def nodes(self, genes):
+        self._node_table = _NodeTable(self.node_gene_type)
+        for key, gene in genes.items():
+            self._node_table.put(key, gene)
+
+    @property
+    def connections(self):
+        return _GeneMapping(self._connection_table)
+
+    @connections.setter
+    def connections(self, genes):
+        self._connection_table = _ConnectionTable(self.connection_gene_type)
+        for key, gene in genes.items():
+            self._connection_table.put(key, gene)
+
+    def configure_from_columns(self, config, nodes, connections):
+        """ Configure a new genome from column-wise gene values; see :meth:`DefaultGenome.configure_from_columns`. """
+        node_keys, node_values = nodes
+        self._node_table.set_columns([node_keys], node_values)
+        connection_keys, innovations, connection_values = connections
+        in_nodes = [key[0] for key in connection_keys]
+        out_nodes = [key[1] for key in connection_keys]
+        self._connection_table.set_columns([innovations, in_nodes, out_nodes], connection_values)
+
+    def configure_crossover(self, genome1, genome2, config, fitness_criterion=None):
+        """
+        Configure a new genome by crossover from two parent genomes.
+
+        Same inheritance rules as :meth:`DefaultGenome.configure_crossover`;
+        the parents' genes are merged in innovation (node key) order.
+        """
+        if not (isinstance(genome1, CompactGenome) and isinstance(genome2, CompactGenome)):
+            return super().configure_crossover(genome1, genome2, config, fitness_criterion)
+
+        if fitness_criterion == 'min':
+            better = genome1.fitness < genome2.fitness
+        else:
+            better = genome1.fitness > genome2.fitness
+        if better:
+            parent1, parent2 = genome1, genome2
+        else:
+            parent1, parent2 = genome2, genome1
+
+        # Connection genes: line up both parents by innovation number.  Genes
+        # only in the less fit parent are not inherited.
+        table1, table2 = parent1._connection_table, parent2._connection_table
+        connections = _ConnectionTable(self.connection_gene_type)
+        innovations2 = table2.columns[0]
+        added = []
+        j, n2 = 0, len(table2)
+        for i, innovation in enumerate(table1.columns[0]):
+            while j < n2 and innovations2[j] < innovation:
+                j += 1
+            key = table1.key_at(i)
+            if j < n2 and innovations2[j] == innovation and table2.key_at(j) == key:
+                row = table1.crossover_row(i, table2, j)
+            else:
+                if j < n2 and innovations2[j] == innovation:
+                    warnings.warn(
+                        f"Innovation number collision: innovation {innovation} assigned to both "
+                        f"{key} and {table2.key_at(j)}. Treating as disjoint genes.",
+                        RuntimeWarning
+                    )
+                row = None
+            # For feed-forward networks, check if this connection would create a cycle
+            if config.feed_forward and creates_cycle(added, key):
+                continue
+            if row is None:
+                connections.append_row(table1, i)
+            else:
+                connections.append_values(row)
+            added.append(key)
+
+        # Node genes: all of the fitter parent's, combined with homologous ones.
+        table1, table2 = parent1._node_table, parent2._node_table
+        nodes = _NodeTable(self.node_gene_type)
+        keys2 = table2.columns[0]
+        j, n2 = 0, len(table2)
+        for i, key in enumerate(table1.columns[0]):
+            while j < n2 and keys2[j] < key:
+                j += 1
+            if j < n2 and keys2[j] == key:
+                nodes.append_values(table1.crossover_row(i, table2, j))
+            else:
+                nodes.append_row(table1, i)
+
+        self._connection_table = connections
+        self._node_table = nodes
+
+    def mutate(self, config, attributes=True):
+        """ Mutates this genome; see :meth:`DefaultGenome.mutate`. """
+        self._mutate_structure(config)
+        if not attributes:
+            return
+        self._connection_table.mutate_attributes(config)
+        self._node_table.mutate_attributes(config)
+
+    def distance(self, other, config):
+        """
+        Returns the genetic distance between this genome and the other, as
+        :meth:`DefaultGenome.distance`, by merging the sorted gene arrays.
+        """
+        if not isinstance(other, CompactGenome):
+            return super().distance(other, config)
+
+        node_distance = 0.0
+        nodes1, nodes2 = self._node_table, other._node_table
+        n1, n2 = len(nodes1), len(nodes2)
+        if config.compatibility_include_node_genes and (n1 or n2):
+            keys1, keys2 = nodes1.columns[0].tolist(), nodes2.columns[0].tolist()
+            rows1, rows2 = [], []
+            i = j = 0
+            while i < n1 and j < n2:
+                if keys1[i] == keys2[j]:
+                    rows1.append(i)
+                    rows2.append(j)
+                    i += 1
+                    j += 1
+                elif keys1[i] < keys2[j]:
+                    i += 1
+                else:
+                    j += 1
+            node_distance = nodes1.homologous_distance(nodes2, rows1, rows2, config)
+            disjoint_nodes = n1 + n2 - 2 * len(rows1)
+            node_distance = (node_distance +
+                             (config.compatibility_disjoint_coefficient *
+                              disjoint_nodes)) / max(n1, n2)
+
+        connection_distance = 0.0
+        conns1, conns2 = self._connection_table, other._connection_table
+        n1, n2 = len(conns1), len(conns2)
+        if n1 or n2:
+            innovations1, innovations2 = conns1.columns[0].tolist(), conns2.columns[0].tolist()
+            max1 = innovations1[-1] if n1 else 0
+            max2 = innovations2[-1] if n2 else 0
+
+            excess_coefficient = config.compatibility_excess_coefficient
+            if excess_coefficient == 'auto':
+                excess_coefficient = config.compatibility_disjoint_coefficient
+            else:
+                excess_coefficient = float(excess_coefficient)
+
+            # Genes beyond the other genome's last innovation are excess, the
+            # remaining unmatched genes are disjoint.
+            excess_count = ((n1 - bisect_right(innovations1, max2)) +
+                            (n2 - bisect_right(innovations2, max1)))
+            if conns1.columns[0] == conns2.columns[0]:
+                rows1 = rows2 = range(n1)
+            else:
+                rows1, rows2 = [], []
+                i = j = 0
+                while i < n1 and j < n2:
+                    if innovations1[i] == innovations2[j]:
+                        rows1.append(i)
+                        rows2.append(j)
+                        i += 1
+                        j += 1
+                    elif innovations1[i] < innovations2[j]:
+                        i += 1
+                    else:
+                        j += 1
+            # Matching innovations with different keys (innovation collisions)
+            # count as two disjoint genes.
+            if rows1 is rows2 and conns1.columns[1:3] == conns2.columns[1:3]:
+                homologous1 = homologous2 = rows1
+            else:
+                keys1, keys2 = conns1.keys(), conns2.keys()
+                homologous1 = [i for i, j in zip(rows1, rows2) if keys1[i] == keys2[j]]
+                homologous2 = [j for i, j in zip(rows1, rows2) if keys1[i] == keys2[j]]
+            disjoint_count = n1 + n2 - excess_count - 2 * len(homologous1)
+
+            homologous_distance = conns1.homologous_distance(conns2, homologous1, homologous2, config)
+            connection_distance = (
+                homologous_distance
+                + config.compatibility_disjoint_coefficient * disjoint_count
+                + excess_coefficient * excess_count
+            ) / max(n1, n2)
+
+        return node_distance + connection_distance
+
+    def mutate_delete_node(self, config):
+        # Do nothing if there are no non-output nodes.
+        available_nodes = [k for k in self._node_table.keys() if k not in config.output_keys]
+        if not available_nodes:
+            return -1
+
+        del_key = choice(available_nodes)
+
+        connections = self._connection_table
+        connections.retain([pos for pos, key in enumerate(connections.keys()) if del_key not in key])
+        self._node_table.delete(self._node_table.find(del_key))
+
+        self._prune_dangling_nodes(config)
+
+        return del_key
+
+    def _prune_dangling_nodes(self, config):
+        """Remove hidden nodes that cannot affect any output, as :meth:`DefaultGenome._prune_dangling_nodes`."""
+        output_keys = set(config.output_keys)
+        connections = self._connection_table
+        keys = connections.keys()
+        enabled_connections = [key for key, enabled in zip(keys, connections.column('enabled')) if enabled]
+        required = required_for_output(config.input_keys, config.output_keys, enabled_connections)
+
+        node_keys = self._node_table.keys()
+        removed = {key for key in node_keys if key not in output_keys and key not in required}
+        if removed:
+            self._node_table.retain([pos for pos, key in enumerate(node_keys) if key not in removed])
+            connections.retain([pos for pos, (i, o) in enumerate(keys) if i not in removed and o not in removed])
+
+    def size(self):
+        """
+        Returns genome 'complexity', taken to be
+        (number of nodes, number of enabled connections)
+        """
+        return len(self._node_table), sum(self._connection_table.column('enabled'))
+
+    def get_pruned_copy(self, genome_config):
+        used_nodes = required_for_output(genome_config.input_keys, genome_config.output_keys,
+                                         self._connection_table.keys())
+        used_pins = used_nodes.union(genome_config.input_keys)
+
+        new_genome = self.__class__(None)
+        nodes = self._node_table
+        for pos, key in enumerate(nodes.columns[0]):
+            if key in used_nodes:
+                new_genome._node_table.append_row(nodes, pos)
+        connections = self._connection_table
+        enabled = connections.column('enabled')
+        for pos, (in_node_id, out_node_id) in enumerate(connections.keys()):
+            if enabled[pos] and in_node_id in used_pins and out_node_id in used_pins:
+                new_genome._connection_table.append_row(connections, pos)
+        return new_genome
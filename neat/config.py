@@ -154,7 +154,10 @@ class Config:
                 ConfigParameter('fitness_threshold', float),
                 ConfigParameter('reset_on_extinction', bool),
                 ConfigParameter('no_fitness_termination', bool, False),
-                ConfigParameter('seed', int, None, optional=True)]
+                ConfigParameter('seed', int, None, optional=True),
+                ConfigParameter('carry_over_fitness', bool, False, optional=True),
+                ConfigParameter('deduplicate_evaluations', bool, False, optional=True),
+                ConfigParameter('fingerprint_digits', int, 6, optional=True)]
 
     def is_better_fitness(self, a, b):
         """Return True if fitness value *a* is strictly better than *b*.
@@ -18,11 +18,17 @@ Example usage:
     
     # Or export directly to file
     export_network_json(net, filepath='network.json', metadata={'fitness': winner.fitness})
+
+    # Load it back, e.g. on an inference host, without a Config
+    from neat.export import load_network_json
+    net = load_network_json('network.json')
 """
 
 import json
-from .exporters import export_feedforward, export_recurrent, export_ctrnn, export_iznn
+from .exporters import export_feedforward, export_recurrent, export_ctrnn, export_iznn, export_npz
 from .json_format import validate_json
+from .archive import NetworkArchive, NetworkArchiveReporter
+from .loaders import load_feedforward, load_recurrent, load_ctrnn, load_iznn, load_npz, validate_graph
 
 
 def export_network_json(network, filepath=None, metadata=None):
@@ -77,7 +83,12 @@ def export_network_json(network, filepath=None, metadata=None):
     """
     if network is None:
         raise TypeError("network cannot be None")
-    
+
+    # Vectorized networks are exported through their scalar equivalent.
+    metadata = dict(getattr(network, 'metadata', {}), **(metadata or {}))
+    if hasattr(network, 'to_network'):
+        network = network.to_network()
+
     # Determine network type and call appropriate exporter
     network_type_name = type(network).__name__
     
@@ -109,5 +120,116 @@ def export_network_json(network, filepath=None, metadata=None):
     return json_str
 
 
+def load_network_json(source, custom_activations=None, custom_aggregations=None, vectorized=True):
+    """
+    Load a network written by :func:`export_network_json`.
+
+    The document is checked with :func:`validate_json` and for graph
+    consistency before a runtime network is built from it.  Builtin
+    activation and aggregation functions are resolved by name, so no
+    ``Config`` is required.
+
+    Args:
+        source: Path to a JSON file, a JSON string, or an already parsed dict
+        custom_activations: Optional dict mapping names to custom activation functions
+        custom_aggregations: Optional dict mapping names to custom aggregation functions
+        vectorized: Build feed-forward and recurrent networks as NumPy
+                    array-backed networks (the default) rather than as
+                    FeedForwardNetwork/RecurrentNetwork
+
+    Returns:
+        VectorizedFeedForwardNetwork, VectorizedRecurrentNetwork, CTRNN or IZNN
+        (FeedForwardNetwork or RecurrentNetwork with ``vectorized=False``)
+
+    Raises:
+        ValueError: If the document is invalid or uses an unknown function
+
+    Example:
+        >>> from neat.export import load_network_json
+        >>> net = load_network_json('my_network.json')
+        >>> outputs = net.activate_batch(inputs)
+    """
+    if isinstance(source, dict):
+        data = source
+    elif isinstance(source, str) and source.lstrip().startswith('{'):
+        data = json.loads(source)
+    else:
+        with open(source) as f:
+            data = json.load(f)
+
+    validate_json(data)
+    validate_graph(data)
+
+    network_type = data['network_type']
+    if network_type == 'feedforward':
+        return load_feedforward(data, custom_activations, custom_aggregations, vectorized)
+    if network_type == 'recurrent':
+        return load_recurrent(data, custom_activations, custom_aggregations, vectorized)
+    if network_type == 'ctrnn':
+        return load_ctrnn(data, custom_activations, custom_aggregations)
+    return load_iznn(data)
+
+
+def export_network_npz(network, filepath, metadata=None):
+    """
+    Export a feed-forward or recurrent network to a binary ``.npz`` artifact.
+
+    The artifact stores the arrays of the vectorized phenotype (see
+    :mod:`neat.nn.vectorized`) with a small activation/aggregation name table,
+    and is loaded with :func:`load_network_npz`.  It is a valid NumPy ``.npz``
+    file.  Requires NumPy.
+
+    Args:
+        network: FeedForwardNetwork, RecurrentNetwork, or a vectorized network
+        filepath: Path of the ``.npz`` file to write
+        metadata: Optional dict with additional information to include
+
+    Raises:
+        ValueError: If the network type is not supported or its node keys
+                    are not integers
+    """
+    if network is None:
+        raise TypeError("network cannot be None")
+    metadata = dict(getattr(network, 'metadata', {}), **(metadata or {}))
+    export_npz(network, filepath, metadata)
+
+
+def load_network_npz(filepath, custom_activations=None, mmap=True):
+    """
+    Load a network written by :func:`export_network_npz`.
+
+    With ``mmap`` (the default) the file is memory-mapped and the network's
+    arrays are zero-copy views into it.
+
+    Args:
+        filepath: Path of the ``.npz`` artifact
+        custom_activations: Optional dict mapping names to custom activation functions
+        mmap: Map the file instead of reading it into memory
+
+    Returns:
+        VectorizedFeedForwardNetwork or VectorizedRecurrentNetwork
+    """
+    return load_npz(filepath, custom_activations, mmap)
+
+
+def convert_json_to_npz(source, filepath, custom_activations=None):
+    """Convert a JSON network export (path, string or dict) to an ``.npz`` artifact."""
+    if isinstance(source, dict):
+        data = source
+    elif isinstance(source, str) and source.lstrip().startswith('{'):
+        data = json.loads(source)
+    else:
+        with open(source) as f:
+            data = json.load(f)
+    network = load_network_json(data, custom_activations=custom_activations)
+    export_npz(network, filepath, data.get('metadata'))
+
+
+def convert_npz_to_json(source, filepath=None, custom_activations=None):
+    """Convert an ``.npz`` artifact to the JSON format; returns the JSON string."""
+    return export_network_json(load_npz(source, custom_activations), filepath)
+
+
 # Export public API
-__all__ = ['export_network_json']
+__all__ = ['export_network_json', 'load_network_json', 'export_network_npz', 'load_network_npz',
+           'convert_json_to_npz', 'convert_npz_to_json', 'NetworkArchive', 'NetworkArchiveReporter']
@@ -0,0 +1,321 @@
+"""
+Columnar archive holding many networks in one file.
+
+A :class:`NetworkArchive` stores feed-forward and recurrent networks (for
+example each generation's champions) in a single uncompressed zip file
+laid out like the ``.npz`` artifact of :func:`neat.export.export_network_npz`.
+Networks are appended in blocks; each block stores the arrays of all its
+networks concatenated column by column, per-network offset columns, and
+metadata columns (genome_id, fitness, generation).  Activation and
+aggregation names are kept in one table shared by the whole archive.
+
+Appending a block never rewrites existing data, and reading one network maps
+the file and slices its columns without reading the rest.
+
+Requires NumPy.
+
+Example usage:
+    from neat.export import NetworkArchive, NetworkArchiveReporter
+
+    population.add_reporter(NetworkArchiveReporter('champions.npz', num_best=3))
+    winner = population.run(eval_genomes, 300)
+
+    archive = NetworkArchive('champions.npz')
+    print(len(archive), archive.metadata(-1))
+    net = archive.load(-1)          # a VectorizedFeedForwardNetwork
+"""
+
+import json
+import math
+import os
+
+from neat.reporting import BaseReporter
+from .exporters import _vectorize, _write_aligned_npz
+from .loaders import _map_npz_array, _npz_member_index
+
+_NETWORK_TYPES = ('feedforward', 'recurrent')
+
+# Columns holding the concatenated arrays of a block's networks, and the
+# offset column that delimits each network's segment.
+_SLOT_COLUMNS = ('node_keys', 'initial_values')
+_NODE_COLUMNS = ('bias', 'response', 'activation_ids', 'aggregation_ids')
+_EDGE_COLUMNS = ('edge_sources', 'edge_weights')
+_OUTPUT_COLUMNS = ('output_nodes', 'output_slots')
+
+
+class NetworkArchive:
+    """
+    Append-only columnar file of networks with random access by index.
+
+    Indices run over all networks in the archive in the order they were
+    appended; negative indices count from the end.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self._blocks = []
+        self._activation_names = []
+        self._aggregation_names = []
+        self._custom_activations = set()
+        self._index = {}
+        self._buffer = None
+        self._views = {}
+        if not os.path.exists(filepath):
+            return
+
+        index = _npz_member_index(filepath)
+        if index is None:
+            raise ValueError(f"{filepath} is not an uncompressed network archive")
+        self._index = index
+        self._remap()
+        b = 0
+        while f'block{b:06d}/header' in index:
+            self._add_block(f'block{b:06d}/', json.loads(str(self._column(f'block{b:06d}/', 'header'))))
+            b += 1
+
+    def _add_block(self, prefix, header):
+        self._activation_names.extend(header['new_activation_names'])
+        self._aggregation_names.extend(header['new_aggregation_names'])
+        self._custom_activations.update(header['custom_activations'])
+        self._blocks.append((prefix, header))
+
+    def _remap(self):
+        """Map the file as it is now, releasing the previous mapping."""
+        import mmap
+
+        self.close()
+        with open(self.filepath, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Release the mapping of the file; the archive is unusable afterwards."""
+        old, self._buffer, self._views = self._buffer, None, {}
+        if old is not None:
+            try:
+                old.close()
+            except BufferError:
+                # Networks loaded earlier still view the mapping; it is
+                # released with the last of them.
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return sum(header['count'] for prefix, header in self._blocks)
+
+    def _locate(self, index):
+        """Return ``(column prefix, block header, index within the block)``."""
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(f"Archive index {index} out of range")
+        for prefix, header in self._blocks:
+            if index < header['count']:
+                return prefix, header, index
+            index -= header['count']
+
+    def _column(self, prefix, name):
+        view = self._views.get(prefix + name)
+        if view is None:
+            view = self._views[prefix + name] = _map_npz_array(self._buffer, self._index[prefix + name])
+        return view
+
+    def metadata(self, index):
+        """Metadata recorded for a network: genome_id, fitness, generation and any extra fields."""
+        prefix, header, i = self._locate(index)
+        result = {}
+        genome_id = int(self._column(prefix, 'genome_id')[i])
+        fitness = float(self._column(prefix, 'fitness')[i])
+        generation = int(self._column(prefix, 'generation')[i])
+        if genome_id != -1:
+            result['genome_id'] = genome_id
+        if not math.isnan(fitness):
+            result['fitness'] = fitness
+        if generation != -1:
+            result['generation'] = generation
+        result.update(header['metadata'][i])
+        return result
+
+    def columns(self, name):
+        """
+        The concatenation of a metadata column ('genome_id', 'fitness' or
+        'generation') over the whole archive, without loading any network.
+        """
+        import numpy as np
+
+        if name not in ('genome_id', 'fitness', 'generation'):
+            raise ValueError(f"Unknown metadata column {name!r}")
+        return np.concatenate([self._column(prefix, name) for prefix, header in self._blocks]) \
+            if self._blocks else np.empty(0)
+
+    def load(self, index, custom_activations=None):
+        """
+        Load one network; its arrays are zero-copy views into the mapped file.
+
+        Returns a :class:`neat.nn.VectorizedFeedForwardNetwork` or
+        :class:`neat.nn.vectorized.VectorizedRecurrentNetwork`.
+        """
+        from neat.nn.vectorized import VectorizedFeedForwardNetwork, VectorizedRecurrentNetwork
+
+        prefix, header, i = self._locate(index)
+        custom = {}
+        for name in self._custom_activations:
+            if not custom_activations or name not in custom_activations:
+                raise ValueError(f"Archive uses custom activation function {name!r}; "
+                                 f"pass it in custom_activations")
+            custom[name] = custom_activations[name]
+
+        def segment(columns, offsets, extra=0):
+            start = int(self._column(prefix, offsets)[i])
+            end = int(self._column(prefix, offsets)[i + 1])
+            return [self._column(prefix, c)[start + i * extra:end + (i + 1) * extra] for c in columns]
+
+        node_keys, initial_values = segment(_SLOT_COLUMNS, 'slot_start')
+        bias, response, activation_ids, aggregation_ids = segment(_NODE_COLUMNS, 'node_start')
+        edge_offsets, = segment(('edge_offsets',), 'node_start', extra=1)
+        edge_sources, edge_weights = segment(_EDGE_COLUMNS, 'edge_start')
+        layer_offsets, = segment(('layer_offsets',), 'layer_start', extra=1)
+        output_nodes, output_slots = segment(_OUTPUT_COLUMNS, 'output_start')
+
+        node_keys = node_keys.tolist()
+        num_inputs = int(self._column(prefix, 'num_inputs')[i])
+        network_type = _NETWORK_TYPES[int(self._column(prefix, 'network_type')[i])]
+        cls = VectorizedRecurrentNetwork if network_type == 'recurrent' else VectorizedFeedForwardNetwork
+        return cls(node_keys[:num_inputs], output_nodes.tolist(), node_keys, initial_values,
+                   bias, response, activation_ids, aggregation_ids,
+                   edge_offsets, edge_sources, edge_weights, layer_offsets, output_slots,
+                   self._activation_names, self._aggregation_names,
+                   activation_functions=custom, simplified=bool(self._column(prefix, 'simplified')[i]))
+
+    def __getitem__(self, index):
+        return self.load(index)
+
+    def append(self, networks, metadata=None):
+        """
+        Append one block of networks.
+
+        Args:
+            networks: FeedForwardNetwork, RecurrentNetwork or vectorized networks
+            metadata: Optional list with one dict per network; 'genome_id',
+                      'fitness' and 'generation' are stored as columns, other
+                      JSON-serializable fields with the block header
+        """
+        import numpy as np
+
+        networks = [_vectorize(net) for net in networks]
+        if not networks:
+            return
+        metadata = list(metadata) if metadata is not None else [{} for _ in networks]
+        if len(metadata) != len(networks):
+            raise ValueError(f"Expected {len(networks)} metadata entries, got {len(metadata)}")
+
+        activation_names = list(self._activation_names)
+        aggregation_names = list(self._aggregation_names)
+        custom_activations = set()
+        columns = {c: [] for c in _SLOT_COLUMNS + _NODE_COLUMNS + _EDGE_COLUMNS + _OUTPUT_COLUMNS
+                   + ('edge_offsets', 'layer_offsets')}
+        starts = {c: [0] for c in ('slot_start', 'node_start', 'edge_start', 'layer_start', 'output_start')}
+        num_inputs, network_types, simplified = [], [], []
+        for net, network_type in networks:
+            # Translate the network's function ids to the shared name tables.
+            for name in net.activation_names:
+                if name not in activation_names:
+                    activation_names.append(name)
+            for name in net.aggregation_names:
+                if name not in aggregation_names:
+                    aggregation_names.append(name)
+            custom_activations.update(net.activation_functions)
+            act_map = np.array([activation_names.index(n) for n in net.activation_names], dtype=np.int32)
+            agg_map = np.array([aggregation_names.index(n) for n in net.aggregation_names], dtype=np.int32)
+
+            columns['node_keys'].append(np.array(net.node_keys, dtype=np.int64))
+            columns['initial_values'].append(net.initial_values)
+            columns['bias'].append(net.bias)
+            columns['response'].append(net.response)
+            columns['activation_ids'].append(act_map[net.activation_ids] if len(act_map) else net.activation_ids)
+            columns['aggregation_ids'].append(agg_map[net.aggregation_ids] if len(agg_map) else net.aggregation_ids)
+            columns['edge_offsets'].append(net.edge_offsets)
+            columns['edge_sources'].append(net.edge_sources)
+            columns['edge_weights'].append(net.edge_weights)
+            columns['layer_offsets'].append(net.layer_offsets)
+            columns['output_nodes'].append(np.array(net.output_nodes, dtype=np.int64))
+            columns['output_slots'].append(net.output_slots)
+
+            starts['slot_start'].append(starts['slot_start'][-1] + len(net.node_keys))
+            starts['node_start'].append(starts['node_start'][-1] + len(net.bias))
+            starts['edge_start'].append(starts['edge_start'][-1] + len(net.edge_sources))
+            starts['layer_start'].append(starts['layer_start'][-1] + len(net.layer_offsets) - 1)
+            starts['output_start'].append(starts['output_start'][-1] + len(net.output_nodes))
+            num_inputs.append(len(net.input_nodes))
+            network_types.append(_NETWORK_TYPES.index(network_type))
+            simplified.append(bool(net.simplified))
+
+        extra = [{k: v for k, v in m.items() if k not in ('genome_id', 'fitness', 'generation')}
+                 for m in metadata]
+        header = {
+            'count': len(networks),
+            'new_activation_names': activation_names[len(self._activation_names):],
+            'new_aggregation_names': aggregation_names[len(self._aggregation_names):],
+            'custom_activations': sorted(custom_activations - self._custom_activations),
+            'metadata': extra,
+        }
+
+        prefix = f'block{len(self._blocks):06d}/'
+        arrays = {prefix + 'header': np.array(json.dumps(header))}
+        for name, parts in columns.items():
+            arrays[prefix + name] = np.concatenate(parts)
+        for name, values in starts.items():
+            arrays[prefix + name] = np.array(values, dtype=np.int64)
+        arrays[prefix + 'num_inputs'] = np.array(num_inputs, dtype=np.int64)
+        arrays[prefix + 'network_type'] = np.array(network_types, dtype=np.int8)
+        arrays[prefix + 'simplified'] = np.array(simplified, dtype=np.bool_)
+        arrays[prefix + 'genome_id'] = np.array([m.get('genome_id', -1) for m in metadata], dtype=np.int64)
+        fitness = [m.get('fitness') for m in metadata]
+        arrays[prefix + 'fitness'] = np.array([math.nan if f is None else f for f in fitness], dtype=np.float64)
+        arrays[prefix + 'generation'] = np.array([m.get('generation', -1) for m in metadata], dtype=np.int64)
+
+        offsets = _write_aligned_npz(self.filepath, arrays, mode='a')
+        for name, array in arrays.items():
+            self._index[name] = (offsets[name], array.dtype, array.shape, False)
+        self._remap()
+        self._add_block(prefix, header)
+
+    def append_genomes(self, genomes, config, generation=None):
+        """Append one block with the phenotypes of ``genomes``, recording their key and fitness."""
+        from neat.nn.vectorized import VectorizedFeedForwardNetwork, VectorizedRecurrentNetwork
+
+        cls = VectorizedFeedForwardNetwork if config.genome_config.feed_forward else VectorizedRecurrentNetwork
+        networks, metadata = [], []
+        for genome in genomes:
+            networks.append(cls.create(genome, config))
+            entry = {'genome_id': genome.key, 'fitness': genome.fitness}
+            if generation is not None:
+                entry['generation'] = generation
+            metadata.append(entry)
+        self.append(networks, metadata)
+
+
+class NetworkArchiveReporter(BaseReporter):
+    """
+    Appends the ``num_best`` best genomes of every generation to a :class:`NetworkArchive`,
+    one block per generation.
+    """
+
+    def __init__(self, filepath, num_best=1):
+        self.archive = NetworkArchive(filepath)
+        self.num_best = num_best
+        self.generation = None
+
+    def start_generation(self, generation):
+        self.generation = generation
+
+    def post_evaluate(self, config, population, species, best_genome):
+        evaluated = [g for g in population.values() if g.fitness is not None]
+        best = sorted(evaluated, key=lambda g: g.fitness,
+                      reverse=config.fitness_criterion != 'min')[:self.num_best]
+        self.archive.append_genomes(best, config, self.generation)
@@ -2,9 +2,11 @@
 Network-specific export functions for each NEAT network type.
 
 This module contains the implementation details for exporting each type of
-NEAT network (FeedForward, Recurrent, CTRNN, IZNN) to the JSON format.
+NEAT network (FeedForward, Recurrent, CTRNN, IZNN) to the JSON format, and
+feed-forward and recurrent networks to the binary ``.npz`` artifact.
 """
 
+import json
 from datetime import datetime, timezone
 from .json_format import FORMAT_VERSION, get_function_info
 
@@ -55,7 +57,19 @@ def export_feedforward(network, metadata=None):
                 "weight": weight,
                 "enabled": True
             })
-    
+
+    # Nodes folded to constants by simplification are exported as input-free
+    # identity nodes whose bias is the constant value.
+    for node_id, value in getattr(network, 'constants', {}).items():
+        nodes.append({
+            "id": node_id,
+            "type": "output" if node_id in network.output_nodes else "hidden",
+            "activation": {"name": "identity", "custom": False},
+            "aggregation": {"name": "sum", "custom": False},
+            "bias": value,
+            "response": 1.0
+        })
+
     # Add input nodes (they don't appear in node_evals but are part of topology)
     for input_id in network.input_nodes:
         nodes.append({
@@ -316,3 +330,117 @@ def export_iznn(network, metadata=None):
         data["metadata"].update(metadata)
     
     return data
+
+
+# Extra-field id used to pad zip local headers so that array data is aligned.
+_NPZ_PADDING_FIELD = 0x4E50
+_NPZ_ALIGNMENT = 64
+
+
+def _write_aligned_npz(filepath, arrays, mode='w'):
+    """
+    Write ``arrays`` as an uncompressed ``.npz`` whose array data is aligned.
+
+    The result is an ordinary ``.npz`` file (``numpy.load`` reads it); each
+    member's local header is padded so the array payload starts at a multiple
+    of 64 bytes, which lets :func:`neat.export.loaders.load_npz` map it
+    without copying.  With ``mode='a'`` the arrays are appended to an
+    existing file without rewriting its members.
+
+    Returns ``{name: offset}``, the file offset of each array's data.
+    """
+    import io
+    import struct
+    import zipfile
+
+    import numpy as np
+
+    offsets = {}
+    with zipfile.ZipFile(filepath, mode, zipfile.ZIP_STORED) as zf:
+        for name, array in arrays.items():
+            array = np.asarray(array, order='C')
+            buf = io.BytesIO()
+            np.lib.format.write_array(buf, array, allow_pickle=False)
+            data = buf.getvalue()
+
+            info = zipfile.ZipInfo(f'{name}.npy', date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_STORED
+            payload = zf.start_dir + 30 + len(info.filename.encode()) + (len(data) - array.nbytes)
+            # The padding field itself takes 4 bytes of header.
+            pad = (-(payload + 4)) % _NPZ_ALIGNMENT
+            info.extra = struct.pack('<HH', _NPZ_PADDING_FIELD, pad) + b'\0' * pad
+            offsets[name] = payload + 4 + pad
+            zf.writestr(info, data)
+    return offsets
+
+
+def _vectorize(network):
+    """Return ``(vectorized network, network_type)`` for a feed-forward or recurrent network."""
+    from neat.nn.vectorized import VectorizedFeedForwardNetwork, VectorizedRecurrentNetwork
+
+    type_name = type(network).__name__
+    if not isinstance(network, VectorizedFeedForwardNetwork):
+        if 'Recurrent' in type_name and 'CTRNN' not in type_name:
+            network = VectorizedRecurrentNetwork.from_network(network)
+        elif 'FeedForward' in type_name:
+            network = VectorizedFeedForwardNetwork.from_network(network)
+        else:
+            raise ValueError(f"Unsupported network type for npz export: {type_name}. "
+                             f"Supported types: FeedForwardNetwork, RecurrentNetwork")
+    if not all(isinstance(k, int) or hasattr(k, '__index__') for k in network.node_keys):
+        raise ValueError("npz export requires integer node keys")
+    network_type = 'recurrent' if isinstance(network, VectorizedRecurrentNetwork) else 'feedforward'
+    return network, network_type
+
+
+def export_npz(network, filepath, metadata=None):
+    """
+    Export a feed-forward or recurrent network to the binary ``.npz`` artifact.
+
+    The artifact holds the arrays of the network's vectorized phenotype
+    (:mod:`neat.nn.vectorized`) -- node, edge and layer arrays plus the
+    activation/aggregation name tables -- so loading it needs no graph
+    processing.  Requires NumPy.
+
+    Args:
+        network: FeedForwardNetwork, RecurrentNetwork or one of their
+                 vectorized counterparts; node keys must be integers
+        filepath: Path of the file to write
+        metadata: Optional dict with fitness, generation, genome_id, etc.
+    """
+    import numpy as np
+
+    network, network_type = _vectorize(network)
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "network_type": network_type,
+        "metadata": {
+            "created_timestamp": datetime.now(timezone.utc).isoformat(),
+            "neat_python_version": _get_neat_version(),
+        },
+        "num_inputs": len(network.input_nodes),
+        "simplified": bool(network.simplified),
+        "activation_names": network.activation_names,
+        "aggregation_names": network.aggregation_names,
+        "custom_activations": sorted(network.activation_functions),
+    }
+    if metadata:
+        header["metadata"].update(metadata)
+
+    _write_aligned_npz(filepath, {
+        "header": np.array(json.dumps(header)),
+        "node_keys": np.array(network.node_keys, dtype=np.int64),
+        "output_nodes": np.array(network.output_nodes, dtype=np.int64),
+        "initial_values": network.initial_values,
+        "bias": network.bias,
+        "response": network.response,
+        "activation_ids": network.activation_ids,
+        "aggregation_ids": network.aggregation_ids,
+        "edge_offsets": network.edge_offsets,
+        "edge_sources": network.edge_sources,
+        "edge_weights": network.edge_weights,
+        "layer_offsets": network.layer_offsets,
+        "output_slots": network.output_slots,
+    })
+    return header
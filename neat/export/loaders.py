@@ -0,0 +1,332 @@
+"""
+Network-specific loaders that turn exported JSON documents back into runtimes.
+
+This module is the counterpart of :mod:`neat.export.exporters`.  Builtin
+activation and aggregation functions are resolved by name, so no ``Config``
+is needed to load a network.  Feed-forward and recurrent networks are built
+as array-backed :mod:`neat.nn.vectorized` networks (or as the plain Python
+networks with ``vectorized=False``); CTRNN and IZNN documents are built as
+:class:`neat.ctrnn.CTRNN` and :class:`neat.iznn.IZNN`.
+"""
+
+from neat.activations import ActivationFunctionSet
+from neat.aggregations import AggregationFunctionSet
+
+_builtin_activations = None
+_builtin_aggregations = None
+
+
+def _builtin_functions():
+    """Return the ``{name: function}`` maps of the builtin activations and aggregations."""
+    global _builtin_activations, _builtin_aggregations
+    if _builtin_activations is None:
+        _builtin_activations = dict(ActivationFunctionSet().functions)
+        _builtin_aggregations = dict(AggregationFunctionSet().functions)
+    return _builtin_activations, _builtin_aggregations
+
+
+def _resolve_function(node, function_type, custom_functions):
+    info = node.get(function_type)
+    if not isinstance(info, dict) or 'name' not in info:
+        raise ValueError(f"Node {node['id']} has no valid '{function_type}' field")
+    name = info['name']
+    if custom_functions and name in custom_functions:
+        return custom_functions[name]
+    if info.get('custom'):
+        raise ValueError(f"Node {node['id']} uses custom {function_type} function {name!r}; "
+                         f"pass it in custom_{function_type}s")
+    activations, aggregations = _builtin_functions()
+    functions = activations if function_type == 'activation' else aggregations
+    if name not in functions:
+        raise ValueError(f"Node {node['id']} has unknown {function_type} function {name!r}")
+    return functions[name]
+
+
+def validate_graph(data):
+    """
+    Check that the nodes and connections of a document form a consistent network.
+
+    Complements :func:`neat.export.json_format.validate_json`, which only
+    checks the document structure.
+
+    Raises:
+        ValueError: If node ids are duplicated, a connection refers to an
+            unknown node, or the topology does not match the nodes.
+    """
+    topology = data['topology']
+    input_keys, output_keys = topology['input_keys'], topology['output_keys']
+    if len(input_keys) != topology['num_inputs'] or len(output_keys) != topology['num_outputs']:
+        raise ValueError("Topology key counts do not match num_inputs/num_outputs")
+
+    node_types = {}
+    for node in data['nodes']:
+        if node['id'] in node_types:
+            raise ValueError(f"Duplicate node id {node['id']}")
+        node_types[node['id']] = node['type']
+
+    for key in input_keys:
+        if node_types.get(key) != 'input':
+            raise ValueError(f"Input key {key} has no input node")
+    for key in output_keys:
+        # An output that was never evaluated may be absent; it reads as 0.0.
+        if node_types.get(key, 'output') != 'output':
+            raise ValueError(f"Output key {key} is a {node_types[key]} node")
+
+    for i, conn in enumerate(data['connections']):
+        if conn['from'] not in node_types or conn['to'] not in node_types:
+            raise ValueError(f"Connection {i} refers to an unknown node")
+        if node_types[conn['to']] == 'input':
+            raise ValueError(f"Connection {i} ends at input node {conn['to']}")
+    return True
+
+
+def _incoming_links(data):
+    links = {}
+    for conn in data['connections']:
+        if conn['enabled']:
+            links.setdefault(conn['to'], []).append((conn['from'], conn['weight']))
+    return links
+
+
+def _evaluation_order(inputs, outputs, links):
+    """
+    Nodes required for the outputs, each after all of its sources.
+
+    Equivalent to flattening :func:`neat.graphs.feed_forward_layers`, but
+    linear in the number of connections, which matters for large documents.
+    """
+    inputs = set(inputs)
+    order = []
+    state = {}  # 1: on the current path, 2: done
+    for root in outputs:
+        if root in state:
+            continue
+        stack = [(root, iter(links.get(root, ())))]
+        state[root] = 1
+        while stack:
+            node, sources = stack[-1]
+            for source, weight in sources:
+                if source in inputs:
+                    continue
+                if state.get(source) == 1:
+                    raise ValueError(f"Node {source} is part of a cycle; not a feed-forward network")
+                if source not in state:
+                    state[source] = 1
+                    stack.append((source, iter(links.get(source, ()))))
+                    break
+            else:
+                stack.pop()
+                state[node] = 2
+                order.append(node)
+    return order
+
+
+def _node_evals(data, order, links, custom_activations, custom_aggregations):
+    nodes = {n['id']: n for n in data['nodes']}
+    node_evals = []
+    for key in order:
+        node = nodes[key]
+        node_evals.append((key, _resolve_function(node, 'activation', custom_activations),
+                           _resolve_function(node, 'aggregation', custom_aggregations),
+                           node['bias'], node['response'], links.get(key, [])))
+    return node_evals
+
+
+def load_feedforward(data, custom_activations=None, custom_aggregations=None, vectorized=True):
+    """
+    Build a feed-forward network from a validated document.
+
+    Returns a :class:`neat.nn.VectorizedFeedForwardNetwork`, or a
+    :class:`neat.nn.FeedForwardNetwork` with ``vectorized=False``.
+    """
+    from neat.nn.feed_forward import FeedForwardNetwork
+
+    topology = data['topology']
+    inputs, outputs = list(topology['input_keys']), list(topology['output_keys'])
+    if set(inputs) & set(outputs):
+        raise ValueError("Input and output keys overlap")
+    links = _incoming_links(data)
+    nodes = {n['id'] for n in data['nodes']}
+    order = [key for key in _evaluation_order(inputs, outputs, links) if key in nodes]
+
+    network = FeedForwardNetwork(inputs, outputs,
+                                 _node_evals(data, order, links, custom_activations, custom_aggregations))
+    if not vectorized:
+        return network
+    from neat.nn.vectorized import VectorizedFeedForwardNetwork
+    return VectorizedFeedForwardNetwork.from_network(network)
+
+
+def load_recurrent(data, custom_activations=None, custom_aggregations=None, vectorized=True):
+    """
+    Build a recurrent network from a validated document.
+
+    Returns a :class:`neat.nn.vectorized.VectorizedRecurrentNetwork`, or a
+    :class:`neat.nn.RecurrentNetwork` with ``vectorized=False``.
+    """
+    from neat.nn.recurrent import RecurrentNetwork
+
+    topology = data['topology']
+    links = _incoming_links(data)
+    order = [n['id'] for n in data['nodes'] if n['type'] != 'input']
+    network = RecurrentNetwork(list(topology['input_keys']), list(topology['output_keys']),
+                               _node_evals(data, order, links, custom_activations, custom_aggregations))
+    if not vectorized:
+        return network
+    from neat.nn.vectorized import VectorizedRecurrentNetwork
+    return VectorizedRecurrentNetwork.from_network(network)
+
+
+def load_ctrnn(data, custom_activations=None, custom_aggregations=None):
+    """Build a :class:`neat.ctrnn.CTRNN` from a validated document."""
+    from neat.ctrnn import CTRNN, CTRNNNodeEval
+
+    topology = data['topology']
+    links = _incoming_links(data)
+    node_evals = {}
+    for node in data['nodes']:
+        if node['type'] == 'input':
+            continue
+        if 'time_constant' not in node:
+            raise ValueError(f"CTRNN node {node['id']} has no 'time_constant' field")
+        node_evals[node['id']] = CTRNNNodeEval(node['time_constant'],
+                                               _resolve_function(node, 'activation', custom_activations),
+                                               _resolve_function(node, 'aggregation', custom_aggregations),
+                                               node['bias'], node['response'], links.get(node['id'], []))
+    return CTRNN(list(topology['input_keys']), list(topology['output_keys']), node_evals)
+
+
+def load_iznn(data):
+    """Build a :class:`neat.iznn.IZNN` from a validated document."""
+    from neat.iznn import IZNN, IZNeuron
+
+    topology = data['topology']
+    links = _incoming_links(data)
+    neurons = {}
+    for node in data['nodes']:
+        if node['type'] == 'input':
+            continue
+        missing = [p for p in ('a', 'b', 'c', 'd') if p not in node]
+        if missing:
+            raise ValueError(f"IZNN node {node['id']} is missing {', '.join(missing)}")
+        neurons[node['id']] = IZNeuron(node['bias'], node['a'], node['b'], node['c'], node['d'],
+                                       links.get(node['id'], []))
+    return IZNN(neurons, list(topology['input_keys']), list(topology['output_keys']))
+
+
+def _npz_member_index(filepath):
+    """
+    Locate the arrays of an uncompressed ``.npz`` file.
+
+    Returns ``{name: (offset, dtype, shape, fortran_order)}``, with the file
+    offset of each array's data, or None if a member is compressed.
+    """
+    import struct
+    import zipfile
+
+    import numpy as np
+
+    with zipfile.ZipFile(filepath) as zf:
+        infos = zf.infolist()
+    if any(info.compress_type != zipfile.ZIP_STORED for info in infos):
+        return None
+
+    index = {}
+    with open(filepath, 'rb') as f:
+        for info in infos:
+            # The central directory's extra field may differ from the local
+            # header's, so read the local header to find the member data.
+            f.seek(info.header_offset)
+            local = f.read(30)
+            name_len, extra_len = struct.unpack('<HH', local[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"Array {info.filename} has object dtype")
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            index[name] = (f.tell(), dtype, shape, fortran_order)
+    return index
+
+
+def _map_npz_array(buffer, entry):
+    """The read-only array at ``entry`` (from :func:`_npz_member_index`) of a mapped file."""
+    import numpy as np
+
+    offset, dtype, shape, fortran_order = entry
+    count = int(np.prod(shape, dtype=np.int64))
+    array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    return array.reshape(shape, order='F' if fortran_order else 'C')
+
+
+def _map_npz_members(filepath):
+    """
+    Map the arrays of an uncompressed ``.npz`` file without copying them.
+
+    Returns ``{name: array}`` of read-only arrays that are views into one
+    memory map of the file, or None if a member is compressed.
+    """
+    import mmap
+
+    index = _npz_member_index(filepath)
+    if index is None:
+        return None
+    with open(filepath, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return {name: _map_npz_array(buffer, entry) for name, entry in index.items()}
+
+
+def load_npz(filepath, custom_activations=None, mmap=True):
+    """
+    Load a network written by :func:`neat.export.exporters.export_npz`.
+
+    With ``mmap`` (the default) the arrays of the returned network are
+    read-only views into a memory map of the file, so nothing is copied or
+    parsed beyond the small header.  The artifact's metadata is available as
+    ``network.metadata``.
+
+    Returns a :class:`neat.nn.VectorizedFeedForwardNetwork` or
+    :class:`neat.nn.vectorized.VectorizedRecurrentNetwork`.
+    """
+    import json
+
+    import numpy as np
+    from neat.nn.vectorized import VectorizedFeedForwardNetwork, VectorizedRecurrentNetwork
+
+    arrays = _map_npz_members(filepath) if mmap else None
+    if arrays is None:
+        with np.load(filepath, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+
+    required = ['header', 'node_keys', 'output_nodes', 'initial_values', 'bias', 'response',
+                'activation_ids', 'aggregation_ids', 'edge_offsets', 'edge_sources',
+                'edge_weights', 'layer_offsets', 'output_slots']
+    missing = [name for name in required if name not in arrays]
+    if missing:
+        raise ValueError(f"Missing arrays in network artifact: {', '.join(missing)}")
+
+    header = json.loads(str(arrays['header']))
+    if header.get('network_type') not in ('feedforward', 'recurrent'):
+        raise ValueError(f"Invalid network_type: {header.get('network_type')}")
+    custom = {}
+    for name in header.get('custom_activations', []):
+        if not custom_activations or name not in custom_activations:
+            raise ValueError(f"Network uses custom activation function {name!r}; "
+                             f"pass it in custom_activations")
+        custom[name] = custom_activations[name]
+
+    node_keys = arrays['node_keys'].tolist()
+    num_inputs = header['num_inputs']
+    cls = VectorizedRecurrentNetwork if header['network_type'] == 'recurrent' else VectorizedFeedForwardNetwork
+    network = cls(node_keys[:num_inputs], arrays['output_nodes'].tolist(), node_keys,
+                  arrays['initial_values'], arrays['bias'], arrays['response'],
+                  arrays['activation_ids'], arrays['aggregation_ids'],
+                  arrays['edge_offsets'], arrays['edge_sources'], arrays['edge_weights'],
+                  arrays['layer_offsets'], arrays['output_slots'],
+                  header['activation_names'], header['aggregation_names'],
+                  activation_functions=custom, simplified=header.get('simplified', False))
+    network.metadata = header.get('metadata', {})
+    return network
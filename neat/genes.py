@@ -6,18 +6,72 @@ from neat.attributes import FloatAttribute, BoolAttribute, StringAttribute
 
 
 # TODO: There is probably a lot of room for simplification of these classes using metaprogramming.
-# TODO: Evaluate using __slots__ for performance/memory usage improvement.
 
 
-class BaseGene:
+class GeneMeta(type):
+    """
+    Gives gene classes a fixed attribute layout.
+
+    A class that defines ``_gene_attributes`` gets a ``__slots__`` entry for
+    each gene attribute not already stored by a base class, in addition to any
+    ``__slots__`` it declares itself.  Its instances also keep a ``__dict__``
+    for other attributes, unless the class sets ``_slots_only = True`` in its
+    own body, as the built-in gene classes do; instances then have no
+    ``__dict__`` and other instance attributes must be declared in
+    ``__slots__``.  Classes that don't define ``_gene_attributes`` are created
+    unchanged.
+    """
+
+    def __new__(mcs, name, bases, namespace, **kwargs):
+        attributes = namespace.get('_gene_attributes', namespace.get('__gene_attributes__'))
+        if attributes is not None:
+            declared = namespace.get('__slots__', ())
+            declared = (declared,) if isinstance(declared, str) else tuple(declared)
+            inherited = set()
+            for base in bases:
+                inherited.update(getattr(base, '_slot_names', ()))
+            slots = declared + tuple(a.name for a in attributes
+                                     if a.name not in inherited and a.name not in declared)
+            if not namespace.get('_slots_only', False) and '__dict__' not in slots \
+                    and not any(base.__dictoffset__ for base in bases):
+                slots += ('__dict__',)
+            namespace['__slots__'] = slots
+        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
+
+        slot_names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            for slot in (slots,) if isinstance(slots, str) else slots:
+                if slot not in slot_names and slot not in ('__dict__', '__weakref__'):
+                    slot_names.append(slot)
+        cls._slot_names = tuple(slot_names)
+        return cls
+
+
+class BaseGene(metaclass=GeneMeta):
     """
     Handles functions shared by multiple types of genes (both node and connection),
     including crossover and calling mutation methods.
     """
+    __slots__ = ('key',)
 
     def __init__(self, key):
         self.key = key
 
+    def __getstate__(self):
+        state = {}
+        for name in self._slot_names:
+            if hasattr(self, name):
+                state[name] = getattr(self, name)
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        # Also restores genes pickled before gene classes had slots, whose
+        # state is their instance __dict__.
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __str__(self):
         attrib = ['key']
         if hasattr(self, 'innovation'):
@@ -52,69 +106,225 @@ class BaseGene:
             a.validate(config)
 
     def init_attributes(self, config):
+        kernels = GeneKernels.get(self.__class__, config)
+        if kernels is not None:
+            kernels.init_attributes(self)
+            return
         for a in self._gene_attributes:
             setattr(self, a.name, a.init_value(config))
 
     def mutate(self, config):
+        kernels = GeneKernels.get(self.__class__, config)
+        if kernels is not None:
+            kernels.mutate(self)
+            return
         for a in self._gene_attributes:
             v = getattr(self, a.name)
             setattr(self, a.name, a.mutate_value(v, config))
 
-    def copy(self):
-        # Handle innovation number for connection genes
-        if hasattr(self, 'innovation'):
-            new_gene = self.__class__(self.key, innovation=self.innovation)
-        else:
-            new_gene = self.__class__(self.key)
-        
-        for a in self._gene_attributes:
-            setattr(new_gene, a.name, getattr(self, a.name))
-
+    def mutated(self, config):
+        """
+        Returns the result of mutating a copy of this gene, leaving this gene
+        unchanged.  Returns this gene itself if the mutation changes nothing,
+        so genes shared between genomes are only copied when they change.
+        """
+        if type(self).mutate is BaseGene.mutate:
+            kernels = GeneKernels.get(self.__class__, config)
+            if kernels is not None:
+                return kernels.mutated(self)
+        new_gene = self.copy()
+        new_gene.mutate(config)
         return new_gene
 
+    def copy(self):
+        return _class_kernels(self.__class__).copy(self)
+
     def crossover(self, gene2):
         """ Creates a new gene randomly inheriting attributes from its parents."""
-        assert self.key == gene2.key
-        
-        # For connection genes, verify innovation numbers match
-        # (they should represent the same historical mutation)
-        if hasattr(self, 'innovation'):
-            assert hasattr(gene2, 'innovation'), "Both genes must have innovation numbers"
-            assert self.innovation == gene2.innovation, (
-                f"Genes with same key must have same innovation number: "
-                f"{self.innovation} vs {gene2.innovation}"
-            )
-
-        # Note: we use "a if random() > 0.5 else b" instead of choice((a, b))
-        # here because `choice` is substantially slower.
-        if hasattr(self, 'innovation'):
-            new_gene = self.__class__(self.key, innovation=self.innovation)
-        else:
-            new_gene = self.__class__(self.key)
-        
-        for a in self._gene_attributes:
-            if random() > 0.5:
-                setattr(new_gene, a.name, getattr(self, a.name))
-            else:
-                setattr(new_gene, a.name, getattr(gene2, a.name))
-        
-        # 75% disable rule from NEAT paper (Stanley & Miikkulainen, 2002, p. 111):
-        # "There was a 75% chance that an inherited gene was disabled if it was
-        # disabled in either parent."
-        # This rule REPLACES the randomly-inherited enabled attribute when either
-        # parent has the gene disabled.
-        if hasattr(new_gene, 'enabled'):
-            if not self.enabled or not gene2.enabled:
-                # Override whatever was randomly inherited: 75% disabled, 25% enabled.
-                new_gene.enabled = random() >= 0.75
+        return _class_kernels(self.__class__).crossover(self, gene2)
+
+    def shared_crossover(self, gene2):
+        """
+        As crossover, drawing the same random numbers, but returns one of the
+        two parent genes itself when the new gene would be identical to it.
+        """
+        if type(self).crossover is BaseGene.crossover:
+            return _class_kernels(self.__class__).shared_crossover(self, gene2)
+        return self.crossover(gene2)
+
+
+# Source of the gene operations generated for each gene class, with one line
+# per gene attribute in place of a loop over ``_gene_attributes``.
+#
+# In crossover, we use "a if random() > 0.5 else b" instead of choice((a, b))
+# because `choice` is substantially slower.  The 75% disable rule from the NEAT
+# paper (Stanley & Miikkulainen, 2002, p. 111): "There was a 75% chance that an
+# inherited gene was disabled if it was disabled in either parent." This rule
+# REPLACES the randomly-inherited enabled attribute when either parent has the
+# gene disabled: 75% disabled, 25% enabled.
+#
+# init_attributes and mutate draw the same random numbers in the same order as
+# the loops over ``a.init_value(config)`` and ``a.mutate_value(v, config)``.
+_CLASS_KERNELS_SOURCE = """
+def copy(self):
+{new_gene}
+{copy}
+    return new_gene
 
+def crossover(self, gene2):
+{checks}
+{new_gene}
+{crossover}
+{disable}
+    return new_gene
+
+def shared_crossover(self, gene2):
+{checks}
+{choose}
+{choose_disable}
+    if {same_as_self}:
+        return self
+    if {same_as_gene2}:
+        return gene2
+{new_gene}
+{assign}
+    return new_gene
+
+def bind(initializers, mutators):
+    {unpack}
+
+    def init_attributes(gene):
+{init}
+
+    def mutate(gene):
+{mutate}
+
+    def mutated(gene):
+{mutated}
+        if {unchanged}:
+            return gene
+        new_gene = copy(gene)
+{assign_mutated}
         return new_gene
 
+    return init_attributes, mutate, mutated
+"""
+
+_NEW_GENE_SOURCE = """\
+    if hasattr(self, 'innovation'):
+        new_gene = cls(self.key, innovation=self.innovation)
+    else:
+        new_gene = cls(self.key)"""
+
+_CHECKS_SOURCE = """\
+    assert self.key == gene2.key
+    # For connection genes, verify innovation numbers match
+    # (they should represent the same historical mutation)
+    if hasattr(self, 'innovation'):
+        assert hasattr(gene2, 'innovation'), "Both genes must have innovation numbers"
+        assert self.innovation == gene2.innovation, (
+            f"Genes with same key must have same innovation number: "
+            f"{self.innovation} vs {gene2.innovation}"
+        )"""
+
+
+class _ClassKernels:
+    """The configuration-independent generated operations of one gene class."""
+
+    def __init__(self, gene_type):
+        names = [a.name for a in gene_type._gene_attributes]
+        if not all(name.isidentifier() for name in names):
+            raise ValueError(f"{gene_type.__name__} gene attribute names must be identifiers: {names!r}")
+        if 'enabled' in names:
+            disable = "    if not self.enabled or not gene2.enabled:\n        new_gene.enabled = random() >= 0.75"
+        else:
+            disable = ("    if hasattr(new_gene, 'enabled') and (not self.enabled or not gene2.enabled):\n"
+                       "        new_gene.enabled = random() >= 0.75")
+
+        def lines(template, indent=4):
+            return '\n'.join(' ' * indent + template.format(n=n) for n in names) or ' ' * indent + 'pass'
+
+        source = _CLASS_KERNELS_SOURCE.format(
+            new_gene=_NEW_GENE_SOURCE,
+            checks=_CHECKS_SOURCE,
+            copy=lines("new_gene.{n} = self.{n}"),
+            crossover=lines("new_gene.{n} = self.{n} if random() > 0.5 else gene2.{n}"),
+            disable=disable,
+            choose=lines("value_{n} = self.{n} if random() > 0.5 else gene2.{n}"),
+            choose_disable=disable.replace('new_gene.enabled', 'value_enabled') if 'enabled' in names else '',
+            same_as_self=' and '.join(f"value_{n} is self.{n}" for n in names) or 'True',
+            same_as_gene2=' and '.join(f"value_{n} is gene2.{n}" for n in names) or 'True',
+            assign=lines("new_gene.{n} = value_{n}"),
+            unpack=(', '.join(f'init_{n}' for n in names) + ', = initializers\n    '
+                    + ', '.join(f'mutate_{n}' for n in names) + ', = mutators') if names else 'pass',
+            init=lines("gene.{n} = init_{n}()", 8),
+            mutate=lines("gene.{n} = mutate_{n}(gene.{n})", 8),
+            mutated=lines("value_{n} = mutate_{n}(gene.{n})", 8),
+            unchanged=' and '.join(f"value_{n} is gene.{n}" for n in names) or 'True',
+            assign_mutated=lines("new_gene.{n} = value_{n}", 8))
+        namespace = {'cls': gene_type, 'random': random}
+        exec(compile(source, f'<{gene_type.__name__} kernels>', 'exec'), namespace)
+        self.attributes = list(gene_type._gene_attributes)
+        self.copy = namespace['copy']
+        self.crossover = namespace['crossover']
+        # Without an 'enabled' attribute the disable rule can't be applied to a shared gene.
+        self.shared_crossover = namespace['shared_crossover'] if 'enabled' in names or not hasattr(
+            gene_type, 'enabled') else self.crossover
+        self.bind = namespace['bind']
+
+
+def _class_kernels(gene_type):
+    kernels = gene_type.__dict__.get('_kernels')
+    if kernels is None:
+        kernels = _ClassKernels(gene_type)
+        # Stored in the class's own namespace, so that subclasses build their own.
+        gene_type._kernels = kernels
+    return kernels
+
+
+class GeneKernels:
+    """
+    The attribute operations of one gene class, specialized for one genome
+    configuration.
+
+    ``init_attributes(gene)``, ``mutate(gene)`` and ``mutated(gene)`` do what
+    the BaseGene methods of the same names do, drawing the same random numbers
+    in the same order,
+    but with each attribute's configuration values looked up once, when the
+    kernels are built, and with the loop over ``_gene_attributes`` unrolled.
+    ``mutators`` holds the per-attribute functions returned by
+    :meth:`neat.attributes.BaseAttribute.mutator`.
+    """
+
+    def __init__(self, gene_type, config):
+        class_kernels = _class_kernels(gene_type)
+        self.gene_type = gene_type
+        self.initializers = [a.initializer(config) for a in class_kernels.attributes]
+        self.mutators = [a.mutator(config) for a in class_kernels.attributes]
+        self.init_attributes, self.mutate, self.mutated = class_kernels.bind(self.initializers, self.mutators)
+
+    @staticmethod
+    def get(gene_type, config):
+        """
+        The kernels of ``gene_type`` for ``config``, built on first use.  Returns
+        None for configuration objects that don't keep a kernel cache (see
+        :class:`neat.genome.DefaultGenomeConfig`), since the kernels would not
+        see later changes to their values.
+        """
+        cache = getattr(config, '_gene_kernels', None)
+        if cache is None:
+            return None
+        kernels = cache.get(gene_type)
+        if kernels is None:
+            kernels = cache[gene_type] = GeneKernels(gene_type, config)
+        return kernels
+
 
 # TODO: Should these be in the nn module?  iznn and ctrnn can have additional attributes.
 
 
 class DefaultNodeGene(BaseGene):
+    _slots_only = True
     _gene_attributes = [FloatAttribute('bias'),
                         FloatAttribute('response'),
                         StringAttribute('activation', options=''),
@@ -146,6 +356,8 @@ class DefaultNodeGene(BaseGene):
 # `product` aggregation function is rather more important than one giving
 # an output of 1 from the connection, for instance!)
 class DefaultConnectionGene(BaseGene):
+    __slots__ = ('innovation',)
+    _slots_only = True
     _gene_attributes = [FloatAttribute('weight'),
                         BoolAttribute('enabled')]
 
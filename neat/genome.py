@@ -1,6 +1,7 @@
 """Handles genomes (individuals in the population)."""
 import copy
 import sys
+from collections import Counter
 from itertools import count
 from random import choice, random, shuffle
 
@@ -8,9 +9,38 @@ from neat.activations import ActivationFunctionSet
 from neat.aggregations import AggregationFunctionSet
 from neat.config import ConfigParameter, write_pretty_params
 from neat.genes import DefaultConnectionGene, DefaultNodeGene
-from neat.graphs import creates_cycle
+from neat.graphs import creates_cycle, descendants, reaches, successors
 from neat.graphs import required_for_output
 
+# Random (input, output) pairs tried by conn_add_sampling = legal before it
+# lists all legal new connections.
+_LEGAL_CONNECTION_TRIES = 16
+
+
+class StructuralMutationCounts:
+    """
+    Numbers of attempted and successful structural mutations, by kind
+    ('add_node', 'delete_node', 'add_connection' and 'delete_connection').
+    A mutation succeeds if it changes the genome's set of nodes or connections.
+    """
+
+    def __init__(self):
+        self.attempted = Counter()
+        self.successful = Counter()
+
+    def record(self, kind, success):
+        self.attempted[kind] += 1
+        if success:
+            self.successful[kind] += 1
+
+    def success_rate(self, kind):
+        """The fraction of the attempted mutations of ``kind`` that succeeded (0.0 if there were none)."""
+        attempted = self.attempted[kind]
+        return self.successful[kind] / attempted if attempted else 0.0
+
+    def __repr__(self):
+        return ', '.join(f"{kind} {self.successful[kind]}/{attempted}" for kind, attempted in self.attempted.items())
+
 
 class DefaultGenomeConfig:
     """Sets up and holds configuration information for the DefaultGenome class."""
@@ -37,10 +67,12 @@ class DefaultGenomeConfig:
                         ConfigParameter('node_delete_prob', float),
                         ConfigParameter('single_structural_mutation', bool, 'false'),
                         ConfigParameter('structural_mutation_surer', str, 'default'),
+                        ConfigParameter('conn_add_sampling', str, 'random_pair'),
                         ConfigParameter('initial_connection', str, 'unconnected'),
                         ConfigParameter('compatibility_excess_coefficient', str, 'auto'),
                         ConfigParameter('compatibility_include_node_genes', bool, True),
-                        ConfigParameter('compatibility_enable_penalty', float, 1.0)]
+                        ConfigParameter('compatibility_enable_penalty', float, 1.0),
+                        ConfigParameter('copy_on_write_genes', bool, False)]
 
         # Gather configuration data from the gene classes.
         self.node_gene_type = params['node_gene_type']
@@ -86,12 +118,29 @@ class DefaultGenomeConfig:
             error_string = f"Invalid structural_mutation_surer {self.structural_mutation_surer!r}"
             raise RuntimeError(error_string)
 
+        if self.conn_add_sampling not in ('random_pair', 'legal'):
+            raise RuntimeError(f"Invalid conn_add_sampling {self.conn_add_sampling!r}")
+
         self.node_indexer = None
         
         # Innovation tracker will be set by Population/Reproduction
         # This enables same-generation deduplication per NEAT paper (Stanley & Miikkulainen, 2002)
         self.innovation_tracker = None
 
+        # Attempted and successful structural mutations of all genomes.
+        self.structural_mutations = StructuralMutationCounts()
+
+        # Gene operations specialized for this configuration, by gene class
+        # (see neat.genes.GeneKernels).  Emptied whenever a setting changes.
+        self._gene_kernels = {}
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name not in ('node_indexer', 'innovation_tracker', 'structural_mutations'):
+            kernels = self.__dict__.get('_gene_kernels')
+            if kernels:
+                kernels.clear()
+
     def add_activation(self, name, func):
         self.activation_defs.add(name, func)
 
@@ -140,6 +189,8 @@ class DefaultGenomeConfig:
     def __getstate__(self):
         """Prepare config for pickling by converting node_indexer to a picklable form."""
         state = self.__dict__.copy()
+        # The gene kernels hold generated functions; they are rebuilt on demand.
+        del state['_gene_kernels']
         # Convert the itertools.count object to an integer representing the next value
         # We peek at the value by calling next() and storing it, then the counter advances
         if self.node_indexer is not None:
@@ -156,6 +207,7 @@ class DefaultGenomeConfig:
         """Restore config from pickled state, recreating node_indexer."""
         _node_indexer_next_value = state.pop('_node_indexer_next_value', None)
         self.__dict__.update(state)
+        self._gene_kernels = {}
         # Recreate the count object starting from the saved next value
         if _node_indexer_next_value is not None:
             # Recreate counter starting from the value we saved
@@ -186,6 +238,10 @@ class DefaultGenome:
         4. The input values are applied to the input pins unmodified.
     """
 
+    # Number of calls to mutate, by which caches tell that a genome was
+    # changed in place (see neat.species.GenomeDistanceCache).
+    mutation_count = 0
+
     @classmethod
     def parse_config(cls, param_dict):
         param_dict['node_gene_type'] = DefaultNodeGene
@@ -223,12 +279,22 @@ class DefaultGenome:
                 self.nodes[node_key] = node
 
         # Add connections based on initial connectivity type.
+        method = self._initial_connection_method(config)
+        if method is not None:
+            getattr(self, method)(config)
 
+    @staticmethod
+    def _initial_connection_method(config):
+        """
+        The name of the ``connect_*`` method that adds the initial connections
+        for ``config.initial_connection``, or None if there are none.  Warns
+        about settings whose meaning depends on whether there are hidden nodes.
+        """
         if 'fs_neat' in config.initial_connection:
             if config.initial_connection == 'fs_neat_nohidden':
-                self.connect_fs_neat_nohidden(config)
+                return 'connect_fs_neat_nohidden'
             elif config.initial_connection == 'fs_neat_hidden':
-                self.connect_fs_neat_hidden(config)
+                return 'connect_fs_neat_hidden'
             else:
                 if config.num_hidden > 0:
                     print(
@@ -236,12 +302,12 @@ class DefaultGenome:
                         "\tif this is desired, set initial_connection = fs_neat_nohidden;",
                         "\tif not, set initial_connection = fs_neat_hidden",
                         sep='\n', file=sys.stderr)
-                self.connect_fs_neat_nohidden(config)
+                return 'connect_fs_neat_nohidden'
         elif 'full' in config.initial_connection:
             if config.initial_connection == 'full_nodirect':
-                self.connect_full_nodirect(config)
+                return 'connect_full_nodirect'
             elif config.initial_connection == 'full_direct':
-                self.connect_full_direct(config)
+                return 'connect_full_direct'
             else:
                 if config.num_hidden > 0:
                     print(
@@ -249,12 +315,12 @@ class DefaultGenome:
                         "\tif this is desired, set initial_connection = full_nodirect;",
                         "\tif not, set initial_connection = full_direct",
                         sep='\n', file=sys.stderr)
-                self.connect_full_nodirect(config)
+                return 'connect_full_nodirect'
         elif 'partial' in config.initial_connection:
             if config.initial_connection == 'partial_nodirect':
-                self.connect_partial_nodirect(config)
+                return 'connect_partial_nodirect'
             elif config.initial_connection == 'partial_direct':
-                self.connect_partial_direct(config)
+                return 'connect_partial_direct'
             else:
                 if config.num_hidden > 0:
                     print(
@@ -262,7 +328,31 @@ class DefaultGenome:
                         f"\tif this is desired, set initial_connection = partial_nodirect {config.connection_fraction};",
                         f"\tif not, set initial_connection = partial_direct {config.connection_fraction}",
                         sep='\n', file=sys.stderr)
-                self.connect_partial_nodirect(config)
+                return 'connect_partial_nodirect'
+        return None
+
+    def configure_from_columns(self, config, nodes, connections):
+        """
+        Configure a new genome from gene values given column-wise, as
+        :mod:`neat.bulk_initialization` does.  ``nodes`` is a pair of the node
+        keys and a dict mapping each node gene attribute name to a list of
+        values, one per key; ``connections`` is a triple of the connection
+        keys, their innovation numbers and a dict of attribute values.
+        """
+        node_keys, node_values = nodes
+        genes = [config.node_gene_type(key) for key in node_keys]
+        for name, values in node_values.items():
+            for gene, value in zip(genes, values):
+                setattr(gene, name, value)
+        self.nodes.update(zip(node_keys, genes))
+
+        connection_keys, innovations, connection_values = connections
+        connection_type = config.connection_gene_type
+        genes = [connection_type(key, innovation=innovation) for key, innovation in zip(connection_keys, innovations)]
+        for name, values in connection_values.items():
+            for gene, value in zip(genes, values):
+                setattr(gene, name, value)
+        self.connections.update(zip(connection_keys, genes))
 
     def configure_crossover(self, genome1, genome2, config, fitness_criterion=None):
         """
@@ -276,7 +366,15 @@ class DefaultGenome:
 
         *fitness_criterion* controls which parent is considered fitter.
         When 'min', lower fitness is better.  Defaults to 'max' if not provided.
+
+        With ``copy_on_write_genes`` enabled, inherited genes that crossover
+        leaves unchanged are shared with the parent instead of copied.
         """
+        if genome1 is genome2:
+            self._configure_clone(genome1, config)
+            return
+
+        share = config.copy_on_write_genes
         if fitness_criterion == 'min':
             better = genome1.fitness < genome2.fitness
         else:
@@ -291,10 +389,7 @@ class DefaultGenome:
         parent1_innovations = {cg.innovation: cg for cg in parent1.connections.values()}
         parent2_innovations = {cg.innovation: cg for cg in parent2.connections.values()}
         
-        # Get all innovation numbers from both parents
-        all_innovations = set(parent1_innovations.keys()) | set(parent2_innovations.keys())
-        
-        for innovation_num in all_innovations:
+        for innovation_num in self._crossover_order(parent1_innovations, parent2_innovations):
             cg1 = parent1_innovations.get(innovation_num)
             cg2 = parent2_innovations.get(innovation_num)
             
@@ -311,20 +406,20 @@ class DefaultGenome:
                         RuntimeWarning
                     )
                     # Take the gene from the fitter parent
-                    new_gene = cg1.copy()
+                    new_gene = cg1 if share else cg1.copy()
                     # For feed-forward networks, check if this connection would create a cycle
                     if config.feed_forward and creates_cycle(list(self.connections), new_gene.key):
                         continue
                     self.connections[new_gene.key] = new_gene
                 else:
-                    new_gene = cg1.crossover(cg2)
+                    new_gene = cg1.shared_crossover(cg2) if share else cg1.crossover(cg2)
                     # For feed-forward networks, check if this connection would create a cycle
                     if config.feed_forward and creates_cycle(list(self.connections), new_gene.key):
                         continue
                     self.connections[new_gene.key] = new_gene
             elif cg1 is not None:
                 # Disjoint or excess gene from fittest parent (parent1)
-                new_gene = cg1.copy()
+                new_gene = cg1 if share else cg1.copy()
                 # For feed-forward networks, check if this connection would create a cycle
                 if config.feed_forward and creates_cycle(list(self.connections), new_gene.key):
                     continue
@@ -340,48 +435,115 @@ class DefaultGenome:
             assert key not in self.nodes
             if ng2 is None:
                 # Extra gene: copy from the fittest parent
-                self.nodes[key] = ng1.copy()
+                self.nodes[key] = ng1 if share else ng1.copy()
             else:
                 # Homologous gene: combine genes from both parents.
-                self.nodes[key] = ng1.crossover(ng2)
+                self.nodes[key] = ng1.shared_crossover(ng2) if share else ng1.crossover(ng2)
+
+    @staticmethod
+    def _crossover_order(parent1_innovations, parent2_innovations):
+        """
+        The innovation numbers of both parents' connection genes, in the order
+        crossover inherits them: that of the union of the two sets, which can
+        differ from the order of either set, even for identical parents.
+        The sets are built from the keys views: a set built from a dict sizes
+        its table differently, and so iterates in another order.
+        """
+        return set(parent1_innovations.keys()) | set(parent2_innovations.keys())
+
+    def _configure_clone(self, parent, config):
+        """
+        Crossover of ``parent`` with itself: the same genes, random numbers and
+        gene order as the general case, without lining up two gene sets or
+        checking for cycles (the parent's connections have none).
+        """
+        share = config.copy_on_write_genes
+        innovations = {cg.innovation: cg for cg in parent.connections.values()}
+        for innovation_num in self._crossover_order(innovations, innovations):
+            cg = innovations[innovation_num]
+            new_gene = cg.shared_crossover(cg) if share else cg.crossover(cg)
+            self.connections[new_gene.key] = new_gene
+
+        for key, ng in parent.nodes.items():
+            self.nodes[key] = ng.shared_crossover(ng) if share else ng.crossover(ng)
+
+    def mutate(self, config, attributes=True):
+        """
+        Mutates this genome.  With ``copy_on_write_genes`` enabled, genes are
+        never changed in place: a mutated gene replaces the original with a
+        changed copy, so genes may be shared with other genomes.
+
+        With ``attributes`` False, only the structural mutations are applied;
+        reproduction then mutates the gene attributes of all offspring at once
+        (see :mod:`neat.vectorized_mutation`).
+        """
+        self.mutation_count += 1
+        self._mutate_structure(config)
+        if not attributes:
+            return
+
+        if config.copy_on_write_genes:
+            connections = self.connections
+            for key, cg in connections.items():
+                connections[key] = cg.mutated(config)
+            nodes = self.nodes
+            for key, ng in nodes.items():
+                nodes[key] = ng.mutated(config)
+            return
+
+        # Mutate connection genes.
+        for cg in self.connections.values():
+            cg.mutate(config)
+
+        # Mutate node genes (bias, response, etc.).
+        for ng in self.nodes.values():
+            ng.mutate(config)
 
-    def mutate(self, config):
-        """ Mutates this genome. """
+    def _own_connection(self, key, config):
+        """The connection gene ``key``, first replaced by a copy if genes are shared."""
+        cg = self.connections[key]
+        if config.copy_on_write_genes:
+            cg = self.connections[key] = cg.copy()
+        return cg
 
+    def _mutate_structure(self, config):
+        """Apply the structural (add/delete node/connection) part of a mutation."""
         if config.single_structural_mutation:
             div = max(1, (config.node_add_prob + config.node_delete_prob +
                           config.conn_add_prob + config.conn_delete_prob))
             r = random()
             if r < (config.node_add_prob / div):
-                self.mutate_add_node(config)
+                self._attempt_structural_mutation('add_node', self.mutate_add_node, config)
             elif r < ((config.node_add_prob + config.node_delete_prob) / div):
-                self.mutate_delete_node(config)
+                self._attempt_structural_mutation('delete_node', self.mutate_delete_node, config)
             elif r < ((config.node_add_prob + config.node_delete_prob +
                        config.conn_add_prob) / div):
-                self.mutate_add_connection(config)
+                self._attempt_structural_mutation('add_connection', self.mutate_add_connection, config)
             elif r < ((config.node_add_prob + config.node_delete_prob +
                        config.conn_add_prob + config.conn_delete_prob) / div):
-                self.mutate_delete_connection(config)
+                self._attempt_structural_mutation('delete_connection', self.mutate_delete_connection, config)
         else:
             if random() < config.node_add_prob:
-                self.mutate_add_node(config)
+                self._attempt_structural_mutation('add_node', self.mutate_add_node, config)
 
             if random() < config.node_delete_prob:
-                self.mutate_delete_node(config)
+                self._attempt_structural_mutation('delete_node', self.mutate_delete_node, config)
 
             if random() < config.conn_add_prob:
-                self.mutate_add_connection(config)
+                self._attempt_structural_mutation('add_connection', self.mutate_add_connection, config)
 
             if random() < config.conn_delete_prob:
-                self.mutate_delete_connection(config)
-
-        # Mutate connection genes.
-        for cg in self.connections.values():
-            cg.mutate(config)
+                self._attempt_structural_mutation('delete_connection', self.mutate_delete_connection, config)
 
-        # Mutate node genes (bias, response, etc.).
-        for ng in self.nodes.values():
-            ng.mutate(config)
+    def _attempt_structural_mutation(self, kind, mutation, config):
+        """Apply ``mutation`` and count it in ``config.structural_mutations``, if present."""
+        counts = getattr(config, 'structural_mutations', None)
+        if counts is None:
+            mutation(config)
+            return
+        sizes = len(self.nodes), len(self.connections)
+        mutation(config)
+        counts.record(kind, (len(self.nodes), len(self.connections)) != sizes)
 
     def mutate_add_node(self, config):
         """
@@ -434,6 +596,7 @@ class DefaultGenome:
         # Disable this connection and create two new connections joining its nodes via
         # the given node.  The new node+connections have roughly the same behavior as
         # the original connection (depending on the activation function of the new node).
+        conn_to_split = self._own_connection(conn_to_split.key, config)
         conn_to_split.enabled = False
 
         # Add the two new connections with their innovation numbers
@@ -476,7 +639,11 @@ class DefaultGenome:
             "Innovation tracker must be set before genome mutations. "
             "This should be set by the reproduction module."
         )
-        
+
+        if getattr(config, 'conn_add_sampling', 'random_pair') == 'legal':
+            self._mutate_add_legal_connection(config)
+            return
+
         possible_outputs = list(self.nodes)
         out_node = choice(possible_outputs)
 
@@ -488,7 +655,7 @@ class DefaultGenome:
         if key in self.connections:
             # TODO: Should this be using mutation to/from rates? Hairy to configure...
             if config.check_structural_mutation_surer():
-                self.connections[key].enabled = True
+                self._own_connection(key, config).enabled = True
             return
 
         # Don't allow connections between two output nodes
@@ -510,6 +677,80 @@ class DefaultGenome:
         cg = self.create_connection(config, in_node, out_node, innovation)
         self.connections[cg.key] = cg
 
+    def _mutate_add_legal_connection(self, config):
+        """
+        Add a connection drawn uniformly from the new connections that
+        mutate_add_connection could add, failing only if there are none.
+
+        As in mutate_add_connection, with structural_mutation_surer in effect
+        a drawn pair that is a disabled connection is re-enabled instead.
+        """
+        surer = config.check_structural_mutation_surer()
+        possible_outputs = list(self.nodes)
+        graph = successors(self.connections) if config.feed_forward else None
+        key = self._sample_new_connection(config, possible_outputs, graph, reenable=surer)
+        if key is None:
+            if self.connections and surer:
+                self._own_connection(choice(list(self.connections)), config).enabled = True
+            return
+        if key in self.connections:
+            self._own_connection(key, config).enabled = True
+            return
+
+        in_node, out_node = key
+        innovation = config.innovation_tracker.get_innovation_number(
+            in_node, out_node, 'add_connection'
+        )
+        cg = self.create_connection(config, in_node, out_node, innovation)
+        self.connections[cg.key] = cg
+
+    def _sample_new_connection(self, config, possible_outputs, graph, reenable=False):
+        """
+        A uniformly chosen (input, output) pair that is not yet a connection,
+        does not join two output nodes and, for feed-forward networks, does not
+        create a cycle; None if there is no such pair.
+
+        ``possible_outputs`` is ``list(self.nodes)`` and ``graph`` is
+        ``successors(self.connections)`` for feed-forward networks (None
+        otherwise), built once by the caller.
+
+        Pairs are drawn as in mutate_add_connection until one is legal (the
+        cycle check only searches the nodes reachable from the output node)
+        or, after a few tries, all legal pairs are listed.  With ``reenable``,
+        a drawn pair that is a disabled connection is returned as well.
+        """
+        if not possible_outputs:
+            return None
+        output_keys = set(config.output_keys)
+        possible_inputs = config.input_keys + [k for k in possible_outputs if k not in output_keys]
+        connections = self.connections
+        feed_forward = config.feed_forward
+
+        for _ in range(_LEGAL_CONNECTION_TRIES):
+            in_node, out_node = choice(possible_inputs), choice(possible_outputs)
+            cg = connections.get((in_node, out_node))
+            if cg is not None:
+                if reenable and not cg.enabled:
+                    return in_node, out_node
+                continue
+            if in_node in output_keys and out_node in output_keys:
+                continue
+            if feed_forward and reaches(graph, out_node, in_node):
+                continue
+            return in_node, out_node
+
+        # Few of the pairs are legal: list them all.
+        legal = []
+        for out_node in possible_outputs:
+            excluded = descendants(graph, out_node) if feed_forward else ()
+            for in_node in possible_inputs:
+                if (in_node, out_node) in connections or in_node in excluded:
+                    continue
+                if in_node in output_keys and out_node in output_keys:
+                    continue
+                legal.append((in_node, out_node))
+        return choice(legal) if legal else None
+
     def mutate_delete_node(self, config):
         # Do nothing if there are no non-output nodes.
         available_nodes = [k for k in self.nodes if k not in config.output_keys]
@@ -568,6 +809,72 @@ class DefaultGenome:
             for conn_key in connections_to_remove:
                 del self.connections[conn_key]
 
+    def expressed_connections(self, config):
+        """
+        Returns the keys of the connections that can affect an output: the
+        enabled connections into nodes required for output.
+        """
+        enabled = [key for key, cg in self.connections.items() if cg.enabled]
+        required = required_for_output(config.input_keys, config.output_keys, enabled)
+        return {key for key in enabled if key[1] in required}
+
+    def fingerprint(self, config, digits=6):
+        """
+        Returns a hashable fingerprint of the network this genome expresses:
+        the output nodes and the other nodes of :meth:`expressed_connections`,
+        and those connections, with their keys and attributes (floats rounded
+        to ``digits`` decimal places).  Genomes with the same fingerprint give
+        the same network up to that rounding, whatever their unexpressed genes.
+        """
+        expressed = sorted(self.expressed_connections(config))
+        input_keys = set(config.input_keys)
+        node_keys = set(config.output_keys)
+        node_keys.update(k for key in expressed for k in key if k not in input_keys)
+
+        def attributes(gene, names):
+            values = []
+            for name in names:
+                value = getattr(gene, name)
+                values.append(round(value, digits) if isinstance(value, float) else value)
+            return tuple(values)
+
+        node_names = [a.name for a in config.node_gene_type._gene_attributes]
+        connection_names = [a.name for a in config.connection_gene_type._gene_attributes if a.name != 'enabled']
+        nodes = tuple((key, attributes(self.nodes[key], node_names)) for key in sorted(node_keys))
+        connections = tuple((key, attributes(self.connections[key], connection_names)) for key in expressed)
+        return nodes, connections
+
+    def compact_genes(self, config, innovations, expressed=None):
+        """
+        Removes the connection genes with innovation numbers in ``innovations``
+        that this genome does not express (``expressed``, by default
+        :meth:`expressed_connections`), and then the hidden nodes left without
+        any connection by their removal.  Hidden nodes that had no connection
+        to begin with (such as one just added and not yet connected) are kept.
+        The network's outputs do not change.
+
+        Returns the numbers of node and connection genes removed.
+        """
+        if expressed is None:
+            expressed = self.expressed_connections(config)
+        removed = [key for key, cg in self.connections.items()
+                   if cg.innovation in innovations and key not in expressed]
+        for key in removed:
+            del self.connections[key]
+
+        endpoints = {node for key in removed for node in key}
+        if endpoints:
+            connected = {node for key in self.connections for node in key}
+            output_keys = set(config.output_keys)
+            unconnected = [key for key in endpoints
+                           if key in self.nodes and key not in output_keys and key not in connected]
+        else:
+            unconnected = []
+        for key in unconnected:
+            del self.nodes[key]
+
+        return len(unconnected), len(removed)
+
     def distance(self, other, config):
         """
         Returns the genetic distance between this genome and the other. This distance value
@@ -25,6 +25,42 @@ def creates_cycle(connections, test):
             return False
 
 
+def successors(connections):
+    """Returns a dict mapping each node to the list of nodes its connections in 'connections' lead to."""
+    result = defaultdict(list)
+    for a, b in connections:
+        result[a].append(b)
+    return result
+
+
+def reaches(successors, start, target):
+    """Returns true if there is a path from 'start' to 'target' in the graph given by 'successors'."""
+    if start == target:
+        return True
+    visited = {start}
+    stack = [start]
+    while stack:
+        for b in successors.get(stack.pop(), ()):
+            if b == target:
+                return True
+            if b not in visited:
+                visited.add(b)
+                stack.append(b)
+    return False
+
+
+def descendants(successors, start):
+    """Returns the set of nodes reachable from 'start' (including itself) in the graph given by 'successors'."""
+    visited = {start}
+    stack = [start]
+    while stack:
+        for b in successors.get(stack.pop(), ()):
+            if b not in visited:
+                visited.add(b)
+                stack.append(b)
+    return visited
+
+
 def required_for_output(inputs, outputs, connections):
     """
     Collect the nodes whose state is required to compute the final network output(s).
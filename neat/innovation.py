@@ -47,6 +47,10 @@ class InnovationTracker:
         # Maps (input_node, output_node, mutation_type) -> innovation_number
         # This is cleared at the start of each generation
         self.generation_innovations = {}
+        # Maps the innovation number of each connection gene in the population
+        # to the last generation in which some genome expressed it (see
+        # record_expression); only kept up to date with gene compaction enabled.
+        self.last_expressed = {}
     
     def get_innovation_number(self, input_node, output_node, mutation_type='add_connection'):
         """
@@ -159,6 +163,39 @@ class InnovationTracker:
         """
         self.generation_innovations.clear()
     
+    def record_expression(self, present, expressed, generation):
+        """
+        Record which connection genes the population holds and expresses.
+
+        Used by gene compaction (see DefaultReproduction). Innovations no longer
+        present in the population are forgotten; new ones count as expressed in
+        the generation in which they first appear.
+
+        Args:
+            present: Innovation numbers of all connection genes in the population
+            expressed: Innovation numbers of the connection genes that some genome
+                       expresses (enabled, and able to affect an output)
+            generation: The current generation number
+        """
+        last_expressed = self.last_expressed
+        self.last_expressed = {innovation: generation if innovation in expressed
+                               else last_expressed.get(innovation, generation)
+                               for innovation in present}
+
+    def inexpressed_innovations(self, generation, generations):
+        """
+        Get the innovations that no genome has expressed for ``generations`` generations.
+
+        Args:
+            generation: The current generation number
+            generations: The number of generations without expression
+
+        Returns:
+            set: The innovation numbers last expressed at or before ``generation - generations``
+        """
+        cutoff = generation - generations
+        return {innovation for innovation, last in self.last_expressed.items() if last <= cutoff}
+
     def get_current_innovation_number(self):
         """
         Get the current (most recently assigned) innovation number.
@@ -180,7 +217,8 @@ class InnovationTracker:
         """
         return {
             'global_counter': self.global_counter,
-            'generation_innovations': self.generation_innovations.copy()
+            'generation_innovations': self.generation_innovations.copy(),
+            'last_expressed': self.last_expressed.copy()
         }
     
     def __setstate__(self, state):
@@ -192,3 +230,4 @@ class InnovationTracker:
         """
         self.global_counter = state['global_counter']
         self.generation_innovations = state['generation_innovations']
+        self.last_expressed = state.get('last_expressed', {})
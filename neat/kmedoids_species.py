@@ -0,0 +1,235 @@
+"""
+Speciation into a fixed number of species by k-medoids clustering, with NumPy
+(imported lazily).
+
+:class:`KMedoidsSpeciesSet` is used in place of :class:`neat.DefaultSpeciesSet`,
+configured in a ``[KMedoidsSpeciesSet]`` section.  DefaultSpeciesSet places
+each genome, in order, in the first-found closest species within the
+compatibility threshold, so the species depend on the order of the genomes,
+and with ``target_num_species`` the number of species only approaches the
+target as the threshold is adjusted over generations.  KMedoidsSpeciesSet
+instead partitions each generation into ``num_species`` species around
+medoids (genomes) chosen to minimize the sum of the distances of the genomes
+to their species' medoid:
+
+* Medoids are chosen with PAM (BUILD, then SWAP steps while they reduce the
+  sum) among a sample of ``clara_sample_size`` genomes, for each of
+  ``clara_samples`` samples (CLARA).  A population no larger than the sample
+  size is clustered as a whole, once.
+* All genomes are then assigned to the closest medoid of each sample's
+  medoids, and the medoids with the least sum of distances over the whole
+  population are kept.
+
+Distances are computed in tiles of at most ``distance_tile_size`` genomes on
+each side, so memory grows with the square of the sample size (for PAM) and
+with the population size times the number of species (for assignment), not
+with the square of the population size.  With ``distance_engine =
+vectorized`` the tiles are computed with a
+:class:`neat.vectorized_distance.DistanceEngine`.
+
+Species keep their ids across generations: each new cluster takes the id of
+the old species whose representative is closest to its medoid (pairs matched
+in order of increasing distance); other clusters start new species and
+unmatched old species go extinct.  Samples are drawn from a NumPy generator
+as for ``attribute_mutation_seed`` (see :func:`neat.vectorized_mutation.make_generator`),
+so speciation is deterministic under ``kmedoids_seed`` or a population seed.
+"""
+import random
+from itertools import count
+
+from neat.config import ConfigParameter
+from neat.species import DefaultSpeciesSet
+from neat.vectorized_mutation import _import_numpy, make_generator
+
+
+def distance_tiles(genomes, others, config, engine=None, tile_size=256, upper=False):
+    """
+    Yields ``(i, j, block)`` for tiles of the matrix of distances from each of
+    ``genomes`` (rows) to each of ``others`` (columns): ``block`` is the NumPy
+    array of the distances from ``genomes[i:i + rows]`` to
+    ``others[j:j + columns]``, of at most ``tile_size`` rows and columns.
+    With ``upper`` (for ``others`` the same as ``genomes``), only the tiles
+    on and above the diagonal.  Uses the
+    :class:`neat.vectorized_distance.DistanceEngine` ``engine`` if given,
+    otherwise each genome's ``distance`` method.
+    """
+    np = _import_numpy()
+    for j in range(0, len(others), tile_size):
+        columns = others[j:j + tile_size]
+        for i in range(0, j + 1 if upper else len(genomes), tile_size):
+            rows = genomes[i:i + tile_size]
+            if engine is not None:
+                block = engine.distance_matrix(rows, columns)
+            else:
+                block = np.array([[g.distance(other, config) for other in columns] for g in rows])
+            yield i, j, block.reshape(len(rows), len(columns))
+
+
+class KMedoidsSpeciesSet(DefaultSpeciesSet):
+    """Partitions the population into ``num_species`` species by k-medoids clustering."""
+
+    def __init__(self, config, reporters):
+        # pylint: disable=super-init-not-called
+        self.species_set_config = config
+        self.reporters = reporters
+        self.indexer = count(1)
+        self.species = {}
+        self.genome_to_species = {}
+        self.distance_cache = None
+        for name in ('num_species', 'clara_sample_size', 'clara_samples', 'distance_tile_size'):
+            if getattr(config, name) < 1:
+                raise RuntimeError(f"Invalid {name} {getattr(config, name)!r}")
+        if config.max_swaps < 0:
+            raise RuntimeError(f"Invalid max_swaps {config.max_swaps!r}")
+        seed = config.kmedoids_seed
+        self.seed = None if seed.lower() == 'none' else int(seed)
+
+    @classmethod
+    def config_parameters(cls):
+        return [ConfigParameter('num_species', int),
+                ConfigParameter('clara_sample_size', int, 1000),
+                ConfigParameter('clara_samples', int, 5),
+                ConfigParameter('max_swaps', int, 100),
+                ConfigParameter('distance_tile_size', int, 256),
+                ConfigParameter('kmedoids_seed', str, 'none'),
+                ConfigParameter('distance_engine', str, 'python')]
+
+    def speciate(self, config, population, generation):
+        """Place genomes into ``num_species`` species around medoids."""
+        assert isinstance(population, dict)
+        np = _import_numpy()
+        species_set_config = self.species_set_config
+        genome_config = config.genome_config
+        tile_size = species_set_config.distance_tile_size
+        engine = self._distance_engine(config, population)
+
+        gids = sorted(population)
+        genomes = [population[gid] for gid in gids]
+        k = min(species_set_config.num_species, len(genomes))
+        sample_size = species_set_config.clara_sample_size
+        if len(genomes) <= sample_size:
+            samples = [np.arange(len(genomes))]
+        else:
+            rng = make_generator(self.seed, generation, random)
+            samples = [np.sort(rng.choice(len(genomes), sample_size, replace=False))
+                       for _ in range(species_set_config.clara_samples)]
+
+        best = None
+        swaps = 0
+        for sample in samples:
+            sample_genomes = [genomes[i] for i in sample]
+            matrix = np.empty((len(sample), len(sample)))
+            for i, j, block in distance_tiles(sample_genomes, sample_genomes, genome_config, engine, tile_size,
+                                              upper=True):
+                matrix[i:i + block.shape[0], j:j + block.shape[1]] = block
+                matrix[j:j + block.shape[1], i:i + block.shape[0]] = block.T
+            medoids, num_swaps = self._pam(np, matrix, k, species_set_config.max_swaps)
+            swaps += num_swaps
+            medoids = [int(sample[m]) for m in medoids]
+            nearest, cost = self._assign(np, genomes, medoids, genome_config, engine, tile_size)
+            if best is None or cost < best[2]:
+                best = (medoids, nearest, cost)
+        medoids, nearest, cost = best
+
+        sids = self._match_species(medoids, genomes, genome_config, engine)
+        new_representatives = {}
+        new_members = {}
+        for m, sid in zip(medoids, sids):
+            new_representatives[sid] = gids[m]
+            new_members[sid] = []
+        for gid, c in zip(gids, nearest.tolist()):
+            new_members[sids[c]].append(gid)
+        for sid in set(self.species) - set(new_representatives):
+            del self.species[sid]
+        self._update_species(population, new_representatives, new_members, generation)
+
+        self.reporters.info(
+            f'k-medoids: {k} species from {len(samples)} sample(s) of {len(samples[0])} genomes, '
+            f'{swaps} swaps, mean distance to medoid {cost / len(genomes):.3f}')
+
+    @staticmethod
+    def _pam(np, matrix, k, max_swaps):
+        """
+        PAM on the distance ``matrix``: returns the indices of ``k`` medoids
+        (BUILD, then at most ``max_swaps`` improving SWAPs) and the number of
+        swaps.  Ties go to the lowest index.
+        """
+        n = len(matrix)
+        # BUILD: the most central point, then the points that reduce the sum the most.
+        medoids = [int(np.argmin(matrix.sum(axis=1)))]
+        nearest = matrix[medoids[0]].copy()
+        while len(medoids) < k:
+            gain = np.maximum(nearest[None, :] - matrix, 0.0).sum(axis=1)
+            gain[medoids] = -1.0
+            m = int(np.argmax(gain))
+            medoids.append(m)
+            nearest = np.minimum(nearest, matrix[m])
+
+        # SWAP: replace the medoid and non-medoid pair that reduces the sum the most
+        # (the FastPAM1 computation of all pairs at once).
+        swaps = 0
+        medoids = np.array(medoids)
+        while k < n and swaps < max_swaps:
+            to_medoids = matrix[medoids]
+            order = np.argsort(to_medoids, axis=0, kind='stable')
+            closest = order[0]
+            first = to_medoids[closest, np.arange(n)]
+            second = to_medoids[order[1], np.arange(n)] if k > 1 else np.full(n, np.inf)
+            # Change in the sum if x replaces medoid i: for points of other
+            # clusters, moving to x if closer; for points of cluster i, moving to
+            # x or their second closest medoid.
+            others = np.minimum(matrix - first[None, :], 0.0)
+            own = np.minimum(matrix, second[None, :]) - first[None, :] - others
+            membership = np.zeros((n, k))
+            membership[np.arange(n), closest] = 1.0
+            delta = others.sum(axis=1)[:, None] + own @ membership
+            delta[medoids] = np.inf
+            x, i = np.unravel_index(np.argmin(delta), delta.shape)
+            if delta[x, i] >= -1e-12 * max(1.0, float(first.sum())):
+                break
+            medoids[i] = x
+            swaps += 1
+        return [int(m) for m in medoids], swaps
+
+    @staticmethod
+    def _assign(np, genomes, medoids, config, engine, tile_size):
+        """The index (in ``medoids``) of each genome's closest medoid, and the sum of the distances."""
+        nearest = np.zeros(len(genomes), dtype=np.int64)
+        distance = np.zeros(len(genomes))
+        medoid_genomes = [genomes[m] for m in medoids]
+        for i, j, block in distance_tiles(medoid_genomes, genomes, config, engine, tile_size):
+            # Tiles of all medoids (at most tile_size) at once, or of fewer rows in turn.
+            columns = slice(j, j + block.shape[1])
+            closest = np.argmin(block, axis=0)
+            if i == 0:
+                nearest[columns] = closest
+                distance[columns] = block[closest, np.arange(block.shape[1])]
+            else:
+                closer = block[closest, np.arange(block.shape[1])] < distance[columns]
+                nearest[columns] = np.where(closer, closest + i, nearest[columns])
+                distance[columns] = np.where(closer, block[closest, np.arange(block.shape[1])], distance[columns])
+        # A medoid belongs to its own cluster (even if a duplicate medoid comes first).
+        nearest[medoids] = np.arange(len(medoids))
+        distance[medoids] = 0.0
+        return nearest, float(distance.sum())
+
+    def _match_species(self, medoids, genomes, config, engine):
+        """
+        The species id for each medoid: that of the old species with the closest
+        representative, matching pairs in order of increasing distance, or a new id.
+        """
+        np = _import_numpy()
+        old = sorted(self.species)
+        sids = [None] * len(medoids)
+        if old:
+            representatives = [self.species[sid].representative for sid in old]
+            pairs = []
+            for i, j, block in distance_tiles(representatives, [genomes[m] for m in medoids], config, engine):
+                for (r, c), d in np.ndenumerate(block):
+                    pairs.append((float(d), old[i + r], j + c))
+            used = set()
+            for d, sid, c in sorted(pairs):
+                if sid not in used and sids[c] is None:
+                    sids[c] = sid
+                    used.add(sid)
+        return [next(self.indexer) if sid is None else sid for sid in sids]
@@ -0,0 +1,217 @@
+"""
+Approximate speciation of large populations with MinHash sketches.
+
+:class:`LSHSpeciesSet` is used in place of :class:`neat.DefaultSpeciesSet`,
+configured in an ``[LSHSpeciesSet]`` section.  DefaultSpeciesSet computes
+the distance from each genome to every species representative, so the time
+taken grows with the population size times the number of species.
+LSHSpeciesSet sketches the set of innovation numbers of each genome's
+connection genes with ``minhash_num_hashes`` MinHash values, splits the
+sketch into ``minhash_bands`` bands of r values, and puts the genome in one
+bucket per band (locality-sensitive hashing).  Two genomes whose innovation
+sets have Jaccard similarity s share a bucket with probability
+``1 - (1 - s**r)**bands``.  A genome is compared (with the exact genome
+distance) only with the representatives sharing one of its buckets, so the
+time taken grows with the population size times the number of similar
+species.
+
+Speciation is otherwise as in DefaultSpeciesSet.  It differs when the
+representative DefaultSpeciesSet would choose for a genome is not among
+those compared; how often that happens is estimated every generation on a
+sample of genomes (the recall), and reported through the reporters' ``info``
+method.  With ``exhaustive_fallback`` (the default), a genome none of whose
+buckets holds a representative within the compatibility threshold is
+compared with all representatives before it starts a new species; without
+it, missed matches start many spurious species.  A species none of whose
+genomes shares a bucket with its representative is compared with all the
+genomes not yet placed, as in DefaultSpeciesSet.
+"""
+import random
+
+from neat.config import ConfigParameter
+from neat.species import DefaultSpeciesSet
+
+# Bucket of the genomes without connection genes.
+_EMPTY = ('empty',)
+
+
+class LSHSpeciesSet(DefaultSpeciesSet):
+    """Speciation comparing genomes only with the representatives in the same MinHash buckets."""
+
+    # The hash functions are (a * x + b) mod this (Mersenne) prime.
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, config, reporters):
+        super().__init__(config, reporters)
+        rng = random.Random(config.minhash_seed)
+        self.hash_parameters = [(rng.randrange(1, self._PRIME), rng.randrange(self._PRIME))
+                                for _ in range(config.minhash_num_hashes)]
+        self.innovation_hashes = {}
+
+    @classmethod
+    def parse_config(cls, param_dict):
+        config = super().parse_config(param_dict)
+        num_hashes = config.minhash_num_hashes
+        bands = config.minhash_bands
+        if bands < 1 or bands > num_hashes:
+            raise RuntimeError(f"minhash_bands ({bands!r}) must be between 1 and "
+                               f"minhash_num_hashes ({num_hashes!r})")
+        if num_hashes % bands:
+            raise RuntimeError(f"minhash_num_hashes ({num_hashes!r}) must be a multiple of "
+                               f"minhash_bands ({bands!r})")
+        if config.recall_sample_size < 0:
+            raise RuntimeError(f"Invalid recall_sample_size {config.recall_sample_size!r}")
+        return config
+
+    @classmethod
+    def config_parameters(cls):
+        return super().config_parameters() + [ConfigParameter('minhash_num_hashes', int, 32),
+                                              ConfigParameter('minhash_bands', int, 16),
+                                              ConfigParameter('minhash_seed', int, 0),
+                                              ConfigParameter('recall_sample_size', int, 100),
+                                              ConfigParameter('exhaustive_fallback', bool, True)]
+
+    def buckets(self, genome):
+        """The keys of the ``minhash_bands`` buckets of ``genome``."""
+        hashes = self.innovation_hashes
+        prime = self._PRIME
+        rows = []
+        for cg in genome.connections.values():
+            row = hashes.get(cg.innovation)
+            if row is None:
+                x = cg.innovation
+                row = hashes[x] = tuple((a * x + b) % prime for a, b in self.hash_parameters)
+            rows.append(row)
+        if not rows:
+            return [_EMPTY]
+        signature = tuple(map(min, *rows)) if len(rows) > 1 else rows[0]
+        r = len(signature) // self.species_set_config.minhash_bands
+        return [(i, signature[i:i + r]) for i in range(0, len(signature), r)]
+
+    def speciate(self, config, population, generation):
+        """
+        Place genomes into species by genetic similarity, as
+        :meth:`neat.DefaultSpeciesSet.speciate` but comparing each genome only
+        with the representatives that share one of its buckets.
+        """
+        assert isinstance(population, dict)
+
+        compatibility_threshold = self.species_set_config.compatibility_threshold
+        distances = self._distance_cache(config, population)
+        # Keep the hashes of the innovation numbers still in use.
+        previous_hashes, self.innovation_hashes = self.innovation_hashes, {}
+        for genome in population.values():
+            for cg in genome.connections.values():
+                row = previous_hashes.get(cg.innovation)
+                if row is not None:
+                    self.innovation_hashes[cg.innovation] = row
+        buckets = {gid: self.buckets(g) for gid, g in population.items()}
+
+        # Find the best representatives for each existing species among the
+        # genomes in its representative's buckets (in ascending id order), or
+        # among all the genomes not yet placed if none of them is in those
+        # buckets.
+        genomes_by_bucket = {}
+        for gid in sorted(population):
+            for key in buckets[gid]:
+                genomes_by_bucket.setdefault(key, []).append(gid)
+        unspeciated = set(population)
+        new_representatives = {}
+        new_members = {}
+        for sid in sorted(self.species.keys()):
+            representative = self.species[sid].representative
+            shortlist = sorted({gid for key in self.buckets(representative)
+                                for gid in genomes_by_bucket.get(key, ()) if gid in unspeciated})
+            if not shortlist:
+                shortlist = sorted(unspeciated)
+                if not shortlist:
+                    # More species than genomes: the species left over go extinct.
+                    del self.species[sid]
+                    continue
+            distances.precompute(representative, [population[gid] for gid in shortlist])
+            new_rid = min(shortlist, key=lambda gid: distances(representative, population[gid]))
+            new_representatives[sid] = new_rid
+            new_members[sid] = [new_rid]
+            unspeciated.remove(new_rid)
+
+        # Partition the remaining genomes, in ascending id order, comparing
+        # each with the representatives in its buckets (in the order they
+        # were chosen, as DefaultSpeciesSet compares them).
+        order = {sid: i for i, sid in enumerate(new_representatives)}
+        species_by_bucket = {}
+        for sid, rid in new_representatives.items():
+            for key in buckets[rid]:
+                species_by_bucket.setdefault(key, []).append(sid)
+        comparisons = fallbacks = 0
+        for gid in sorted(unspeciated):
+            g = population[gid]
+            shortlist = sorted({sid for key in buckets[gid] for sid in species_by_bucket.get(key, ())},
+                               key=order.__getitem__)
+            comparisons += len(shortlist)
+            candidates = []
+            for sid in shortlist:
+                d = distances(population[new_representatives[sid]], g)
+                if d < compatibility_threshold:
+                    candidates.append((d, sid))
+            if not candidates and self.species_set_config.exhaustive_fallback:
+                others = [sid for sid in new_representatives if sid not in shortlist]
+                comparisons += len(others)
+                fallbacks += 1
+                for sid in others:
+                    d = distances(population[new_representatives[sid]], g)
+                    if d < compatibility_threshold:
+                        candidates.append((d, sid))
+
+            if candidates:
+                ignored_sdist, sid = min(candidates, key=lambda x: x[0])
+                new_members[sid].append(gid)
+            else:
+                # No species is similar enough, create a new species, using
+                # this genome as its representative.
+                sid = next(self.indexer)
+                new_representatives[sid] = gid
+                new_members[sid] = [gid]
+                order[sid] = len(order)
+                for key in buckets[gid]:
+                    species_by_bucket.setdefault(key, []).append(sid)
+
+        self._update_species(population, new_representatives, new_members, generation)
+        self._report_distances(population, distances)
+        self.reporters.info(
+            f'LSH speciation: {comparisons} representative comparisons for {len(unspeciated)} genomes '
+            f'and {len(new_representatives)} species ({fallbacks} genomes compared with all)')
+        if self.species_set_config.recall_sample_size:
+            self._report_recall(population, buckets, new_representatives, distances)
+        self._adjust_threshold()
+
+    def _report_recall(self, population, buckets, representatives, distances):
+        """
+        Reports the fraction of a sample of genomes (other than representatives)
+        for which the representative closest within the compatibility threshold,
+        compared exactly with all of them, shares one of the genome's buckets.
+        """
+        compatibility_threshold = self.species_set_config.compatibility_threshold
+        rids = set(representatives.values())
+        keys = [gid for gid in sorted(population) if gid not in rids]
+        step = max(1, len(keys) // self.species_set_config.recall_sample_size)
+        found = total = 0
+        for gid in keys[::step][:self.species_set_config.recall_sample_size]:
+            g = population[gid]
+            candidates = []
+            for rid in representatives.values():
+                d = distances(population[rid], g)
+                if d < compatibility_threshold:
+                    candidates.append((d, rid))
+            if not candidates:
+                continue
+            ignored_distance, rid = min(candidates, key=lambda x: x[0])
+            total += 1
+            found += not set(buckets[gid]).isdisjoint(buckets[rid])
+        if total:
+            self.reporters.info(f'LSH recall {found / total:.1%} on {total} sampled genomes')
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # The hashes of the innovation numbers are recomputed when needed.
+        state['innovation_hashes'] = {}
+        return state
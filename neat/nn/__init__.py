@@ -1,2 +1,4 @@
 from neat.nn.feed_forward import FeedForwardNetwork
 from neat.nn.recurrent import RecurrentNetwork
+from neat.nn.vectorized import VectorizedFeedForwardNetwork
+from neat.nn.ensemble import EnsembleFeedForwardNetwork
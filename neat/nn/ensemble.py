@@ -0,0 +1,139 @@
+"""
+Batched ensemble of feed-forward networks.
+
+:class:`EnsembleFeedForwardNetwork` packs several feed-forward phenotypes
+(for example the genomes returned by
+:meth:`StatisticsReporter.best_unique_genomes`) into the disjoint union of
+their graphs, stored as a single :class:`VectorizedFeedForwardNetwork`.  All
+members share the input pins, and their layers are merged, so one pass over
+the union evaluates every member for a whole batch of inputs.
+
+Requires NumPy (imported lazily).
+
+Usage::
+
+    genomes = stats.best_unique_genomes(5)
+    ensemble = EnsembleFeedForwardNetwork.create(genomes, config, combine='weighted')
+    outputs = ensemble.predict(inputs)            # [n_samples, n_outputs]
+    members = ensemble.activate_batch(inputs)     # [n_members, n_samples, n_outputs]
+"""
+
+from neat.nn.feed_forward import FeedForwardNetwork
+from neat.nn.vectorized import VectorizedFeedForwardNetwork, _import_numpy
+
+COMBINE_METHODS = ('mean', 'vote', 'weighted')
+
+
+class EnsembleFeedForwardNetwork:
+    """
+    Evaluates a set of feed-forward networks together and combines their outputs.
+
+    ``combine`` selects how member outputs are merged by :meth:`predict`:
+
+    * ``'mean'`` -- the average of the member outputs;
+    * ``'weighted'`` -- the average weighted by ``member_weights``
+      (by default the members' fitness values);
+    * ``'vote'`` -- the fraction of members voting for each output.  With
+      several outputs each member votes for its largest output; with a single
+      output each member votes if its output exceeds ``vote_threshold``.
+    """
+
+    def __init__(self, networks, combine='mean', member_weights=None, vote_threshold=0.5):
+        if not networks:
+            raise ValueError("An ensemble needs at least one network")
+        if combine not in COMBINE_METHODS:
+            raise ValueError(f"Unknown combine method {combine!r}; expected one of {COMBINE_METHODS}")
+
+        input_nodes = list(networks[0].input_nodes)
+        num_outputs = len(networks[0].output_nodes)
+        for net in networks:
+            if list(net.input_nodes) != input_nodes or len(net.output_nodes) != num_outputs:
+                raise ValueError("All ensemble members must have the same input and output pins")
+
+        self.input_nodes = input_nodes
+        self.num_members = len(networks)
+        self.num_outputs = num_outputs
+        self.combine = combine
+        self.vote_threshold = vote_threshold
+        self.member_weights = None
+        if member_weights is not None:
+            self.set_member_weights(member_weights)
+        elif combine == 'weighted':
+            raise ValueError("combine='weighted' requires member_weights")
+
+        # Relabel every non-input node as (member index, node key) so that the
+        # members' graphs stay disjoint when merged.
+        def relabel(m, key):
+            return key if key in input_nodes else (m, key)
+
+        outputs, node_evals, constants = [], [], {}
+        for m, net in enumerate(networks):
+            outputs.extend((m, o) for o in net.output_nodes)
+            for node, act, agg, bias, response, links in net.node_evals:
+                node_evals.append(((m, node), act, agg, bias, response,
+                                   [(relabel(m, i), w) for i, w in links]))
+            for node, value in getattr(net, 'constants', {}).items():
+                constants[(m, node)] = value
+
+        union = FeedForwardNetwork(input_nodes, outputs, node_evals, constants)
+        self.network = VectorizedFeedForwardNetwork.from_network(union)
+
+    @staticmethod
+    def create(genomes, config, combine='mean', member_weights=None, vote_threshold=0.5):
+        """
+        Build an ensemble from genomes.
+
+        When ``combine`` is ``'weighted'`` and no ``member_weights`` are given,
+        members are weighted by their fitness, which must then be
+        non-negative with higher values being better.
+        """
+        networks = [FeedForwardNetwork.create(g, config) for g in genomes]
+        if combine == 'weighted' and member_weights is None:
+            if config.fitness_criterion == 'min':
+                raise ValueError("Fitness weighting assumes higher fitness is better; "
+                                 "pass member_weights explicitly when fitness_criterion is 'min'")
+            member_weights = [g.fitness for g in genomes]
+        return EnsembleFeedForwardNetwork(networks, combine, member_weights, vote_threshold)
+
+    def set_member_weights(self, member_weights):
+        np = _import_numpy()
+        weights = np.asarray(member_weights, dtype=float)
+        if weights.shape != (self.num_members,):
+            raise ValueError(f"Expected {self.num_members} member weights, got {weights.shape}")
+        if (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError("Member weights must be non-negative and not all zero")
+        self.member_weights = weights / weights.sum()
+
+    def activate_batch(self, inputs):
+        """
+        Evaluate every member for each row of ``inputs`` ([n_samples, n_inputs]).
+
+        Returns an array of shape [n_members, n_samples, n_outputs].
+        """
+        outputs = self.network.activate_batch(inputs)
+        n_samples = outputs.shape[0]
+        return outputs.reshape(n_samples, self.num_members, self.num_outputs).transpose(1, 0, 2)
+
+    def predict(self, inputs, combine=None):
+        """Evaluate the ensemble and combine the member outputs; returns [n_samples, n_outputs]."""
+        np = _import_numpy()
+        combine = combine or self.combine
+        members = self.activate_batch(inputs)
+        if combine == 'mean':
+            return members.mean(axis=0)
+        if combine == 'weighted':
+            if self.member_weights is None:
+                raise ValueError("combine='weighted' requires member_weights")
+            return np.tensordot(self.member_weights, members, axes=1)
+        if combine == 'vote':
+            if self.num_outputs == 1:
+                return (members > self.vote_threshold).mean(axis=0)
+            votes = members.argmax(axis=2)
+            return (votes[..., None] == np.arange(self.num_outputs)).mean(axis=0)
+        raise ValueError(f"Unknown combine method {combine!r}; expected one of {COMBINE_METHODS}")
+
+    def activate(self, inputs):
+        """Combined outputs for a single input vector, as a list."""
+        if len(self.input_nodes) != len(inputs):
+            raise RuntimeError(f"Expected {len(self.input_nodes):n} inputs, got {len(inputs):n}")
+        return self.predict([inputs])[0].tolist()
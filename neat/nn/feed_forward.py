@@ -1,12 +1,19 @@
 from neat.graphs import feed_forward_layers
+from neat.nn.simplify import simplify_feed_forward
 import random
 
 class FeedForwardNetwork:
-    def __init__(self, inputs, outputs, node_evals):
+    def __init__(self, inputs, outputs, node_evals, constants=None, simplified=False):
         self.input_nodes = inputs
         self.output_nodes = outputs
         self.node_evals = node_evals
+        # Nodes whose value does not depend on the inputs (see neat.nn.simplify).
+        self.constants = dict(constants) if constants else {}
+        # Whether simplification changed node_evals, e.g. folding weights into
+        # biases or dropping zero-weight links.
+        self.simplified = simplified
         self.values = {key: 0.0 for key in inputs + outputs}
+        self.values.update(self.constants)
 
     def activate(self, inputs):
         if len(self.input_nodes) != len(inputs):
@@ -25,8 +32,17 @@ class FeedForwardNetwork:
         return [self.values[i] for i in self.output_nodes]
 
     @staticmethod
-    def create(genome, config, unique_value=False, random_values=False):
-        """ Receives a genome and returns its phenotype (a FeedForwardNetwork). """
+    def create(genome, config, unique_value=False, random_values=False, simplify=True):
+        """
+        Receives a genome and returns its phenotype (a FeedForwardNetwork).
+
+        With ``simplify`` (the default) the network's ``node_evals`` are passed
+        through :func:`neat.nn.simplify.simplify_feed_forward`, which removes
+        structure that does not affect the outputs.  Pass ``simplify=False``
+        to keep one node evaluation per expressed node, e.g. when inspecting
+        the phenotype's structure.  The network's ``simplified`` attribute
+        tells whether the pass changed anything.
+        """
 
         # Gather expressed connections.
         connections = [cg.key for cg in genome.connections.values() if cg.enabled]
@@ -42,6 +58,10 @@ class FeedForwardNetwork:
                     inode, onode = conn_key
                     if onode == node and inode in required_with_inputs:
                         cg = genome.connections[conn_key]
+                        if (random_values or unique_value) and getattr(config.genome_config,
+                                                                       'copy_on_write_genes', False):
+                            # The gene may be shared with other genomes.
+                            cg = genome.connections[conn_key] = cg.copy()
                         if random_values:
                             cg.weight = random.uniform(-1.0, 1.0)
                         if unique_value:
@@ -53,4 +73,11 @@ class FeedForwardNetwork:
                 activation_function = config.genome_config.activation_defs.get(ng.activation)
                 node_evals.append((node, activation_function, aggregation_function, ng.bias, ng.response, inputs))
 
-        return FeedForwardNetwork(config.genome_config.input_keys, config.genome_config.output_keys, node_evals)
+        input_keys = config.genome_config.input_keys
+        output_keys = config.genome_config.output_keys
+        if simplify:
+            simplified_evals, constants = simplify_feed_forward(input_keys, output_keys, node_evals)
+            return FeedForwardNetwork(input_keys, output_keys, simplified_evals, constants,
+                                      simplified=bool(constants) or simplified_evals != node_evals)
+
+        return FeedForwardNetwork(input_keys, output_keys, node_evals)
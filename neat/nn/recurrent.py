@@ -1,4 +1,5 @@
 from neat.graphs import required_for_output
+from neat.nn.simplify import simplify_recurrent
 
 
 class RecurrentNetwork:
@@ -42,8 +43,13 @@ class RecurrentNetwork:
         return [ovalues[i] for i in self.output_nodes]
 
     @staticmethod
-    def create(genome, config):
-        """ Receives a genome and returns its phenotype (a RecurrentNetwork). """
+    def create(genome, config, simplify=True):
+        """
+        Receives a genome and returns its phenotype (a RecurrentNetwork).
+
+        With ``simplify`` (the default) zero-weight links and nodes that do not
+        feed any output are dropped; see :func:`neat.nn.simplify.simplify_recurrent`.
+        """
         genome_config = config.genome_config
         required = required_for_output(genome_config.input_keys, genome_config.output_keys, genome.connections)
 
@@ -69,4 +75,7 @@ class RecurrentNetwork:
             aggregation_function = genome_config.aggregation_function_defs.get(node.aggregation)
             node_evals.append((node_key, activation_function, aggregation_function, node.bias, node.response, inputs))
 
+        if simplify:
+            node_evals = simplify_recurrent(genome_config.input_keys, genome_config.output_keys, node_evals)
+
         return RecurrentNetwork(genome_config.input_keys, genome_config.output_keys, node_evals)
@@ -0,0 +1,153 @@
+"""
+Simplification passes over network ``node_evals``.
+
+Evolved genomes often carry structure that does not change what the network
+computes: nodes without any incoming links (whose value is a constant),
+pass-through nodes with a single input and an identity activation, and links
+with a weight of exactly zero.  The functions in this module rewrite the
+``node_evals`` of :class:`FeedForwardNetwork` and :class:`RecurrentNetwork`
+so that this dead weight is not paid for on every call to ``activate``.
+
+The rewrites assume that network inputs are finite.  Constant values and
+dead links are handled exactly; folding a pass-through node into its
+consumers multiplies weights together (and may move a bias into the
+consumer's bias), so those results agree with the unsimplified network to
+within floating point rounding.
+"""
+from neat.activations import identity_activation
+from neat.aggregations import (max_aggregation, maxabs_aggregation, mean_aggregation, median_aggregation,
+                               min_aggregation, product_aggregation, sum_aggregation)
+
+# Aggregations that return their only input unchanged.  A node using one of
+# these with a single incoming link and the identity activation is a (scaled
+# and shifted) copy of its input.
+_SINGLE_INPUT_IDENTITY_AGGREGATIONS = (sum, sum_aggregation, product_aggregation, max_aggregation,
+                                       min_aggregation, maxabs_aggregation, median_aggregation,
+                                       mean_aggregation)
+
+# Aggregations for which a term of exactly zero can be dropped without
+# changing the result, and constant terms can be folded into the bias.
+_SUM_AGGREGATIONS = (sum, sum_aggregation)
+
+
+def _is_sum(aggregation):
+    return any(aggregation is a for a in _SUM_AGGREGATIONS)
+
+
+def _is_single_input_identity(aggregation):
+    return any(aggregation is a for a in _SINGLE_INPUT_IDENTITY_AGGREGATIONS)
+
+
+def _required_node_evals(outputs, node_evals, constants=()):
+    """
+    Return the subset of ``node_evals`` (preserving order) whose values can
+    reach one of the outputs.  Nodes listed in ``constants`` never need to be
+    evaluated and are not included.
+    """
+    links_by_node = {node: links for node, _, _, _, _, links in node_evals}
+    required = set()
+    pending = [o for o in outputs]
+    while pending:
+        node = pending.pop()
+        if node in required:
+            continue
+        required.add(node)
+        if node in constants:
+            continue
+        for i, w in links_by_node.get(node, ()):
+            if i not in required:
+                pending.append(i)
+
+    kept = [ne for ne in node_evals if ne[0] in required and ne[0] not in constants]
+    return kept, required
+
+
+def simplify_feed_forward(inputs, outputs, node_evals):
+    """
+    Simplify the ``node_evals`` of a feed-forward network.
+
+    ``node_evals`` must be in evaluation order, as produced by
+    :meth:`FeedForwardNetwork.create`.  Returns ``(node_evals, constants)``
+    where ``constants`` maps node keys whose value never depends on the
+    inputs to that value.  Those nodes are removed from ``node_evals``; the
+    network is expected to seed its value table with them instead.
+
+    The pass performs:
+
+    * constant folding -- nodes whose inputs are all constant are evaluated
+      once, and constant terms feeding a ``sum`` node are folded into its bias;
+    * dead-link elimination -- zero-weight links into ``sum`` nodes are dropped;
+    * identity-chain collapsing -- non-output nodes with the identity
+      activation and a single incoming link are bypassed, their consumers
+      being linked directly to the upstream node;
+    * removal of nodes that no longer contribute to any output.
+    """
+    output_set = set(outputs)
+    constants = {}
+    # node -> (source, scale, offset): value == offset + scale * value[source]
+    linear = {}
+    rewritten = []
+
+    for node, act, agg, bias, response, links in node_evals:
+        if all(i in constants for i, w in links):
+            # Every input is known: evaluate the node once, exactly as
+            # activate() would.
+            s = agg([constants[i] * w for i, w in links])
+            constants[node] = act(bias + response * s)
+            continue
+
+        is_sum = _is_sum(agg)
+        new_links = []
+        shift = 0.0
+        for i, w in links:
+            if is_sum and w == 0.0:
+                continue
+            if is_sum and i in constants:
+                shift += constants[i] * w
+                continue
+            if i in linear:
+                source, scale, offset = linear[i]
+                if is_sum or offset == 0.0:
+                    shift += offset * w
+                    new_links.append((source, scale * w))
+                    continue
+            new_links.append((i, w))
+
+        if shift:
+            bias = bias + response * shift
+
+        if not new_links:
+            # Only zero-weight links and constants remained.
+            constants[node] = act(bias + response * agg([]))
+            continue
+
+        if (node not in output_set and len(new_links) == 1 and act is identity_activation
+                and _is_single_input_identity(agg)):
+            source, w = new_links[0]
+            linear[node] = (source, response * w, bias)
+
+        rewritten.append((node, act, agg, bias, response, new_links))
+
+    kept, required = _required_node_evals(outputs, rewritten, constants)
+    constants = {k: v for k, v in constants.items() if k in required}
+    return kept, constants
+
+
+def simplify_recurrent(inputs, outputs, node_evals):
+    """
+    Simplify the ``node_evals`` of a recurrent network.
+
+    Every node of a recurrent network reads the previous step's values, so
+    folding constants or bypassing pass-through nodes would change the timing
+    of the network's response.  Only the timing-neutral rewrites are applied:
+    zero-weight links into ``sum`` nodes are dropped, and nodes that no
+    longer contribute to any output are removed.
+    """
+    rewritten = []
+    for node, act, agg, bias, response, links in node_evals:
+        if _is_sum(agg):
+            links = [(i, w) for i, w in links if w != 0.0]
+        rewritten.append((node, act, agg, bias, response, links))
+
+    kept, required = _required_node_evals(outputs, rewritten)
+    return kept
@@ -0,0 +1,526 @@
+"""
+Array-backed feed-forward phenotype that evaluates a network over a batch of inputs.
+
+:class:`VectorizedFeedForwardNetwork` stores a feed-forward network as flat
+NumPy arrays -- per-node bias, response and function ids, and per-edge source
+slots and weights grouped by destination node -- and evaluates it one layer at
+a time with whole-array operations.  The result of ``activate_batch`` for a
+batch of input vectors matches calling :meth:`FeedForwardNetwork.activate`
+once per vector, up to floating point rounding.
+
+This module requires NumPy, which is imported lazily: ``import neat`` never
+imports it.
+
+Usage::
+
+    net = VectorizedFeedForwardNetwork.create(genome, config)
+    outputs = net.activate_batch(inputs)   # inputs: [n_samples, n_inputs]
+
+    # Weight-agnostic evaluation: one topology, many shared weight values.
+    net = VectorizedFeedForwardNetwork.create(genome, config, simplify=False)
+    outputs = net.activate_shared_weights(inputs, [-2.0, -1.0, 1.0, 2.0])
+    # outputs: [n_weights, n_samples, n_outputs]
+"""
+
+from neat.activations import ActivationFunctionSet
+from neat.aggregations import AggregationFunctionSet
+from neat.nn.feed_forward import FeedForwardNetwork
+
+
+def _import_numpy():
+    """Import and return NumPy, or raise an informative error."""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        raise ImportError(
+            "NumPy is required for vectorized network evaluation but is not installed.\n"
+            "Install it with: pip install numpy"
+        ) from None
+
+
+def _numpy_activations(np):
+    """NumPy versions of the builtin activation functions in neat.activations."""
+
+    def sigmoid(z):
+        z = np.clip(5.0 * z, -60.0, 60.0)
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def tanh(z):
+        return np.tanh(np.clip(2.5 * z, -60.0, 60.0))
+
+    def sin(z):
+        return np.sin(np.clip(5.0 * z, -60.0, 60.0))
+
+    def gauss(z):
+        z = np.clip(z, -3.4, 3.4)
+        return np.exp(-5.0 * z ** 2)
+
+    def relu(z):
+        return np.where(z > 0.0, z, 0.0)
+
+    def elu(z):
+        return np.where(z > 0.0, z, np.exp(np.minimum(z, 0.0)) - 1)
+
+    def lelu(z):
+        return np.where(z > 0.0, z, 0.005 * z)
+
+    def selu(z):
+        lam = 1.0507009873554804934193349852946
+        alpha = 1.6732632423543772848170429916717
+        return np.where(z > 0.0, lam * z, lam * alpha * (np.exp(np.minimum(z, 0.0)) - 1))
+
+    def softplus(z):
+        z = np.clip(5.0 * z, -60.0, 60.0)
+        return 0.2 * np.log(1 + np.exp(z))
+
+    def identity(z):
+        return z
+
+    def clamped(z):
+        return np.clip(z, -1.0, 1.0)
+
+    def inv(z):
+        with np.errstate(divide='ignore'):
+            return np.where(z == 0.0, 0.0, 1.0 / np.where(z == 0.0, 1.0, z))
+
+    def log(z):
+        return np.log(np.maximum(1e-7, z))
+
+    def exp(z):
+        return np.exp(np.clip(z, -60.0, 60.0))
+
+    def hat(z):
+        return np.maximum(0.0, 1 - np.abs(z))
+
+    def square(z):
+        return z ** 2
+
+    def cube(z):
+        return z ** 3
+
+    return {'sigmoid': sigmoid, 'tanh': tanh, 'sin': sin, 'gauss': gauss, 'relu': relu,
+            'elu': elu, 'lelu': lelu, 'selu': selu, 'softplus': softplus, 'identity': identity,
+            'clamped': clamped, 'inv': inv, 'log': log, 'exp': exp, 'abs': np.abs, 'hat': hat,
+            'square': square, 'cube': cube}
+
+
+# Aggregations evaluated with a ufunc ``reduceat`` over each node's edges, and
+# the value an aggregation returns for a node without inputs.
+_REDUCEAT_AGGREGATIONS = {'sum': 'add', 'product': 'multiply', 'max': 'maximum',
+                          'min': 'minimum', 'mean': 'add'}
+_EMPTY_AGGREGATION_VALUES = {'sum': 0.0, 'product': 1.0, 'max': 0.0, 'min': 0.0,
+                             'maxabs': 0.0, 'median': 0.0, 'mean': 0.0}
+
+_builtin_activation_names = None
+_builtin_aggregation_names = None
+
+
+def _builtin_names():
+    """Return ``({function: name}, {function: name})`` for the builtin function sets."""
+    global _builtin_activation_names, _builtin_aggregation_names
+    if _builtin_activation_names is None:
+        _builtin_activation_names = {f: n for n, f in ActivationFunctionSet().functions.items()}
+        names = {f: n for n, f in AggregationFunctionSet().functions.items()}
+        # Hand-built node_evals frequently use the Python builtin directly.
+        names[sum] = 'sum'
+        _builtin_aggregation_names = names
+    return _builtin_activation_names, _builtin_aggregation_names
+
+
+def _pack_node_evals(input_nodes, output_nodes, order, constants, layer_of, dtype=None):
+    """
+    Pack ``node_evals`` (already sorted by layer) into the constructor arguments
+    of :class:`VectorizedFeedForwardNetwork`; ``layer_of`` maps each evaluated
+    node to its layer.  Returns ``(args, kwargs)``.
+    """
+    np = _import_numpy()
+    dtype = dtype or np.float64
+    activation_names, aggregation_names = _builtin_names()
+
+    input_nodes = list(input_nodes)
+    constants = dict(constants)
+    evaluated = {ne[0] for ne in order}
+
+    # Slots: inputs, then fixed-value nodes (constants, and any source that
+    # is never evaluated, which keeps its initial 0.0), then evaluated nodes.
+    fixed = list(constants)
+    for node, act, agg, bias, response, links in order:
+        for i, w in links:
+            if i not in evaluated and i not in constants and i not in input_nodes and i not in fixed:
+                fixed.append(i)
+    for o in output_nodes:
+        if o not in evaluated and o not in fixed:
+            fixed.append(o)
+    node_keys = input_nodes + fixed + [ne[0] for ne in order]
+    slot = {k: n for n, k in enumerate(node_keys)}
+    initial_values = np.zeros(len(node_keys), dtype=dtype)
+    for k, v in constants.items():
+        initial_values[slot[k]] = v
+
+    # Custom activations are told apart by identity; each gets its own name,
+    # its __name__ with a numeric suffix if another function (or a builtin)
+    # already has it.
+    act_table, agg_table, custom, custom_names = [], [], {}, {}
+    builtin_activations = set(activation_names.values())
+    act_ids, agg_ids, bias_list, response_list = [], [], [], []
+    edge_offsets, edge_sources, edge_weights = [0], [], []
+    layer_offsets = [0]
+    for n, (node, act, agg, bias, response, links) in enumerate(order):
+        if n > 0 and layer_of[node] != layer_of[order[n - 1][0]]:
+            layer_offsets.append(n)
+
+        act_name = activation_names.get(act)
+        if act_name is None:
+            act_name = custom_names.get(id(act))
+        if act_name is None:
+            base = act_name = getattr(act, '__name__', 'custom')
+            suffix = 1
+            while act_name in custom or act_name in builtin_activations:
+                suffix += 1
+                act_name = f'{base}_{suffix}'
+            custom[act_name] = act
+            custom_names[id(act)] = act_name
+        agg_name = aggregation_names.get(agg)
+        if agg_name is None:
+            raise ValueError(f"Node {node}: custom aggregation function {agg!r} is not supported "
+                             "by vectorized networks")
+        if act_name not in act_table:
+            act_table.append(act_name)
+        if agg_name not in agg_table:
+            agg_table.append(agg_name)
+        act_ids.append(act_table.index(act_name))
+        agg_ids.append(agg_table.index(agg_name))
+        bias_list.append(bias)
+        response_list.append(response)
+        for i, w in links:
+            edge_sources.append(slot[i])
+            edge_weights.append(w)
+        edge_offsets.append(len(edge_sources))
+    layer_offsets.append(len(order))
+
+    args = (input_nodes, list(output_nodes), node_keys, initial_values,
+            np.array(bias_list, dtype=dtype), np.array(response_list, dtype=dtype),
+            np.array(act_ids, dtype=np.int32), np.array(agg_ids, dtype=np.int32),
+            np.array(edge_offsets, dtype=np.int64), np.array(edge_sources, dtype=np.int64),
+            np.array(edge_weights, dtype=dtype), np.array(layer_offsets, dtype=np.int64),
+            np.array([slot[o] for o in output_nodes], dtype=np.int64),
+            act_table, agg_table)
+    return args, {'activation_functions': custom}
+
+
+class _Layer:
+    """Precomputed slices and function groups for one layer of evaluated nodes."""
+
+    def __init__(self, net, n0, n1):
+        np = _import_numpy()
+        self.n0 = n0
+        self.n1 = n1
+        self.e0 = int(net.edge_offsets[n0])
+        self.e1 = int(net.edge_offsets[n1])
+        self.slot0 = net.first_node_slot + n0
+        self.slot1 = net.first_node_slot + n1
+        counts = np.diff(net.edge_offsets[n0:n1 + 1])
+        # reduceat cannot express empty segments, so it runs over the nodes
+        # that have inputs; the others get their aggregation's empty value.
+        self.nonempty = counts > 0
+        self.has_empty = not bool(self.nonempty.all())
+        self.starts = (net.edge_offsets[n0:n1] - self.e0)[self.nonempty]
+        self.counts = counts[self.nonempty]
+
+        agg_ids = net.aggregation_ids[n0:n1]
+        self.aggregations = [(net.aggregation_names[k], agg_ids == k) for k in np.unique(agg_ids)]
+        act_ids = net.activation_ids[n0:n1]
+        self.activations = [(int(k), act_ids == k) for k in np.unique(act_ids)]
+
+
+class VectorizedFeedForwardNetwork:
+    """
+    A feed-forward network stored as arrays and evaluated over batches of inputs.
+
+    Values live in a slot vector: the input pins occupy the first slots,
+    followed by nodes with a fixed value (see :mod:`neat.nn.simplify`), then
+    the evaluated nodes in layer order.  Evaluated node ``n`` has slot
+    ``first_node_slot + n`` and its incoming edges are
+    ``edge_offsets[n]:edge_offsets[n + 1]``.
+
+    Builtin activation and aggregation functions are evaluated with NumPy.
+    Custom activation functions are applied element-wise through
+    ``numpy.vectorize``; custom aggregation functions are not supported.
+    Each custom activation function is named by its ``__name__`` in
+    ``activation_names`` (and in exported files), with a suffix such as
+    ``_2`` if a builtin or another function of the network has that name.
+    """
+
+    def __init__(self, input_nodes, output_nodes, node_keys, initial_values,
+                 bias, response, activation_ids, aggregation_ids,
+                 edge_offsets, edge_sources, edge_weights, layer_offsets, output_slots,
+                 activation_names, aggregation_names, activation_functions=None, simplified=False):
+        np = _import_numpy()
+        self.input_nodes = list(input_nodes)
+        self.output_nodes = list(output_nodes)
+        self.node_keys = list(node_keys)
+        self.initial_values = initial_values
+        self.bias = bias
+        self.response = response
+        self.activation_ids = activation_ids
+        self.aggregation_ids = aggregation_ids
+        self.edge_offsets = edge_offsets
+        self.edge_sources = edge_sources
+        self.edge_weights = edge_weights
+        self.layer_offsets = layer_offsets
+        self.output_slots = output_slots
+        self.activation_names = list(activation_names)
+        self.aggregation_names = list(aggregation_names)
+        self.simplified = simplified
+
+        self.num_slots = len(self.node_keys)
+        self.first_node_slot = self.num_slots - len(bias)
+
+        for name in self.aggregation_names:
+            if name not in _EMPTY_AGGREGATION_VALUES:
+                raise ValueError(f"Aggregation function {name!r} is not supported by vectorized networks")
+
+        # Resolve each activation id to a NumPy function, falling back to
+        # element-wise application of the scalar function for custom ones.
+        builtin = _numpy_activations(np)
+        activation_functions = activation_functions or {}
+        self.activation_functions = dict(activation_functions)
+        self._activation_funcs = []
+        for name in self.activation_names:
+            if name in activation_functions:
+                f = activation_functions[name]
+                self._activation_funcs.append(np.vectorize(f, otypes=[np.float64]))
+            elif name in builtin:
+                self._activation_funcs.append(builtin[name])
+            else:
+                raise ValueError(f"No NumPy implementation for activation function {name!r}; "
+                                 "pass the scalar function in activation_functions")
+
+        self._layers = [_Layer(self, int(layer_offsets[i]), int(layer_offsets[i + 1]))
+                        for i in range(len(layer_offsets) - 1)]
+
+    @staticmethod
+    def from_network(network, dtype=None):
+        """
+        Build a vectorized network from a :class:`FeedForwardNetwork`, keeping
+        its ``simplified`` flag.
+        """
+        # Layer of each evaluated node: one more than its deepest source.
+        depth = {}
+        for node, act, agg, bias, response, links in network.node_evals:
+            depth[node] = 1 + max((depth.get(i, 0) for i, w in links), default=0)
+        order = sorted(network.node_evals, key=lambda ne: depth[ne[0]])
+        constants = getattr(network, 'constants', {})
+        args, kwargs = _pack_node_evals(network.input_nodes, network.output_nodes, order,
+                                        constants, depth, dtype)
+        return VectorizedFeedForwardNetwork(*args, simplified=getattr(network, 'simplified', False), **kwargs)
+
+    def _scalar_node_evals(self):
+        """``node_evals`` and fixed slot values for an equivalent scalar network."""
+        activations = dict(ActivationFunctionSet().functions)
+        activations.update(self.activation_functions)
+        aggregations = AggregationFunctionSet().functions
+        node_evals = []
+        for n in range(len(self.bias)):
+            e0, e1 = int(self.edge_offsets[n]), int(self.edge_offsets[n + 1])
+            links = [(self.node_keys[int(i)], float(w))
+                     for i, w in zip(self.edge_sources[e0:e1], self.edge_weights[e0:e1])]
+            node_evals.append((self.node_keys[self.first_node_slot + n],
+                               activations[self.activation_names[self.activation_ids[n]]],
+                               aggregations[self.aggregation_names[self.aggregation_ids[n]]],
+                               float(self.bias[n]), float(self.response[n]), links))
+        fixed = {self.node_keys[k]: float(self.initial_values[k])
+                 for k in range(len(self.input_nodes), self.first_node_slot)}
+        return node_evals, fixed
+
+    def to_network(self):
+        """Rebuild the equivalent :class:`FeedForwardNetwork`, e.g. for JSON export."""
+        node_evals, fixed = self._scalar_node_evals()
+        return FeedForwardNetwork(self.input_nodes, self.output_nodes, node_evals, fixed, simplified=self.simplified)
+
+    @staticmethod
+    def create(genome, config, simplify=True, dtype=None):
+        """
+        Receives a genome and returns its vectorized phenotype.
+
+        Use ``simplify=False`` for networks that will be evaluated with
+        :meth:`activate_shared_weights`, since simplification folds the
+        genome's connection weights into the network structure; the network's
+        ``simplified`` attribute tells whether it did.
+        """
+        network = FeedForwardNetwork.create(genome, config, simplify=simplify)
+        return VectorizedFeedForwardNetwork.from_network(network, dtype=dtype)
+
+    def _evaluate(self, values, shared_weights=None):
+        """
+        Evaluate all layers in place on ``values`` ([..., num_slots]).
+
+        ``shared_weights`` (broadcastable against ``values[..., :1]``) replaces
+        every edge weight when given.
+        """
+        np = _import_numpy()
+        for layer in self._layers:
+            if shared_weights is None:
+                weights = self.edge_weights[layer.e0:layer.e1]
+            else:
+                weights = shared_weights
+            terms = values[..., self.edge_sources[layer.e0:layer.e1]] * weights
+            s = self._aggregate(np, layer, terms)
+            z = self.bias[layer.n0:layer.n1] + self.response[layer.n0:layer.n1] * s
+            values[..., layer.slot0:layer.slot1] = self._activate(np, layer, z)
+        return values
+
+    def _aggregate(self, np, layer, terms):
+        shape = terms.shape[:-1] + (layer.n1 - layer.n0,)
+        result = np.empty(shape, dtype=terms.dtype)
+        for name, mask in layer.aggregations:
+            if layer.has_empty:
+                result[..., mask] = _EMPTY_AGGREGATION_VALUES[name]
+            if not len(layer.starts):
+                continue
+
+            ufunc = _REDUCEAT_AGGREGATIONS.get(name)
+            if ufunc is not None:
+                r = getattr(np, ufunc).reduceat(terms, layer.starts, axis=-1)
+                if name == 'mean':
+                    r = r / layer.counts
+            else:
+                r = self._aggregate_per_node(np, layer, terms, name, mask[layer.nonempty])
+
+            if len(layer.aggregations) == 1 and not layer.has_empty:
+                return r
+            selected = mask & layer.nonempty
+            result[..., selected] = r[..., mask[layer.nonempty]]
+        return result
+
+    @staticmethod
+    def _aggregate_per_node(np, layer, terms, name, mask):
+        """Order-dependent aggregations (maxabs, median), one node at a time."""
+        result = np.zeros(terms.shape[:-1] + (len(layer.starts),), dtype=terms.dtype)
+        for j in np.flatnonzero(mask):
+            start = layer.starts[j]
+            t = terms[..., start:start + layer.counts[j]]
+            if name == 'maxabs':
+                # First element with the largest magnitude, as max(x, key=abs).
+                k = np.argmax(np.abs(t), axis=-1)[..., None]
+                result[..., j] = np.take_along_axis(t, k, axis=-1)[..., 0]
+            else:
+                result[..., j] = np.median(t, axis=-1)
+        return result
+
+    def _activate(self, np, layer, z):
+        if len(layer.activations) == 1:
+            return self._activation_funcs[layer.activations[0][0]](z)
+        out = np.empty_like(z)
+        for k, mask in layer.activations:
+            out[..., mask] = self._activation_funcs[k](z[..., mask])
+        return out
+
+    def _initial_values(self, np, inputs, leading_shape):
+        inputs = np.asarray(inputs, dtype=self.initial_values.dtype)
+        num_inputs = len(self.input_nodes)
+        if inputs.ndim != 2 or inputs.shape[1] != num_inputs:
+            raise RuntimeError(f"Expected inputs of shape [n_samples, {num_inputs}], got {inputs.shape}")
+        values = np.empty(leading_shape + (inputs.shape[0], self.num_slots), dtype=self.initial_values.dtype)
+        values[...] = self.initial_values
+        values[..., :num_inputs] = inputs
+        return values
+
+    def activate_batch(self, inputs):
+        """
+        Evaluate the network for each row of ``inputs`` ([n_samples, n_inputs]).
+
+        Returns an array of shape [n_samples, n_outputs].
+        """
+        np = _import_numpy()
+        values = self._evaluate(self._initial_values(np, inputs, ()))
+        return values[..., self.output_slots]
+
+    def activate(self, inputs):
+        """Evaluate a single input vector; returns a list, as FeedForwardNetwork.activate."""
+        if len(self.input_nodes) != len(inputs):
+            raise RuntimeError(f"Expected {len(self.input_nodes):n} inputs, got {len(inputs):n}")
+        return self.activate_batch([inputs])[0].tolist()
+
+    def activate_shared_weights(self, inputs, weights):
+        """
+        Weight-agnostic evaluation: evaluate the topology once per shared weight value.
+
+        Every connection of the network takes the same weight (as with
+        ``FeedForwardNetwork.create(..., unique_value=w)``), for each value in
+        ``weights``, in a single vectorized pass.  ``inputs`` has shape
+        [n_samples, n_inputs]; returns an array of shape
+        [n_weights, n_samples, n_outputs].
+
+        The network must not have been changed by simplification (build it
+        with ``simplify=False``), and be a feed-forward network: a :class:`VectorizedRecurrentNetwork` raises
+        TypeError.
+        """
+        if isinstance(self, VectorizedRecurrentNetwork):
+            raise TypeError("Shared-weight evaluation is only available for feed-forward networks")
+        if self.simplified:
+            raise RuntimeError("Shared-weight evaluation requires a network created with simplify=False")
+        np = _import_numpy()
+        weights = np.asarray(weights, dtype=self.initial_values.dtype).reshape(-1)
+        values = self._initial_values(np, inputs, (len(weights),))
+        values = self._evaluate(values, shared_weights=weights[:, None, None])
+        return values[..., self.output_slots]
+
+
+class VectorizedRecurrentNetwork(VectorizedFeedForwardNetwork):
+    """
+    A recurrent network stored as arrays.
+
+    All nodes form a single layer evaluated from the previous step's values,
+    so each call to :meth:`activate` matches one :meth:`RecurrentNetwork.activate`
+    step.  :meth:`activate_batch` advances a batch of independent network
+    states (one per input row) by one step.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.state = None
+
+    @staticmethod
+    def from_network(network, dtype=None):
+        """Build a vectorized network from a :class:`RecurrentNetwork`."""
+        layer_of = {ne[0]: 0 for ne in network.node_evals}
+        args, kwargs = _pack_node_evals(network.input_nodes, network.output_nodes, network.node_evals,
+                                        {}, layer_of, dtype)
+        return VectorizedRecurrentNetwork(*args, **kwargs)
+
+    @staticmethod
+    def create(genome, config, simplify=True, dtype=None):
+        """Receives a genome and returns its vectorized recurrent phenotype."""
+        from neat.nn.recurrent import RecurrentNetwork
+        return VectorizedRecurrentNetwork.from_network(RecurrentNetwork.create(genome, config, simplify),
+                                                       dtype=dtype)
+
+    def to_network(self):
+        """Rebuild the equivalent :class:`RecurrentNetwork`, e.g. for JSON export."""
+        from neat.nn.recurrent import RecurrentNetwork
+        node_evals, fixed = self._scalar_node_evals()
+        return RecurrentNetwork(self.input_nodes, self.output_nodes, node_evals)
+
+    def reset(self):
+        self.state = None
+
+    def activate_batch(self, inputs):
+        """
+        Advance one state per row of ``inputs`` ([n_samples, n_inputs]) by one step.
+
+        Returns an array of shape [n_samples, n_outputs].  The number of rows
+        must stay the same between calls until :meth:`reset`.
+        """
+        np = _import_numpy()
+        values = self._initial_values(np, inputs, ())
+        if self.state is not None:
+            if self.state.shape != values.shape:
+                raise RuntimeError(f"Expected {self.state.shape[0]} input rows, got {values.shape[0]}; "
+                                   "call reset() to change the batch size")
+            values[..., len(self.input_nodes):] = self.state[..., len(self.input_nodes):]
+        # The single layer reads every source before writing any node, so
+        # nodes see the previous step's values, as in RecurrentNetwork.
+        self.state = self._evaluate(values)
+        return self.state[..., self.output_slots]
@@ -101,6 +101,14 @@ class ParallelEvaluator:
         self.close()
 
     def evaluate(self, genomes, config):
+        self.evaluate_async(genomes, config).join()
+
+    def evaluate_async(self, genomes, config):
+        """
+        Starts the evaluation of ``genomes`` in the pool and returns an
+        :class:`AsyncEvaluation`, whose ``join`` method waits for it and
+        assigns the fitnesses.  Used by ``Population.run`` with ``pipeline``.
+        """
         jobs = []
         for ignored_genome_id, genome in genomes:
             if self.seed is not None:
@@ -112,7 +120,18 @@ class ParallelEvaluator:
             else:
                 # Original behavior - no seed
                 jobs.append(self.pool.apply_async(self.eval_function, (genome, config)))
+        return AsyncEvaluation(jobs, genomes, self.timeout)
+
+
+class AsyncEvaluation:
+    """Fitness evaluations started by :meth:`ParallelEvaluator.evaluate_async`."""
+
+    def __init__(self, jobs, genomes, timeout=None):
+        self.jobs = jobs
+        self.genomes = genomes
+        self.timeout = timeout
 
-        # assign the fitness back to each genome
-        for job, (ignored_genome_id, genome) in tqdm(zip(jobs, genomes), total=len(jobs)):
+    def join(self):
+        """Waits for the evaluations and assigns the fitness of each genome."""
+        for job, (ignored_genome_id, genome) in tqdm(zip(self.jobs, self.genomes), total=len(self.jobs)):
             genome.fitness = job.get(timeout=self.timeout)
@@ -65,6 +65,12 @@ class Population:
 
         self.best_genome = None
         self._skip_first_evaluation = False
+        # Evaluations skipped with carry_over_fitness and deduplicate_evaluations,
+        # over all generations run.
+        self.skipped_evaluations = 0
+        self.deduplicated_evaluations = 0
+        # An executor (such as ParallelEvaluator.pool) to compute speciation distances with.
+        self.speciation_executor = None
 
     def add_reporter(self, reporter):
         self.reporters.add(reporter)
@@ -72,7 +78,7 @@ class Population:
     def remove_reporter(self, reporter):
         self.reporters.remove(reporter)
 
-    def run(self, fitness_function, n=None):
+    def run(self, fitness_function, n=None, pipeline=False):
         """
         Runs NEAT's genetic algorithm for at most n generations.  If n
         is None, run until solution is found or extinction occurs.
@@ -90,12 +96,31 @@ class Population:
         It is assumed that fitness_function does not modify the list of genomes,
         the genomes themselves (apart from updating the fitness member),
         or the configuration object.
+
+        With carry_over_fitness, genomes that already have a fitness (elites,
+        which reproduction keeps unchanged) are not passed to fitness_function
+        again and keep their fitness; skipped_evaluations counts them.  With
+        deduplicate_evaluations, only the first genome (in id order) of those
+        with the same fingerprint (see DefaultGenome.fingerprint) is passed to
+        fitness_function, and the others are given its fitness;
+        deduplicated_evaluations counts them.
+
+        With pipeline, fitness_function instead only starts the evaluation
+        (such as in other processes) and returns an object whose join() method
+        waits for it and assigns the fitnesses, as ParallelEvaluator.evaluate_async
+        does.  Each new generation is then evaluated while it is speciated and
+        end_generation is reported, and joined where it would otherwise have
+        been evaluated; the results are those of the sequential loop, provided
+        that evaluation does not depend on the state of this process.
         """
 
         if self.config.no_fitness_termination and (n is None):
             raise RuntimeError("Cannot have no generational limit with no fitness termination")
 
         k = 0
+        pending = None
+        skipped = 0
+        duplicates = []
         while n is None or k < n:
             k += 1
 
@@ -108,7 +133,19 @@ class Population:
                 self._skip_first_evaluation = False
             else:
                 # Evaluate all genomes using the user-provided function.
-                fitness_function(list(self.population.items()), self.config)
+                if not pipeline:
+                    genomes, skipped, duplicates = self._genomes_to_evaluate()
+                    self._count_skipped(skipped, duplicates)
+                    fitness_function(genomes, self.config)
+                else:
+                    if pending is None:
+                        genomes, skipped, duplicates = self._genomes_to_evaluate()
+                        pending = fitness_function(genomes, self.config)
+                    self._count_skipped(skipped, duplicates)
+                    pending.join()
+                    pending = None
+                for genome, evaluated in duplicates:
+                    genome.fitness = evaluated.fitness
 
                 # Gather and report statistics.
                 best = None
@@ -148,8 +185,17 @@ class Population:
                 else:
                     raise CompleteExtinctionException()
 
+            if pipeline and (n is None or k < n):
+                # Start evaluating the new generation while it is speciated.
+                genomes, skipped, duplicates = self._genomes_to_evaluate()
+                pending = fitness_function(genomes, self.config)
+
             # Divide the new population into species.
-            self.species.speciate(self.config, self.population, self.generation)
+            if self.speciation_executor is not None:
+                self.species.speciate(self.config, self.population, self.generation,
+                                      executor=self.speciation_executor)
+            else:
+                self.species.speciate(self.config, self.population, self.generation)
 
             self.reporters.end_generation(self.config, self.population, self.species)
 
@@ -159,3 +205,45 @@ class Population:
             self.reporters.found_solution(self.config, self.generation, self.best_genome)
 
         return self.best_genome
+
+    def _genomes_to_evaluate(self):
+        """
+        The (genome id, genome) pairs to pass to the fitness function, the
+        number of genomes that keep their fitness, and (genome, genome to take
+        the fitness of) pairs for the duplicates of other genomes.
+        """
+        genomes = list(self.population.items())
+        carry_over = getattr(self.config, 'carry_over_fitness', False)
+        evaluate = [(gid, g) for gid, g in genomes if g.fitness is None] if carry_over else genomes
+        skipped = len(genomes) - len(evaluate)
+        duplicates = []
+        if getattr(self.config, 'deduplicate_evaluations', False):
+            genome_config = self.config.genome_config
+            digits = self.config.fingerprint_digits
+            first = {}
+            if carry_over:
+                # Genomes that keep their fitness can give it to their duplicates.
+                for gid, g in sorted(genomes):
+                    if g.fitness is not None:
+                        first.setdefault(g.fingerprint(genome_config, digits), g)
+            distinct = []
+            for gid, g in sorted(evaluate):
+                fingerprint = g.fingerprint(genome_config, digits)
+                evaluated = first.setdefault(fingerprint, g)
+                if evaluated is g:
+                    distinct.append((gid, g))
+                else:
+                    duplicates.append((g, evaluated))
+            evaluate = distinct
+        return evaluate, skipped, duplicates
+
+    def _count_skipped(self, skipped, duplicates):
+        if skipped:
+            self.skipped_evaluations += skipped
+            self.reporters.info(f"Kept the fitness of {skipped} unchanged genomes")
+        if getattr(self.config, 'deduplicate_evaluations', False):
+            self.deduplicated_evaluations += len(duplicates)
+            evaluated = len(self.population) - skipped
+            ratio = len(duplicates) / evaluated if evaluated else 0.0
+            self.reporters.info(f"Deduplication: {len(duplicates)} of {evaluated} genomes to evaluate "
+                                f"are duplicates ({ratio:.1%})")
@@ -7,9 +7,11 @@ import math
 import random
 from itertools import count
 
+from neat.bulk_initialization import create_genomes, supports_bulk
 from neat.config import ConfigParameter, DefaultClassConfig
 from neat.innovation import InnovationTracker
 from neat.math_util import mean
+from neat.vectorized_mutation import make_generator, mutate_attributes
 
 
 # TODO: Provide some sort of optional cross-species performance criteria, which
@@ -32,7 +34,12 @@ class DefaultReproduction(DefaultClassConfig):
                                    ConfigParameter('min_species_size', int, 1),
                                    ConfigParameter('fitness_sharing', str, 'normalized'),
                                    ConfigParameter('spawn_method', str, 'smoothed'),
-                                   ConfigParameter('interspecies_crossover_prob', float, 0.0)],
+                                   ConfigParameter('interspecies_crossover_prob', float, 0.0),
+                                   ConfigParameter('attribute_mutation', str, 'per_gene'),
+                                   ConfigParameter('attribute_mutation_seed', str, 'none'),
+                                   ConfigParameter('initialization', str, 'per_genome'),
+                                   ConfigParameter('initialization_workers', int, 1),
+                                   ConfigParameter('gene_compaction_generations', int, 0)],
                                   'DefaultReproduction')
 
     def __init__(self, config, reporters, stagnation):
@@ -42,6 +49,16 @@ class DefaultReproduction(DefaultClassConfig):
         self.genome_indexer = count(1)
         self.stagnation = stagnation
         self.ancestors = {}
+
+        if config.attribute_mutation not in ('per_gene', 'vectorized'):
+            raise RuntimeError(f"Invalid attribute_mutation {config.attribute_mutation!r}")
+        seed = config.attribute_mutation_seed
+        self.attribute_mutation_seed = None if seed.lower() == 'none' else int(seed)
+        if config.initialization not in ('per_genome', 'bulk'):
+            raise RuntimeError(f"Invalid initialization {config.initialization!r}")
+        if config.gene_compaction_generations < 0:
+            raise RuntimeError(
+                f"Invalid gene_compaction_generations {config.gene_compaction_generations!r}")
         
         # Create innovation tracker for tracking structural mutations
         # Per NEAT paper (Stanley & Miikkulainen, 2002), this persists across generations
@@ -52,6 +69,14 @@ class DefaultReproduction(DefaultClassConfig):
         # Set innovation tracker for initial genome creation
         genome_config.innovation_tracker = self.innovation_tracker
         
+        if self.reproduction_config.initialization == 'bulk' and supports_bulk(genome_type):
+            keys = [next(self.genome_indexer) for i in range(num_genomes)]
+            new_genomes = create_genomes(genome_type, genome_config, keys,
+                                         num_workers=self.reproduction_config.initialization_workers)
+            for key in keys:
+                self.ancestors[key] = tuple()
+            return new_genomes
+
         new_genomes = {}
         for i in range(num_genomes):
             key = next(self.genome_indexer)
@@ -193,6 +218,9 @@ class DefaultReproduction(DefaultClassConfig):
         # TODO: I don't like this modification of the species and stagnation objects,
         # because it requires internal knowledge of the objects.
 
+        vectorized = self.reproduction_config.attribute_mutation == 'vectorized'
+        offspring = []
+
         # Filter out stagnated species, collect the set of non-stagnated
         # species members, and compute their average adjusted fitness.
         # The average adjusted fitness scheme (normalized to the interval
@@ -265,6 +293,7 @@ class DefaultReproduction(DefaultClassConfig):
         spawn_amounts = self._adjust_spawn_exact(spawn_amounts, pop_size, min_species_size)
 
         new_population = {}
+        elites = set()
         species.species = {}
         for spawn, s in zip(spawn_amounts, remaining_species):
             # If elitism is enabled, each species always at least gets to retain its elites.
@@ -289,6 +318,7 @@ class DefaultReproduction(DefaultClassConfig):
             if self.reproduction_config.elitism > 0:
                 for i, m in old_members[:self.reproduction_config.elitism]:
                     new_population[i] = m
+                    elites.add(i)
                     spawn -= 1
 
             if spawn <= 0:
@@ -325,8 +355,53 @@ class DefaultReproduction(DefaultClassConfig):
                 child = config.genome_type(gid)
                 child.configure_crossover(parent1, parent2, config.genome_config,
                                          fitness_criterion=config.fitness_criterion)
-                child.mutate(config.genome_config)
+                if vectorized:
+                    child.mutate(config.genome_config, attributes=False)
+                    offspring.append(child)
+                else:
+                    child.mutate(config.genome_config)
                 new_population[gid] = child
                 self.ancestors[gid] = (parent1_id, parent2_id)
 
+        if vectorized:
+            rng = make_generator(self.attribute_mutation_seed, generation, random)
+            mutate_attributes(offspring, config.genome_config, rng)
+
+        if self.reproduction_config.gene_compaction_generations > 0:
+            self.compact_genes(config.genome_config, new_population, generation, preserved=elites)
+
         return new_population
+
+    def compact_genes(self, genome_config, population, generation, preserved=()):
+        """
+        Removes from ``population`` the connection genes that no genome has
+        expressed (see ``expressed_connections``) for ``gene_compaction_generations``
+        generations, and the hidden nodes left without connections by their
+        removal; the networks of the genomes do not change.  Which genes are
+        expressed is recorded in the innovation tracker every generation, for
+        all of ``population``, but the genomes with ids in ``preserved`` (the
+        elites carried over unchanged) are not compacted.
+        """
+        present = set()
+        expressed = set()
+        expressed_keys = {}
+        for gid, genome in population.items():
+            keys = expressed_keys[gid] = genome.expressed_connections(genome_config)
+            for key, cg in genome.connections.items():
+                present.add(cg.innovation)
+                if key in keys:
+                    expressed.add(cg.innovation)
+        tracker = self.innovation_tracker
+        tracker.record_expression(present, expressed, generation)
+        stale = tracker.inexpressed_innovations(generation, self.reproduction_config.gene_compaction_generations)
+        if not stale:
+            return
+
+        num_nodes = num_connections = 0
+        for gid, genome in population.items():
+            if gid in preserved:
+                continue
+            nodes, connections = genome.compact_genes(genome_config, stale, expressed_keys[gid])
+            num_nodes += nodes
+            num_connections += connections
+        self.reporters.info(f"Gene compaction removed {num_connections} connection genes and {num_nodes} node genes")
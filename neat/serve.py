@@ -0,0 +1,377 @@
+"""
+Local micro-batching inference server for evolved feed-forward networks.
+
+Concurrent ``activate`` requests are coalesced into micro-batches and
+evaluated together by a :class:`neat.nn.VectorizedFeedForwardNetwork`, so the
+per-request Python overhead is paid once per batch rather than once per
+request.  The served model can be replaced at any time (for example from a
+new checkpoint) without dropping requests: batches already being evaluated
+finish on the old model and every later batch uses the new one.
+
+Requires NumPy (imported lazily, when a model is loaded).
+
+Usage::
+
+    server = InferenceServer(load_model('winner.json'), port=8000)
+    server.start()
+    ...
+    server.swap_model(load_model('neat-checkpoint-99'))
+    ...
+    server.shutdown()
+
+or from the command line::
+
+    python -m neat.serve winner.json --port 8000
+
+HTTP interface:
+
+* ``POST /activate`` with ``{"inputs": [x1, x2, ...]}`` returns
+  ``{"outputs": [...]}``; a list of input vectors returns a list of outputs.
+* ``POST /reload`` with ``{"path": "..."}`` hot-swaps the model from a JSON
+  export.  Reloading over HTTP is disabled unless the server is given a
+  ``reload_dir``, and then only ``.json`` files inside that directory are
+  accepted; checkpoints are pickles, which can run arbitrary code when
+  loaded, so they can only be swapped in from Python with
+  :meth:`InferenceServer.swap_model`.
+* ``GET /stats`` returns request and batch counters.
+"""
+
+import gzip
+import json
+import os
+import pickle
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from neat.export import load_network_json
+from neat.nn.feed_forward import FeedForwardNetwork
+from neat.nn.vectorized import VectorizedFeedForwardNetwork, VectorizedRecurrentNetwork, _import_numpy
+
+
+def _best_checkpoint_genome(filename):
+    """Return ``(genome, config)`` for the fittest genome stored in a checkpoint file."""
+    # Read the file directly: Checkpointer.restore_checkpoint would also reset
+    # the global random state, which a server has no business doing.
+    with gzip.open(filename) as f:
+        data = pickle.load(f)
+    config, population = data[1], data[2]
+    best = data[5] if len(data) == 6 else None
+    if best is None:
+        evaluated = [g for g in population.values() if g.fitness is not None]
+        if not evaluated:
+            raise ValueError(f"Checkpoint {filename} contains no evaluated genomes")
+        best = max(evaluated, key=lambda g: g.fitness)
+    return best, config
+
+
+def load_model(source, config=None):
+    """
+    Build a vectorized network to serve from ``source``.
+
+    ``source`` may be a :class:`VectorizedFeedForwardNetwork`, a
+    :class:`FeedForwardNetwork`, a genome (``config`` is then required), a
+    path to a ``.json`` file written by :func:`neat.export.export_network_json`,
+    or a path to a checkpoint file (the best genome it contains is served).
+    """
+    if isinstance(source, VectorizedRecurrentNetwork):
+        raise ValueError("Recurrent networks keep per-caller state and cannot be micro-batched")
+    if isinstance(source, VectorizedFeedForwardNetwork):
+        return source
+    if isinstance(source, FeedForwardNetwork):
+        return VectorizedFeedForwardNetwork.from_network(source)
+    if hasattr(source, 'connections') and hasattr(source, 'nodes'):
+        if config is None:
+            raise ValueError("A config is required to serve a genome")
+        return VectorizedFeedForwardNetwork.create(source, config)
+
+    filename = str(source)
+    if filename.endswith('.json'):
+        network = load_network_json(filename)
+        if not isinstance(network, VectorizedFeedForwardNetwork):
+            raise ValueError(f"Only feedforward networks can be served, got {type(network).__name__}")
+        return load_model(network)
+    genome, saved_config = _best_checkpoint_genome(filename)
+    return VectorizedFeedForwardNetwork.create(genome, config or saved_config)
+
+
+class _Request:
+    __slots__ = ('inputs', 'done', 'outputs', 'error')
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.done = threading.Event()
+        self.outputs = None
+        self.error = None
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests into batches evaluated by one network.
+
+    A worker thread takes the first waiting request, then keeps collecting
+    requests until ``max_batch_size`` are queued or ``max_delay`` seconds have
+    passed, and evaluates them with a single ``activate_batch`` call.
+    """
+
+    def __init__(self, network, max_batch_size=64, max_delay=0.001):
+        self.network = network
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.requests = 0
+        self.batches = 0
+        self.swaps = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._worker = None
+
+    def start(self):
+        if self._worker is None:
+            self._stopping.clear()
+            self._worker = threading.Thread(target=self._run, name='neat-serve-batcher', daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        """Stop the worker after the requests already queued have been answered."""
+        if self._worker is not None:
+            self._stopping.set()
+            self._worker.join()
+            self._worker = None
+
+    def swap(self, network):
+        """Serve ``network`` from the next batch on; queued requests are not dropped."""
+        if len(network.input_nodes) != len(self.network.input_nodes):
+            raise ValueError(f"New model expects {len(network.input_nodes)} inputs, "
+                             f"the served model {len(self.network.input_nodes)}")
+        with self._lock:
+            self.network = network
+            self.swaps += 1
+
+    def submit(self, inputs, timeout=None):
+        """Evaluate one input vector; blocks until its batch has been evaluated."""
+        return self.submit_many([inputs], timeout)[0]
+
+    def submit_many(self, inputs_list, timeout=None):
+        """Evaluate several input vectors, which may share batches with other requests."""
+        # Check every input vector before queueing it, so that a malformed
+        # request is rejected here rather than failing the batch it joins.
+        num_inputs = len(self.network.input_nodes)
+        requests = []
+        for inputs in inputs_list:
+            inputs = [float(x) for x in inputs]
+            if len(inputs) != num_inputs:
+                raise ValueError(f"Expected {num_inputs} inputs, got {len(inputs)}")
+            requests.append(_Request(inputs))
+        if self._worker is None:
+            raise RuntimeError("MicroBatcher has not been started")
+        for request in requests:
+            self._queue.put(request)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for request in requests:
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            if not request.done.wait(remaining):
+                raise TimeoutError("Inference request timed out")
+            if request.error is not None:
+                raise request.error
+        return [request.outputs for request in requests]
+
+    def stats(self):
+        return {'requests': self.requests,
+                'batches': self.batches,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'swaps': self.swaps}
+
+    def _run(self):
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            batch = [first]
+            deadline = time.perf_counter() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._evaluate(batch)
+
+    def _evaluate(self, batch):
+        np = _import_numpy()
+        with self._lock:
+            network = self.network
+        try:
+            outputs = network.activate_batch(np.array([r.inputs for r in batch], dtype=float)).tolist()
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                # Evaluate the requests one by one, so that only the ones
+                # that fail get an error.
+                for r in batch:
+                    try:
+                        r.outputs = network.activate_batch(np.array([r.inputs], dtype=float)).tolist()[0]
+                    except Exception as error:
+                        r.error = error
+        else:
+            for r, out in zip(batch, outputs):
+                r.outputs = out
+        self.requests += len(batch)
+        self.batches += 1
+        for r in batch:
+            r.done.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'neat-serve'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self._reply(200, self.server.inference.stats())
+        else:
+            self._reply(404, {'error': f'unknown path {self.path}'})
+
+    def do_POST(self):
+        inference = self.server.inference
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            if self.path == '/activate':
+                inputs = body['inputs']
+                if inputs and isinstance(inputs[0], list):
+                    result = inference.batcher.submit_many(inputs)
+                else:
+                    result = inference.batcher.submit(inputs)
+                self._reply(200, {'outputs': result})
+            elif self.path == '/reload':
+                path = inference.reload_path(body['path'])
+                if path is None:
+                    self._reply(403, {'error': 'reloading this path is not allowed'})
+                else:
+                    inference.swap_model(path)
+                    self._reply(200, {'swaps': inference.batcher.swaps})
+            else:
+                self._reply(404, {'error': f'unknown path {self.path}'})
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            self._reply(400, {'error': str(e)})
+        except Exception as e:
+            self._reply(500, {'error': str(e)})
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 makes bursts of clients wait for SYN retries.
+    request_queue_size = 128
+
+
+class InferenceServer:
+    """
+    HTTP front end for a :class:`MicroBatcher`, bound to a local address.
+
+    Use ``port=0`` to bind a free port; the bound address is available as
+    :attr:`address` once the server has been constructed.  ``POST /reload``
+    is refused unless ``reload_dir`` is given, and then only accepts ``.json``
+    network exports inside that directory.
+    """
+
+    def __init__(self, model, config=None, host='127.0.0.1', port=0, max_batch_size=64, max_delay=0.001,
+                 reload_dir=None):
+        self.config = config
+        self.reload_dir = None if reload_dir is None else os.path.realpath(reload_dir)
+        self.batcher = MicroBatcher(load_model(model, config), max_batch_size, max_delay)
+        self.httpd = _HTTPServer((host, port), _Handler)
+        self.httpd.inference = self
+        self._thread = None
+
+    @property
+    def address(self):
+        return self.httpd.server_address[:2]
+
+    @property
+    def url(self):
+        host, port = self.address
+        return f'http://{host}:{port}'
+
+    def swap_model(self, source, config=None):
+        """Hot-swap the served model; see :func:`load_model` for accepted sources."""
+        self.batcher.swap(load_model(source, config or self.config))
+
+    def reload_path(self, path):
+        """
+        Return the resolved ``path`` if an HTTP client may reload the model
+        from it, and None otherwise.  Relative paths are taken relative to
+        ``reload_dir``.
+        """
+        if self.reload_dir is None or not isinstance(path, str) or not path.endswith('.json'):
+            return None
+        path = os.path.realpath(os.path.join(self.reload_dir, path))
+        if os.path.commonpath([self.reload_dir, path]) != self.reload_dir:
+            return None
+        return path
+
+    def stats(self):
+        return self.batcher.stats()
+
+    def start(self):
+        """Serve requests from a background thread."""
+        self.batcher.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='neat-serve-http', daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """Serve requests from the calling thread until interrupted."""
+        self.batcher.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.batcher.stop()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.batcher.stop()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve an exported network or checkpoint over HTTP.')
+    parser.add_argument('model', help='JSON network export or checkpoint file')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-delay', type=float, default=0.001, help='seconds to wait while filling a batch')
+    parser.add_argument('--reload-dir', default=None,
+                        help='allow POST /reload of JSON exports in this directory (disabled by default)')
+    args = parser.parse_args(argv)
+
+    server = InferenceServer(args.model, host=args.host, port=args.port,
+                             max_batch_size=args.max_batch_size, max_delay=args.max_delay,
+                             reload_dir=args.reload_dir)
+    print(f"Serving {args.model} on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,15 @@
 """Divides the population into species based on genomic distances."""
+import math
+import os
+from collections import OrderedDict
 from itertools import count
+from types import SimpleNamespace
 
 from neat.config import ConfigParameter, DefaultClassConfig
+from neat.genes import DefaultConnectionGene, DefaultNodeGene
+from neat.genome import DefaultGenome
 from neat.math_util import mean, stdev
+from neat.vectorized_distance import DistanceEngine, supports_vectorized_distance
 
 
 class Species:
@@ -24,10 +31,79 @@ class Species:
         return [m.fitness for m in self.members.values()]
 
 
+def _pack_genome(genome):
+    """
+    The genes of a genome as tuples of the attributes compared by
+    :meth:`neat.DefaultGenome.distance`, in the genome's order.
+    """
+    return (genome.key,
+            tuple((k, ng.bias, ng.response, ng.time_constant, ng.activation, ng.aggregation)
+                  for k, ng in genome.nodes.items()),
+            tuple((k, cg.innovation, cg.weight, cg.enabled) for k, cg in genome.connections.items()))
+
+
+def _unpack_genome(packed):
+    """A DefaultGenome with the genes of :func:`_pack_genome`, in the same order."""
+    key, nodes, connections = packed
+    genome = DefaultGenome(key)
+    for k, bias, response, time_constant, activation, aggregation in nodes:
+        ng = DefaultNodeGene(k)
+        ng.bias = bias
+        ng.response = response
+        ng.time_constant = time_constant
+        ng.activation = activation
+        ng.aggregation = aggregation
+        genome.nodes[k] = ng
+    for k, innovation, weight, enabled in connections:
+        cg = DefaultConnectionGene(k, innovation=innovation)
+        cg.weight = weight
+        cg.enabled = enabled
+        genome.connections[k] = cg
+    return genome
+
+
+def _distance_shard(task):
+    """
+    Executor task: the distances from each genome of a batch to each genome
+    of a chunk, as rows (one per batch genome).
+    """
+    config, packed, genomes0, genomes = task
+    if packed:
+        genomes0 = [_unpack_genome(g) for g in genomes0]
+        genomes = [_unpack_genome(g) for g in genomes]
+    return [[genome0.distance(g, config) for g in genomes] for genome0 in genomes0]
+
+
 class GenomeDistanceCache:
-    def __init__(self, config):
+    """
+    Genomic distances, looked up by the keys of the two genomes.
+
+    ``distances`` holds the distances looked up since the cache was created or
+    since the last :meth:`update_genomes`.  With ``max_size`` above zero, the
+    distances computed are also kept across calls to :meth:`update_genomes`
+    (generations), for at most ``max_size`` of the most recently used pairs.
+
+    Distances computed by a :class:`neat.vectorized_distance.DistanceEngine`
+    sum the per-gene distances in a different order than the genome's
+    ``distance`` method, and can differ from it in the last bits.  Where that
+    could change a decision, such as for a distance within rounding of the
+    compatibility threshold, :meth:`exact` replaces them with the genome's own.
+    """
+
+    # Relative difference within which an engine distance may fall on either
+    # side of a limit once computed exactly.
+    _TOLERANCE = 1e-9
+
+    def __init__(self, config, engine=None, max_size=0):
         self.distances = {}
         self.config = config
+        self.engine = engine
+        self.max_size = max_size
+        self.stored = OrderedDict()
+        self.genomes = {}
+        self.computed = {}
+        # Pairs (in the order computed) whose distance is the engine's.
+        self.approximate = set()
         self.hits = 0
         self.misses = 0
 
@@ -36,16 +112,227 @@ class GenomeDistanceCache:
         g1 = genome1.key
         d = self.distances.get((g0, g1))
         if d is None:
-            # Distance is not already computed.
-            d = genome0.distance(genome1, self.config)
+            d = self._stored_distance(g0, g1)
+            if d is None:
+                # Distance is not already computed, unless by an executor.
+                d = self.computed.pop((g0, g1), None)
+                if d is None:
+                    d = genome0.distance(genome1, self.config)
+                self._store(g0, g1, d)
+                self.misses += 1
+            else:
+                self.hits += 1
             self.distances[g0, g1] = d
             self.distances[g1, g0] = d
-            self.misses += 1
         else:
             self.hits += 1
 
         return d
 
+    def _stored_distance(self, g0, g1):
+        if not self.max_size:
+            return None
+        pair = (g0, g1) if g0 <= g1 else (g1, g0)
+        d = self.stored.get(pair)
+        if d is not None:
+            self.stored.move_to_end(pair)
+        return d
+
+    def _store(self, g0, g1, d):
+        if not self.max_size:
+            return
+        self.stored[(g0, g1) if g0 <= g1 else (g1, g0)] = d
+        if len(self.stored) > self.max_size:
+            # Evict the least recently used pair.
+            self.stored.popitem(last=False)
+
+    def precompute(self, genome0, genomes):
+        """
+        With a :class:`neat.vectorized_distance.DistanceEngine`, computes the
+        distances from ``genome0`` to each of ``genomes`` not already known in
+        one batch, so that later calls find them in the cache.
+        """
+        if self.engine is None:
+            return
+        g0 = genome0.key
+        distances = self.distances
+        missing = [g for g in genomes
+                   if (g0, g.key) not in distances and self._stored_distance(g0, g.key) is None]
+        for g, d in zip(missing, self.engine.distances(genome0, missing)):
+            distances[g0, g.key] = d
+            distances[g.key, g0] = d
+            self._store(g0, g.key, d)
+            self.approximate.add((g0, g.key))
+        # Each of these distances is looked up once later; count that as the miss.
+        self.misses += len(missing)
+        self.hits -= len(missing)
+
+    def near(self, d, limit):
+        """Whether an engine distance ``d`` is within rounding of ``limit``."""
+        return abs(d - limit) <= self._TOLERANCE * max(abs(d), abs(limit))
+
+    def exact(self, genome0, genome1):
+        """
+        Returns the distance between the genomes, computed by the genome's
+        ``distance`` method (in the order the pair was first computed) if the
+        cached distance is the engine's.
+        """
+        d = self(genome0, genome1)
+        g0 = genome0.key
+        g1 = genome1.key
+        if (g1, g0) in self.approximate:
+            genome0, genome1 = genome1, genome0
+            g0, g1 = g1, g0
+        elif (g0, g1) not in self.approximate:
+            return d
+        self.approximate.remove((g0, g1))
+        d = genome0.distance(genome1, self.config)
+        self.distances[g0, g1] = d
+        self.distances[g1, g0] = d
+        self._store(g0, g1, d)
+        return d
+
+    def precompute_sharded(self, genomes0, genomes, executor, genome_type, workers=None):
+        """
+        Computes the distances from each of ``genomes0`` to each of ``genomes``
+        not already known across the processes of ``executor`` (anything with
+        an order-preserving ``map``, such as a :class:`multiprocessing.Pool` or
+        a :class:`concurrent.futures.Executor`), so that later calls find them.
+        Genomes whose distance is the default one are sent as tuples of their
+        genes' attributes rather than pickled, and rebuilt in the same order,
+        so the distances are those computed in this process.  Each distance
+        counts as a miss when it is looked up.
+
+        The work is split into a few chunks per worker.  ``workers`` defaults
+        to the executor's number of workers where it exposes one, otherwise to
+        the number of CPUs.
+        """
+        def known(g0, g1):
+            return ((g0, g1) in self.distances or (g0, g1) in self.computed or
+                    self._stored_distance(g0, g1) is not None)
+
+        missing = [g for g in genomes if not all(known(g0.key, g.key) for g0 in genomes0)]
+        if not genomes0 or not missing:
+            return
+        config = self.config
+        packed = (genome_type.distance is DefaultGenome.distance and
+                  supports_vectorized_distance(genome_type, config))
+        if packed:
+            # Only the coefficients, not the whole genome configuration.
+            config = SimpleNamespace(
+                compatibility_include_node_genes=config.compatibility_include_node_genes,
+                compatibility_disjoint_coefficient=config.compatibility_disjoint_coefficient,
+                compatibility_excess_coefficient=config.compatibility_excess_coefficient,
+                compatibility_weight_coefficient=config.compatibility_weight_coefficient,
+                compatibility_enable_penalty=getattr(config, 'compatibility_enable_penalty', 1.0))
+            batch = [_pack_genome(g) for g in genomes0]
+            chunks = [_pack_genome(g) for g in missing]
+        else:
+            batch = genomes0
+            chunks = missing
+        if workers is None:
+            # concurrent.futures executors and multiprocessing pools.
+            workers = (getattr(executor, '_max_workers', None) or getattr(executor, '_processes', None) or
+                       os.cpu_count() or 1)
+        # A few chunks per process, to even out the load.
+        size = math.ceil(len(missing) / (4 * workers))
+        tasks = [(config, packed, batch, chunks[i:i + size]) for i in range(0, len(missing), size)]
+        for i, rows in zip(range(0, len(missing), size), executor.map(_distance_shard, tasks)):
+            for genome0, row in zip(genomes0, rows):
+                for g, d in zip(missing[i:i + size], row):
+                    if not known(genome0.key, g.key):
+                        self.computed[genome0.key, g.key] = d
+
+    def update_genomes(self, genomes):
+        """
+        Starts a new round of lookups (normally a generation) among ``genomes``:
+        resets ``distances`` and the hit and miss counts, and forgets the kept
+        distances of genomes that are not among ``genomes`` or have changed.  A
+        genome is taken to be unchanged if it is the same object with the same
+        numbers of node and connection genes (gene compaction removes genes in
+        place) and has not been mutated since (its ``mutation_count``, if any,
+        is the same).
+        """
+        current = {g.key: (g, len(g.nodes), len(g.connections), getattr(g, 'mutation_count', 0))
+                   for g in genomes}
+        valid = set()
+        for key, (genome, *version) in current.items():
+            previous = self.genomes.get(key)
+            if previous is not None and previous[0] is genome and previous[1:] == tuple(version):
+                valid.add(key)
+        if self.stored:
+            self.stored = OrderedDict((pair, d) for pair, d in self.stored.items()
+                                      if pair[0] in valid and pair[1] in valid)
+        self.approximate = {(g0, g1) for g0, g1 in self.approximate
+                            if ((g0, g1) if g0 <= g1 else (g1, g0)) in self.stored}
+        self.genomes = current
+        self.distances = {}
+        self.computed = {}
+        self.hits = 0
+        self.misses = 0
+
+
+class GenomeDistanceBound:
+    """
+    Lower bounds on :meth:`neat.DefaultGenome.distance` from the numbers of
+    genes alone.  Genomes with ``n0`` and ``n1`` connection genes (one per
+    innovation number) have at least ``abs(n0 - n1)`` disjoint or excess
+    genes, each adding at least the smaller of their coefficients, and
+    likewise for node genes; homologous genes add nothing negative.
+    """
+
+    # Allowance for rounding in the exact distance.
+    _SLACK = 1.0 - 1e-9
+
+    def __init__(self, config):
+        excess_coefficient = config.compatibility_excess_coefficient
+        if excess_coefficient == 'auto':
+            excess_coefficient = config.compatibility_disjoint_coefficient
+        self.connection_coefficient = min(config.compatibility_disjoint_coefficient, float(excess_coefficient))
+        self.node_coefficient = (config.compatibility_disjoint_coefficient
+                                 if config.compatibility_include_node_genes else 0.0)
+        self.sizes = {}
+        self.checked = 0
+        self.skipped = 0
+
+    @staticmethod
+    def applies(config):
+        """Whether the bounds hold for the genomes of ``config`` (a :class:`neat.Config`)."""
+        genome_config = config.genome_config
+        coefficients = [genome_config.compatibility_disjoint_coefficient,
+                        genome_config.compatibility_weight_coefficient,
+                        getattr(genome_config, 'compatibility_enable_penalty', 1.0)]
+        if genome_config.compatibility_excess_coefficient != 'auto':
+            coefficients.append(float(genome_config.compatibility_excess_coefficient))
+        # The genome and gene distances must be the default ones, as for the vectorized engine.
+        return (supports_vectorized_distance(config.genome_type, genome_config) and
+                min(coefficients) >= 0.0)
+
+    def _size(self, genome):
+        size = self.sizes.get(genome.key)
+        if size is None:
+            size = self.sizes[genome.key] = (len(genome.nodes),
+                                             len({cg.innovation for cg in genome.connections.values()}))
+        return size
+
+    def __call__(self, genome0, genome1):
+        nodes0, connections0 = self._size(genome0)
+        nodes1, connections1 = self._size(genome1)
+        bound = 0.0
+        if nodes0 != nodes1:
+            bound += self.node_coefficient * abs(nodes0 - nodes1) / max(nodes0, nodes1)
+        if connections0 != connections1:
+            bound += self.connection_coefficient * abs(connections0 - connections1) / max(connections0, connections1)
+        return bound
+
+    def excludes(self, genome0, genome1, limit):
+        """Whether the distance between the genomes is certainly at least ``limit``."""
+        self.checked += 1
+        if self(genome0, genome1) * self._SLACK >= limit:
+            self.skipped += 1
+            return True
+        return False
+
 
 class DefaultSpeciesSet(DefaultClassConfig):
     """ Encapsulates the default speciation scheme. """
@@ -57,21 +344,35 @@ class DefaultSpeciesSet(DefaultClassConfig):
         self.indexer = count(1)
         self.species = {}
         self.genome_to_species = {}
+        self.distance_cache = None
+        if config.distance_cache_size < 0:
+            raise RuntimeError(f"Invalid distance_cache_size {config.distance_cache_size!r}")
 
     @classmethod
     def parse_config(cls, param_dict):
-        return DefaultClassConfig(param_dict,
-                                  [ConfigParameter('compatibility_threshold', float),
-                                   ConfigParameter('target_num_species', str, 'none'),
-                                   ConfigParameter('threshold_adjust_rate', float, 0.1),
-                                   ConfigParameter('threshold_min', float, 0.1),
-                                   ConfigParameter('threshold_max', float, 100.0)],
-                                  'DefaultSpeciesSet')
-
-    def speciate(self, config, population, generation):
+        return DefaultClassConfig(param_dict, cls.config_parameters(), cls.__name__)
+
+    @classmethod
+    def config_parameters(cls):
+        """The configuration parameters; subclasses with more parameters extend this list."""
+        return [ConfigParameter('compatibility_threshold', float),
+                ConfigParameter('target_num_species', str, 'none'),
+                ConfigParameter('threshold_adjust_rate', float, 0.1),
+                ConfigParameter('threshold_min', float, 0.1),
+                ConfigParameter('threshold_max', float, 100.0),
+                ConfigParameter('distance_engine', str, 'python'),
+                ConfigParameter('distance_cache_size', int, 0),
+                ConfigParameter('distance_bounds', bool, False)]
+
+    def speciate(self, config, population, generation, executor=None):
         """
         Place genomes into species by genetic similarity.
 
+        With an ``executor`` (such as the ``pool`` of a
+        :class:`neat.ParallelEvaluator`), the distances from the representatives
+        to the genomes are computed in batches across its processes; the
+        species are the same as without.
+
         Note that this method assumes the current representatives of the species are from the old
         generation, and that after speciation has been performed, the old representatives should be
         dropped and replaced with representatives from the new generation.  If you violate this
@@ -82,54 +383,105 @@ class DefaultSpeciesSet(DefaultClassConfig):
 
         compatibility_threshold = self.species_set_config.compatibility_threshold
 
-        # Find the best representatives for each existing species.
-        # Use a deterministic ordering for unspeciated genomes so that
-        # speciation is reproducible across runs and checkpoint restores.
-        unspeciated = list(sorted(population.keys()))
-        distances = GenomeDistanceCache(config.genome_config)
+        # Genomes are indexed in ascending id order so that speciation is
+        # reproducible across runs and checkpoint restores.
+        gids = sorted(population)
+        genomes = [population[gid] for gid in gids]
+        unassigned = bytearray(b'\x01') * len(genomes)
+        distances = self._distance_cache(config, population)
+        bounds = None
+        # With the vectorized engine all distances are computed in batches anyway.
+        if (self.species_set_config.distance_bounds and distances.engine is None and
+                GenomeDistanceBound.applies(config)):
+            bounds = GenomeDistanceBound(config.genome_config)
+        # With the vectorized engine, distances are batched in this process
+        # instead, and computed exactly where they are within rounding of the
+        # distance they are compared with.
+        refine = distances.engine is not None
+        if refine:
+            executor = None
+        if executor is not None:
+            distances.precompute_sharded([self.species[sid].representative for sid in sorted(self.species)],
+                                         genomes, executor, config.genome_type)
         new_representatives = {}
         new_members = {}
-        # Iterate species in deterministic id order.
+        # Find the best representatives for each existing species, in id order:
+        # the unassigned genome closest to the current representative.
         for sid in sorted(self.species.keys()):
-            s = self.species[sid]
-            candidates = []
-            for gid in unspeciated:
-                g = population[gid]
-                d = distances(s.representative, g)
-                candidates.append((d, g))
-
-            # The new representative is the genome closest to the current representative.
-            ignored_rdist, new_rep = min(candidates, key=lambda x: x[0])
-            new_rid = new_rep.key
-            new_representatives[sid] = new_rid
-            new_members[sid] = [new_rid]
-            unspeciated.remove(new_rid)
-
-        # Partition population into species based on genetic similarity.
-        # Iterate remaining genomes in ascending id order for determinism.
-        while unspeciated:
-            gid = unspeciated.pop(0)
-            g = population[gid]
-
-            # Find the species with the most similar representative.
-            candidates = []
-            for sid, rid in new_representatives.items():
-                rep = population[rid]
+            rep = self.species[sid].representative
+            distances.precompute(rep, [g for g, u in zip(genomes, unassigned) if u])
+            closest = None
+            best = float('inf')
+            for i, g in enumerate(genomes):
+                if not unassigned[i] or (bounds is not None and bounds.excludes(rep, g, best)):
+                    continue
                 d = distances(rep, g)
-                if d < compatibility_threshold:
-                    candidates.append((d, sid))
+                if refine and closest is not None and distances.near(d, best):
+                    d = distances.exact(rep, g)
+                    best = distances.exact(rep, genomes[closest])
+                if closest is None or d < best:
+                    closest = i
+                    best = d
+            new_representatives[sid] = gids[closest]
+            new_members[sid] = [gids[closest]]
+            unassigned[closest] = 0
 
-            if candidates:
-                ignored_sdist, sid = min(candidates, key=lambda x: x[0])
-                new_members[sid].append(gid)
-            else:
+        # Partition the other genomes into species based on genetic similarity.
+        # In ascending id order, each goes to the species with the closest
+        # representative within the threshold (the first in species order on a
+        # tie), among the representatives above and those of the species founded
+        # by the genomes before it, or founds a new species.  The distances from
+        # each representative (a row) update the closest species of the genomes
+        # after it in one pass.
+        remaining = [i for i in range(len(genomes)) if unassigned[i]]
+        closest_distance = [compatibility_threshold] * len(genomes)
+        closest_species = [None] * len(genomes)
+
+        def update_closest(rep, sid, first):
+            distances.precompute(rep, [genomes[i] for i in remaining[first:]])
+            for i in remaining[first:]:
+                g = genomes[i]
+                best = closest_distance[i]
+                # A representative at least as far as an earlier candidate cannot be chosen.
+                if bounds is not None and bounds.excludes(rep, g, best):
+                    continue
+                d = distances(rep, g)
+                if refine and distances.near(d, best):
+                    d = distances.exact(rep, g)
+                    if closest_species[i] is not None:
+                        best = distances.exact(population[new_representatives[closest_species[i]]], g)
+                        closest_distance[i] = best
+                if d < best:
+                    closest_distance[i] = d
+                    closest_species[i] = sid
+
+        if executor is not None:
+            distances.precompute_sharded([population[rid] for rid in new_representatives.values()],
+                                         [genomes[i] for i in remaining], executor, config.genome_type)
+        for sid, rid in list(new_representatives.items()):
+            update_closest(population[rid], sid, 0)
+        for position, i in enumerate(remaining):
+            sid = closest_species[i]
+            if sid is None:
                 # No species is similar enough, create a new species, using
                 # this genome as its representative.
                 sid = next(self.indexer)
-                new_representatives[sid] = gid
-                new_members[sid] = [gid]
+                new_representatives[sid] = gids[i]
+                new_members[sid] = [gids[i]]
+                update_closest(genomes[i], sid, position + 1)
+            else:
+                new_members[sid].append(gids[i])
 
-        # Update species collection based on new speciation.
+        self._update_species(population, new_representatives, new_members, generation)
+        self._report_distances(population, distances)
+        if bounds is not None and bounds.checked:
+            self.reporters.info(
+                f'Distance bounds skipped {bounds.skipped} of {bounds.checked} distance computations '
+                f'({bounds.skipped / bounds.checked:.1%})')
+        self._adjust_threshold()
+
+    def _update_species(self, population, new_representatives, new_members, generation):
+        """Update species collection based on new speciation."""
         self.genome_to_species = {}
         for sid in sorted(new_representatives.keys()):
             rid = new_representatives[sid]
@@ -145,14 +497,22 @@ class DefaultSpeciesSet(DefaultClassConfig):
             member_dict = {gid: population[gid] for gid in members}
             s.update(population[rid], member_dict)
 
-        # Mean and std genetic distance info report
-        if len(population) > 1:
+    def _report_distances(self, population, distances):
+        """Mean and std genetic distance info report, and the distance cache statistics."""
+        if len(population) > 1 and distances.distances:
             gdmean = mean(distances.distances.values())
             gdstdev = stdev(distances.distances.values())
             self.reporters.info(
                 f'Mean genetic distance {gdmean:.3f}, standard deviation {gdstdev:.3f}')
+        if distances is self.distance_cache:
+            lookups = distances.hits + distances.misses
+            hit_rate = distances.hits / lookups if lookups else 0.0
+            self.reporters.info(
+                f'Distance cache: {distances.hits} hits, {distances.misses} misses '
+                f'({hit_rate:.1%} hit rate), {len(distances.stored)} distances kept')
 
-        # Dynamic threshold adjustment (only when target_num_species is configured).
+    def _adjust_threshold(self):
+        """Dynamic threshold adjustment (only when target_num_species is configured)."""
         target = self.species_set_config.target_num_species
         if target != 'none':
             target = int(target)
@@ -169,6 +529,36 @@ class DefaultSpeciesSet(DefaultClassConfig):
                 min(self.species_set_config.threshold_max,
                     self.species_set_config.compatibility_threshold))
 
+    def _distance_cache(self, config, population):
+        """
+        The GenomeDistanceCache for this generation: a new one, or with
+        ``distance_cache_size`` above zero the one kept across generations.
+        """
+        engine = self._distance_engine(config, population)
+        max_size = self.species_set_config.distance_cache_size
+        if not max_size:
+            return GenomeDistanceCache(config.genome_config, engine)
+
+        cache = self.distance_cache
+        if cache is None or cache.max_size != max_size:
+            cache = self.distance_cache = GenomeDistanceCache(config.genome_config, engine, max_size)
+        cache.config = config.genome_config
+        cache.engine = engine
+        # The old representatives are compared with the new generation too.
+        cache.update_genomes(list(population.values()) + [s.representative for s in self.species.values()])
+        return cache
+
+    def _distance_engine(self, config, population):
+        """The DistanceEngine for ``distance_engine = vectorized``, or None."""
+        engine = self.species_set_config.distance_engine
+        if engine == 'python':
+            return None
+        if engine != 'vectorized':
+            raise RuntimeError(f"Invalid distance_engine {engine!r}")
+        if not supports_vectorized_distance(config.genome_type, config.genome_config):
+            return None
+        return DistanceEngine(config.genome_config, population.values())
+
     def get_species_id(self, individual_id):
         return self.genome_to_species[individual_id]
 
@@ -185,11 +575,14 @@ class DefaultSpeciesSet(DefaultClassConfig):
             state['indexer'] = None
         else:
             state['_indexer_next_value'] = None
+        # Kept distances only save time; leave them out of checkpoints.
+        state['distance_cache'] = None
         return state
 
     def __setstate__(self, state):
         """Restore species set from pickled state, recreating indexer."""
         _indexer_next_value = state.pop('_indexer_next_value', None)
+        state.setdefault('distance_cache', None)
         self.__dict__.update(state)
         # Recreate the count object starting from the saved next value
         if _indexer_next_value is not None:
@@ -0,0 +1,247 @@
+"""
+Genomic distances of one genome to many others with NumPy (imported lazily).
+
+Selected with ``distance_engine = vectorized`` in the ``[DefaultSpeciesSet]``
+section.  :meth:`neat.DefaultSpeciesSet.speciate` calls
+``DefaultGenome.distance`` once for each pair of a species representative and
+a genome; each call builds dicts of both genomes' connection genes by
+innovation number and compares the genes one at a time.  A
+:class:`DistanceEngine` instead packs the genes of every genome once, as
+arrays sorted by innovation number (connections) and key (nodes), and
+computes the distances from one representative to a whole batch of genomes
+with a few array operations: ``searchsorted`` finds the representative's
+gene matching each gene of the batch, and per-genome sums are taken with
+``bincount``.
+
+The distances are those of :meth:`neat.DefaultGenome.distance`: excess and
+disjoint genes are told apart in the same way, and matching innovation
+numbers with different connection keys (innovation collisions) count as two
+disjoint genes.  Sums of the per-gene distances are taken in a different
+order, so results can differ in the last bits; speciation computes again
+with ``DefaultGenome.distance`` the distances that are within rounding of the
+threshold or of the distance they are compared with (see
+:meth:`neat.species.GenomeDistanceCache.exact`).
+"""
+
+from neat.compact_genome import CompactGenome, _intern
+from neat.genes import DefaultConnectionGene, DefaultNodeGene
+from neat.genome import DefaultGenome
+from neat.vectorized_mutation import _import_numpy
+
+
+def supports_vectorized_distance(genome_type, config):
+    """
+    Whether :class:`DistanceEngine` computes the distances of genomes of
+    ``genome_type`` with genome configuration ``config``: the genome and
+    gene distance methods must be the default ones.
+    """
+    return (issubclass(genome_type, DefaultGenome) and
+            genome_type.distance in (DefaultGenome.distance, CompactGenome.distance) and
+            config.node_gene_type.distance is DefaultNodeGene.distance and
+            config.connection_gene_type.distance is DefaultConnectionGene.distance)
+
+
+class _PackedGenome:
+    """
+    The genes of one genome as NumPy arrays: node keys (sorted) with their
+    attributes, and connections sorted by innovation number (one per number,
+    as in ``DefaultGenome.distance``) with their keys and attributes.
+    """
+    __slots__ = ('genome', 'node_keys', 'bias', 'response', 'time_constant', 'activation', 'aggregation',
+                 'innovation', 'in_node', 'out_node', 'weight', 'enabled')
+
+    def __init__(self, np, genome):
+        self.genome = genome
+        if isinstance(genome, CompactGenome):
+            self._from_tables(np, genome._node_table, genome._connection_table)
+            return
+
+        nodes = sorted(genome.nodes.items())
+        self.node_keys = np.array([k for k, ng in nodes], dtype=np.int64)
+        self.bias = np.array([ng.bias for k, ng in nodes], dtype=np.float64)
+        self.response = np.array([ng.response for k, ng in nodes], dtype=np.float64)
+        self.time_constant = np.array([ng.time_constant for k, ng in nodes], dtype=np.float64)
+        self.activation = np.array([_intern(ng.activation) for k, ng in nodes], dtype=np.int64)
+        self.aggregation = np.array([_intern(ng.aggregation) for k, ng in nodes], dtype=np.int64)
+
+        by_innovation = sorted({cg.innovation: cg for cg in genome.connections.values()}.items())
+        self.innovation = np.array([i for i, cg in by_innovation], dtype=np.int64)
+        self.in_node = np.array([cg.key[0] for i, cg in by_innovation], dtype=np.int64)
+        self.out_node = np.array([cg.key[1] for i, cg in by_innovation], dtype=np.int64)
+        self.weight = np.array([cg.weight for i, cg in by_innovation], dtype=np.float64)
+        self.enabled = np.array([cg.enabled for i, cg in by_innovation], dtype=bool)
+
+    def _from_tables(self, np, nodes, connections):
+        # The tables are already sorted, with string attributes interned.
+        def column(table, name, dtype):
+            return np.array(table.column(name), dtype=dtype)
+
+        self.node_keys = np.array(nodes.columns[0], dtype=np.int64)
+        self.bias = column(nodes, 'bias', np.float64)
+        self.response = column(nodes, 'response', np.float64)
+        self.time_constant = column(nodes, 'time_constant', np.float64)
+        self.activation = column(nodes, 'activation', np.int64)
+        self.aggregation = column(nodes, 'aggregation', np.int64)
+        self.innovation = np.array(connections.columns[0], dtype=np.int64)
+        self.in_node = np.array(connections.columns[1], dtype=np.int64)
+        self.out_node = np.array(connections.columns[2], dtype=np.int64)
+        self.weight = column(connections, 'weight', np.float64)
+        self.enabled = column(connections, 'enabled', bool)
+
+
+class _Pool:
+    """The arrays of a list of packed genomes, concatenated, with the genome (``owner``) of each gene."""
+
+    _NODE_COLUMNS = ('node_keys', 'bias', 'response', 'time_constant', 'activation', 'aggregation')
+    _CONNECTION_COLUMNS = ('innovation', 'in_node', 'out_node', 'weight', 'enabled')
+
+    def __init__(self, np, packed):
+        self.size = len(packed)
+        for names, sizes_name, owner_name in ((self._NODE_COLUMNS, 'num_nodes', 'node_owner'),
+                                              (self._CONNECTION_COLUMNS, 'num_connections', 'connection_owner')):
+            for name in names:
+                setattr(self, name, np.concatenate([getattr(p, name) for p in packed]))
+            sizes = np.array([len(getattr(p, names[0])) for p in packed], dtype=np.int64)
+            setattr(self, sizes_name, sizes)
+            setattr(self, owner_name, np.repeat(np.arange(len(packed)), sizes))
+        # Last innovation number of each genome (0 if it has no connections).
+        self.max_innovation = np.zeros(self.size, dtype=np.int64)
+        nonempty = self.num_connections > 0
+        self.max_innovation[nonempty] = self.innovation[np.cumsum(self.num_connections)[nonempty] - 1]
+
+
+class DistanceEngine:
+    """
+    Computes :meth:`neat.DefaultGenome.distance` from one genome to many.
+
+    Genomes are packed into arrays the first time they are seen, and the
+    genomes distances are computed to (``genomes``, and any later passed as
+    ``others``) are concatenated into one pool; the distances from a genome
+    to all of the pool are computed together.  Create a new engine (normally
+    once per generation) after genomes have changed.
+    """
+
+    def __init__(self, config, genomes=()):
+        self.np = _import_numpy()
+        self.config = config
+        self._packed = {}
+        self._members = []
+        self._index = {}
+        self._pool = None
+        self.add(genomes)
+
+    def _pack(self, genome):
+        packed = self._packed.get(genome.key)
+        if packed is None or packed.genome is not genome:
+            packed = self._packed[genome.key] = _PackedGenome(self.np, genome)
+        return packed
+
+    def add(self, genomes):
+        """Adds ``genomes`` to the pool."""
+        for genome in genomes:
+            i = self._index.get(genome.key)
+            if i is None:
+                self._index[genome.key] = len(self._members)
+                self._members.append(self._pack(genome))
+                self._pool = None
+            elif self._members[i].genome is not genome:
+                self._members[i] = self._pack(genome)
+                self._pool = None
+
+    def distances(self, genome, others):
+        """Returns the list of ``genome.distance(other, config)`` for each genome of ``others``."""
+        if not others:
+            return []
+        self.add(others)
+        if self._pool is None:
+            self._pool = _Pool(self.np, self._members)
+        row = self._distances_to_pool(self._pack(genome), self._pool)
+        return row[[self._index[other.key] for other in others]].tolist()
+
+    def distance_matrix(self, genomes, others):
+        """
+        Returns the array of distances from each of ``genomes`` (rows) to each
+        of ``others`` (columns); ``others`` form a pool of their own, so the
+        work and memory used grow with the size of the block only.
+        """
+        np = self.np
+        if not genomes or not others:
+            return np.zeros((len(genomes), len(others)))
+        pool = _Pool(np, [self._pack(other) for other in others])
+        return np.array([self._distances_to_pool(self._pack(genome), pool) for genome in genomes])
+
+    def _distances_to_pool(self, rep, pool):
+        """The distances from the packed genome ``rep`` to each genome of ``pool``, as an array."""
+        np = self.np
+        config = self.config
+        n = pool.size
+        coefficient = config.compatibility_weight_coefficient
+        disjoint_coefficient = config.compatibility_disjoint_coefficient
+
+        node_distance = np.zeros(n)
+        if config.compatibility_include_node_genes:
+            keys, owner, sizes = pool.node_keys, pool.node_owner, pool.num_nodes
+            m = len(rep.node_keys)
+            matched = np.zeros(len(keys), dtype=bool)
+            pos = np.zeros(len(keys), dtype=np.int64)
+            if m:
+                pos = np.minimum(np.searchsorted(rep.node_keys, keys), m - 1)
+                matched = rep.node_keys[pos] == keys
+            pos = pos[matched]
+            # As DefaultNodeGene.distance.
+            d = np.abs(pool.bias[matched] - rep.bias[pos]) + np.abs(pool.response[matched] - rep.response[pos])
+            d += np.abs(pool.time_constant[matched] - rep.time_constant[pos])
+            d += pool.activation[matched] != rep.activation[pos]
+            d += pool.aggregation[matched] != rep.aggregation[pos]
+            d *= coefficient
+            homologous = np.bincount(owner[matched], weights=d, minlength=n)
+            disjoint = m + sizes - 2 * np.bincount(owner[matched], minlength=n)
+            largest = np.maximum(m, sizes)
+            nonempty = largest > 0
+            node_distance[nonempty] = ((homologous[nonempty] + disjoint_coefficient * disjoint[nonempty]) /
+                                       largest[nonempty])
+
+        excess_coefficient = config.compatibility_excess_coefficient
+        if excess_coefficient == 'auto':
+            excess_coefficient = disjoint_coefficient
+        else:
+            excess_coefficient = float(excess_coefficient)
+        enable_penalty = getattr(config, 'compatibility_enable_penalty', 1.0)
+
+        innovation, owner, sizes = pool.innovation, pool.connection_owner, pool.num_connections
+        m = len(rep.innovation)
+        rep_max = int(rep.innovation[-1]) if m else 0
+        matched = homologous = np.zeros(len(innovation), dtype=bool)
+        pos = np.zeros(len(innovation), dtype=np.int64)
+        if m:
+            pos = np.minimum(np.searchsorted(rep.innovation, innovation), m - 1)
+            matched = rep.innovation[pos] == innovation
+            homologous = matched & (rep.in_node[pos] == pool.in_node) & (rep.out_node[pos] == pool.out_node)
+        pos = pos[homologous]
+        # As DefaultConnectionGene.distance.
+        d = np.abs(pool.weight[homologous] - rep.weight[pos])
+        d += (pool.enabled[homologous] != rep.enabled[pos]) * enable_penalty
+        d *= coefficient
+        homologous_distance = np.bincount(owner[homologous], weights=d, minlength=n)
+        num_matched = np.bincount(owner[matched], minlength=n)
+        num_homologous = np.bincount(owner[homologous], minlength=n)
+
+        # Unmatched genes beyond the other genome's last innovation are excess,
+        # the remaining unmatched genes disjoint; matching innovations with
+        # different keys count as two disjoint genes.
+        excess = np.bincount(owner[innovation > rep_max], minlength=n)
+        rep_excess = m - np.searchsorted(rep.innovation, pool.max_innovation, side='right')
+        disjoint = (sizes - num_matched - excess) + (m - num_matched - rep_excess)
+        disjoint += 2 * (num_matched - num_homologous)
+        excess += rep_excess
+
+        connection_distance = np.zeros(n)
+        largest = np.maximum(m, sizes)
+        nonempty = largest > 0
+        connection_distance[nonempty] = (
+            homologous_distance[nonempty]
+            + disjoint_coefficient * disjoint[nonempty]
+            + excess_coefficient * excess[nonempty]
+        ) / largest[nonempty]
+
+        return node_distance + connection_distance
@@ -0,0 +1,299 @@
+"""
+Population-level mutation of gene attributes with NumPy (imported lazily).
+
+Selected with ``attribute_mutation = vectorized`` in the
+``[DefaultReproduction]`` section.  Instead of each offspring mutating its
+genes one attribute at a time, :class:`neat.DefaultReproduction` applies only
+the structural mutations per genome and then passes all offspring of the
+generation to :func:`mutate_attributes`.  That gathers each attribute of
+every gene into one array, applies the attribute's mutate/replace/clamp rules
+with vectorized draws from a ``numpy.random.Generator``, and writes back only
+the values that changed.
+
+The rules are those of :mod:`neat.attributes`, so the distribution of the
+results is unchanged, but the random numbers come from the NumPy generator
+rather than the ``random`` module, so a run differs from one using per-gene
+mutation.  Runs are reproducible: see :func:`make_generator`.
+"""
+
+from operator import attrgetter
+
+from neat.attributes import BoolAttribute, FloatAttribute, IntegerAttribute, StringAttribute
+
+
+def _import_numpy():
+    """Import and return NumPy, or raise an informative error."""
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        raise ImportError(
+            "NumPy is required for attribute_mutation = vectorized but is not installed.\n"
+            "Install it with: pip install numpy"
+        ) from None
+
+
+def make_generator(seed, generation, python_random):
+    """
+    Returns the ``numpy.random.Generator`` for the offspring of ``generation``.
+
+    With an integer ``seed`` the generator depends only on the seed and the
+    generation number.  With ``seed`` None it is seeded from ``python_random``
+    (normally the ``random`` module, which :class:`neat.Population` seeds and
+    checkpoints save), so that seeded runs and restored checkpoints reproduce.
+    """
+    np = _import_numpy()
+    if seed is None:
+        return np.random.default_rng(python_random.getrandbits(64))
+    return np.random.default_rng([seed, generation])
+
+
+def _float_init(np, attribute, config):
+    mean = getattr(config, attribute.init_mean_name)
+    stdev = getattr(config, attribute.init_stdev_name)
+    min_value = getattr(config, attribute.min_value_name)
+    max_value = getattr(config, attribute.max_value_name)
+    init_type = getattr(config, attribute.init_type_name).lower()
+
+    if ('gauss' in init_type) or ('normal' in init_type):
+        def init(rng, n):
+            return np.clip(rng.normal(mean, stdev, n), min_value, max_value)
+    elif 'uniform' in init_type:
+        low = max(min_value, (mean - (2 * stdev)))
+        high = min(max_value, (mean + (2 * stdev)))
+
+        def init(rng, n):
+            return rng.uniform(low, high, n)
+    else:
+        raise RuntimeError(f"Unknown init_type {getattr(config, attribute.init_type_name)!r} "
+                           f"for {attribute.init_type_name!s}")
+    return init
+
+
+def _float_rule(np, attribute, config):
+    mutate_rate = getattr(config, attribute.mutate_rate_name)
+    mutate_power = getattr(config, attribute.mutate_power_name)
+    replace_limit = getattr(config, attribute.replace_rate_name) + mutate_rate
+    min_value = getattr(config, attribute.min_value_name)
+    max_value = getattr(config, attribute.max_value_name)
+    init = _float_init(np, attribute, config)
+
+    def mutate(rng, values):
+        values = np.asarray(values, dtype=float)
+        r = rng.random(len(values))
+        mutated = r < mutate_rate
+        replaced = ~mutated & (r < replace_limit)
+        result = values.copy()
+        result[mutated] = np.clip(values[mutated] + rng.normal(0.0, mutate_power, mutated.sum()),
+                                  min_value, max_value)
+        if replaced.any():
+            result[replaced] = init(rng, replaced.sum())
+        return result, mutated | replaced
+
+    return mutate
+
+
+def _integer_init(np, attribute, config):
+    min_value = getattr(config, attribute.min_value_name)
+    max_value = getattr(config, attribute.max_value_name)
+
+    def init(rng, n):
+        return rng.integers(min_value, max_value, n, endpoint=True)
+
+    return init
+
+
+def _integer_rule(np, attribute, config):
+    mutate_rate = getattr(config, attribute.mutate_rate_name)
+    mutate_power = getattr(config, attribute.mutate_power_name)
+    replace_limit = getattr(config, attribute.replace_rate_name) + mutate_rate
+    min_value = getattr(config, attribute.min_value_name)
+    max_value = getattr(config, attribute.max_value_name)
+    init = _integer_init(np, attribute, config)
+
+    def mutate(rng, values):
+        values = np.asarray(values, dtype=np.int64)
+        r = rng.random(len(values))
+        mutated = r < mutate_rate
+        replaced = ~mutated & (r < replace_limit)
+        result = values.copy()
+        steps = np.round(rng.normal(0.0, mutate_power, mutated.sum())).astype(np.int64)
+        result[mutated] = np.clip(values[mutated] + steps, min_value, max_value)
+        result[replaced] = init(rng, replaced.sum())
+        return result, mutated | replaced
+
+    return mutate
+
+
+def _bool_init(np, attribute, config):
+    default = str(getattr(config, attribute.default_name)).lower()
+
+    if default in ('1', 'on', 'yes', 'true', '0', 'off', 'no', 'false'):
+        value = default in ('1', 'on', 'yes', 'true')
+
+        def init(rng, n):
+            return np.full(n, value)
+    elif default in ('random', 'none'):
+        def init(rng, n):
+            return rng.random(n) < 0.5
+    else:
+        raise RuntimeError(f"Unknown default value {default!r} for {attribute.name!s}")
+    return init
+
+
+def _bool_rule(np, attribute, config):
+    mutate_rate = getattr(config, attribute.mutate_rate_name)
+    true_rate = mutate_rate + getattr(config, attribute.rate_to_false_add_name)
+    false_rate = mutate_rate + getattr(config, attribute.rate_to_true_add_name)
+
+    def mutate(rng, values):
+        values = np.asarray(values, dtype=bool)
+        # As BoolAttribute.mutate_value, the new value is chosen at random,
+        # so a mutation may leave it unchanged.
+        mutated = rng.random(len(values)) < np.where(values, true_rate, false_rate)
+        result = values.copy()
+        result[mutated] = rng.random(mutated.sum()) < 0.5
+        return result, mutated
+
+    return mutate
+
+
+def _string_init(np, attribute, config):
+    default = getattr(config, attribute.default_name)
+    options = getattr(config, attribute.options_name)
+
+    if default.lower() in ('none', 'random'):
+        def init(rng, n):
+            return [options[i] for i in rng.integers(0, len(options), n).tolist()]
+    else:
+        def init(rng, n):
+            return [default] * n
+    return init
+
+
+def _string_rule(np, attribute, config):
+    mutate_rate = getattr(config, attribute.mutate_rate_name)
+    options = getattr(config, attribute.options_name)
+
+    def mutate(rng, values):
+        if mutate_rate <= 0:
+            return values, np.zeros(len(values), dtype=bool)
+        mutated = rng.random(len(values)) < mutate_rate
+        result = list(values)
+        for i, choice in zip(np.flatnonzero(mutated).tolist(),
+                             rng.integers(0, len(options), mutated.sum()).tolist()):
+            result[i] = options[choice]
+        return result, mutated
+
+    return mutate
+
+
+_RULES = ((FloatAttribute, ('mutate_value', 'init_value', 'clamp'), _float_rule),
+          (IntegerAttribute, ('mutate_value', 'init_value', 'clamp'), _integer_rule),
+          (BoolAttribute, ('mutate_value',), _bool_rule),
+          (StringAttribute, ('mutate_value',), _string_rule))
+
+_INITS = ((FloatAttribute, ('init_value', 'clamp'), _float_init),
+          (IntegerAttribute, ('init_value',), _integer_init),
+          (BoolAttribute, ('init_value',), _bool_init),
+          (StringAttribute, ('init_value',), _string_init))
+
+
+def _vectorized_rule(np, attribute, config):
+    """The vectorized mutation of ``attribute``, or None if its class isn't one of the built-in ones."""
+    for attribute_class, methods, rule in _RULES:
+        if isinstance(attribute, attribute_class) and attribute._specializes(attribute_class, *methods):
+            return rule(np, attribute, config)
+    return None
+
+
+def _gene_class(gene):
+    """The gene class of ``gene``; for a gene view of a CompactGenome, that of its table."""
+    table = getattr(gene, '_table', None)
+    return type(gene) if table is None else table.gene_type
+
+
+def initial_values(attribute, config):
+    """
+    Returns a function ``init(rng, n)`` giving a list of ``n`` initial values
+    of ``attribute``, as ``n`` calls of its ``init_value(config)`` would, but
+    drawn from the NumPy generator ``rng``.  Attributes of other classes than
+    the built-in ones (or that override ``init_value``) call their own
+    :meth:`~neat.attributes.BaseAttribute.initializer`, which draws from the
+    ``random`` module.
+    """
+    np = _import_numpy()
+    for attribute_class, methods, make_init in _INITS:
+        if isinstance(attribute, attribute_class) and attribute._specializes(attribute_class, *methods):
+            vectorized = make_init(np, attribute, config)
+
+            def init(rng, n):
+                values = vectorized(rng, n)
+                return values if isinstance(values, list) else values.tolist()
+            return init
+
+    initializer = attribute.initializer(config)
+
+    def init(rng, n):
+        return [initializer() for _ in range(n)]
+    return init
+
+
+def mutate_attributes(genomes, config, rng):
+    """
+    Mutates the attributes of every node and connection gene of ``genomes``
+    (an iterable of genomes with ``nodes`` and ``connections`` mappings), as
+    calling ``mutate(config)`` on each gene would, drawing from the NumPy
+    generator ``rng``.
+
+    Attributes of classes other than the built-in attribute classes (or that
+    override their mutation methods) are mutated one gene at a time with the
+    attribute's own :meth:`~neat.attributes.BaseAttribute.mutator`.  With
+    ``copy_on_write_genes`` enabled, changed genes are replaced by changed
+    copies instead of being modified in place.
+    """
+    np = _import_numpy()
+    copy_on_write = getattr(config, 'copy_on_write_genes', False)
+
+    # Genes grouped by class, with the mapping and key each one is held under.
+    groups = {}
+    for genome in genomes:
+        for mapping in (genome.connections, genome.nodes):
+            for key, gene in mapping.items():
+                gene_class = _gene_class(gene)
+                group = groups.get(gene_class)
+                if group is None:
+                    group = groups[gene_class] = ([], [], [])
+                group[0].append(gene)
+                group[1].append(mapping)
+                group[2].append(key)
+
+    for gene_class, (genes, mappings, keys) in groups.items():
+        updates = []
+        changed_any = np.zeros(len(genes), dtype=bool)
+        for attribute in gene_class._gene_attributes:
+            values = list(map(attrgetter(attribute.name), genes))
+            rule = _vectorized_rule(np, attribute, config)
+            if rule is None:
+                mutate = attribute.mutator(config)
+                new_values = [mutate(v) for v in values]
+                changed = np.fromiter((n is not v for n, v in zip(new_values, values)), dtype=bool,
+                                      count=len(values))
+            else:
+                new_values, changed = rule(rng, values)
+                if not isinstance(new_values, list):
+                    # Back to Python floats, ints and bools.
+                    new_values = new_values.tolist()
+            updates.append((attribute.name, new_values, changed))
+            changed_any |= changed
+
+        rows = np.flatnonzero(changed_any).tolist()
+        if copy_on_write:
+            for i in rows:
+                genes[i] = genes[i].copy()
+        for name, new_values, changed in updates:
+            for i in np.flatnonzero(changed).tolist():
+                setattr(genes[i], name, new_values[i])
+        if copy_on_write:
+            for i in rows:
+                mappings[i][keys[i]] = genes[i]
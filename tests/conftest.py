@@ -0,0 +1,16 @@
+"""Shared pytest configuration for the neat-python tests."""
+
+import pytest
+
+
+@pytest.fixture
+def run_in_tmp_path(tmp_path, monkeypatch):
+    """
+    Run a test in its own temporary directory, so that checkpoints and
+    statistics files written to the current directory (such as by
+    ``Checkpointer`` and ``StatisticsReporter.save`` with their default file
+    names) do not end up in the source tree.  Modules whose tests write such
+    files use it with ``pytestmark = pytest.mark.usefixtures('run_in_tmp_path')``;
+    tests find their configuration files relative to ``__file__``.
+    """
+    monkeypatch.chdir(tmp_path)
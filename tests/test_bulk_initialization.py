@@ -0,0 +1,120 @@
+"""
+Unit tests for bulk creation of the initial population in neat.bulk_initialization.
+"""
+
+import configparser
+import os
+
+import pytest
+
+import neat
+from neat.bulk_initialization import create_genomes, supports_bulk
+from neat.compact_genome import CompactGenome
+
+np = pytest.importorskip("numpy")
+
+
+def get_config(tmp_path, genome_type=neat.DefaultGenome, **overrides):
+    """Load the test configuration with genome settings ``overrides``, using bulk initialization."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), 'test_configuration'))
+    section = dict(parser['DefaultGenome'])
+    section.update({k: str(v) for k, v in overrides.items()})
+    parser.remove_section('DefaultGenome')
+    parser[genome_type.__name__] = section
+    parser['DefaultReproduction']['initialization'] = 'bulk'
+    path = str(tmp_path / genome_type.__name__)
+    with open(path, 'w') as f:
+        parser.write(f)
+    return neat.Config(genome_type, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, path)
+
+
+def summary(genome, config):
+    """Node keys, connection count and kinds of connection of ``genome``."""
+    gc = config.genome_config
+    kinds = {(i in gc.input_keys, o in gc.output_keys, i == o) for i, o in genome.connections}
+    return sorted(genome.nodes), len(genome.connections), sorted(kinds)
+
+
+@pytest.mark.parametrize('initial_connection', ['unconnected', 'fs_neat_nohidden', 'fs_neat_hidden',
+                                                'full_nodirect', 'full_direct', 'partial_nodirect 0.5'])
+@pytest.mark.parametrize('num_hidden', [0, 2])
+@pytest.mark.parametrize('feed_forward', [True, False])
+def test_structure_matches_configure_new(tmp_path, initial_connection, num_hidden, feed_forward):
+    config = get_config(tmp_path, initial_connection=initial_connection, num_hidden=num_hidden,
+                        feed_forward=feed_forward, num_inputs=4, num_outputs=3)
+    bulk = neat.Population(config, seed=1).population
+
+    config = get_config(tmp_path, initial_connection=initial_connection, num_hidden=num_hidden,
+                        feed_forward=feed_forward, num_inputs=4, num_outputs=3)
+    config.reproduction_config.initialization = 'per_genome'
+    per_genome = neat.Population(config, seed=1).population
+
+    assert list(bulk) == list(per_genome)
+    for key in bulk:
+        expected = summary(per_genome[key], config)
+        if 'partial' in initial_connection:
+            # Which connections are chosen is random; only their number is fixed.
+            expected = expected[:2]
+            assert summary(bulk[key], config)[:2] == expected
+        else:
+            assert summary(bulk[key], config) == expected
+
+    # A connection has the same innovation number in every genome.
+    innovations = {}
+    for genome in bulk.values():
+        for key, cg in genome.connections.items():
+            assert innovations.setdefault(key, cg.innovation) == cg.innovation
+    assert len(set(innovations.values())) == len(innovations)
+
+
+def test_attribute_values(tmp_path):
+    config = get_config(tmp_path, num_inputs=50, num_outputs=20, initial_connection='full_direct',
+                        enabled_default='random', activation_default='random',
+                        activation_options='sigmoid tanh relu')
+    population = neat.Population(config, seed=2).population
+    connections = [cg for g in population.values() for cg in g.connections.values()]
+    weights = np.array([cg.weight for cg in connections])
+    gc = config.genome_config
+    assert weights.mean() == pytest.approx(gc.weight_init_mean, abs=0.01)
+    assert weights.std() == pytest.approx(gc.weight_init_stdev, abs=0.01)
+    assert weights.min() >= gc.weight_min_value and weights.max() <= gc.weight_max_value
+    assert np.mean([cg.enabled for cg in connections]) == pytest.approx(0.5, abs=0.01)
+    assert all(type(cg.weight) is float and type(cg.enabled) is bool for cg in connections)
+    activations = [ng.activation for g in population.values() for ng in g.nodes.values()]
+    assert set(activations) == {'sigmoid', 'tanh', 'relu'}
+
+
+def test_reproducible_with_workers_and_compact_genomes(tmp_path):
+    def create(genome_type, seed, num_workers=1):
+        config = get_config(tmp_path, genome_type, num_hidden=1, initial_connection='partial_direct 0.5')
+        config.genome_config.innovation_tracker = neat.InnovationTracker()
+        genomes = create_genomes(genome_type, config.genome_config, range(1, 21), seed, num_workers)
+        return {key: str(genome) for key, genome in genomes.items()}
+
+    genomes = create(neat.DefaultGenome, 5)
+    assert create(neat.DefaultGenome, 5) == genomes
+    assert create(neat.DefaultGenome, 6) != genomes
+    assert create(neat.DefaultGenome, 5, num_workers=2) == genomes
+    assert create(CompactGenome, 5) == genomes
+
+
+def test_unsupported_genome_types_are_configured_one_by_one(tmp_path):
+    class MarkedGenome(neat.DefaultGenome):
+        def configure_new(self, config):
+            super().configure_new(config)
+            self.marked = True
+
+    assert supports_bulk(neat.DefaultGenome) and supports_bulk(CompactGenome)
+    assert not supports_bulk(MarkedGenome)
+    config = get_config(tmp_path, MarkedGenome)
+    population = neat.Population(config, seed=1).population
+    assert all(genome.marked for genome in population.values())
+
+
+def test_invalid_option(tmp_path):
+    config = get_config(tmp_path)
+    config.reproduction_config.initialization = 'parallel'
+    with pytest.raises(RuntimeError):
+        neat.Population(config)
@@ -0,0 +1,162 @@
+"""
+Unit tests for the array-backed neat.CompactGenome.
+
+Most tests compare against neat.DefaultGenome holding the same genes.
+"""
+
+import configparser
+import os
+import pickle
+import random
+import tracemalloc
+
+import pytest
+
+import neat
+from neat.compact_genome import CompactGenome
+
+
+def get_config(genome_type, tmp_path, **overrides):
+    """Load the test configuration with its genome section renamed for ``genome_type``."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), 'test_configuration'))
+    section = dict(parser['DefaultGenome'])
+    section.update({k: str(v) for k, v in overrides.items()})
+    parser.remove_section('DefaultGenome')
+    parser[genome_type.__name__] = section
+    path = str(tmp_path / genome_type.__name__)
+    with open(path, 'w') as f:
+        parser.write(f)
+    config = neat.Config(genome_type, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, path)
+    gc = config.genome_config
+    gc.activation_options = ['sigmoid', 'tanh', 'relu']
+    gc.activation_mutate_rate = 0.3
+    gc.node_add_prob = 0.5
+    gc.conn_add_prob = 0.5
+    gc.node_delete_prob = 0.1
+    gc.conn_delete_prob = 0.1
+    return config
+
+
+def eval_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = 0.5 * random.random()
+
+
+def to_default(genome):
+    """A DefaultGenome holding copies of ``genome``'s genes."""
+    result = neat.DefaultGenome(genome.key)
+    result.nodes = {k: ng.copy() for k, ng in genome.nodes.items()}
+    result.connections = {k: cg.copy() for k, cg in genome.connections.items()}
+    result.fitness = genome.fitness
+    return result
+
+
+@pytest.mark.parametrize('initial_connection', ['full_direct', 'partial_nodirect 0.5', 'fs_neat_hidden'])
+def test_configure_new_matches_default_genome(tmp_path, initial_connection):
+    genomes = []
+    for genome_type in (neat.DefaultGenome, CompactGenome):
+        config = get_config(genome_type, tmp_path, initial_connection=initial_connection,
+                            num_hidden=3, num_outputs=2)
+        config.genome_config.innovation_tracker = neat.InnovationTracker()
+        random.seed(17)
+        genome = genome_type(1)
+        genome.configure_new(config.genome_config)
+        genomes.append(genome)
+
+    default, compact = genomes
+    assert set(compact.nodes) == set(default.nodes)
+    assert set(compact.connections) == set(default.connections)
+    assert str(compact.nodes[0]) == str(default.nodes[0])
+    for key, cg in default.connections.items():
+        assert str(compact.connections[key]) == str(cg)
+    assert compact.size() == default.size()
+
+
+def test_operations_match_default_genome(tmp_path):
+    config = get_config(CompactGenome, tmp_path)
+    gc = config.genome_config
+    p = neat.Population(config, seed=5)
+    p.run(eval_genomes, 12)
+    genomes = list(p.population.values())[:40]
+    for genome in genomes:
+        genome.fitness = random.random()
+    defaults = [to_default(g) for g in genomes]
+
+    for a, da in zip(genomes, defaults):
+        for b, db in zip(genomes, defaults):
+            assert a.distance(b, gc) == pytest.approx(da.distance(db, gc), abs=1e-12)
+
+        child = CompactGenome(0)
+        child.configure_crossover(a, genomes[0], gc)
+        default_child = neat.DefaultGenome(0)
+        default_child.configure_crossover(da, defaults[0], gc)
+        assert set(child.connections) == set(default_child.connections)
+        assert set(child.nodes) == set(default_child.nodes)
+
+        net = neat.nn.FeedForwardNetwork.create(a, config)
+        default_net = neat.nn.FeedForwardNetwork.create(da, config)
+        assert net.activate([0.5, -1.0]) == default_net.activate([0.5, -1.0])
+
+        pruned = a.get_pruned_copy(gc)
+        default_pruned = da.get_pruned_copy(gc)
+        assert isinstance(pruned, CompactGenome)
+        assert set(pruned.connections) == set(default_pruned.connections)
+
+
+def test_dict_views_and_pickling(tmp_path):
+    config = get_config(CompactGenome, tmp_path)
+    p = neat.Population(config, seed=2)
+    p.run(eval_genomes, 8)
+    genome = max(p.population.values(), key=lambda g: len(g.connections))
+
+    key, cg = next(iter(genome.connections.items()))
+    assert key in genome.connections and cg.key == key
+    cg.weight = 0.25
+    cg.enabled = False
+    assert genome.connections[key].weight == 0.25
+    assert genome.connections[key].enabled is False
+    with pytest.raises(AttributeError):
+        cg.innovation = 0
+
+    # Views follow their gene when other genes move, and fail once it is deleted.
+    other_key = list(genome.connections)[-1]
+    other = genome.connections[other_key]
+    saved = cg.copy()
+    del genome.connections[key]
+    assert key not in genome.connections
+    assert other.weight == genome.connections[other_key].weight
+    with pytest.raises(KeyError):
+        cg.weight
+    genome.connections[key] = saved
+    assert genome.connections[key].weight == 0.25
+    assert isinstance(saved, neat.DefaultConnectionGene)
+
+    node = genome.nodes[0]
+    node.activation = 'relu'
+    assert genome.nodes[0].activation == 'relu'
+
+    restored = pickle.loads(pickle.dumps(genome))
+    assert str(restored) == str(genome)
+    assert restored.distance(genome, config.genome_config) == 0.0
+
+
+def test_memory_footprint(tmp_path):
+    def held(genome_type):
+        config = get_config(genome_type, tmp_path, num_inputs=20, num_outputs=20,
+                            initial_connection='full_direct')
+        config.genome_config.innovation_tracker = neat.InnovationTracker()
+        genome_type(0).configure_new(config.genome_config)
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        genomes = []
+        for key in range(1, 6):
+            genome = genome_type(key)
+            genome.configure_new(config.genome_config)
+            genomes.append(genome)
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        return size
+
+    assert held(CompactGenome) < held(neat.DefaultGenome) / 3
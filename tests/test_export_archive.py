@@ -0,0 +1,142 @@
+"""
+Unit tests for the columnar network archive in neat.export.archive.
+"""
+
+import os
+import random
+import zipfile
+
+import pytest
+
+import neat
+from neat.export import NetworkArchive, NetworkArchiveReporter
+
+np = pytest.importorskip("numpy")
+
+
+def get_test_config():
+    """Load test configuration."""
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                         neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                         config_path)
+    gc = config.genome_config
+    gc.activation_options = ['sigmoid', 'tanh', 'relu']
+    gc.activation_mutate_rate = 0.3
+    gc.node_add_prob = 0.5
+    gc.conn_add_prob = 0.5
+    return config
+
+
+def eval_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = 0.5 * random.random()
+
+
+SAMPLES = [[0.0, 0.0], [0.5, -1.0], [-2.0, 1.5], [1.0, 1.0]]
+
+
+def test_reporter_appends_champions_per_generation(tmp_path):
+    config = get_test_config()
+    path = str(tmp_path / 'champions.npz')
+    p = neat.Population(config, seed=12)
+    p.add_reporter(NetworkArchiveReporter(path, num_best=3))
+    champions = []
+
+    def record(genomes, config):
+        eval_genomes(genomes, config)
+        best = sorted((g for _, g in genomes), key=lambda g: g.fitness, reverse=True)[:3]
+        # Elites are re-evaluated later, so record key and fitness now.
+        champions.extend((g.key, g.fitness, neat.nn.FeedForwardNetwork.create(g, config)) for g in best)
+
+    p.run(record, 5)
+
+    archive = NetworkArchive(path)
+    assert len(archive) == len(champions) == 15
+    assert list(archive.columns('generation')) == [g for g in range(5) for _ in range(3)]
+    for index, (key, fitness, net) in enumerate(champions):
+        meta = archive.metadata(index)
+        assert meta['genome_id'] == key
+        assert meta['fitness'] == fitness
+        loaded = archive.load(index)
+        assert np.allclose([net.activate(x) for x in SAMPLES], loaded.activate_batch(SAMPLES))
+        assert not loaded.edge_weights.flags.writeable
+
+    # One block per generation, with function names shared across blocks.
+    with zipfile.ZipFile(path) as zf:
+        headers = [n for n in zf.namelist() if n.endswith('/header.npy')]
+    assert len(headers) == 5
+
+
+def test_append_mixed_networks_and_random_access(tmp_path):
+    config = get_test_config()
+    path = str(tmp_path / 'archive.npz')
+    p = neat.Population(config, seed=3)
+    p.run(eval_genomes, 4)
+    genomes = list(p.population.values())[:10]
+
+    archive = NetworkArchive(path)
+    assert len(archive) == 0
+    ff = [neat.nn.FeedForwardNetwork.create(g, config) for g in genomes]
+    archive.append(ff[:6], [{'genome_id': g.key, 'note': 'first'} for g in genomes[:6]])
+
+    config.genome_config.feed_forward = False
+    rnn = [neat.nn.RecurrentNetwork.create(g, config) for g in genomes[6:]]
+    archive.append(rnn)
+    size_after_two_blocks = os.path.getsize(path)
+    archive.append(ff[6:])
+    assert os.path.getsize(path) > size_after_two_blocks
+
+    reopened = NetworkArchive(path)
+    assert len(reopened) == 14
+    assert reopened.metadata(2) == {'genome_id': genomes[2].key, 'note': 'first'}
+    assert reopened.metadata(7) == {}
+
+    for index in (5, 0, 3):
+        assert np.allclose([ff[index].activate(x) for x in SAMPLES], reopened[index].activate_batch(SAMPLES))
+    for index, net in enumerate(rnn):
+        loaded = reopened.load(6 + index)
+        assert isinstance(loaded, neat.nn.vectorized.VectorizedRecurrentNetwork)
+        for x in SAMPLES:
+            assert np.allclose(net.activate(x), loaded.activate(x))
+    assert np.allclose([ff[9].activate(x) for x in SAMPLES], reopened[-1].activate_batch(SAMPLES))
+
+    with pytest.raises(IndexError):
+        reopened.load(14)
+    with pytest.raises(ValueError):
+        reopened.append(ff[:2], [{}])
+
+
+def test_append_indexes_only_the_new_block(tmp_path, monkeypatch):
+    config = get_test_config()
+    path = str(tmp_path / 'archive.npz')
+    p = neat.Population(config, seed=3)
+    p.run(eval_genomes, 2)
+    genomes = list(p.population.values())[:6]
+    ff = [neat.nn.FeedForwardNetwork.create(g, config) for g in genomes]
+
+    archive = NetworkArchive(path)
+    archive.append(ff[:2])
+    first = archive[0]
+
+    import neat.export.archive as archive_module
+
+    def reparse(filepath):
+        raise AssertionError("append re-read the whole archive")
+
+    monkeypatch.setattr(archive_module, '_npz_member_index', reparse)
+    for i in range(2, 6):
+        archive.append(ff[i:i + 1], [{'genome_id': genomes[i].key}])
+    monkeypatch.undo()
+
+    # A network loaded before later appends still views valid data.
+    assert np.allclose([ff[0].activate(x) for x in SAMPLES], first.activate_batch(SAMPLES))
+    assert archive.metadata(4) == {'genome_id': genomes[4].key}
+    with NetworkArchive(path) as reopened:
+        assert len(reopened) == len(archive) == 6
+        for index in range(6):
+            expected = [ff[index].activate(x) for x in SAMPLES]
+            assert np.allclose(expected, archive[index].activate_batch(SAMPLES))
+            assert np.allclose(expected, reopened[index].activate_batch(SAMPLES))
+    archive.close()
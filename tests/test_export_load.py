@@ -0,0 +1,155 @@
+"""
+Unit tests for loading exported JSON networks with neat.export.load_network_json.
+
+Each network type is exported, loaded back without a Config and compared
+against the original network.
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+import neat
+from neat.export import export_network_json, load_network_json
+
+np = pytest.importorskip("numpy")
+
+
+def get_test_config():
+    """Load test configuration."""
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def evolved_genomes(config, generations=6, seed=4):
+    """Run a few generations with structural mutation and return the genomes."""
+    gc = config.genome_config
+    gc.activation_options = ['sigmoid', 'tanh', 'relu', 'identity']
+    gc.activation_mutate_rate = 0.3
+    gc.aggregation_options = ['sum', 'product', 'max']
+    gc.aggregation_mutate_rate = 0.1
+    gc.node_add_prob = 0.5
+    gc.conn_add_prob = 0.5
+
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = 0.5 * random.random()
+
+    p = neat.Population(config, seed=seed)
+    p.run(eval_genomes, generations)
+    return list(p.population.values())[:30]
+
+
+SAMPLES = [[0.0, 0.0], [0.5, -1.0], [-2.0, 1.5], [1.0, 1.0]]
+
+
+def test_feedforward_round_trip():
+    config = get_test_config()
+    for genome in evolved_genomes(config):
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        json_str = export_network_json(net)
+        expected = [net.activate(x) for x in SAMPLES]
+
+        loaded = load_network_json(json_str)
+        assert isinstance(loaded, neat.nn.VectorizedFeedForwardNetwork)
+        assert np.allclose(expected, loaded.activate_batch(SAMPLES))
+
+        plain = load_network_json(json.loads(json_str), vectorized=False)
+        assert isinstance(plain, neat.nn.FeedForwardNetwork)
+        assert [plain.activate(x) for x in SAMPLES] == expected
+
+
+def test_recurrent_round_trip(tmp_path):
+    from neat.nn.vectorized import VectorizedRecurrentNetwork
+
+    config = get_test_config()
+    config.genome_config.feed_forward = False
+    path = str(tmp_path / 'net.json')
+    for genome in evolved_genomes(config, seed=8):
+        net = neat.nn.RecurrentNetwork.create(genome, config)
+        export_network_json(net, filepath=path)
+        loaded = load_network_json(path)
+        assert isinstance(loaded, VectorizedRecurrentNetwork)
+        for x in SAMPLES:
+            assert np.allclose(net.activate(x), loaded.activate(x))
+
+
+def test_ctrnn_round_trip():
+    config = get_test_config()
+    config.genome_config.feed_forward = False
+    for genome in evolved_genomes(config, generations=3):
+        net = neat.ctrnn.CTRNN.create(genome, config)
+        loaded = load_network_json(export_network_json(net))
+        assert isinstance(loaded, neat.ctrnn.CTRNN)
+        for x in SAMPLES:
+            assert net.advance(x, 0.1, 0.02) == loaded.advance(x, 0.1, 0.02)
+
+
+def test_iznn_round_trip():
+    from neat.iznn import IZNN, IZNeuron
+
+    neurons = {0: IZNeuron(bias=5.0, a=0.02, b=0.2, c=-65.0, d=8.0, inputs=[(-1, 10.0), (1, 2.0)]),
+               1: IZNeuron(bias=1.0, a=0.1, b=0.2, c=-65.0, d=2.0, inputs=[(-2, 5.0)])}
+    net = IZNN(neurons, [-1, -2], [0])
+    loaded = load_network_json(export_network_json(net))
+    assert isinstance(loaded, IZNN)
+    net.set_inputs([1.0, 0.5])
+    loaded.set_inputs([1.0, 0.5])
+    for _ in range(50):
+        assert net.advance(0.25) == loaded.advance(0.25)
+
+
+def test_custom_functions():
+    def double(z):
+        return 2.0 * z
+
+    identity = neat.activations.identity_activation
+    total = neat.aggregations.sum_aggregation
+    node_evals = [(0, double, total, 0.5, 1.0, [(-1, 1.0)]),
+                  (1, identity, total, 0.0, 1.0, [(-1, 3.0)])]
+    data = json.loads(export_network_json(neat.nn.FeedForwardNetwork([-1], [0, 1], node_evals)))
+
+    with pytest.raises(ValueError):
+        load_network_json(data)
+    loaded = load_network_json(data, custom_activations={'double': double})
+    assert np.allclose(loaded.activate_batch([[1.0], [-0.5]]), [[3.0, 3.0], [0.0, -1.5]])
+
+
+def test_invalid_documents_are_rejected():
+    config = get_test_config()
+    genome = evolved_genomes(config, generations=1)[0]
+    data = json.loads(export_network_json(neat.nn.FeedForwardNetwork.create(genome, config)))
+
+    missing = dict(data)
+    del missing['connections']
+    with pytest.raises(ValueError):
+        load_network_json(missing)
+
+    dangling = json.loads(json.dumps(data))
+    dangling['connections'].append({'from': 999, 'to': 0, 'weight': 1.0, 'enabled': True})
+    with pytest.raises(ValueError):
+        load_network_json(dangling)
+
+    unknown = json.loads(json.dumps(data))
+    unknown['nodes'][0]['activation'] = {'name': 'no_such_function', 'custom': False}
+    with pytest.raises(ValueError):
+        load_network_json(unknown)
+
+    miscounted = json.loads(json.dumps(data))
+    miscounted['topology']['num_inputs'] += 1
+    with pytest.raises(ValueError):
+        load_network_json(miscounted)
+
+    cyclic = json.loads(json.dumps(data))
+    hidden = {'id': 50, 'type': 'hidden', 'activation': {'name': 'sigmoid', 'custom': False},
+              'aggregation': {'name': 'sum', 'custom': False}, 'bias': 0.0, 'response': 1.0}
+    cyclic['nodes'].append(hidden)
+    cyclic['connections'] += [{'from': 50, 'to': 0, 'weight': 1.0, 'enabled': True},
+                              {'from': 0, 'to': 50, 'weight': 1.0, 'enabled': True}]
+    with pytest.raises(ValueError):
+        load_network_json(cyclic)
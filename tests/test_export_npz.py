@@ -0,0 +1,134 @@
+"""
+Unit tests for the binary .npz network artifact in neat.export.
+"""
+
+import json
+import os
+import random
+
+import pytest
+
+import neat
+from neat.export import (convert_json_to_npz, convert_npz_to_json, export_network_json,
+                         export_network_npz, load_network_json, load_network_npz)
+
+np = pytest.importorskip("numpy")
+
+
+def get_test_config():
+    """Load test configuration."""
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def evolved_genomes(config, generations=6, seed=6):
+    """Run a few generations with structural mutation and return the genomes."""
+    gc = config.genome_config
+    gc.activation_options = ['sigmoid', 'tanh', 'relu', 'identity']
+    gc.activation_mutate_rate = 0.3
+    gc.aggregation_options = ['sum', 'product', 'max']
+    gc.aggregation_mutate_rate = 0.1
+    gc.node_add_prob = 0.5
+    gc.conn_add_prob = 0.5
+
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = 0.5 * random.random()
+
+    p = neat.Population(config, seed=seed)
+    p.run(eval_genomes, generations)
+    return list(p.population.values())[:20]
+
+
+SAMPLES = [[0.0, 0.0], [0.5, -1.0], [-2.0, 1.5], [1.0, 1.0]]
+
+
+def test_feedforward_round_trip_is_memory_mapped(tmp_path):
+    config = get_test_config()
+    path = str(tmp_path / 'net.npz')
+    for genome in evolved_genomes(config):
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        export_network_npz(net, path, metadata={'genome_id': genome.key})
+
+        loaded = load_network_npz(path)
+        assert isinstance(loaded, neat.nn.VectorizedFeedForwardNetwork)
+        assert loaded.metadata['genome_id'] == genome.key
+        assert np.allclose([net.activate(x) for x in SAMPLES], loaded.activate_batch(SAMPLES))
+
+        # Arrays are read-only, aligned views into the mapped file.
+        for array in (loaded.bias, loaded.edge_weights, loaded.edge_sources):
+            assert not array.flags.writeable
+            assert not array.flags.owndata
+            assert array.flags.aligned
+
+        copied = load_network_npz(path, mmap=False)
+        assert np.array_equal(copied.edge_weights, loaded.edge_weights)
+
+
+def test_artifact_is_a_plain_npz_file(tmp_path):
+    config = get_test_config()
+    genome = evolved_genomes(config, generations=2)[0]
+    vnet = neat.nn.VectorizedFeedForwardNetwork.create(genome, config)
+    path = str(tmp_path / 'net.npz')
+    export_network_npz(vnet, path)
+    with np.load(path, allow_pickle=False) as data:
+        assert np.array_equal(data['edge_weights'], vnet.edge_weights)
+        assert json.loads(str(data['header']))['network_type'] == 'feedforward'
+
+
+def test_recurrent_round_trip(tmp_path):
+    config = get_test_config()
+    config.genome_config.feed_forward = False
+    path = str(tmp_path / 'net.npz')
+    for genome in evolved_genomes(config, seed=2):
+        net = neat.nn.RecurrentNetwork.create(genome, config)
+        export_network_npz(net, path)
+        loaded = load_network_npz(path)
+        for x in SAMPLES:
+            assert np.allclose(net.activate(x), loaded.activate(x))
+
+
+def test_json_round_trip(tmp_path):
+    config = get_test_config()
+    npz_path = str(tmp_path / 'net.npz')
+    for genome in evolved_genomes(config, seed=9):
+        net = neat.nn.FeedForwardNetwork.create(genome, config)
+        json_str = export_network_json(net, metadata={'fitness': genome.fitness})
+        expected = [net.activate(x) for x in SAMPLES]
+
+        convert_json_to_npz(json_str, npz_path)
+        data = json.loads(convert_npz_to_json(npz_path))
+        assert data['metadata']['fitness'] == genome.fitness
+        assert np.allclose(expected, load_network_json(data).activate_batch(SAMPLES))
+        plain = load_network_json(data, vectorized=False)
+        assert np.allclose(expected, [plain.activate(x) for x in SAMPLES])
+
+
+def test_custom_activation_and_unsupported_networks(tmp_path):
+    def double(z):
+        return 2.0 * z
+
+    path = str(tmp_path / 'net.npz')
+    net = neat.nn.FeedForwardNetwork([-1], [0], [(0, double, neat.aggregations.sum_aggregation,
+                                                  0.5, 1.0, [(-1, 1.0)])])
+    export_network_npz(net, path)
+    with pytest.raises(ValueError):
+        load_network_npz(path)
+    loaded = load_network_npz(path, custom_activations={'double': double})
+    assert np.allclose(loaded.activate_batch([[1.0]]), [[3.0]])
+
+    # Different functions with the same name are stored under different names.
+    double, triple = (lambda z: 2.0 * z), (lambda z: 3.0 * z)
+    net = neat.nn.FeedForwardNetwork([-1], [0, 1], [(0, double, sum, 0.0, 1.0, [(-1, 1.0)]),
+                                                    (1, triple, sum, 0.0, 1.0, [(-1, 1.0)])])
+    export_network_npz(net, path)
+    loaded = load_network_npz(path, custom_activations={'<lambda>': double, '<lambda>_2': triple})
+    assert np.allclose(loaded.activate_batch([[1.0]]), [[2.0, 3.0]])
+
+    config = get_test_config()
+    genome = evolved_genomes(config, generations=1)[0]
+    with pytest.raises(ValueError):
+        export_network_npz(neat.ctrnn.CTRNN.create(genome, config), path)
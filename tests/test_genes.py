@@ -1,6 +1,13 @@
+import copy
+import os
+import pickle
+import random
 import unittest
 
-from neat.genes import DefaultNodeGene, DefaultConnectionGene
+import neat
+from neat.attributes import FloatAttribute
+from neat.genes import BaseGene, DefaultNodeGene, DefaultConnectionGene, GeneKernels
+from neat.iznn import IZNodeGene
 
 
 class _DummyConfig:
@@ -260,5 +267,220 @@ class TestConnectionDistanceEnablePenalty(unittest.TestCase):
         self.assertAlmostEqual(g1.distance(g2, cfg), 1.0)
 
 
+class TestGeneSlots(unittest.TestCase):
+    def _node(self):
+        g = DefaultNodeGene(3)
+        g.bias = 0.5
+        g.response = 1.0
+        g.activation = "relu"
+        g.aggregation = "sum"
+        g.time_constant = 1.0
+        return g
+
+    def test_slots_are_generated_from_gene_attributes(self):
+        self.assertEqual(DefaultNodeGene._slot_names,
+                         ('key', 'bias', 'response', 'activation', 'aggregation', 'time_constant'))
+        self.assertEqual(DefaultConnectionGene._slot_names, ('key', 'innovation', 'weight', 'enabled'))
+        self.assertEqual(IZNodeGene._slot_names, ('key', 'bias', 'a', 'b', 'c', 'd'))
+        for gene in (self._node(), DefaultConnectionGene((0, 1), innovation=1), IZNodeGene(0)):
+            self.assertFalse(hasattr(gene, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self._node().not_an_attribute = 1.0
+
+    def test_subclass_adds_only_new_attributes(self):
+        class ExtendedNodeGene(DefaultNodeGene):
+            _gene_attributes = DefaultNodeGene._gene_attributes + [FloatAttribute('gain')]
+
+        class PlainSubclass(DefaultNodeGene):
+            pass
+
+        self.assertEqual(ExtendedNodeGene.__slots__, ('gain', '__dict__'))
+        self.assertEqual(ExtendedNodeGene._slot_names[-1], 'gain')
+        # Subclasses without their own gene attributes keep an instance __dict__.
+        plain = PlainSubclass(0)
+        plain.extra = 1
+        self.assertEqual(plain.extra, 1)
+
+    def test_user_subclass_can_set_extra_attributes(self):
+        class LabelledNodeGene(DefaultNodeGene):
+            _gene_attributes = DefaultNodeGene._gene_attributes + [FloatAttribute('gain')]
+
+            def __init__(self, key):
+                DefaultNodeGene.__init__(self, key)
+                self.label = f'node {key}'
+
+        class CompactNodeGene(DefaultNodeGene):
+            _slots_only = True
+            _gene_attributes = DefaultNodeGene._gene_attributes + [FloatAttribute('gain')]
+
+        gene = LabelledNodeGene(4)
+        gene.gain = 2.0
+        self.assertEqual(gene.label, 'node 4')
+        for restored in (copy.copy(gene), copy.deepcopy(gene)):
+            self.assertEqual((restored.label, restored.gain), ('node 4', 2.0))
+
+        self.assertEqual(CompactNodeGene.__slots__, ('gain',))
+        self.assertFalse(hasattr(CompactNodeGene(0), '__dict__'))
+        with self.assertRaises(AttributeError):
+            CompactNodeGene(0).label = 'x'
+
+    def test_pickle_and_copy_round_trip(self):
+        node = self._node()
+        conn = DefaultConnectionGene((0, 1), innovation=7)
+        conn.weight = -0.25
+        conn.enabled = False
+        for gene in (node, conn):
+            for restored in (pickle.loads(pickle.dumps(gene, protocol=0)),
+                             pickle.loads(pickle.dumps(gene)), copy.deepcopy(gene), gene.copy()):
+                self.assertIs(type(restored), type(gene))
+                self.assertEqual(str(restored), str(gene))
+
+        # Genes pickled before gene classes had slots carry their instance __dict__.
+        old_state = {'key': 3, 'bias': 0.5, 'response': 1.0, 'activation': 'relu',
+                     'aggregation': 'sum', 'time_constant': 1.0}
+        restored = BaseGene.__new__(DefaultNodeGene)
+        restored.__setstate__(old_state)
+        self.assertEqual(str(restored), str(node))
+
+
+class TestGeneKernels(unittest.TestCase):
+    def setUp(self):
+        config_path = os.path.join(os.path.dirname(__file__), 'test_configuration')
+        config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                             neat.DefaultStagnation, config_path)
+        self.config = config.genome_config
+        self.config.activation_options = ['sigmoid', 'tanh', 'relu']
+        self.config.activation_mutate_rate = 0.5
+        self.config.weight_replace_rate = 0.2
+        self.config.enabled_mutate_rate = 0.3
+        self.config.enabled_rate_to_true_add = 0.1
+
+    def _genes(self):
+        genes = [DefaultNodeGene(i) for i in range(20)]
+        genes += [DefaultConnectionGene((-1, i), innovation=i) for i in range(20)]
+        return genes
+
+    def _generic(self, genes):
+        """Initialize and mutate ``genes`` with the attribute methods directly."""
+        for g in genes:
+            for a in g._gene_attributes:
+                setattr(g, a.name, a.init_value(self.config))
+        for _ in range(10):
+            for g in genes:
+                for a in g._gene_attributes:
+                    setattr(g, a.name, a.mutate_value(getattr(g, a.name), self.config))
+        return [str(g) for g in genes]
+
+    def _kernels(self, genes):
+        for g in genes:
+            g.init_attributes(self.config)
+        for _ in range(10):
+            for g in genes:
+                g.mutate(self.config)
+        return [str(g) for g in genes]
+
+    def test_same_random_stream_as_attribute_methods(self):
+        for init_type in ('gaussian', 'uniform'):
+            self.config.weight_init_type = init_type
+            random.seed(3)
+            expected = self._generic(self._genes())
+            expected_state = random.getstate()
+            random.seed(3)
+            self.assertEqual(self._kernels(self._genes()), expected)
+            self.assertEqual(random.getstate(), expected_state)
+
+    def test_crossover_and_copy_match_attribute_loop(self):
+        random.seed(1)
+        genes = self._genes()
+        self._kernels(genes)
+        others = [g.copy() for g in genes]
+        self._kernels(others)
+        for g1, g2 in zip(genes, others):
+            state = random.getstate()
+            child = g1.crossover(g2)
+            random.setstate(state)
+            for a in g1._gene_attributes:
+                parent = g1 if random.random() > 0.5 else g2
+                if a.name != 'enabled' or (g1.enabled and g2.enabled):
+                    self.assertEqual(getattr(child, a.name), getattr(parent, a.name))
+            if isinstance(g1, DefaultConnectionGene):
+                self.assertEqual(child.innovation, g1.innovation)
+                if not g1.enabled or not g2.enabled:
+                    self.assertEqual(child.enabled, random.random() >= 0.75)
+            self.assertEqual(str(g1.copy()), str(g1))
+
+    def test_kernels_follow_config_changes(self):
+        gene = DefaultConnectionGene((-1, 0), innovation=0)
+        gene.init_attributes(self.config)
+        kernels = GeneKernels.get(DefaultConnectionGene, self.config)
+        self.assertIs(GeneKernels.get(DefaultConnectionGene, self.config), kernels)
+
+        self.config.weight_mutate_rate = 1.0
+        self.config.weight_max_value = self.config.weight_min_value = 0.25
+        self.assertIsNot(GeneKernels.get(DefaultConnectionGene, self.config), kernels)
+        gene.mutate(self.config)
+        self.assertEqual(gene.weight, 0.25)
+
+        # Options lists are shared with the configuration, so in-place changes apply too.
+        node = DefaultNodeGene(0)
+        node.init_attributes(self.config)
+        self.config.activation_mutate_rate = 1.0
+        node.mutate(self.config)
+        self.config.activation_options[:] = ['abs']
+        node.mutate(self.config)
+        self.assertEqual(node.activation, 'abs')
+
+        # Pickled configurations rebuild their kernels.
+        restored = pickle.loads(pickle.dumps(self.config))
+        self.assertEqual(restored._gene_kernels, {})
+        node.mutate(restored)
+        self.assertEqual(node.activation, 'abs')
+
+    def test_mutated_and_shared_crossover_reuse_unchanged_genes(self):
+        random.seed(5)
+        self.config.weight_mutate_rate = 0.5
+        self.config.weight_replace_rate = 0.0
+        self.config.enabled_mutate_rate = 0.0
+        genes = [DefaultConnectionGene((-1, i), innovation=i) for i in range(200)]
+        for g in genes:
+            g.init_attributes(self.config)
+
+        state = random.getstate()
+        mutated = [g.mutated(self.config) for g in genes]
+        random.setstate(state)
+        expected = [g.copy() for g in genes]
+        for g in expected:
+            g.mutate(self.config)
+        self.assertEqual([str(g) for g in mutated], [str(g) for g in expected])
+        unchanged = [m is g for m, g in zip(mutated, genes)]
+        self.assertTrue(any(unchanged) and not all(unchanged))
+
+        others = [g.copy() for g in genes]
+        for g in others:
+            g.weight += 1.0
+            g.enabled = False
+        state = random.getstate()
+        shared = [g1.shared_crossover(g2) for g1, g2 in zip(genes, others)]
+        random.setstate(state)
+        expected = [g1.crossover(g2) for g1, g2 in zip(genes, others)]
+        self.assertEqual([str(g) for g in shared], [str(g) for g in expected])
+        self.assertTrue(any(s is g for s, g in zip(shared, genes)))
+        self.assertTrue(any(s is g for s, g in zip(shared, others)))
+
+    def test_overridden_attribute_methods_are_used(self):
+        class DoublingAttribute(FloatAttribute):
+            def mutate_value(self, value, config):
+                return 2 * value
+
+        class DoublingGene(DefaultNodeGene):
+            _gene_attributes = [DoublingAttribute('bias')] + DefaultNodeGene._gene_attributes[1:]
+
+        gene = DoublingGene(0)
+        gene.init_attributes(self.config)
+        gene.bias = 1.5
+        gene.mutate(self.config)
+        self.assertEqual(gene.bias, 3.0)
+
+
 if __name__ == "__main__":
     unittest.main()
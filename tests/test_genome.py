@@ -1,6 +1,8 @@
 """Tests creating genomes with various configuration options."""
 
+import copy
 import os
+import random
 import sys
 import unittest
 
@@ -389,6 +391,35 @@ class TestPruning(unittest.TestCase):
         self.assertEqual(set(g_pruned.nodes.keys()), {0})
         self.assertEqual(set(g_pruned.connections.keys()), {(-1, 0), (-2, 0)})
 
+    def test_fingerprint(self):
+        config = self.config.genome_config
+        config.initial_connection = 'unconnected'
+        config.num_hidden = 0
+
+        g = neat.DefaultGenome(42)
+        g.configure_new(config)
+        g.add_connection(config, -1, 0, 1.0, True)
+        g.add_connection(config, -2, 0, 0.5, True)
+        g.nodes[0].bias = 0.2
+        twin = copy.deepcopy(g)
+        twin.key = 43
+        self.assertEqual(g.fingerprint(config), twin.fingerprint(config))
+
+        # Unexpressed genes and changes below the rounding do not change the fingerprint.
+        new_node_id = config.get_new_node_key(twin.nodes)
+        twin.nodes[new_node_id] = twin.create_node(config, new_node_id)
+        twin.add_connection(config, -1, new_node_id, 1.0, True)
+        twin.add_connection(config, -2, new_node_id, 2.0, False)
+        twin.connections[(-1, 0)].weight += 1e-9
+        self.assertEqual(g.fingerprint(config), twin.fingerprint(config))
+
+        twin.connections[(-2, 0)].enabled = False
+        self.assertNotEqual(g.fingerprint(config), twin.fingerprint(config))
+        twin.connections[(-2, 0)].enabled = True
+        twin.nodes[0].bias += 0.1
+        self.assertNotEqual(g.fingerprint(config), twin.fingerprint(config))
+        self.assertEqual(g.fingerprint(config, digits=0), twin.fingerprint(config, digits=0))
+
     def test_get_new_node_key_empty_nodes_starts_at_num_outputs(self):
         """get_new_node_key with empty node dict should start at num_outputs."""
         config = self.config.genome_config
@@ -404,5 +435,84 @@ class TestPruning(unittest.TestCase):
         self.assertEqual(second_node_id, config.num_outputs + 1)
 
 
+class TestCopyOnWriteGenes(unittest.TestCase):
+    def get_config(self, copy_on_write):
+        config_path = os.path.join(os.path.dirname(__file__), 'test_configuration')
+        config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                             neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                             config_path)
+        gc = config.genome_config
+        gc.copy_on_write_genes = copy_on_write
+        gc.node_add_prob = 0.5
+        gc.conn_add_prob = 0.5
+        gc.weight_mutate_rate = 0.3
+        gc.bias_mutate_rate = 0.3
+        config.no_fitness_termination = True
+        return config
+
+    @staticmethod
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = random.random()
+
+    def test_same_results_as_copying(self):
+        results = []
+        for copy_on_write in (False, True):
+            p = neat.Population(self.get_config(copy_on_write), seed=4)
+            p.run(self.eval_genomes, 8)
+            results.append([str(p.population[k]) for k in sorted(p.population)])
+        self.assertEqual(results[0], results[1])
+
+    def test_parents_are_not_modified(self):
+        config = self.get_config(True)
+        p = neat.Population(config, seed=9)
+        p.run(self.eval_genomes, 3)
+        parents = dict(p.population)
+
+        def genes(genomes):
+            return {k: [str(g) for g in list(genome.nodes.values()) + list(genome.connections.values())]
+                    for k, genome in genomes.items()}
+
+        before = genes(parents)
+        parent_genes = {id(g) for genome in parents.values() for g in genome.connections.values()}
+
+        p.run(self.eval_genomes, 1)
+        self.assertEqual(genes(parents), before)
+        children = [g for g in p.population.values() if g.key not in parents]
+        shared = sum(id(g) in parent_genes for child in children for g in child.connections.values())
+        self.assertGreater(shared, 0)
+
+    def test_clone_of_identical_parents(self):
+        for copy_on_write in (False, True):
+            config = self.get_config(copy_on_write)
+            gc = config.genome_config
+            p = neat.Population(config, seed=2)
+            p.run(self.eval_genomes, 4)
+            parent = max(p.population.values(), key=lambda g: len(g.connections))
+            parent.fitness = 1.0
+            for cg in list(parent.connections.values())[::2]:
+                cg.enabled = False
+            twin = copy.deepcopy(parent)
+
+            random.seed(1)
+            clone = neat.DefaultGenome(1)
+            clone.configure_crossover(parent, parent, gc)
+            state = random.getstate()
+            random.seed(1)
+            child = neat.DefaultGenome(1)
+            child.configure_crossover(parent, twin, gc)
+
+            self.assertEqual(random.getstate(), state)
+            self.assertEqual(list(clone.connections), list(child.connections))
+            self.assertEqual(str(clone), str(child))
+            reenabled = [k for k, cg in clone.connections.items() if cg.enabled != parent.connections[k].enabled]
+            self.assertTrue(all(clone.connections[k].enabled for k in reenabled))
+            shared = [k for k, cg in clone.connections.items() if cg is parent.connections[k]]
+            if copy_on_write:
+                self.assertEqual(len(shared) + len(reenabled), len(parent.connections))
+            else:
+                self.assertEqual(shared, [])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,10 +14,16 @@ These tests address gaps identified in TESTING_RECOMMENDATIONS.md for genome mut
 which were tested indirectly but lacked dedicated unit tests for mutation operations.
 """
 
+import configparser
+import copy
 import os
+import random
+import tempfile
 import unittest
+from collections import Counter
+
 import neat
-from neat.graphs import creates_cycle
+from neat.graphs import creates_cycle, successors
 
 
 class TestGenomeMutations(unittest.TestCase):
@@ -992,5 +998,143 @@ class TestDanglingNodePruning(unittest.TestCase):
         self.assertLessEqual(len(genome.connections), initial_conn_count)
 
 
+
+class TestLegalConnectionSampling(unittest.TestCase):
+    """Tests for conn_add_sampling = legal and the structural mutation counters."""
+
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, 'test_configuration')
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  config_path)
+        self.gc = self.config.genome_config
+        self.gc.innovation_tracker = neat.InnovationTracker()
+        self.gc.conn_add_sampling = 'legal'
+
+    def legal_connections(self, genome):
+        """All connections mutate_add_connection may add, by brute force."""
+        gc = self.gc
+        inputs = gc.input_keys + [k for k in genome.nodes if k not in gc.output_keys]
+        return {(i, o) for i in inputs for o in genome.nodes
+                if (i, o) not in genome.connections
+                and not (gc.feed_forward and creates_cycle(list(genome.connections), (i, o)))}
+
+    def sample(self, genome):
+        graph = successors(genome.connections) if self.gc.feed_forward else None
+        return genome._sample_new_connection(self.gc, list(genome.nodes), graph)
+
+    def random_genome(self, num_hidden, num_connections):
+        genome = neat.DefaultGenome(1)
+        genome.configure_new(self.gc)
+        for _ in range(num_hidden):
+            genome.mutate_add_node(self.gc)
+        for _ in range(num_connections):
+            genome.mutate_add_connection(self.gc)
+        return genome
+
+    def test_samples_are_legal_and_uniform(self):
+        random.seed(1)
+        genome = self.random_genome(4, 6)
+        legal = self.legal_connections(genome)
+        self.assertGreater(len(legal), 3)
+        samples = Counter(self.sample(genome) for _ in range(200 * len(legal)))
+        self.assertEqual(set(samples), legal)
+        for count in samples.values():
+            self.assertAlmostEqual(count / 200, 1.0, delta=0.3)
+
+    def test_last_legal_connection_is_found(self):
+        random.seed(2)
+        genome = self.random_genome(3, 0)
+        legal = sorted(self.legal_connections(genome))
+        # Leave a single legal connection.
+        for i, o in legal[1:]:
+            if not creates_cycle(list(genome.connections), (i, o)):
+                genome.add_connection(self.gc, i, o, 0.0, True)
+        remaining = self.legal_connections(genome)
+        self.assertEqual(len(remaining), 1)
+        genome.mutate_add_connection(self.gc)
+        self.assertIn(remaining.pop(), genome.connections)
+
+        # With no legal connection left, nothing is added unless a connection is re-enabled.
+        self.assertEqual(self.legal_connections(genome), set())
+        for cg in genome.connections.values():
+            cg.enabled = False
+        self.gc.structural_mutation_surer = 'false'
+        connections = dict(genome.connections)
+        genome.mutate_add_connection(self.gc)
+        self.assertEqual(genome.connections, connections)
+        self.assertFalse(any(cg.enabled for cg in genome.connections.values()))
+        self.gc.structural_mutation_surer = 'true'
+        genome.mutate_add_connection(self.gc)
+        self.assertEqual(sum(cg.enabled for cg in genome.connections.values()), 1)
+
+    def test_drawn_disabled_connection_is_reenabled(self):
+        random.seed(4)
+        gc = self.gc
+        gc.input_keys = gc.input_keys[:1]
+        pair = (gc.input_keys[0], gc.output_keys[0])
+        genome = neat.DefaultGenome(1)
+        genome.nodes = {k: genome.create_node(gc, k) for k in (gc.output_keys[0], 1)}
+        genome.add_connection(gc, pair[0], pair[1], 0.5, False)
+        # (input, 1) and (1, output) are legal new connections, so the
+        # disabled pair is only re-enabled when it is drawn.
+        reenabled = {}
+        for surer in ('false', 'true'):
+            gc.structural_mutation_surer = surer
+            reenabled[surer] = 0
+            for _ in range(40):
+                child = copy.deepcopy(genome)
+                child.mutate_add_connection(gc)
+                if child.connections[pair].enabled:
+                    self.assertEqual(len(child.connections), 1)
+                    reenabled[surer] += 1
+                else:
+                    self.assertEqual(len(child.connections), 2)
+        self.assertEqual(reenabled['false'], 0)
+        self.assertGreater(reenabled['true'], 0)
+
+    def test_recurrent_genomes(self):
+        random.seed(3)
+        self.gc.feed_forward = False
+        genome = self.random_genome(2, 5)
+        legal = self.legal_connections(genome)
+        samples = {self.sample(genome) for _ in range(50 * len(legal))}
+        self.assertEqual(samples, legal)
+
+    def test_structural_mutation_counts(self):
+        def eval_genomes(genomes, config):
+            for genome_id, genome in genomes:
+                genome.fitness = random.random()
+
+        rates = {}
+        for sampling in ('random_pair', 'legal'):
+            self.gc.conn_add_sampling = sampling
+            self.gc.structural_mutations = neat.genome.StructuralMutationCounts()
+            self.gc.conn_add_prob = 0.9
+            self.gc.node_add_prob = 0.5
+            self.config.no_fitness_termination = True
+            population = neat.Population(self.config, seed=4)
+            population.run(eval_genomes, 5)
+            counts = self.gc.structural_mutations
+            for kind in ('add_node', 'delete_node', 'add_connection', 'delete_connection'):
+                self.assertLessEqual(counts.successful[kind], counts.attempted[kind])
+            self.assertGreater(counts.attempted['add_connection'], 100)
+            rates[sampling] = counts.success_rate('add_connection')
+        self.assertGreater(rates['legal'], rates['random_pair'] + 0.2)
+
+    def test_invalid_option(self):
+        parser = configparser.ConfigParser()
+        parser.read(os.path.join(os.path.dirname(__file__), 'test_configuration'))
+        parser['DefaultGenome']['conn_add_sampling'] = 'exhaustive'
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'config')
+            with open(path, 'w') as f:
+                parser.write(f)
+            with self.assertRaises(RuntimeError):
+                neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                            neat.DefaultSpeciesSet, neat.DefaultStagnation, path)
+
+
 if __name__ == '__main__':
     unittest.main()
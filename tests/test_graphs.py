@@ -1,6 +1,6 @@
 import random
 
-from neat.graphs import creates_cycle, required_for_output, feed_forward_layers
+from neat.graphs import creates_cycle, descendants, feed_forward_layers, reaches, required_for_output, successors
 
 
 def assert_almost_equal(x, y, tol):
@@ -223,6 +223,19 @@ def test_orphaned_with_self_loop_prevention():
     assert creates_cycle(connections, (2, 2))
 
 
+def test_reaches_and_descendants():
+    random.seed(0)
+    for _ in range(50):
+        # A random acyclic graph: connections only from lower to higher node ids.
+        connections = {tuple(sorted(random.sample(range(12), 2))) for _ in range(random.randint(0, 25))}
+        graph = successors(connections)
+        for a in range(12):
+            below = descendants(graph, a)
+            for b in range(12):
+                assert reaches(graph, a, b) == (b in below)
+                assert (b in below) == (a == b or creates_cycle(list(connections), (b, a)))
+
+
 if __name__ == '__main__':
     test_creates_cycle()
     test_required_for_output()
@@ -234,3 +247,4 @@ if __name__ == '__main__':
     test_orphaned_mixed()
     test_orphaned_output_node()
     test_orphaned_with_self_loop_prevention()
+    test_reaches_and_descendants()
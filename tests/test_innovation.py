@@ -222,6 +222,21 @@ class TestInnovationTracker(unittest.TestCase):
         inn2 = restored.get_innovation_number(0, 1, 'add_connection')
         self.assertEqual(inn1, inn2)
 
+    def test_record_expression(self):
+        """Test tracking of the generations in which innovations were last expressed."""
+        tracker = neat.InnovationTracker()
+        tracker.record_expression({1, 2, 3}, {1}, 0)
+        tracker.record_expression({1, 2, 3, 4}, {2}, 1)
+        self.assertEqual(tracker.last_expressed, {1: 0, 2: 1, 3: 0, 4: 1})
+        self.assertEqual(tracker.inexpressed_innovations(2, 2), {1, 3})
+        self.assertEqual(tracker.inexpressed_innovations(2, 1), {1, 2, 3, 4})
+
+        # Innovations no longer in the population are forgotten.
+        tracker.record_expression({2, 4}, set(), 2)
+        self.assertEqual(tracker.last_expressed, {2: 1, 4: 1})
+        restored = pickle.loads(pickle.dumps(tracker))
+        self.assertEqual(restored.last_expressed, {2: 1, 4: 1})
+
 
 class TestGenomeInnovationTracking(unittest.TestCase):
     """Test innovation tracking in genome mutations."""
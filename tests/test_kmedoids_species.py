@@ -0,0 +1,138 @@
+"""
+Unit tests for k-medoids speciation in neat.kmedoids_species.
+"""
+
+import configparser
+import os
+import pickle
+import random
+from itertools import product
+
+import pytest
+
+import neat
+from neat.reporting import ReporterSet
+
+np = pytest.importorskip("numpy")
+
+from neat.kmedoids_species import KMedoidsSpeciesSet, distance_tiles  # noqa: E402
+
+
+def get_config(tmp_path, **settings):
+    """Load the test configuration, with a KMedoidsSpeciesSet section of ``settings``."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), 'test_configuration'))
+    parser.remove_section('DefaultSpeciesSet')
+    parser['KMedoidsSpeciesSet'] = {k: str(v) for k, v in {'num_species': 5, **settings}.items()}
+    parser['NEAT']['no_fitness_termination'] = 'True'
+    parser['DefaultGenome']['node_add_prob'] = '0.5'
+    path = str(tmp_path / 'config')
+    with open(path, 'w') as f:
+        parser.write(f)
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, KMedoidsSpeciesSet,
+                       neat.DefaultStagnation, path)
+
+
+def mutated_population(config, size=60):
+    random.seed(2)
+    reproduction = neat.DefaultReproduction(config.reproduction_config, ReporterSet(), None)
+    population = reproduction.create_new(neat.DefaultGenome, config.genome_config, size)
+    for gid, genome in population.items():
+        for _ in range(gid % 8):
+            genome.mutate(config.genome_config)
+    return population
+
+
+def total_distance(matrix, medoids):
+    return matrix[medoids].min(axis=0).sum()
+
+
+def test_distance_tiles(tmp_path):
+    config = get_config(tmp_path)
+    genomes = list(mutated_population(config, 20).values())
+    matrix = np.zeros((15, 20))
+    for i, j, block in distance_tiles(genomes[:15], genomes, config.genome_config, tile_size=6):
+        assert block.shape[0] <= 6 and block.shape[1] <= 6
+        matrix[i:i + block.shape[0], j:j + block.shape[1]] = block
+    expected = [[g1.distance(g2, config.genome_config) for g2 in genomes] for g1 in genomes[:15]]
+    assert matrix.tolist() == expected
+
+    tiles = list(distance_tiles(genomes, genomes, config.genome_config, tile_size=6, upper=True))
+    assert [(i, j) for i, j, block in tiles] == [(0, 0), (0, 6), (6, 6), (0, 12), (6, 12), (12, 12),
+                                                 (0, 18), (6, 18), (12, 18), (18, 18)]
+
+
+@pytest.mark.parametrize('k', [1, 2, 3])
+def test_pam_finds_a_swap_optimum(k):
+    rng = np.random.default_rng(k)
+    points = rng.normal(size=(12, 2))
+    matrix = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+    medoids, swaps = KMedoidsSpeciesSet._pam(np, matrix, k, 100)
+    assert len(set(medoids)) == k
+    cost = total_distance(matrix, medoids)
+    # No single swap of a medoid for a non-medoid improves the result.
+    for i, x in product(range(k), range(len(matrix))):
+        if x not in medoids:
+            swapped = list(medoids)
+            swapped[i] = x
+            assert total_distance(matrix, swapped) >= cost - 1e-9
+
+
+def test_speciation(tmp_path):
+    config = get_config(tmp_path)
+    population = mutated_population(config)
+    species_set = KMedoidsSpeciesSet(config.species_set_config, ReporterSet())
+    species_set.speciate(config, population, 0)
+    first = dict(species_set.genome_to_species)
+    species_set.speciate(config, population, 1)
+
+    assert len(species_set.species) == 5
+    assert set(species_set.genome_to_species) == set(population)
+    genome_config = config.genome_config
+    for sid, species in species_set.species.items():
+        rep = species.representative
+        assert species_set.genome_to_species[rep.key] == sid
+        # Each genome is in the species of its closest medoid.
+        for genome in species.members.values():
+            assert all(genome.distance(rep, genome_config) <= genome.distance(other.representative, genome_config)
+                       for other in species_set.species.values())
+    # The same population keeps its species ids.
+    assert species_set.genome_to_species == first
+
+
+def test_deterministic_under_seed(tmp_path):
+    results = []
+    for state in range(2):
+        config = get_config(tmp_path, clara_sample_size=20, clara_samples=3, distance_tile_size=7,
+                            kmedoids_seed=11)
+        population = mutated_population(config)
+        species_set = KMedoidsSpeciesSet(config.species_set_config, ReporterSet())
+        # The samples do not depend on the random module with a seed.
+        random.seed(state)
+        species_set.speciate(config, population, 0)
+        results.append(species_set.genome_to_species)
+    assert results[0] == results[1]
+
+
+def test_population_run(tmp_path):
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = random.random()
+
+    results = []
+    for _ in range(2):
+        config = get_config(tmp_path, distance_engine='vectorized', clara_sample_size=100, clara_samples=2)
+        population = neat.Population(config, seed=4)
+        population.run(eval_genomes, 4)
+        assert len(population.species.species) == 5
+        results.append(population.species.genome_to_species)
+        pickle.loads(pickle.dumps(population.species))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize('settings', [{'num_species': 0}, {'clara_samples': 0}, {'max_swaps': -1},
+                                      {'distance_tile_size': 0}])
+def test_invalid_options(tmp_path, settings):
+    config = get_config(tmp_path, **settings)
+    with pytest.raises(RuntimeError):
+        KMedoidsSpeciesSet(config.species_set_config, ReporterSet())
@@ -0,0 +1,146 @@
+"""
+Unit tests for approximate speciation with MinHash sketches in neat.lsh_species.
+"""
+
+import configparser
+import os
+import pickle
+import random
+
+import pytest
+
+import neat
+from neat.lsh_species import LSHSpeciesSet
+from neat.reporting import BaseReporter, ReporterSet
+
+
+class InfoReporter(BaseReporter):
+    def __init__(self):
+        self.messages = []
+
+    def info(self, msg):
+        self.messages.append(msg)
+
+
+def get_config(tmp_path, species_set_type=LSHSpeciesSet, **overrides):
+    """Load the test configuration, with species set settings ``overrides``."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), 'test_configuration'))
+    section = dict(parser['DefaultSpeciesSet'])
+    section.update({k: str(v) for k, v in overrides.items()})
+    parser.remove_section('DefaultSpeciesSet')
+    parser[species_set_type.__name__] = section
+    parser['NEAT']['no_fitness_termination'] = 'True'
+    parser['DefaultGenome']['node_add_prob'] = '0.5'
+    path = str(tmp_path / species_set_type.__name__)
+    with open(path, 'w') as f:
+        parser.write(f)
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction, species_set_type,
+                       neat.DefaultStagnation, path)
+
+
+def mutated_population(config, size=80):
+    random.seed(2)
+    reproduction = neat.DefaultReproduction(config.reproduction_config, ReporterSet(), None)
+    population = reproduction.create_new(neat.DefaultGenome, config.genome_config, size)
+    for gid, genome in population.items():
+        for _ in range(gid % 8):
+            genome.mutate(config.genome_config)
+    return population
+
+
+def test_buckets(tmp_path):
+    config = get_config(tmp_path, minhash_num_hashes=12, minhash_bands=4)
+    species_set = LSHSpeciesSet(config.species_set_config, ReporterSet())
+    population = mutated_population(config)
+    genome = population[1]
+    buckets = species_set.buckets(genome)
+    assert len(buckets) == 4
+    assert all(len(signature) == 3 for band, signature in buckets)
+
+    copy = pickle.loads(pickle.dumps(genome))
+    copy.key = 1000
+    assert LSHSpeciesSet(config.species_set_config, ReporterSet()).buckets(copy) == buckets
+    genome.connections.clear()
+    assert species_set.buckets(genome) == species_set.buckets(neat.DefaultGenome(1001))
+
+
+def test_speciation(tmp_path):
+    config = get_config(tmp_path, compatibility_threshold=1.5)
+    population = mutated_population(config)
+    reporter = InfoReporter()
+    reporters = ReporterSet()
+    reporters.add(reporter)
+    species_set = LSHSpeciesSet(config.species_set_config, reporters)
+    species_set.speciate(config, population, 0)
+    species_set.speciate(config, population, 1)
+
+    assert set(species_set.genome_to_species) == set(population)
+    assert len(species_set.species) > 1
+    for sid, species in species_set.species.items():
+        assert species_set.genome_to_species[species.representative.key] == sid
+        assert set(species.members) == {gid for gid, s in species_set.genome_to_species.items() if s == sid}
+    assert any(m.startswith('LSH speciation:') for m in reporter.messages)
+    assert any(m.startswith('LSH recall') for m in reporter.messages)
+
+
+def test_one_value_per_band_matches_exact(tmp_path):
+    # With one value in each of many bands, genomes with overlapping
+    # innovation sets almost always share a bucket; for these small genomes
+    # the species are those of exact speciation.
+    population = mutated_population(get_config(tmp_path))
+    results = []
+    for species_set_type, overrides in ((neat.DefaultSpeciesSet, {}),
+                                        (LSHSpeciesSet, {'minhash_num_hashes': 64, 'minhash_bands': 64})):
+        config = get_config(tmp_path, species_set_type, compatibility_threshold=1.5, **overrides)
+        species_set = species_set_type(config.species_set_config, ReporterSet())
+        species_set.speciate(config, population, 0)
+        species_set.speciate(config, population, 1)
+        results.append(species_set.genome_to_species)
+    assert results[0] == results[1]
+
+
+def test_population_run(tmp_path):
+    config = get_config(tmp_path, minhash_num_hashes=16, minhash_bands=8, exhaustive_fallback=False)
+
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = random.random()
+
+    population = neat.Population(config, seed=1)
+    population.run(eval_genomes, 5)
+    restored = pickle.loads(pickle.dumps(population.species))
+    assert restored.innovation_hashes == {}
+    assert restored.hash_parameters == population.species.hash_parameters
+
+
+def test_species_without_bucket_match_falls_back(tmp_path):
+    config = get_config(tmp_path, compatibility_threshold=1.5)
+    population = mutated_population(config)
+    species_set = LSHSpeciesSet(config.species_set_config, ReporterSet())
+    species_set.speciate(config, population, 0)
+    old_species = set(species_set.species)
+
+    # Genomes without connections share no bucket with the representatives
+    # that have some; the species are kept, with the closest genomes as
+    # representatives.
+    next_generation = {}
+    for gid, genome in population.items():
+        genome = pickle.loads(pickle.dumps(genome))
+        genome.key = gid + len(population)
+        genome.connections.clear()
+        next_generation[genome.key] = genome
+    species_set.speciate(config, next_generation, 1)
+    assert set(species_set.species) == old_species
+    assert set(species_set.genome_to_species) == set(next_generation)
+    for species in species_set.species.values():
+        assert next_generation[species.representative.key] is species.representative
+
+
+@pytest.mark.parametrize('overrides', [{'minhash_num_hashes': 30, 'minhash_bands': 16},
+                                       {'minhash_num_hashes': 8, 'minhash_bands': 16},
+                                       {'minhash_bands': 0},
+                                       {'recall_sample_size': -1}])
+def test_invalid_options(tmp_path, overrides):
+    with pytest.raises(RuntimeError):
+        get_config(tmp_path, **overrides)
@@ -0,0 +1,102 @@
+"""Tests for the batched ensemble phenotype in neat.nn.ensemble."""
+import os
+import random
+
+import pytest
+
+import neat
+from neat import activations
+from neat.aggregations import sum_aggregation
+from neat.nn import EnsembleFeedForwardNetwork, FeedForwardNetwork
+
+np = pytest.importorskip("numpy")
+
+
+def _load_config():
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def _best_genomes(config, k=5, generations=6, seed=2):
+    gc = config.genome_config
+    gc.node_add_prob = 0.5
+    gc.conn_add_prob = 0.5
+
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = 0.5 * random.random()
+
+    stats = neat.StatisticsReporter()
+    p = neat.Population(config, seed=seed)
+    p.add_reporter(stats)
+    p.run(eval_genomes, generations)
+    return stats.best_unique_genomes(k)
+
+
+def _two_output_net(w0, w1):
+    identity = activations.identity_activation
+    node_evals = [(0, identity, sum_aggregation, 0.0, 1.0, [(-1, w0)]),
+                  (1, identity, sum_aggregation, 0.0, 1.0, [(-1, w1)])]
+    return FeedForwardNetwork([-1], [0, 1], node_evals)
+
+
+def test_members_match_individual_networks():
+    config = _load_config()
+    genomes = _best_genomes(config)
+    ensemble = EnsembleFeedForwardNetwork.create(genomes, config)
+    rng = np.random.default_rng(0)
+    inputs = rng.uniform(-2.0, 2.0, size=(12, 2))
+
+    members = ensemble.activate_batch(inputs)
+    assert members.shape == (len(genomes), len(inputs), config.genome_config.num_outputs)
+    expected = []
+    for genome in genomes:
+        net = FeedForwardNetwork.create(genome, config)
+        expected.append([net.activate(list(x)) for x in inputs])
+    assert np.allclose(expected, members, rtol=1e-9, atol=1e-12)
+    assert np.allclose(np.mean(expected, axis=0), ensemble.predict(inputs))
+
+
+def test_weighted_combination_uses_fitness():
+    config = _load_config()
+    genomes = _best_genomes(config, k=3)
+    ensemble = EnsembleFeedForwardNetwork.create(genomes, config, combine='weighted')
+    inputs = [[0.5, -0.25], [1.0, 1.0]]
+
+    fitness = np.array([g.fitness for g in genomes])
+    members = ensemble.activate_batch(inputs)
+    expected = np.tensordot(fitness / fitness.sum(), members, axes=1)
+    assert np.allclose(expected, ensemble.predict(inputs))
+    assert np.allclose(expected[0], ensemble.activate([0.5, -0.25]))
+
+
+def test_vote_combination():
+    nets = [_two_output_net(1.0, -1.0), _two_output_net(2.0, 0.0), _two_output_net(-1.0, 1.0)]
+    ensemble = EnsembleFeedForwardNetwork(nets, combine='vote')
+    # Two of the three members pick output 0 for a positive input and
+    # output 1 for a negative one.
+    votes = ensemble.predict([[1.0], [-1.0]])
+    assert np.allclose(votes, [[2 / 3, 1 / 3], [1 / 3, 2 / 3]])
+
+    sigmoid = activations.sigmoid_activation
+    single = [FeedForwardNetwork([-1], [0], [(0, sigmoid, sum_aggregation, b, 1.0, [(-1, 1.0)])])
+              for b in (-1.0, 0.5, 2.0)]
+    ensemble = EnsembleFeedForwardNetwork(single, combine='vote')
+    assert np.allclose(ensemble.predict([[0.0]]), [[2 / 3]])
+
+
+def test_invalid_arguments():
+    nets = [_two_output_net(1.0, 1.0), _two_output_net(0.5, 0.5)]
+    with pytest.raises(ValueError):
+        EnsembleFeedForwardNetwork(nets, combine='median')
+    with pytest.raises(ValueError):
+        EnsembleFeedForwardNetwork(nets, combine='weighted')
+    with pytest.raises(ValueError):
+        EnsembleFeedForwardNetwork(nets, member_weights=[1.0, -1.0])
+    with pytest.raises(ValueError):
+        EnsembleFeedForwardNetwork([nets[0], FeedForwardNetwork([-1, -2], [0], [])])
+    with pytest.raises(RuntimeError):
+        EnsembleFeedForwardNetwork(nets).activate([0.0, 1.0])
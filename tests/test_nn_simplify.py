@@ -0,0 +1,166 @@
+"""Tests for the phenotype simplification pass in neat.nn.simplify."""
+import json
+import os
+import random
+
+import neat
+from neat import activations
+from neat.aggregations import product_aggregation, sum_aggregation
+from neat.export import export_network_json
+from neat.nn import FeedForwardNetwork, RecurrentNetwork
+from neat.nn.simplify import simplify_feed_forward, simplify_recurrent
+
+
+def _load_config():
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def _evolved_genomes(config, generations=8, seed=3):
+    """Run a few generations with structural mutation and return the genomes."""
+    gc = config.genome_config
+    gc.activation_options = ['sigmoid', 'identity', 'tanh', 'relu']
+    gc.activation_mutate_rate = 0.3
+    gc.aggregation_options = ['sum', 'product', 'max']
+    gc.aggregation_mutate_rate = 0.1
+    gc.node_add_prob = 0.5
+    gc.node_delete_prob = 0.0
+    gc.conn_add_prob = 0.5
+    gc.conn_delete_prob = 0.1
+
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = 0.5 * random.random()
+
+    p = neat.Population(config, seed=seed)
+    p.run(eval_genomes, generations)
+    return list(p.population.values())
+
+
+def test_constant_node_is_folded():
+    sigmoid = activations.sigmoid_activation
+    # Node 1 has no inputs, so its value is constant and feeds output 0.
+    node_evals = [(1, sigmoid, sum_aggregation, 0.3, 1.0, []),
+                  (0, sigmoid, sum_aggregation, 0.0, 1.0, [(-1, 1.0), (1, 2.0)])]
+    new_evals, constants = simplify_feed_forward([-1], [0], node_evals)
+
+    # The constant term has been moved into the output node's bias, so the
+    # constant node itself is no longer needed.
+    assert not constants
+    assert [ne[0] for ne in new_evals] == [0]
+    assert new_evals[0][5] == [(-1, 1.0)]
+    assert abs(new_evals[0][3] - 2.0 * sigmoid(0.3)) < 1e-12
+
+    full = FeedForwardNetwork([-1], [0], node_evals)
+    simple = FeedForwardNetwork([-1], [0], new_evals, constants)
+    for x in (-1.0, 0.0, 0.5):
+        assert abs(full.activate([x])[0] - simple.activate([x])[0]) < 1e-12
+
+
+def test_zero_weight_links_removed_from_sum_nodes_only():
+    sigmoid = activations.sigmoid_activation
+    node_evals = [(0, sigmoid, sum_aggregation, 0.0, 1.0, [(-1, 0.0), (-2, 1.5)]),
+                  (1, sigmoid, product_aggregation, 0.0, 1.0, [(-1, 0.0), (-2, 1.5)])]
+    new_evals, constants = simplify_feed_forward([-1, -2], [0, 1], node_evals)
+
+    assert not constants
+    links = {ne[0]: ne[5] for ne in new_evals}
+    assert links[0] == [(-2, 1.5)]
+    # A zero term changes the result of a product, so the link must stay.
+    assert links[1] == [(-1, 0.0), (-2, 1.5)]
+
+
+def test_identity_chain_is_collapsed():
+    identity = activations.identity_activation
+    sigmoid = activations.sigmoid_activation
+    # -1 -> 2 -> 1 -> 0, where 2 and 1 are identity pass-through nodes.
+    node_evals = [(2, identity, sum_aggregation, 0.0, 1.0, [(-1, 0.5)]),
+                  (1, identity, sum_aggregation, 0.25, 2.0, [(2, 3.0)]),
+                  (0, sigmoid, sum_aggregation, 0.1, 1.0, [(1, -1.0), (-1, 1.0)])]
+    new_evals, constants = simplify_feed_forward([-1], [0], node_evals)
+
+    assert not constants
+    assert [ne[0] for ne in new_evals] == [0]
+    sources = sorted(i for i, w in new_evals[0][5])
+    assert sources == [-1, -1]
+
+    full = FeedForwardNetwork([-1], [0], node_evals)
+    simple = FeedForwardNetwork([-1], [0], new_evals, constants)
+    for x in (-2.0, -0.3, 0.0, 0.7, 4.0):
+        assert abs(full.activate([x])[0] - simple.activate([x])[0]) < 1e-12
+
+
+def test_identity_output_node_is_kept():
+    identity = activations.identity_activation
+    node_evals = [(0, identity, sum_aggregation, 0.0, 1.0, [(-1, 2.0)])]
+    new_evals, constants = simplify_feed_forward([-1], [0], node_evals)
+    assert new_evals == node_evals
+    assert not constants
+
+
+def test_create_simplifies_by_default_and_preserves_outputs():
+    config = _load_config()
+    genomes = _evolved_genomes(config)
+    rng = random.Random(0)
+    samples = [[rng.uniform(-2, 2) for _ in range(2)] for _ in range(10)]
+
+    fewer = 0
+    for genome in genomes:
+        full = FeedForwardNetwork.create(genome, config, simplify=False)
+        simple = FeedForwardNetwork.create(genome, config)
+        full_links = sum(len(ne[5]) for ne in full.node_evals)
+        simple_links = sum(len(ne[5]) for ne in simple.node_evals)
+        assert len(simple.node_evals) <= len(full.node_evals)
+        assert simple_links <= full_links
+        if len(simple.node_evals) < len(full.node_evals) or simple_links < full_links:
+            fewer += 1
+        for x in samples:
+            for a, b in zip(full.activate(x), simple.activate(x)):
+                assert abs(a - b) <= 1e-9 * max(1.0, abs(a))
+
+    # Evolved bias neurons and pass-through nodes give the pass something to do.
+    assert fewer > 0
+
+
+def test_recurrent_simplification_preserves_outputs():
+    sigmoid = activations.sigmoid_activation
+    node_evals = [(0, sigmoid, sum_aggregation, 0.0, 1.0, [(-1, 1.0), (1, 0.0), (0, 0.5)]),
+                  (1, sigmoid, sum_aggregation, 0.2, 1.0, [(-1, 1.0)])]
+    new_evals = simplify_recurrent([-1], [0], node_evals)
+    # Node 1 only fed node 0 through a zero-weight link, so it is no longer needed.
+    assert [ne[0] for ne in new_evals] == [0]
+    assert new_evals[0][5] == [(-1, 1.0), (0, 0.5)]
+
+    full = RecurrentNetwork([-1], [0], node_evals)
+    simple = RecurrentNetwork([-1], [0], new_evals)
+    for x in (0.3, -0.2, 0.9, 0.0):
+        assert full.activate([x]) == simple.activate([x])
+
+
+def test_recurrent_create_matches_unsimplified():
+    config = _load_config()
+    config.genome_config.feed_forward = False
+    genomes = _evolved_genomes(config, generations=5, seed=11)
+    for genome in genomes:
+        full = RecurrentNetwork.create(genome, config, simplify=False)
+        simple = RecurrentNetwork.create(genome, config)
+        for step in range(5):
+            x = [0.1 * step, -0.2 * step]
+            assert full.activate(x) == simple.activate(x)
+
+
+def test_export_includes_constant_nodes():
+    sigmoid = activations.sigmoid_activation
+    node_evals = [(1, sigmoid, sum_aggregation, 0.3, 1.0, []),
+                  (0, sigmoid, product_aggregation, 0.0, 1.0, [(-1, 1.0), (1, 2.0)])]
+    new_evals, constants = simplify_feed_forward([-1], [0], node_evals)
+    net = FeedForwardNetwork([-1], [0], new_evals, constants)
+
+    data = json.loads(export_network_json(net))
+    nodes = {n['id']: n for n in data['nodes']}
+    assert nodes[1]['bias'] == constants[1]
+    assert nodes[1]['activation']['name'] == 'identity'
+    assert any(c['from'] == 1 and c['to'] == 0 for c in data['connections'])
@@ -0,0 +1,191 @@
+"""Tests for the array-backed feed-forward phenotype in neat.nn.vectorized."""
+import os
+import random
+
+import pytest
+
+import neat
+from neat import activations
+from neat.aggregations import max_aggregation, maxabs_aggregation, median_aggregation, sum_aggregation
+from neat.nn import FeedForwardNetwork, VectorizedFeedForwardNetwork
+from neat.nn.vectorized import VectorizedRecurrentNetwork
+
+np = pytest.importorskip("numpy")
+
+
+def _load_config():
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def _evolved_genomes(config, generations=10, seed=5):
+    gc = config.genome_config
+    gc.activation_options = sorted(gc.activation_defs.functions)
+    gc.activation_mutate_rate = 0.5
+    gc.aggregation_options = sorted(gc.aggregation_function_defs.functions)
+    gc.aggregation_mutate_rate = 0.3
+    gc.node_add_prob = 0.5
+    gc.node_delete_prob = 0.0
+    gc.conn_add_prob = 0.5
+    gc.conn_delete_prob = 0.1
+
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = 0.5 * random.random()
+
+    p = neat.Population(config, seed=seed)
+    p.run(eval_genomes, generations)
+    return list(p.population.values())
+
+
+def _assert_close(expected, actual):
+    expected = np.asarray(expected, dtype=float)
+    assert np.allclose(expected, actual, rtol=1e-9, atol=1e-12), (expected, actual)
+
+
+def test_matches_scalar_network_on_evolved_genomes():
+    config = _load_config()
+    rng = np.random.default_rng(0)
+    inputs = rng.uniform(-2.0, 2.0, size=(16, 2))
+    for genome in _evolved_genomes(config):
+        for simplify in (True, False):
+            net = FeedForwardNetwork.create(genome, config, simplify=simplify)
+            vnet = VectorizedFeedForwardNetwork.create(genome, config, simplify=simplify)
+            expected = [net.activate(list(x)) for x in inputs]
+            _assert_close(expected, vnet.activate_batch(inputs))
+
+
+def test_single_activate_returns_list():
+    node_evals = [(0, activations.sigmoid_activation, sum, 0.0, 1.0, [(-1, 1.0)])]
+    net = FeedForwardNetwork([-1], [0], node_evals)
+    vnet = VectorizedFeedForwardNetwork.from_network(net)
+    result = vnet.activate([0.2])
+    assert isinstance(result, list)
+    assert abs(result[0] - net.activate([0.2])[0]) < 1e-12
+
+    with pytest.raises(RuntimeError):
+        vnet.activate([0.2, 0.3])
+
+
+def test_order_dependent_aggregations_and_empty_nodes():
+    identity = activations.identity_activation
+    node_evals = [(3, identity, sum_aggregation, 0.7, 1.0, []),
+                  (0, identity, maxabs_aggregation, 0.0, 1.0, [(-1, 1.0), (-2, -1.0), (3, 1.0)]),
+                  (1, identity, median_aggregation, 0.0, 1.0, [(-1, 1.0), (-2, 2.0), (3, 1.0), (-1, 3.0)]),
+                  (2, identity, max_aggregation, 0.1, 1.0, [])]
+    net = FeedForwardNetwork([-1, -2], [0, 1, 2], node_evals)
+    vnet = VectorizedFeedForwardNetwork.from_network(net)
+    inputs = [[0.5, -0.5], [-2.0, 0.3], [0.0, 0.0], [1.0, 1.0]]
+    expected = [net.activate(x) for x in inputs]
+    _assert_close(expected, vnet.activate_batch(inputs))
+
+
+def test_custom_activation_is_applied_elementwise():
+    def double(z):
+        return 2.0 * z
+
+    node_evals = [(0, double, sum, 0.5, 1.0, [(-1, 1.0)])]
+    net = FeedForwardNetwork([-1], [0], node_evals)
+    vnet = VectorizedFeedForwardNetwork.from_network(net)
+    _assert_close([[2.5], [0.0]], vnet.activate_batch([[0.75], [-0.5]]))
+
+
+def test_custom_activations_with_the_same_name_are_kept_apart():
+    def sigmoid(z):
+        return -z
+
+    double = lambda z: 2.0 * z
+    triple = lambda z: 3.0 * z
+    node_evals = [(0, double, sum, 0.0, 1.0, [(-1, 1.0)]),
+                  (1, triple, sum, 0.0, 1.0, [(-1, 1.0)]),
+                  (2, sigmoid, sum, 0.0, 1.0, [(-1, 1.0)]),
+                  (3, activations.sigmoid_activation, sum, 0.0, 1.0, [(-1, 1.0)])]
+    net = FeedForwardNetwork([-1], [0, 1, 2, 3], node_evals)
+    vnet = VectorizedFeedForwardNetwork.from_network(net)
+    assert sorted(vnet.activation_functions) == ['<lambda>', '<lambda>_2', 'sigmoid_2']
+    _assert_close([net.activate([1.0])], vnet.activate_batch([[1.0]]))
+    _assert_close([net.activate([1.0])], [vnet.to_network().activate([1.0])])
+
+
+def test_custom_aggregation_is_rejected():
+    node_evals = [(0, activations.identity_activation, lambda x: 0.0, 0.0, 1.0, [(-1, 1.0)])]
+    net = FeedForwardNetwork([-1], [0], node_evals)
+    with pytest.raises(ValueError):
+        VectorizedFeedForwardNetwork.from_network(net)
+
+
+def test_shared_weights_match_rebuilt_networks():
+    config = _load_config()
+    genomes = _evolved_genomes(config, generations=6, seed=9)
+    weights = [-2.0, -1.0, -0.5, 0.5, 1.0, 2.0]
+    rng = np.random.default_rng(1)
+    inputs = rng.uniform(-1.0, 1.0, size=(8, 2))
+
+    for genome in genomes[:20]:
+        vnet = VectorizedFeedForwardNetwork.create(genome, config, simplify=False)
+        outputs = vnet.activate_shared_weights(inputs, weights)
+        assert outputs.shape == (len(weights), len(inputs), config.genome_config.num_outputs)
+
+        for k, w in enumerate(weights):
+            # Rebuild the scalar network with every weight set to w, without
+            # touching the genome (create(unique_value=...) overwrites weights).
+            template = FeedForwardNetwork.create(genome, config, simplify=False)
+            node_evals = [(n, a, g, b, r, [(i, w) for i, _ in links])
+                          for n, a, g, b, r, links in template.node_evals]
+            net = FeedForwardNetwork(template.input_nodes, template.output_nodes, node_evals)
+            expected = [net.activate(list(x)) for x in inputs]
+            _assert_close(expected, outputs[k])
+
+
+def _hand_built_genome(config, connections):
+    """A genome with output 0, a hidden identity node 1 and the given ``{(in, out): weight}``."""
+    genome = neat.DefaultGenome(1)
+    for key, activation in ((0, 'sigmoid'), (1, 'identity')):
+        node = genome.create_node(config.genome_config, key)
+        node.bias, node.response, node.activation, node.aggregation = 0.0, 1.0, activation, 'sum'
+        genome.nodes[key] = node
+    for innovation, ((i, o), weight) in enumerate(connections.items()):
+        cg = genome.create_connection(config.genome_config, i, o, innovation)
+        cg.weight, cg.enabled = weight, True
+        genome.connections[cg.key] = cg
+    return genome
+
+
+def test_shared_weights_require_unsimplified_network():
+    config = _load_config()
+    cases = [
+        # A zero-weight link is dropped.
+        ({(-1, 0): 0.5, (-2, 0): 0.0}, True),
+        # The identity node 1 is bypassed.
+        ({(-1, 1): 0.5, (1, 0): 0.7, (-2, 0): 0.3}, True),
+        ({(-1, 1): 0.5, (1, 0): 0.7, (-2, 0): 0.0}, True),
+        # Nothing to simplify.
+        ({(-1, 0): 0.5, (-2, 0): 0.3}, False),
+    ]
+    for connections, simplified in cases:
+        genome = _hand_built_genome(config, connections)
+        net = FeedForwardNetwork.create(genome, config)
+        assert not net.constants
+        assert net.simplified == simplified
+        vnet = VectorizedFeedForwardNetwork.create(genome, config)
+        assert vnet.simplified == simplified
+        assert VectorizedFeedForwardNetwork.from_network(vnet.to_network()).simplified == simplified
+        if simplified:
+            with pytest.raises(RuntimeError):
+                vnet.activate_shared_weights([[1.0, 2.0]], [2.0])
+        else:
+            expected = VectorizedFeedForwardNetwork.create(genome, config, simplify=False)
+            _assert_close(expected.activate_shared_weights([[1.0, 2.0]], [2.0]),
+                          vnet.activate_shared_weights([[1.0, 2.0]], [2.0]))
+        assert not VectorizedFeedForwardNetwork.create(genome, config, simplify=False).simplified
+
+
+def test_shared_weights_reject_recurrent_network():
+    config = _load_config()
+    genome = _evolved_genomes(config, generations=1)[0]
+    vnet = VectorizedRecurrentNetwork.create(genome, config, simplify=False)
+    with pytest.raises(TypeError):
+        vnet.activate_shared_weights([[0.0, 0.0]], [1.0])
@@ -2,6 +2,8 @@
 
 import multiprocessing
 import os
+import random
+
 import neat
 
 
@@ -90,8 +92,55 @@ def test_parallel_evaluator_backward_compatibility():
     pe.close()
 
 
+def eval_random_genome(genome, config):
+    """Fitness evaluation that depends on the (per-genome seeded) random module."""
+    return random.random() + 0.1 * len(genome.connections)
+
+
+class EventReporter(neat.reporting.BaseReporter):
+    """Records the reporter calls, with the state they report."""
+
+    def __init__(self):
+        self.events = []
+
+    def start_generation(self, generation):
+        self.events.append(('start_generation', generation))
+
+    def post_evaluate(self, config, population, species, best_genome):
+        self.events.append(('post_evaluate', sorted((g.key, g.fitness) for g in population.values()),
+                            best_genome.key))
+
+    def end_generation(self, config, population, species_set):
+        self.events.append(('end_generation', sorted(species_set.genome_to_species.items())))
+
+
+def test_parallel_evaluator_pipeline():
+    """Test that a pipelined run gives the same results as a sequential one."""
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    results = []
+    with neat.ParallelEvaluator(2, eval_random_genome, seed=42) as pe:
+        for pipeline in (False, True):
+            config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                 neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                 config_path)
+            config.no_fitness_termination = True
+            p = neat.Population(config, seed=3)
+            reporter = EventReporter()
+            p.add_reporter(reporter)
+            if pipeline:
+                winner = p.run(pe.evaluate_async, 4, pipeline=True)
+            else:
+                winner = p.run(pe.evaluate, 4)
+            results.append((winner.key, winner.fitness, reporter.events))
+
+    assert len([e for e in results[0][2] if e[0] == 'post_evaluate']) == 4
+    assert results[0] == results[1]
+
+
 if __name__ == '__main__':
     test_parallel_evaluator_context_manager()
     test_parallel_evaluator_explicit_close()
     test_parallel_evaluator_backward_compatibility()
+    test_parallel_evaluator_pipeline()
     print("All ParallelEvaluator tests passed!")
@@ -1,8 +1,13 @@
 import os
 import unittest
 
+import pytest
+
 import neat
 
+# Checkpoints and statistics are written to the current directory.
+pytestmark = pytest.mark.usefixtures('run_in_tmp_path')
+
 
 class PopulationTests(unittest.TestCase):
     def test_valid_fitness_criterion(self):
@@ -154,6 +159,83 @@ class PopulationTests(unittest.TestCase):
             msg="Species reporters do not match after restore"
         )
 
+    def test_carry_over_fitness(self):
+        """
+        Test that with carry_over_fitness the elites are not evaluated again,
+        the skipped evaluations are counted, and a deterministic fitness
+        function gives the same evolution.
+        """
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, 'test_configuration')
+        results = []
+        for carry_over in (False, True):
+            config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                 neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                 config_path)
+            config.no_fitness_termination = True
+            config.carry_over_fitness = carry_over
+            evaluated = []
+
+            def eval_genomes(genomes, config):
+                for genome_id, genome in genomes:
+                    evaluated.append(genome_id)
+                    genome.fitness = sum(cg.weight for cg in genome.connections.values())
+
+            p = neat.Population(config, seed=5)
+            p.run(eval_genomes, 5)
+            results.append((p.best_genome.key, p.best_genome.fitness, sorted(p.population),
+                            p.species.genome_to_species))
+            if carry_over:
+                self.assertGreater(p.skipped_evaluations, 0)
+                self.assertEqual(len(evaluated) + p.skipped_evaluations, 5 * config.pop_size)
+                self.assertEqual(len(evaluated), len(set(evaluated)))
+            else:
+                self.assertEqual(p.skipped_evaluations, 0)
+                self.assertEqual(len(evaluated), 5 * config.pop_size)
+
+        self.assertEqual(results[0], results[1])
+
+    def test_deduplicate_evaluations(self):
+        """
+        Test that with deduplicate_evaluations each fingerprint is evaluated once
+        per generation, the duplicates get its fitness, and a deterministic
+        fitness function gives the same evolution.
+        """
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, 'test_configuration')
+        results = []
+        for deduplicate in (False, True):
+            config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                 neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                 config_path)
+            config.no_fitness_termination = True
+            config.deduplicate_evaluations = deduplicate
+            genome_config = config.genome_config
+            # Low mutation rates leave many offspring the same as their parents.
+            for name in ('bias_mutate_rate', 'bias_replace_rate', 'weight_mutate_rate', 'weight_replace_rate',
+                         'conn_add_prob', 'conn_delete_prob', 'node_add_prob', 'node_delete_prob'):
+                setattr(genome_config, name, 0.05)
+            evaluated = []
+
+            def eval_genomes(genomes, config):
+                fingerprints = [genome.fingerprint(config.genome_config) for genome_id, genome in genomes]
+                if deduplicate:
+                    self.assertEqual(len(fingerprints), len(set(fingerprints)))
+                for genome_id, genome in genomes:
+                    evaluated.append(genome_id)
+                    expressed = genome.expressed_connections(config.genome_config)
+                    genome.fitness = sum(round(genome.connections[key].weight, 6) for key in sorted(expressed))
+
+            p = neat.Population(config, seed=5)
+            p.run(eval_genomes, 5)
+            results.append((p.best_genome.key, p.best_genome.fitness, sorted(p.population),
+                            p.species.genome_to_species))
+            self.assertEqual(len(evaluated) + p.deduplicated_evaluations, 5 * config.pop_size)
+            if deduplicate:
+                self.assertGreater(p.deduplicated_evaluations, 0)
+
+        self.assertEqual(results[0], results[1])
+
 
 if __name__ == '__main__':
     pass
@@ -493,5 +493,110 @@ class TestInterspeciesCrossover(unittest.TestCase):
         self.assertEqual(len(new_pop), pop_size)
 
 
+class TestGeneCompaction(unittest.TestCase):
+    """Tests for gene_compaction_generations."""
+
+    def setUp(self):
+        local_dir = os.path.dirname(__file__)
+        config_path = os.path.join(local_dir, 'test_configuration')
+        self.config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                                  neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                                  config_path)
+        self.config.no_fitness_termination = True
+        self.config.genome_config.node_add_prob = 0.5
+
+    @staticmethod
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = random.random()
+
+    def test_disabled_by_default(self):
+        self.assertEqual(self.config.reproduction_config.gene_compaction_generations, 0)
+
+    def test_compaction_keeps_outputs(self):
+        population = neat.Population(self.config, seed=3)
+        population.run(self.eval_genomes, 10)
+        genome_config = self.config.genome_config
+        innovations = {cg.innovation for g in population.population.values() for cg in g.connections.values()}
+        inputs = [(random.uniform(-1, 1), random.uniform(-1, 1)) for _ in range(5)]
+        removed = 0
+        for genome in population.population.values():
+            expected = neat.nn.FeedForwardNetwork.create(genome, self.config)
+            expected = [expected.activate(x) for x in inputs]
+            nodes, connections = genome.compact_genes(genome_config, innovations)
+            removed += connections
+            self.assertEqual(set(genome.connections), genome.expressed_connections(genome_config))
+            self.assertTrue(all(cg.enabled for cg in genome.connections.values()))
+            net = neat.nn.FeedForwardNetwork.create(genome, self.config)
+            self.assertEqual([net.activate(x) for x in inputs], expected)
+        self.assertGreater(removed, 0)
+
+    def _genome_with_hidden_nodes(self, reproduction):
+        """
+        A genome with a hidden node 1 fed only by a disabled connection (and
+        feeding the output), and a hidden node 2 without any connection.
+        """
+        genome_config = self.config.genome_config
+        genome = reproduction.create_new(self.config.genome_type, genome_config, 1)[1]
+        for key in (1, 2):
+            genome.nodes[key] = genome.create_node(genome_config, key)
+        for i, (key, enabled) in enumerate((((-1, 1), False), ((1, 0), True))):
+            cg = genome.create_connection(genome_config, key[0], key[1], 100 + i)
+            cg.enabled = enabled
+            genome.connections[key] = cg
+        return genome
+
+    def test_compaction_keeps_nodes_not_yet_connected(self):
+        reproduction = DefaultReproduction(self.config.reproduction_config, ReporterSet(), None)
+        genome = self._genome_with_hidden_nodes(reproduction)
+        genome_config = self.config.genome_config
+        innovations = {cg.innovation for cg in genome.connections.values()}
+        nodes, connections = genome.compact_genes(genome_config, innovations)
+        # Only (-1, 1) was not expressed; node 1 keeps its connection to the
+        # output, and node 2 had no connection to lose.
+        self.assertEqual((nodes, connections), (0, 1))
+        self.assertIn(2, genome.nodes)
+        self.assertIn(1, genome.nodes)
+        self.assertNotIn((-1, 1), genome.connections)
+
+        # Without its connection to the output, node 1 is no longer
+        # expressed and goes with the connection it loses.
+        del genome.connections[(1, 0)]
+        cg = genome.create_connection(genome_config, -1, 1, 100)
+        cg.enabled = False
+        genome.connections[cg.key] = cg
+        self.assertEqual(genome.compact_genes(genome_config, innovations), (1, 1))
+        self.assertNotIn(1, genome.nodes)
+        self.assertIn(2, genome.nodes)
+
+    def test_compaction_preserves_elites(self):
+        self.config.reproduction_config.gene_compaction_generations = 1
+        reproduction = DefaultReproduction(self.config.reproduction_config, ReporterSet(), None)
+        elite = self._genome_with_hidden_nodes(reproduction)
+        child = copy.deepcopy(elite)
+        child.key = 2
+        population = {1: elite, 2: child}
+        reproduction.innovation_tracker.last_expressed = {cg.innovation: 0 for cg in elite.connections.values()}
+        elite_genes = (set(elite.nodes), set(elite.connections))
+        reproduction.compact_genes(self.config.genome_config, population, 5, preserved={1})
+        self.assertEqual((set(elite.nodes), set(elite.connections)), elite_genes)
+        self.assertNotIn((-1, 1), child.connections)
+
+    def test_population_drops_stale_genes(self):
+        self.config.reproduction_config.gene_compaction_generations = 2
+        population = neat.Population(self.config, seed=4)
+        population.run(self.eval_genomes, 10)
+        tracker = population.reproduction.innovation_tracker
+        present = {cg.innovation for g in population.population.values() for cg in g.connections.values()}
+        self.assertLessEqual(present, set(tracker.last_expressed))
+        # The last reproduction was in generation 9.
+        self.assertFalse(present & tracker.inexpressed_innovations(9, 2))
+
+    def test_invalid_generations(self):
+        self.config.reproduction_config.gene_compaction_generations = -1
+        with self.assertRaises(RuntimeError):
+            DefaultReproduction(self.config.reproduction_config, ReporterSet(), None)
+
+
 if __name__ == '__main__':
     unittest.main()
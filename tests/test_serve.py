@@ -0,0 +1,201 @@
+"""Tests for the micro-batching inference server in neat.serve."""
+import json
+import os
+import random
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+import neat
+from neat import activations
+from neat.aggregations import sum_aggregation
+from neat.export import export_network_json
+from neat.nn import FeedForwardNetwork
+from neat.serve import InferenceServer, MicroBatcher, _Request, load_model
+
+np = pytest.importorskip("numpy")
+
+
+def _load_config():
+    local_dir = os.path.dirname(__file__)
+    config_path = os.path.join(local_dir, 'test_configuration')
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation,
+                       config_path)
+
+
+def _linear_net(weight, bias=0.0):
+    identity = activations.identity_activation
+    node_evals = [(0, identity, sum_aggregation, bias, 1.0, [(-1, weight), (-2, 1.0)])]
+    return FeedForwardNetwork([-1, -2], [0], node_evals)
+
+
+def _post(url, body):
+    request = urllib.request.Request(url, data=json.dumps(body).encode(),
+                                      headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+def test_load_model_from_genome_and_json(tmp_path):
+    config = _load_config()
+    config.genome_config.node_add_prob = 0.5
+
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = 0.5 * random.random()
+
+    p = neat.Population(config, seed=1)
+    p.run(eval_genomes, 5)
+    samples = [[0.1, 0.9], [-1.0, 0.5], [2.0, -2.0]]
+
+    for genome in list(p.population.values())[:20]:
+        net = FeedForwardNetwork.create(genome, config)
+        path = tmp_path / 'net.json'
+        export_network_json(net, filepath=str(path))
+        for model in (load_model(genome, config), load_model(str(path)), load_model(net)):
+            assert np.allclose([net.activate(x) for x in samples], model.activate_batch(samples))
+
+    with pytest.raises(ValueError):
+        load_model(genome)
+
+
+def test_concurrent_requests_are_batched():
+    batcher = MicroBatcher(load_model(_linear_net(2.0)), max_batch_size=16, max_delay=0.05)
+    batcher.start()
+    results = {}
+
+    def client(i):
+        results[i] = batcher.submit([float(i), 1.0])
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(32)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    batcher.stop()
+
+    assert results == {i: [2.0 * i + 1.0] for i in range(32)}
+    stats = batcher.stats()
+    assert stats['requests'] == 32
+    assert stats['batches'] < 32
+
+    with pytest.raises(ValueError):
+        batcher.swap(load_model(FeedForwardNetwork([-1], [0], [])))
+
+
+def test_http_activate_reload_and_stats(tmp_path):
+    path = tmp_path / 'new.json'
+    export_network_json(_linear_net(-1.0, bias=5.0), filepath=str(path))
+
+    server = InferenceServer(_linear_net(1.0), max_delay=0.0, reload_dir=str(tmp_path))
+    server.start()
+    try:
+        assert _post(server.url + '/activate', {'inputs': [2.0, 3.0]}) == {'outputs': [5.0]}
+        assert _post(server.url + '/activate', {'inputs': [[1.0, 0.0], [0.0, 1.0]]}) == {'outputs': [[1.0], [1.0]]}
+
+        # Requests keep being answered while the model is swapped.
+        stop = threading.Event()
+        failures = []
+
+        def client():
+            while not stop.is_set():
+                out = _post(server.url + '/activate', {'inputs': [2.0, 3.0]})['outputs']
+                if out not in ([5.0], [6.0]):
+                    failures.append(out)
+
+        threads = [threading.Thread(target=client) for _ in range(4)]
+        for t in threads:
+            t.start()
+        _post(server.url + '/reload', {'path': 'new.json'})
+        stop.set()
+        for t in threads:
+            t.join()
+        assert not failures
+
+        assert _post(server.url + '/activate', {'inputs': [2.0, 3.0]}) == {'outputs': [6.0]}
+        with pytest.raises(urllib.error.HTTPError) as e:
+            _post(server.url + '/activate', {'inputs': [1.0]})
+        assert e.value.code == 400
+
+        with urllib.request.urlopen(server.url + '/stats', timeout=10) as response:
+            stats = json.loads(response.read())
+        assert stats['swaps'] == 1
+        assert stats['requests'] >= 5
+    finally:
+        server.shutdown()
+
+
+def test_malformed_request_does_not_fail_its_batch():
+    batcher = MicroBatcher(load_model(_linear_net(2.0)), max_batch_size=16, max_delay=0.05)
+    batcher.start()
+    results = {}
+    errors = {}
+
+    def client(i):
+        try:
+            results[i] = batcher.submit([float(i), 1.0] if i % 4 else ['x', 1.0])
+        except ValueError as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with pytest.raises(TypeError):
+        batcher.submit([None, 1.0])
+    assert batcher.submit(['3', 1.0]) == [7.0]
+
+    # A batch that fails during evaluation is retried request by request.
+    class FailsOnNegative:
+        input_nodes = [-1, -2]
+
+        def activate_batch(self, inputs):
+            if (inputs < 0).any():
+                raise ValueError("negative input")
+            return inputs[:, :1]
+
+    batcher.swap(FailsOnNegative())
+    batch = [_Request([1.0, 2.0]), _Request([-1.0, 2.0]), _Request([3.0, 4.0])]
+    batcher._evaluate(batch)
+    batcher.stop()
+
+    assert results == {i: [2.0 * i + 1.0] for i in range(16) if i % 4}
+    assert sorted(errors) == [0, 4, 8, 12]
+    assert [r.outputs for r in batch] == [[1.0], None, [3.0]]
+    assert [r.error is None for r in batch] == [True, False, True]
+    assert all(r.done.is_set() for r in batch)
+
+
+def test_http_reload_is_restricted(tmp_path):
+    allowed = tmp_path / 'models'
+    allowed.mkdir()
+    export_network_json(_linear_net(-1.0), filepath=str(allowed / 'net.json'))
+    export_network_json(_linear_net(-1.0), filepath=str(tmp_path / 'outside.json'))
+    (allowed / 'neat-checkpoint-1').write_bytes(b'')
+
+    disabled = InferenceServer(_linear_net(1.0), max_delay=0.0)
+    disabled.start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as e:
+            _post(disabled.url + '/reload', {'path': str(allowed / 'net.json')})
+        assert e.value.code == 403
+    finally:
+        disabled.shutdown()
+
+    server = InferenceServer(_linear_net(1.0), max_delay=0.0, reload_dir=str(allowed))
+    server.start()
+    try:
+        for path in (str(tmp_path / 'outside.json'), '../outside.json', 'neat-checkpoint-1',
+                     str(allowed / 'neat-checkpoint-1')):
+            with pytest.raises(urllib.error.HTTPError) as e:
+                _post(server.url + '/reload', {'path': path})
+            assert e.value.code == 403
+        assert server.stats()['swaps'] == 0
+        assert _post(server.url + '/reload', {'path': str(allowed / 'net.json')}) == {'swaps': 1}
+    finally:
+        server.shutdown()
@@ -1,8 +1,13 @@
 import multiprocessing
 import os
 
+import pytest
+
 import neat
 
+# Checkpoints and statistics are written to the current directory.
+pytestmark = pytest.mark.usefixtures('run_in_tmp_path')
+
 VERBOSE = True
 
 
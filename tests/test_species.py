@@ -13,10 +13,14 @@ Tests cover:
 
 """
 
+import copy
 import os
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+
 import neat
-from neat.species import Species, GenomeDistanceCache, DefaultSpeciesSet
+from neat.species import Species, GenomeDistanceBound, GenomeDistanceCache, DefaultSpeciesSet
+from neat.species import _pack_genome, _unpack_genome
 from neat.reporting import ReporterSet
 
 
@@ -393,6 +397,290 @@ class TestSpeciesManagement(unittest.TestCase):
         num_pairs = len(distances)
         self.assertEqual(cache.hits, initial_hits + num_pairs)
     
+    def test_cache_kept_across_generations(self):
+        """
+        Test that a cache with a size bound keeps the distances of genomes
+        that are still present and unchanged, and forgets the others.
+        """
+        cache = GenomeDistanceCache(self.config.genome_config, max_size=100)
+        genomes = [self.create_test_genome(i) for i in range(3)]
+        cache.update_genomes(genomes)
+        cache(genomes[0], genomes[1])
+        cache(genomes[0], genomes[2])
+        cache(genomes[1], genomes[2])
+        self.assertEqual(cache.misses, 3)
+
+        # Genome 2 is replaced by a new object with the same key.
+        genomes[2] = self.create_test_genome(2)
+        cache.update_genomes(genomes)
+        self.assertEqual(len(cache.stored), 1)
+        cache(genomes[1], genomes[0])
+        cache(genomes[0], genomes[2])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Genome 0 loses a connection gene in place; genome 1 is gone.
+        del genomes[0].connections[next(iter(genomes[0].connections))]
+        cache.update_genomes([genomes[0], genomes[2]])
+        self.assertEqual(len(cache.stored), 0)
+
+    def test_cache_forgets_genomes_mutated_in_place(self):
+        """
+        Test that a genome whose gene attributes were mutated in place, with
+        the same numbers of genes, has its kept distances forgotten.
+        """
+        gc = self.config.genome_config
+        cache = GenomeDistanceCache(gc, max_size=100)
+        genomes = [self.create_test_genome(i) for i in range(3)]
+        cache.update_genomes(genomes)
+        cache(genomes[0], genomes[1])
+        cache(genomes[1], genomes[2])
+
+        gc.node_add_prob = gc.node_delete_prob = gc.conn_add_prob = gc.conn_delete_prob = 0.0
+        gc.weight_mutate_rate = 1.0
+        sizes = (len(genomes[0].nodes), len(genomes[0].connections))
+        genomes[0].mutate(gc)
+        self.assertEqual((len(genomes[0].nodes), len(genomes[0].connections)), sizes)
+        cache.update_genomes(genomes)
+        self.assertEqual(list(cache.stored), [(1, 2)])
+        self.assertEqual(cache(genomes[1], genomes[0]), genomes[1].distance(genomes[0], gc))
+
+    def test_cache_size_bound(self):
+        """
+        Test that the least recently used distances are evicted first.
+        """
+        cache = GenomeDistanceCache(self.config.genome_config, max_size=2)
+        genomes = [self.create_test_genome(i) for i in range(3)]
+        cache.update_genomes(genomes)
+        cache(genomes[0], genomes[1])
+        cache(genomes[0], genomes[2])
+        cache.update_genomes(genomes)
+        cache(genomes[1], genomes[0])
+        cache(genomes[1], genomes[2])
+        self.assertEqual(list(cache.stored), [(0, 1), (1, 2)])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_persistent_cache_speciation(self):
+        """
+        Test that speciation with a distance cache kept across generations
+        gives the same species, and reports the cache statistics.
+        """
+        messages = []
+
+        class InfoReporter(neat.reporting.BaseReporter):
+            def info(self, msg):
+                messages.append(msg)
+
+        results = []
+        for cache_size in (0, 1000):
+            self.config.species_set_config.distance_cache_size = cache_size
+            reporters = ReporterSet()
+            reporters.add(InfoReporter())
+            species_set = DefaultSpeciesSet(self.config.species_set_config, reporters)
+            population = self.create_population(20)
+            species_set.speciate(self.config, population, 0)
+            # The next generation keeps half of the genomes.
+            for i in range(10):
+                population[i + 20] = self.create_test_genome(i + 20)
+                del population[i]
+            species_set.speciate(self.config, population, 1)
+            results.append(species_set.genome_to_species)
+            if cache_size:
+                self.assertGreater(species_set.distance_cache.hits, 0)
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(len([m for m in messages if m.startswith('Distance cache:')]), 2)
+
+    def test_invalid_distance_cache_size(self):
+        """
+        Test that a negative distance_cache_size is rejected.
+        """
+        self.config.species_set_config.distance_cache_size = -1
+        with self.assertRaises(RuntimeError):
+            DefaultSpeciesSet(self.config.species_set_config, self.reporters)
+
+    def test_distance_bound_below_distance(self):
+        """
+        Test that the gene count bound never exceeds the genomic distance.
+        """
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.5
+        genomes = [self.create_test_genome(i) for i in range(30)]
+        for i, genome in enumerate(genomes):
+            for _ in range(i % 10):
+                genome.mutate(genome_config)
+        self.assertTrue(GenomeDistanceBound.applies(self.config))
+        bound = GenomeDistanceBound(genome_config)
+        self.assertTrue(any(bound(g1, g2) > 0.0 for g1 in genomes for g2 in genomes))
+        for g1 in genomes:
+            for g2 in genomes:
+                self.assertLessEqual(bound(g1, g2), g1.distance(g2, genome_config) + 1e-12)
+
+    def test_distance_bounds_speciation(self):
+        """
+        Test that skipping distances with the gene count bound gives the same species,
+        and that the number skipped is reported.
+        """
+        messages = []
+
+        class InfoReporter(neat.reporting.BaseReporter):
+            def info(self, msg):
+                messages.append(msg)
+
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.5
+        population = self.create_population(60)
+        for gid, genome in population.items():
+            for _ in range(gid % 12):
+                genome.mutate(genome_config)
+        next_population = {}
+        for gid, genome in population.items():
+            child = copy.deepcopy(genome)
+            child.key = gid + 60
+            child.mutate(genome_config)
+            next_population[child.key] = child
+        self.config.species_set_config.compatibility_threshold = 1.5
+
+        results = []
+        for bounds in (False, True):
+            self.config.species_set_config.distance_bounds = bounds
+            reporters = ReporterSet()
+            reporters.add(InfoReporter())
+            species_set = DefaultSpeciesSet(self.config.species_set_config, reporters)
+            species_set.speciate(self.config, population, 0)
+            species_set.speciate(self.config, next_population, 1)
+            results.append(species_set.genome_to_species)
+
+        self.assertGreater(len(set(results[0].values())), 1)
+        self.assertEqual(results[0], results[1])
+        skipped = [m for m in messages if m.startswith('Distance bounds skipped')]
+        self.assertEqual(len(skipped), 2)
+        self.assertNotIn('skipped 0 of', skipped[0])
+
+    def test_speciation_assignment_order(self):
+        """
+        Test that each genome, in id order, joins the species with the closest
+        representative within the threshold (the first in species order on a tie),
+        among the old species' new representatives and the species founded by
+        the genomes before it.
+        """
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.5
+        self.config.species_set_config.compatibility_threshold = 1.5
+        population = self.create_population(60)
+        for gid, genome in population.items():
+            for _ in range(gid % 12):
+                genome.mutate(genome_config)
+        species_set = DefaultSpeciesSet(self.config.species_set_config, self.reporters)
+        species_set.speciate(self.config, population, 0)
+        old_representatives = {sid: s.representative for sid, s in species_set.species.items()}
+        next_population = {}
+        for gid, genome in population.items():
+            child = copy.deepcopy(genome)
+            child.key = gid + 60
+            child.mutate(genome_config)
+            next_population[child.key] = child
+        species_set.speciate(self.config, next_population, 1)
+
+        representatives = {}
+        expected = {}
+        unspeciated = sorted(next_population)
+        for sid in sorted(old_representatives):
+            rid = min(unspeciated, key=lambda gid: old_representatives[sid].distance(next_population[gid],
+                                                                                     genome_config))
+            representatives[sid] = rid
+            expected[rid] = sid
+            unspeciated.remove(rid)
+        new_sids = iter(sorted(set(species_set.species) - set(old_representatives)))
+        for gid in unspeciated:
+            found = [(next_population[rid].distance(next_population[gid], genome_config), sid)
+                     for sid, rid in representatives.items()]
+            found = [(d, sid) for d, sid in found if d < 1.5]
+            if found:
+                expected[gid] = min(found, key=lambda x: x[0])[1]
+            else:
+                expected[gid] = next(new_sids)
+                representatives[expected[gid]] = gid
+
+        self.assertGreater(len(representatives), len(old_representatives))
+        self.assertEqual(species_set.genome_to_species, expected)
+
+    def test_packed_genome_distance(self):
+        """
+        Test that genomes rebuilt from their packed genes have the same distances.
+        """
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.5
+        genomes = [self.create_test_genome(i) for i in range(20)]
+        for i, genome in enumerate(genomes):
+            for _ in range(i % 10):
+                genome.mutate(genome_config)
+        rebuilt = [_unpack_genome(_pack_genome(g)) for g in genomes]
+        for g1, r1 in zip(genomes, rebuilt):
+            for g2, r2 in zip(genomes, rebuilt):
+                self.assertEqual(r1.distance(r2, genome_config), g1.distance(g2, genome_config))
+
+    def test_executor_speciation(self):
+        """
+        Test that speciation with distances computed by a process pool gives the
+        same species, distances and reports as without.
+        """
+        genome_config = self.config.genome_config
+        genome_config.node_add_prob = 0.5
+        population = self.create_population(60)
+        for gid, genome in population.items():
+            for _ in range(gid % 12):
+                genome.mutate(genome_config)
+        next_population = {}
+        for gid, genome in population.items():
+            child = copy.deepcopy(genome)
+            child.key = gid + 60
+            child.mutate(genome_config)
+            next_population[child.key] = child
+        self.config.species_set_config.compatibility_threshold = 1.5
+
+        results = []
+        with ProcessPoolExecutor(2) as executor:
+            for species_executor in (None, executor):
+                messages = []
+
+                class InfoReporter(neat.reporting.BaseReporter):
+                    def info(self, msg):
+                        messages.append(msg)
+
+                reporters = ReporterSet()
+                reporters.add(InfoReporter())
+                species_set = DefaultSpeciesSet(self.config.species_set_config, reporters)
+                species_set.speciate(self.config, population, 0, executor=species_executor)
+                species_set.speciate(self.config, next_population, 1, executor=species_executor)
+                results.append((species_set.genome_to_species, messages))
+
+        self.assertGreater(len(set(results[0][0].values())), 1)
+        self.assertEqual(results[0], results[1])
+
+    def test_sharded_chunks_follow_executor_workers(self):
+        """
+        Test that precompute_sharded splits the work into a few chunks per
+        worker of the executor, or of ``workers`` if given.
+        """
+        class RecordingExecutor:
+            def __init__(self, max_workers):
+                self._max_workers = max_workers
+                self.tasks = 0
+
+            def map(self, function, tasks):
+                tasks = list(tasks)
+                self.tasks += len(tasks)
+                return map(function, tasks)
+
+        genome_config = self.config.genome_config
+        genomes = list(self.create_population(40).values())
+        for workers, expected_tasks in ((None, 8), (1, 4)):
+            executor = RecordingExecutor(2)
+            cache = GenomeDistanceCache(genome_config)
+            cache.precompute_sharded(genomes[:2], genomes, executor, neat.DefaultGenome, workers=workers)
+            self.assertEqual(executor.tasks, expected_tasks)
+            self.assertEqual(cache(genomes[0], genomes[7]), genomes[0].distance(genomes[7], genome_config))
+
     # ========== Representative Selection Tests ==========
     
     def test_representative_initial_selection(self):
@@ -0,0 +1,166 @@
+"""
+Unit tests for the vectorized genome distance engine in neat.vectorized_distance.
+"""
+
+import configparser
+import math
+import os
+import random
+
+import pytest
+
+import neat
+from neat.compact_genome import CompactGenome
+from neat.genes import DefaultConnectionGene, DefaultNodeGene
+from neat.reporting import ReporterSet
+from neat.vectorized_distance import DistanceEngine, supports_vectorized_distance
+
+pytest.importorskip("numpy")
+
+
+def get_config(tmp_path, genome_type=neat.DefaultGenome, **overrides):
+    """Load the test configuration with genome settings ``overrides``."""
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), 'test_configuration'))
+    section = dict(parser['DefaultGenome'])
+    section.update({k: str(v) for k, v in overrides.items()})
+    parser.remove_section('DefaultGenome')
+    parser[genome_type.__name__] = section
+    parser['NEAT']['no_fitness_termination'] = 'True'
+    path = str(tmp_path / genome_type.__name__)
+    with open(path, 'w') as f:
+        parser.write(f)
+    return neat.Config(genome_type, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                       neat.DefaultStagnation, path)
+
+
+def evolved_population(config, generations=15, seed=3):
+    def eval_genomes(genomes, config):
+        for genome_id, genome in genomes:
+            genome.fitness = random.random()
+
+    population = neat.Population(config, seed=seed)
+    population.run(eval_genomes, generations)
+    return list(population.population.values())
+
+
+def assert_distances_match(genomes, config):
+    engine = DistanceEngine(config, genomes)
+    for genome in genomes[:20] + genomes[-5:]:
+        expected = [genome.distance(other, config) for other in genomes]
+        assert engine.distances(genome, genomes) == pytest.approx(expected, rel=1e-12, abs=1e-12)
+
+
+@pytest.mark.parametrize('genome_type', [neat.DefaultGenome, CompactGenome])
+@pytest.mark.parametrize('overrides', [{}, {'compatibility_include_node_genes': False},
+                                       {'compatibility_excess_coefficient': 0.25,
+                                        'compatibility_enable_penalty': 0.5,
+                                        'activation_mutate_rate': 0.3,
+                                        'activation_options': 'sigmoid tanh'}])
+def test_matches_genome_distance(tmp_path, genome_type, overrides):
+    config = get_config(tmp_path, genome_type, node_add_prob=0.5, **overrides)
+    genomes = evolved_population(config)
+    assert_distances_match(genomes, config.genome_config)
+
+
+def test_excess_disjoint_and_collisions(tmp_path):
+    config = get_config(tmp_path).genome_config
+
+    def genome(key, connections):
+        g = neat.DefaultGenome(key)
+        for node_key in (0, 1, 2):
+            g.nodes[node_key] = g.create_node(config, node_key)
+        for innovation, conn_key in connections:
+            g.connections[conn_key] = g.create_connection(config, conn_key[0], conn_key[1], innovation)
+        return g
+
+    genomes = [
+        genome(1, [(1, (-1, 0)), (2, (-2, 0)), (4, (-1, 1)), (9, (1, 0))]),
+        genome(2, [(1, (-1, 0)), (3, (-2, 1)), (5, (2, 0))]),
+        # Innovation 4 for a different connection than in genome 1.
+        genome(3, [(2, (-2, 0)), (4, (-2, 2)), (6, (2, 1))]),
+        genome(4, []),
+        genome(5, [(1, (-1, 0)), (2, (-2, 0)), (4, (-1, 1)), (9, (1, 0))]),
+    ]
+    genomes[4].nodes = {}
+    assert_distances_match(genomes, config)
+
+
+def test_engine_in_speciation(tmp_path):
+    config = get_config(tmp_path, node_add_prob=0.5)
+    genomes = {g.key: g for g in evolved_population(config)}
+    config.species_set_config.compatibility_threshold = 1.5
+    results = []
+    for engine in ('python', 'vectorized'):
+        config.species_set_config.distance_engine = engine
+        species_set = neat.DefaultSpeciesSet(config.species_set_config, ReporterSet())
+        species_set.speciate(config, genomes, 0)
+        species_set.speciate(config, genomes, 1)
+        results.append(species_set.genome_to_species)
+    assert len(set(results[0].values())) > 1
+    assert results[0] == results[1]
+
+
+def test_distance_at_threshold_in_speciation(tmp_path):
+    # The engine sums these weight differences in another order than
+    # DefaultGenome.distance, which gives a distance a few ulps lower; with the
+    # threshold at the exact distance, the second genome founds a species.
+    config = get_config(tmp_path)
+    innovations = [25, 27, 3, 17, 33, 32]
+    weights = [-0.5703951752975143, 1.702791534208636, -1.1801236435264353,
+               -0.14041827508586513, 0.5002922367301874, 2.448677311172011]
+
+    def genome(key, weights):
+        g = neat.DefaultGenome(key)
+        g.nodes[0] = g.create_node(config.genome_config, 0)
+        g.nodes[0].bias = 0.0
+        g.nodes[0].response = 1.0
+        g.nodes[0].activation = 'sigmoid'
+        g.nodes[0].aggregation = 'sum'
+        g.nodes[0].time_constant = 1.0
+        for innovation, weight in zip(innovations, weights):
+            cg = g.create_connection(config.genome_config, -innovation, 0, innovation)
+            cg.weight = weight
+            cg.enabled = True
+            g.connections[cg.key] = cg
+        return g
+
+    genomes = {1: genome(1, [0.0] * len(weights)), 2: genome(2, weights)}
+    exact = genomes[1].distance(genomes[2], config.genome_config)
+    for threshold, num_species in ((exact, 2), (math.nextafter(exact, math.inf), 1)):
+        config.species_set_config.compatibility_threshold = threshold
+        for engine in ('python', 'vectorized'):
+            config.species_set_config.distance_engine = engine
+            species_set = neat.DefaultSpeciesSet(config.species_set_config, ReporterSet())
+            species_set.speciate(config, genomes, 0)
+            assert len(species_set.species) == num_species, (threshold, engine)
+
+
+def test_unsupported_genomes_use_their_distance(tmp_path):
+    class OtherGenome(neat.DefaultGenome):
+        def distance(self, other, config):
+            return 0.0
+
+    class OtherNodeGene(DefaultNodeGene):
+        def distance(self, other, config):
+            return 0.0
+
+    config = get_config(tmp_path, OtherGenome)
+    assert supports_vectorized_distance(neat.DefaultGenome, config.genome_config)
+    assert supports_vectorized_distance(CompactGenome, config.genome_config)
+    assert not supports_vectorized_distance(OtherGenome, config.genome_config)
+    config.genome_config.node_gene_type = OtherNodeGene
+    assert not supports_vectorized_distance(neat.DefaultGenome, config.genome_config)
+    config.genome_config.node_gene_type = DefaultNodeGene
+    assert config.genome_config.connection_gene_type is DefaultConnectionGene
+
+    config.species_set_config.distance_engine = 'vectorized'
+    population = neat.Population(config, seed=1)
+    assert len(population.species.species) == 1
+
+
+def test_invalid_option(tmp_path):
+    config = get_config(tmp_path)
+    config.species_set_config.distance_engine = 'gpu'
+    with pytest.raises(RuntimeError):
+        neat.Population(config)
@@ -0,0 +1,165 @@
+"""
+Unit tests for population-level attribute mutation in neat.vectorized_mutation.
+"""
+
+import configparser
+import os
+import random
+
+import pytest
+
+import neat
+from neat.attributes import FloatAttribute
+from neat.compact_genome import CompactGenome
+from neat.genes import DefaultNodeGene
+from neat.vectorized_mutation import make_generator, mutate_attributes
+
+np = pytest.importorskip("numpy")
+
+
+def get_config(**reproduction):
+    config_path = os.path.join(os.path.dirname(__file__), 'test_configuration')
+    config = neat.Config(neat.DefaultGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, config_path)
+    for name, value in reproduction.items():
+        setattr(config.reproduction_config, name, value)
+    gc = config.genome_config
+    gc.activation_options = ['sigmoid', 'tanh', 'relu']
+    gc.activation_mutate_rate = 0.3
+    gc.node_add_prob = 0.5
+    gc.conn_add_prob = 0.5
+    config.no_fitness_termination = True
+    return config
+
+
+def eval_genomes(genomes, config):
+    for genome_id, genome in genomes:
+        genome.fitness = random.random()
+
+
+def genes_of(genome):
+    return [str(g) for g in list(genome.nodes.values()) + list(genome.connections.values())]
+
+
+def run(config, seed, generations):
+    p = neat.Population(config, seed=seed)
+    p.run(eval_genomes, generations)
+    return {k: genes_of(g) for k, g in p.population.items()}
+
+
+def test_runs_are_reproducible():
+    vectorized = run(get_config(attribute_mutation='vectorized'), 3, 6)
+    assert run(get_config(attribute_mutation='vectorized'), 3, 6) == vectorized
+    assert run(get_config(), 3, 6) != vectorized
+    assert run(get_config(attribute_mutation='vectorized'), 4, 6) != vectorized
+
+    # A fixed generator seed makes the draws depend only on it and the generation.
+    rng = make_generator(11, 5, random)
+    state = random.getstate()
+    assert make_generator(11, 5, random).random() == rng.random()
+    assert random.getstate() == state
+    assert make_generator(11, 6, random).random() != make_generator(11, 5, random).random()
+
+
+def test_mutation_rates_and_bounds():
+    config = get_config()
+    gc = config.genome_config
+    gc.weight_mutate_rate = 0.3
+    gc.weight_replace_rate = 0.2
+    gc.weight_max_value = gc.weight_min_value = 0.5
+    gc.enabled_mutate_rate = 0.4
+    gc.enabled_rate_to_true_add = 0.2
+    gc.bias_mutate_rate = 0.0
+    gc.bias_replace_rate = 0.0
+    gc.innovation_tracker = neat.InnovationTracker()
+
+    random.seed(0)
+    genome = neat.DefaultGenome(1)
+    for i in range(20000):
+        genome.add_connection(gc, -1, i, 0.0, bool(i % 2), innovation=i)
+    for key in range(100):
+        genome.nodes[key] = genome.create_node(gc, key)
+    biases = [ng.bias for ng in genome.nodes.values()]
+
+    mutate_attributes([genome], gc, np.random.default_rng(1))
+    weights = np.array([cg.weight for cg in genome.connections.values()])
+    assert np.mean(weights == 0.5) == pytest.approx(0.5, abs=0.02)
+    assert set(weights.tolist()) == {0.0, 0.5}
+
+    # A mutated enabled flag is chosen at random, as in BoolAttribute.mutate_value.
+    was_enabled = np.arange(20000) % 2 == 1
+    enabled = np.array([cg.enabled for cg in genome.connections.values()])
+    assert np.mean(enabled[was_enabled] != was_enabled[was_enabled]) == pytest.approx(0.2, abs=0.02)
+    assert np.mean(enabled[~was_enabled] != was_enabled[~was_enabled]) == pytest.approx(0.3, abs=0.02)
+    assert all(type(cg.weight) is float and type(cg.enabled) is bool for cg in genome.connections.values())
+
+    # Bias is neither mutated nor replaced; activation changes about 30% of the time.
+    assert [ng.bias for ng in genome.nodes.values()] == biases
+    activations = [ng.activation for ng in genome.nodes.values()]
+    assert set(activations) <= set(gc.activation_options) and len(set(activations)) > 1
+
+
+def test_offspring_only_and_copy_on_write():
+    config = get_config(attribute_mutation='vectorized', elitism=2)
+    config.genome_config.copy_on_write_genes = True
+    p = neat.Population(config, seed=6)
+    p.run(eval_genomes, 3)
+    parents = dict(p.population)
+    before = {k: genes_of(g) for k, g in parents.items()}
+    p.run(eval_genomes, 1)
+    assert {k: genes_of(g) for k, g in parents.items()} == before
+    elites = [k for k in p.population if k in parents]
+    assert len(elites) >= 2
+
+
+def test_custom_attributes_use_their_mutator():
+    class DoublingAttribute(FloatAttribute):
+        def mutate_value(self, value, config):
+            return 2 * value
+
+    class DoublingGene(DefaultNodeGene):
+        _gene_attributes = [DoublingAttribute('bias')] + DefaultNodeGene._gene_attributes[1:]
+
+    config = get_config()
+    genome = neat.DefaultGenome(1)
+    for key in range(10):
+        genome.nodes[key] = DoublingGene(key)
+        genome.nodes[key].init_attributes(config.genome_config)
+        genome.nodes[key].bias = float(key)
+    mutate_attributes([genome], config.genome_config, np.random.default_rng(0))
+    assert [ng.bias for ng in genome.nodes.values()] == [2.0 * key for key in range(10)]
+
+
+def test_compact_genome(tmp_path):
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(os.path.dirname(__file__), 'test_configuration'))
+    parser['CompactGenome'] = dict(parser['DefaultGenome'])
+    parser.remove_section('DefaultGenome')
+    path = str(tmp_path / 'config')
+    with open(path, 'w') as f:
+        parser.write(f)
+    config = neat.Config(CompactGenome, neat.DefaultReproduction, neat.DefaultSpeciesSet,
+                         neat.DefaultStagnation, path)
+    gc = config.genome_config
+    gc.innovation_tracker = neat.InnovationTracker()
+    gc.initial_connection = 'full_direct'
+
+    random.seed(2)
+    compact = CompactGenome(1)
+    compact.configure_new(gc)
+    # A DefaultGenome holding the same genes in the same order.
+    default = neat.DefaultGenome(1)
+    default.nodes = {k: ng.copy() for k, ng in compact.nodes.items()}
+    default.connections = {k: cg.copy() for k, cg in compact.connections.items()}
+    before = genes_of(default)
+
+    mutate_attributes([compact], gc, np.random.default_rng(5))
+    mutate_attributes([default], gc, np.random.default_rng(5))
+    assert genes_of(compact) == genes_of(default)
+    assert genes_of(compact) != before
+
+
+def test_invalid_option():
+    config = get_config(attribute_mutation='batched')
+    with pytest.raises(RuntimeError):
+        neat.Population(config)
@@ -1,7 +1,12 @@
 import os
 
+import pytest
+
 import neat
 
+# Checkpoints and statistics are written to the current directory.
+pytestmark = pytest.mark.usefixtures('run_in_tmp_path')
+
 
 def test_xor_example_uniform_weights():
     test_xor_example(uniform_weights=True)